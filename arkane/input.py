@@ -477,7 +477,7 @@ def pressureDependence(label,
                        maximumGrainSize=None, minimumGrainCount=0,
                        method=None, interpolationModel=None,
                        activeKRotor=True, activeJRotor=True, rmgmode=False,
-                       sensitivity_conditions=None):
+                       sensitivity_conditions=None, sparse=False):
     global jobList, networkDict
     
     if isinstance(interpolationModel, str):
@@ -493,7 +493,7 @@ def pressureDependence(label,
         maximumGrainSize=maximumGrainSize, minimumGrainCount=minimumGrainCount,
         method=method, interpolationModel=interpolationModel,
         activeKRotor=activeKRotor, activeJRotor=activeJRotor,
-        rmgmode=rmgmode, sensitivity_conditions=sensitivity_conditions)
+        rmgmode=rmgmode, sensitivity_conditions=sensitivity_conditions, sparse=sparse)
     jobList.append(job)
 
 
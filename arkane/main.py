@@ -50,6 +50,7 @@ from rmgpy.data.thermo import ThermoLibrary
 from rmgpy.data.base import Entry
 from rmgpy.data.kinetics.library import KineticsLibrary
 from rmgpy.exceptions import InputError
+from rmgpy.scoop_framework.util import setExecutor, shutdown as shutdownExecutor
 
 from arkane.input import loadInputFile
 from arkane.kinetics import KineticsJob
@@ -74,6 +75,7 @@ class Arkane:
     `inputFile`         The path of the input file defining the jobs to execute
     `outputDirectory`   The directory in which to write the output files
     `verbose`           The level of detail in the generated logging messages
+    `processes`         The number of worker processes for computing k(T,P) values
     =================== ========================================================
     
     The output directory defaults to the same directory as the input file if
@@ -86,11 +88,12 @@ class Arkane:
     :meth:`parseCommandLineArguments()` method before running :meth:`execute()`.
     """
     
-    def __init__(self, inputFile=None, outputDirectory=None, verbose=logging.INFO):
+    def __init__(self, inputFile=None, outputDirectory=None, verbose=logging.INFO, processes=1):
         self.jobList = []
         self.inputFile = inputFile
         self.outputDirectory = outputDirectory
         self.verbose = verbose
+        self.processes = processes
     
     def parseCommandLineArguments(self):
         """
@@ -123,6 +126,10 @@ class Arkane:
         # Add options for controlling generation of plots
         parser.add_argument('-p', '--plot', action='store_true', default=True, help='generate plots of results')
 
+        # Add options for computing the k(T,P) values of different temperatures in parallel
+        parser.add_argument('-n', '--processes', type=int, default=1, metavar='N',
+            help='use N worker processes for pressure dependence jobs')
+
         args = parser.parse_args()
         
         # Extract the input file
@@ -133,6 +140,9 @@ class Arkane:
         
         # Extract the plot settings
         self.plot = args.plot
+
+        # Extract the number of worker processes
+        self.processes = args.processes
         
         # Determine the output directory
         # By default the directory containing the input file is used, unless an
@@ -234,6 +244,9 @@ class Arkane:
         # Load the input file for the job
         self.jobList = self.loadInputFile(self.inputFile)
         logging.info('')
+
+        if self.processes > 1:
+            setExecutor('process', self.processes)
         
         # Initialize (and clear!) the output files for the job
         if self.outputDirectory is None:
@@ -308,6 +321,9 @@ class Arkane:
         with open(chemkinFile, 'a') as f:
             f.write('END\n\n')
 
+        # Stop the workers of the executor
+        shutdownExecutor()
+
         # Print some information to the end of the log
         self.logFooter()
     
@@ -87,6 +87,12 @@ def parse_command_line_arguments(command_line_args=None):
                         help='output a folder, kinetics_database, that contains a .txt file for each reaction family '
                              'listing the source(s) for each entry')
 
+    # Add options for distributing reaction generation and thermo estimation over several workers
+    parser.add_argument('-e', '--executor', type=str, choices=['serial', 'process', 'thread', 'scoop'], default=None,
+                        help='distribute tasks with EXECUTOR; overrides the input file')
+    parser.add_argument('-n', '--processes', type=int, default=None, metavar='N',
+                        help='use N workers for the executor; overrides the input file')
+
     args = parser.parse_args(command_line_args)
 
     # Process args to set correct default values and format
@@ -136,7 +142,9 @@ def main():
     kwargs = {
         'restart': args.restart,
         'walltime': args.walltime,
-        'kineticsdatastore': args.kineticsdatastore
+        'kineticsdatastore': args.kineticsdatastore,
+        'executor': args.executor,
+        'processes': args.processes,
     }
 
     if args.profile:
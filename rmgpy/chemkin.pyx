@@ -34,6 +34,7 @@ import re
 import logging
 import warnings
 import textwrap
+import itertools
 import os.path
 import numpy
 
@@ -54,6 +55,7 @@ from rmgpy.molecule import Molecule
 from rmgpy.molecule.util import retrieveElementCount
 from rmgpy.transport import TransportData
 from rmgpy.exceptions import ChemkinError
+from rmgpy.scoop_framework.util import broadcast, discard, get, getChunkSize, getExecutor, map_
 
 __chemkin_reaction_count = None
     
@@ -737,29 +739,24 @@ def readReactionComments(reaction, comments, read = True):
 
 ################################################################################
 
-def loadSpeciesDictionary(path):
+def loadSpeciesDictionary(path, generateResonanceStructures=True):
     """
     Load an RMG dictionary - containing species identifiers and the associated
     adjacency lists - from the file located at `path` on disk. Returns a dict
     mapping the species identifiers to the loaded species. Resonance isomers
-    for each species are automatically generated.
-    """
-    speciesDict = {}
+    for each species are automatically generated unless
+    `generateResonanceStructures` is ``False``, which callers that only
+    need the structures in the dictionary can use to skip that work.
     
-    inerts = [Species().fromSMILES(inert) for inert in ('[He]', '[Ne]', 'N#N', '[Ar]')]
+    The adjacency lists are parsed by the workers of the executor in use.
+    """
+    adjlists = []
     with open(path, 'r') as f:
         adjlist = ''
         for line in f:
             if line.strip() == '' and adjlist.strip() != '':
                 # Finish this adjacency list
-                species = Species().fromAdjacencyList(adjlist)
-                species.generate_resonance_structures()
-                label = species.label
-                for inert in inerts:
-                    if inert.isIsomorphic(species):
-                        species.reactive = False
-                        break
-                speciesDict[label] = species
+                adjlists.append(adjlist)
                 adjlist = ''
             else:
                 if "InChI" in line:
@@ -770,17 +767,36 @@ def loadSpeciesDictionary(path):
                 adjlist += line
         else: #reach end of file
             if adjlist.strip() != '':
-                species = Species().fromAdjacencyList(adjlist)
-                species.generate_resonance_structures()
-                label = species.label
-                for inert in inerts:
-                    if inert.isIsomorphic(species):
-                        species.reactive = False
-                        break
-                speciesDict[label] = species
+                adjlists.append(adjlist)
+
+    speciesDict = {}
+    chunkSize = getChunkSize(len(adjlists), getExecutor().processes)
+    chunks = [adjlists[i:i+chunkSize] for i in range(0, len(adjlists), chunkSize)]
+    for speciesList in map_(_readSpeciesDictionaryEntries, chunks, [generateResonanceStructures] * len(chunks)):
+        for species in speciesList:
+            speciesDict[species.label] = species
 
     return speciesDict
 
+def _readSpeciesDictionaryEntries(adjlists, generateResonanceStructures=True):
+    """
+    Return a list of the species read from the given species dictionary
+    entries `adjlists`. This function is passed to the workers by
+    :func:`loadSpeciesDictionary`.
+    """
+    speciesList = []
+    inerts = [Species().fromSMILES(inert) for inert in ('[He]', '[Ne]', 'N#N', '[Ar]')]
+    for adjlist in adjlists:
+        species = Species().fromAdjacencyList(adjlist)
+        if generateResonanceStructures:
+            species.generate_resonance_structures()
+        for inert in inerts:
+            if inert.isIsomorphic(species):
+                species.reactive = False
+                break
+        speciesList.append(species)
+    return speciesList
+
 def removeCommentFromLine(line):
     """
     Remove a comment from a line of a Chemkin file or species dictionary file.
@@ -840,11 +856,13 @@ def loadTransportFile(path, speciesDict):
                 )
 
 def loadChemkinFile(path, dictionaryPath=None, transportPath=None, readComments=True, thermoPath=None,
-                    useChemkinNames=False, checkDuplicates=True):
+                    useChemkinNames=False, checkDuplicates=True, generateResonanceStructures=True):
     """
     Load a Chemkin input file located at `path` on disk to `path`, returning lists of the species
     and reactions in the Chemkin file. The 'thermoPath' point to a separate thermo file, or, if 'None' is 
-    specified, the function will look for the thermo database within the chemkin mechanism file
+    specified, the function will look for the thermo database within the chemkin mechanism file.
+    If `generateResonanceStructures` is ``False``, only the structures in the species dictionary
+    are loaded, which is much faster for large mechanisms.
     """
     speciesList = []; speciesDict = {}; speciesAliases = {}
     reactionList = []
@@ -854,7 +872,7 @@ def loadChemkinFile(path, dictionaryPath=None, transportPath=None, readComments=
     # as N2, or else the species objects will not store any structures for the final
     # HTML output.
     if dictionaryPath:
-        speciesDict = loadSpeciesDictionary(dictionaryPath)
+        speciesDict = loadSpeciesDictionary(dictionaryPath, generateResonanceStructures)
 
     with open(path, 'r+b') as f:
     
@@ -929,88 +947,124 @@ def loadChemkinFile(path, dictionaryPath=None, transportPath=None, readComments=
     return speciesList, reactionList
 
 
+def _groupReactionsBySignature(reactions, bint eitherDirection=False):
+    """
+    Return a list of the groups of two or more of the given `reactions` that
+    have the same multisets of reactants and products and the same specific
+    collider, in the order of their first reaction. If `eitherDirection` is
+    ``True``, reactions written in opposite directions are placed in the same
+    group. Only reactions in the same group can be duplicates of one another,
+    so this lets duplicates be found in linear time.
+    """
+    cdef dict groups = {}
+    cdef list keys = []
+    cdef tuple reactants, products, key
+
+    for reaction in reactions:
+        reactants = tuple(sorted([hash(spec) for spec in reaction.reactants]))
+        products = tuple(sorted([hash(spec) for spec in reaction.products]))
+        if eitherDirection and products < reactants:
+            reactants, products = products, reactants
+        key = (reactants, products, hash(reaction.specificCollider))
+        try:
+            groups[key].append(reaction)
+        except KeyError:
+            groups[key] = [reaction]
+            keys.append(key)
+
+    return [groups[key] for key in keys if len(groups[key]) > 1]
+
 cpdef _process_duplicate_reactions(list reactionList):
     """
     Check for marked (and unmarked!) duplicate reactions
     Combine marked duplicate reactions into a single reaction using MultiKinetics
     Raise exception for unmarked duplicate reactions
     """
-    cdef list duplicateReactionsToRemove = []
+    cdef set duplicateReactionsToRemove = set()
     cdef list duplicateReactionsToAdd = []
+    cdef dict positions
+    cdef list group
     cdef int index1, index2
     cdef Reaction reaction, reaction1, reaction2
     cdef KineticsModel kinetics
 
-    for index1 in xrange(len(reactionList)):
-        reaction1 = reactionList[index1]
-        if reaction1 in duplicateReactionsToRemove:
-            continue
+    positions = dict([(id(reaction1), index1) for index1, reaction1 in enumerate(reactionList)])
+    for group in _groupReactionsBySignature(reactionList):
+        for index1 in xrange(len(group)):
+            reaction1 = group[index1]
+            if id(reaction1) in duplicateReactionsToRemove:
+                continue
 
-        for index2 in xrange(index1 + 1, len(reactionList)):
-            reaction2 = reactionList[index2]
-            if (reaction1.reactants == reaction2.reactants
-                    and reaction1.products == reaction2.products
-                    and reaction1.specificCollider == reaction2.specificCollider):
-                if reaction1.duplicate and reaction2.duplicate:
-
-                    if isinstance(reaction1, LibraryReaction) and isinstance(reaction2, LibraryReaction):
-                        if reaction1.library != reaction2.library:
-                            raise ChemkinError("Identical reactions {0} and {1} taken from different libraries: {2}, "
-                                               "{3}".format(reaction1, reaction2, reaction1.library, reaction2.library))
-                        if reaction1 not in duplicateReactionsToRemove:
-                            # already created duplicate reaction, move on to appending any additional duplicate kinetics
-                            if isinstance(reaction1.kinetics,
-                                          _kinetics.PDepArrhenius):
-                                kinetics = _kinetics.MultiPDepArrhenius()
-                            elif isinstance(reaction1.kinetics,
-                                            _kinetics.Arrhenius):
-                                kinetics = _kinetics.MultiArrhenius()
-                            else:
-                                logging.warning(
-                                    'Unexpected kinetics type {0} for duplicate reaction {1}. '
-                                    'Not combining reactions.'.format(reaction1.kinetics.__class__, reaction1)
+            for index2 in xrange(index1 + 1, len(group)):
+                reaction2 = group[index2]
+                if (reaction1.reactants == reaction2.reactants
+                        and reaction1.products == reaction2.products
+                        and reaction1.specificCollider == reaction2.specificCollider):
+                    if reaction1.duplicate and reaction2.duplicate:
+
+                        if isinstance(reaction1, LibraryReaction) and isinstance(reaction2, LibraryReaction):
+                            if reaction1.library != reaction2.library:
+                                raise ChemkinError("Identical reactions {0} and {1} taken from different libraries: {2}, "
+                                                   "{3}".format(reaction1, reaction2, reaction1.library, reaction2.library))
+                            if id(reaction1) not in duplicateReactionsToRemove:
+                                # already created duplicate reaction, move on to appending any additional duplicate kinetics
+                                if isinstance(reaction1.kinetics,
+                                              _kinetics.PDepArrhenius):
+                                    kinetics = _kinetics.MultiPDepArrhenius()
+                                elif isinstance(reaction1.kinetics,
+                                                _kinetics.Arrhenius):
+                                    kinetics = _kinetics.MultiArrhenius()
+                                else:
+                                    logging.warning(
+                                        'Unexpected kinetics type {0} for duplicate reaction {1}. '
+                                        'Not combining reactions.'.format(reaction1.kinetics.__class__, reaction1)
+                                    )
+                                    continue
+                                reaction = LibraryReaction(
+                                    index=reaction1.index,
+                                    reactants=reaction1.reactants,
+                                    products=reaction1.products,
+                                    specificCollider=reaction1.specificCollider,
+                                    kinetics=kinetics,
+                                    library=reaction1.library,
+                                    duplicate=False,
                                 )
-                                continue
-                            reaction = LibraryReaction(
-                                index=reaction1.index,
-                                reactants=reaction1.reactants,
-                                products=reaction1.products,
-                                specificCollider=reaction1.specificCollider,
-                                kinetics=kinetics,
-                                library=reaction1.library,
-                                duplicate=False,
-                            )
-                            duplicateReactionsToAdd.append(reaction)
-                            kinetics.arrhenius = [reaction1.kinetics]
-                            duplicateReactionsToRemove.append(reaction1)
-
-                    else:
-                        # Do not use as duplicate reactions if it's not a library reaction
-                        # Template reactions should be kept separate
-                        continue
-
-                    if (isinstance(reaction.kinetics,
-                                   _kinetics.MultiPDepArrhenius) and
-                            isinstance(reaction2.kinetics,
-                                       _kinetics.PDepArrhenius)):
-                        reaction.kinetics.arrhenius.append(reaction2.kinetics)
-                    elif (isinstance(reaction.kinetics,
-                                     _kinetics.MultiArrhenius) and
-                          isinstance(reaction2.kinetics,
-                                     _kinetics.Arrhenius)):
-                        reaction.kinetics.arrhenius.append(reaction2.kinetics)
-                    else:
-                        raise ChemkinError('Mixed kinetics for duplicate reaction {0}.'.format(reaction))
-
-                    duplicateReactionsToRemove.append(reaction2)
-                elif reaction1.kinetics.isPressureDependent() == reaction2.kinetics.isPressureDependent():
-                    # If both reactions are pressure-independent or both are pressure-dependent, then they need
-                    # duplicate tags. Chemkin treates pdep and non-pdep reactions as different, so those are okay
-                    raise ChemkinError('Encountered unmarked duplicate reaction {0}.'.format(reaction1))
-
-    for reaction in duplicateReactionsToRemove:
-        reactionList.remove(reaction)
-    reactionList.extend(duplicateReactionsToAdd)
+                                duplicateReactionsToAdd.append((positions[id(reaction1)], reaction))
+                                kinetics.arrhenius = [reaction1.kinetics]
+                                duplicateReactionsToRemove.add(id(reaction1))
+
+                        else:
+                            # Do not use as duplicate reactions if it's not a library reaction
+                            # Template reactions should be kept separate
+                            continue
+
+                        if (isinstance(reaction.kinetics,
+                                       _kinetics.MultiPDepArrhenius) and
+                                isinstance(reaction2.kinetics,
+                                           _kinetics.PDepArrhenius)):
+                            reaction.kinetics.arrhenius.append(reaction2.kinetics)
+                        elif (isinstance(reaction.kinetics,
+                                         _kinetics.MultiArrhenius) and
+                              isinstance(reaction2.kinetics,
+                                         _kinetics.Arrhenius)):
+                            reaction.kinetics.arrhenius.append(reaction2.kinetics)
+                        else:
+                            raise ChemkinError('Mixed kinetics for duplicate reaction {0}.'.format(reaction))
+
+                        duplicateReactionsToRemove.add(id(reaction2))
+                    elif reaction1.kinetics.isPressureDependent() == reaction2.kinetics.isPressureDependent():
+                        # If both reactions are pressure-independent or both are pressure-dependent, then they need
+                        # duplicate tags. Chemkin treates pdep and non-pdep reactions as different, so those are okay
+                        raise ChemkinError('Encountered unmarked duplicate reaction {0}.'.format(reaction1))
+
+    if duplicateReactionsToRemove:
+        # Append the combined reactions to the end of the list, ordered by the
+        # position of the first reaction each one replaces, as a scan over all
+        # pairs of reactions would create them (the positions are unique, so
+        # the pairs never compare by their reactions)
+        duplicateReactionsToAdd.sort()
+        reactionList[:] = [reaction for reaction in reactionList if id(reaction) not in duplicateReactionsToRemove]
+        reactionList.extend([pair[1] for pair in duplicateReactionsToAdd])
 
 
 def readSpeciesBlock(f, speciesDict, speciesAliases, speciesList):
@@ -1315,8 +1369,57 @@ def readReactionsBlock(f, speciesDict, readComments = True):
             logging.warning("Discarding comments from Chemkin file because not sure which reaction they apply to")
             commentsList = ['' for kinetics in kineticsList]
         
+    # Parse the reaction entries in chunks, which are distributed over the
+    # workers of the executor in use
+    entries = zip(kineticsList, commentsList)
+    chunkSize = getChunkSize(len(entries), getExecutor().processes)
+    chunks = [entries[i:i+chunkSize] for i in range(0, len(entries), chunkSize)]
+    count = len(chunks)
+    reactionList = []
+    # The species dictionary is shared with the workers once per read rather
+    # than being sent along with every chunk; running workers are kept and
+    # load it on their first chunk. It is only sent with the chunks if the
+    # executor cannot share objects (SCOOP not started properly)
+    key = 'chemkin.speciesDict.{0:d}'.format(next(_speciesDictKeys))
+    shared = broadcast(speciesDict, key, restart=False)
+    if shared:
+        results = map_(_readSharedKineticsEntries, chunks, [key] * count,
+                       [Aunits] * count, [Eunits] * count, [readComments] * count)
+    else:
+        results = map_(_readKineticsEntries, chunks, [speciesDict] * count,
+                       [Aunits] * count, [Eunits] * count, [readComments] * count)
+    try:
+        for reactions, usedSpecies in results:
+            _relinkSpecies(reactions, usedSpecies, speciesDict)
+            reactionList.extend(reactions)
+    finally:
+        if shared:
+            discard(key)
+        
+    return reactionList
+
+# Numbers the keys under which species dictionaries are broadcasted
+_speciesDictKeys = itertools.count()
+
+def _readSharedKineticsEntries(entries, key, Aunits, Eunits, readComments=True):
+    """
+    Read the reaction `entries` using the species dictionary broadcasted
+    under the given `key`. See :func:`_readKineticsEntries`.
+    """
+    return _readKineticsEntries(entries, get(key), Aunits, Eunits, readComments)
+
+def _readKineticsEntries(entries, speciesDict, Aunits, Eunits, readComments=True):
+    """
+    Read the reactions from a list of `entries`, each of which is a tuple of
+    the kinetics and comments strings of a reaction in a Chemkin file. This
+    function is passed to the workers by :func:`readReactionsBlock`.
+    
+    Returns the list of reactions and a dict of the species in `speciesDict`
+    that they refer to. A worker returns copies of these species, which the
+    caller replaces by the original species using :func:`_relinkSpecies`.
+    """
     reactionList = []
-    for kinetics, comments in zip(kineticsList, commentsList):
+    for kinetics, comments in entries:
         try:
             reaction = readKineticsEntry(kinetics, speciesDict, Aunits, Eunits)
             reaction = readReactionComments(reaction, comments, read = readComments)
@@ -1327,8 +1430,49 @@ def readReactionsBlock(f, speciesDict, readComments = True):
             else:
                 raise e
         reactionList.append(reaction)
-        
-    return reactionList
+
+    referenced = set()
+    for reaction in reactionList:
+        referenced.update([id(spec) for spec in reaction.reactants + reaction.products])
+        if reaction.specificCollider is not None:
+            referenced.add(id(reaction.specificCollider))
+        efficiencies = getattr(reaction.kinetics, 'efficiencies', None)
+        if efficiencies:
+            referenced.update([id(molecule) for molecule in efficiencies])
+    usedSpecies = {}
+    for label, spec in speciesDict.iteritems():
+        if id(spec) in referenced or (spec.molecule and id(spec.molecule[0]) in referenced):
+            usedSpecies[label] = spec
+
+    return reactionList, usedSpecies
+
+def _relinkSpecies(reactionList, usedSpecies, speciesDict):
+    """
+    Replace the species in the reactions of `reactionList` that are copies of
+    the species in `speciesDict` by the original species, using the dict
+    `usedSpecies` of the copies returned by :func:`_readKineticsEntries`. The
+    collider efficiencies, which are keyed by molecule, are updated as well.
+    """
+    speciesMap = {}
+    for label, spec in usedSpecies.iteritems():
+        original = speciesDict[label]
+        if spec is not original:
+            speciesMap[id(spec)] = original
+            if spec.molecule:
+                speciesMap[id(spec.molecule[0])] = original.molecule[0]
+    if not speciesMap:
+        # The reactions were read in this process
+        return
+
+    for reaction in reactionList:
+        reaction.reactants = [speciesMap.get(id(spec), spec) for spec in reaction.reactants]
+        reaction.products = [speciesMap.get(id(spec), spec) for spec in reaction.products]
+        if reaction.specificCollider is not None:
+            reaction.specificCollider = speciesMap.get(id(reaction.specificCollider), reaction.specificCollider)
+        efficiencies = getattr(reaction.kinetics, 'efficiencies', None)
+        if efficiencies:
+            reaction.kinetics.efficiencies = dict([(speciesMap.get(id(molecule), molecule), efficiency)
+                                                   for molecule, efficiency in efficiencies.iteritems()])
 
 ################################################################################
 
@@ -1807,13 +1951,13 @@ def markDuplicateReactions(reactions):
     For a given list of `reactions`, mark all of the duplicate reactions as
     understood by Chemkin.
     
-    This is pretty slow (quadratic in size of reactions list) so only call it if you're really worried
-    you may have undetected duplicate reactions.
+    The reactions are first grouped by their reactants, products and specific
+    collider in either direction, so only reactions that could be duplicates
+    of one another are compared.
     """
-    for index1 in range(len(reactions)):
-        reaction1 = reactions[index1]
-        remainingList = reactions[index1+1:]
-        markDuplicateReaction(reaction1, remainingList)
+    for group in _groupReactionsBySignature(reactions, eitherDirection=True):
+        for index1 in range(len(group)):
+            markDuplicateReaction(group[index1], group[index1+1:])
  
 
 def saveSpeciesDictionary(path, species, oldStyle=False):
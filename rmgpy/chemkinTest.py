@@ -28,17 +28,21 @@
 #                                                                             #
 ###############################################################################
 
+import sys
 import unittest
 import mock
 import os
+import cPickle
+from StringIO import StringIO
 from chemkin import *
-from chemkin import _removeLineBreaks, _process_duplicate_reactions
+from chemkin import _removeLineBreaks, _process_duplicate_reactions, _readKineticsEntries, _relinkSpecies
 import rmgpy
 from rmgpy.species import Species
 from rmgpy.reaction import Reaction
 from rmgpy.data.kinetics import LibraryReaction
 from rmgpy.kinetics.arrhenius import Arrhenius, MultiArrhenius
 from rmgpy.kinetics.chebyshev import Chebyshev
+from rmgpy.scoop_framework.util import setExecutor, map_
 
 
 ###################################################
@@ -312,6 +316,89 @@ multiplicity 2
 
         self.assertEqual(reaction.specificCollider.label, 'N2(5)')
 
+    def testRelinkSpeciesFromWorkers(self):
+        """
+        Test that reactions read by a worker process refer to the original species
+        objects after relinking, including the third body collider efficiencies.
+        """
+        speciesDict = {}
+        for adjlist in ["""O2(4)
+multiplicity 3
+1 O u1 p2 c0 {2,S}
+2 O u1 p2 c0 {1,S}""", """H(5)
+multiplicity 2
+1 H u1 p0 c0""", """N2(5)
+1 N u0 p1 c0 {2,T}
+2 N u0 p1 c0 {1,T}""", """HO2(10)
+multiplicity 2
+1 O u0 p2 c0 {2,S} {3,S}
+2 O u1 p2 c0 {1,S}
+3 H u0 p0 c0 {1,S}"""]:
+            spec = Species().fromAdjacencyList(adjlist)
+            speciesDict[spec.label] = spec
+        entries = [("""O2(4)+H(5)+M<=>HO2(10)+M                          4.651e+12 0.440     0.000
+N2(5)/0.7/""", ''), ("""O2(4)+H(5)(+N2(5))<=>HO2(10)(+N2(5))                          4.651e+12 0.440     0.000""", '')]
+        Aunits = ['','s^-1','cm^3/(mol*s)','cm^6/(mol^2*s)','cm^9/(mol^3*s)']
+        Eunits = 'kcal/mol'
+
+        # Pickle the result as it would be when returned by a worker
+        reactions, usedSpecies = cPickle.loads(cPickle.dumps(_readKineticsEntries(entries, speciesDict, Aunits, Eunits), -1))
+        self.assertEqual(sorted(usedSpecies.keys()), sorted(speciesDict.keys()))
+        self.assertIsNot(reactions[0].reactants[0], speciesDict['O2(4)'])
+
+        _relinkSpecies(reactions, usedSpecies, speciesDict)
+        for reaction in reactions:
+            for spec in reaction.reactants + reaction.products:
+                self.assertIs(spec, speciesDict[spec.label])
+        self.assertEqual(reactions[0].kinetics.efficiencies.keys(), [speciesDict['N2(5)'].molecule[0]])
+        self.assertIs(reactions[0].kinetics.efficiencies.keys()[0], speciesDict['N2(5)'].molecule[0])
+        self.assertIs(reactions[1].specificCollider, speciesDict['N2(5)'])
+
+    @unittest.skipUnless(sys.platform.startswith("linux"),
+                         "test currently only runs on linux")
+    def testReadReactionsWithRunningPool(self):
+        """
+        Test that reading reactions with the process executor keeps the running
+        worker pool, that the species dictionary shared with the workers is
+        discarded afterwards, and that the reactions refer to the original
+        species objects.
+        """
+        speciesDict = {}
+        for adjlist in ["""O2(4)
+multiplicity 3
+1 O u1 p2 c0 {2,S}
+2 O u1 p2 c0 {1,S}""", """H(5)
+multiplicity 2
+1 H u1 p0 c0""", """OH(6)
+multiplicity 2
+1 O u1 p2 c0 {2,S}
+2 H u0 p0 c0 {1,S}""", """HO2(10)
+multiplicity 2
+1 O u0 p2 c0 {2,S} {3,S}
+2 O u1 p2 c0 {1,S}
+3 H u0 p0 c0 {1,S}"""]:
+            spec = Species().fromAdjacencyList(adjlist)
+            speciesDict[spec.label] = spec
+        block = """REACTIONS    KCAL/MOLE   MOLES
+O2(4)+H(5)<=>HO2(10)                          4.651e+12 0.440     0.000
+OH(6)+OH(6)<=>O2(4)+H(5)+H(5)                 1.000e+13 0.000     0.000
+HO2(10)+H(5)<=>OH(6)+OH(6)                    7.080e+13 0.000     0.300
+END
+"""
+        executor = setExecutor('process', 2)
+        try:
+            self.assertEqual(list(map_(abs, range(-4, 4))), [4, 3, 2, 1, 0, 1, 2, 3])
+            pool = executor.pool
+            reactions = readReactionsBlock(StringIO(block), speciesDict, readComments=False)
+            self.assertIs(executor.pool, pool)
+            self.assertEqual(os.listdir(executor.directory), [])
+        finally:
+            setExecutor('serial')
+        self.assertEqual(len(reactions), 3)
+        for reaction in reactions:
+            for spec in reaction.reactants + reaction.products:
+                self.assertIs(spec, speciesDict[spec.label])
+
     def test_process_duplicate_reactions(self):
         """
         Test that duplicate reactions are handled correctly when
@@ -381,6 +468,42 @@ multiplicity 2
         self.assertTrue(isinstance(rtest.kinetics, MultiArrhenius))
         self.assertTrue(all(isinstance(k, Arrhenius) for k in rtest.kinetics.arrhenius))
 
+    def test_process_duplicate_reactions_order(self):
+        """
+        Test that duplicate library reactions of several reactions are merged
+        into one reaction each, which are appended to the list in the order of
+        their first occurrence.
+        """
+        s1 = Species().fromSMILES('CC')
+        s2 = Species().fromSMILES('[CH3]')
+        s3 = Species().fromSMILES('[OH]')
+        s4 = Species().fromSMILES('C[CH2]')
+        s5 = Species().fromSMILES('O')
+        r1 = LibraryReaction(reactants=[s1, s3], products=[s4, s5], duplicate=True,
+                             kinetics=Arrhenius(), library='lib1')
+        r2 = LibraryReaction(reactants=[s1], products=[s2, s2], duplicate=True,
+                             kinetics=Arrhenius(), library='lib1')
+        r3 = Reaction(reactants=[s4], products=[s1], duplicate=False, kinetics=Arrhenius())
+        r4 = LibraryReaction(reactants=[s1], products=[s2, s2], duplicate=True,
+                             kinetics=Arrhenius(), library='lib1')
+        r5 = LibraryReaction(reactants=[s1, s3], products=[s4, s5], duplicate=True,
+                             kinetics=Arrhenius(), library='lib1')
+        r6 = LibraryReaction(reactants=[s1, s3], products=[s4, s5], duplicate=True,
+                             kinetics=Arrhenius(), library='lib1')
+        reaction_list = [r1, r2, r3, r4, r5, r6]
+
+        _process_duplicate_reactions(reaction_list)
+
+        self.assertEqual(len(reaction_list), 3)
+        self.assertIs(reaction_list[0], r3)
+        self.assertEqual(reaction_list[1].reactants, [s1, s3])
+        self.assertEqual(len(reaction_list[1].kinetics.arrhenius), 3)
+        self.assertEqual(reaction_list[2].reactants, [s1])
+        self.assertEqual(len(reaction_list[2].kinetics.arrhenius), 2)
+        self.assertFalse(reaction_list[0].duplicate)
+        self.assertFalse(reaction_list[1].duplicate)
+        self.assertFalse(reaction_list[2].duplicate)
+
     def test_mark_duplicate_reactions(self):
         """Test that we can properly mark duplicate reactions for Chemkin."""
         s1 = Species().fromSMILES('CC')
@@ -402,6 +402,15 @@ and immediately used in input files without any additional changes.
                 onoff = 'on ' if self.recommendedFamilies[label] else 'off'
                 f.write("{num:<2d}    {onoff}     {label}\n".format(num=number, label=label, onoff=onoff))
     
+    def getTemplateKineticsStatistics(self):
+        """
+        Return the total number of kinetics estimates that the families reused
+        from their template caches and the number that had to be computed.
+        """
+        hits = sum([family.templateKineticsHits for family in self.families.itervalues()])
+        misses = sum([family.templateKineticsMisses for family in self.families.itervalues()])
+        return hits, misses
+
     def generate_reactions(self, reactants, products=None, only_families=None, resonance=True):
         """
         Generate all reactions between the provided list of one or two
@@ -436,7 +445,7 @@ and immediately used in input files without any additional changes.
         ensure_species(reactants)
 
         reaction_list = []
-        for entry in library.entries.values():
+        for entry in library.getCandidateEntries(reactants):
             if entry.item.matchesSpecies(reactants, products=products):
                 reaction = LibraryReaction(
                     reactants = entry.item.reactants[:],
@@ -40,6 +40,8 @@ import codecs
 from copy import deepcopy
 from collections import OrderedDict
 
+from rdkit import Chem
+
 from rmgpy.constraints import failsSpeciesConstraints
 from rmgpy.data.base import Database, Entry, LogicNode, LogicOr, ForbiddenStructures,\
                             getAllCombinations
@@ -48,6 +50,7 @@ from rmgpy import settings
 from rmgpy.reaction import Reaction
 from rmgpy.kinetics import Arrhenius
 from rmgpy.molecule import Bond, GroupBond, Group, Molecule
+from rmgpy.molecule.converter import toRDKitMol
 from rmgpy.molecule.resonance import generate_optimal_aromatic_resonance_structures
 from rmgpy.species import Species
 
@@ -60,6 +63,7 @@ from rmgpy.exceptions import InvalidActionError, ReactionPairsError, KineticsErr
                              UndeterminableKineticsError, ForbiddenStructureException,\
                              KekulizationError, ActionError, DatabaseError
 import itertools
+
 ################################################################################
 
 class TemplateReaction(Reaction):
@@ -392,6 +396,9 @@ class KineticsFamily(Database):
     `groups`            :class:`KineticsGroups`         The set of kinetics group additivity values
     `rules`             :class:`KineticsRules`          The set of kinetics rate rules from RMG-Java
     `depositories`      ``list``                        A set of additional depositories used to store kinetics data from various sources
+    ------------------- ------------------------------- ------------------------
+    `templateMatches`   ``OrderedDict``                 The template mappings found for recently matched molecule structures and template reactants
+    `templateKinetics`  ``OrderedDict``                 The single-path kinetics estimates for recently used templates and estimators
     =================== =============================== ========================
 
     There are a few reaction families that are their own reverse (hydrogen
@@ -399,6 +406,11 @@ class KineticsFamily(Database):
     `reverseTemplate` and `reverseRecipe` will both be ``None``.
     """
 
+    # The maximum number of entries kept in `templateMatches`
+    maxTemplateMatches = 10000
+    # The maximum number of estimates kept in `templateKinetics`
+    maxTemplateKinetics = 10000
+
     def __init__(self,
                  entries=None,
                  top=None,
@@ -433,6 +445,13 @@ class KineticsFamily(Database):
         self.rules = None
         self.depositories = []
 
+        self.templateMatches = OrderedDict()
+        self.templateMatchHits = 0
+        self.templateMatchMisses = 0
+        self.templateKinetics = OrderedDict()
+        self.templateKineticsHits = 0
+        self.templateKineticsMisses = 0
+
     def __repr__(self):
         return '<ReactionFamily "{0}">'.format(self.label)
 
@@ -445,6 +464,7 @@ class KineticsFamily(Database):
                       " removed in version 2.3.", DeprecationWarning)
         self.label = os.path.basename(path)
         self.name = self.label
+        self.templateKinetics.clear()
 
         self.groups = KineticsGroups(label='{0}/groups'.format(self.label))
         self.groups.name = self.groups.label
@@ -637,6 +657,7 @@ class KineticsFamily(Database):
         local_context['reversible'] = None
         local_context['boundaryAtoms'] = None
         local_context['treeDistances'] = None
+        self.templateKinetics.clear()
         self.groups = KineticsGroups(label='{0}/groups'.format(self.label))
         logging.debug("Loading kinetics family groups from {0}".format(os.path.join(path, 'groups.py')))
         Database.load(self.groups, os.path.join(path, 'groups.py'), local_context, global_context)
@@ -1059,6 +1080,7 @@ class KineticsFamily(Database):
         For each reaction involving real reactants and products in the training
         set, add a rate rule for that reaction.
         """
+        self.templateKinetics.clear()
         try:
             depository = self.getTrainingDepository()
         except:
@@ -1175,7 +1197,7 @@ class KineticsFamily(Database):
         Fill in gaps in the kinetics rate rules by averaging child nodes
         recursively starting from the top level root template.
         """
-        
+        self.templateKinetics.clear()
         self.rules.fillRulesByAveragingUp(self.getRootTemplate(), {}, verbose)
 
     def applyRecipe(self, reactantStructures, forward=True, unique=True):
@@ -1559,9 +1581,47 @@ class KineticsFamily(Database):
         """
         Return a complete list of the mappings if the provided reactant 
         matches the provided template reactant, or an empty list if not.
+
+        The mappings for the most recently matched structures are kept in
+        `templateMatches` by the canonical positions of the matched atoms, so
+        that later calls for the same structure (e.g. a species created again
+        with new atom ids, or reacting with different partners) rebuild them
+        for the atoms of `reactant` instead of repeating the search.
         """
 
         if isinstance(templateReactant, list): templateReactant = templateReactant[0]
+
+        structure, positions = getTemplateMatchKey(reactant)
+        if structure is None:
+            return self.__findTemplateMappings(reactant, templateReactant)
+
+        key = (structure, templateReactant)
+        try:
+            matches = self.templateMatches.pop(key)
+        except KeyError:
+            self.templateMatchMisses += 1
+            mappings = self.__findTemplateMappings(reactant, templateReactant)
+            matches = [
+                [(positions[atom], groupAtom) for atom, groupAtom in mapping.iteritems()] for mapping in mappings
+            ]
+            if len(self.templateMatches) >= self.maxTemplateMatches:
+                self.templateMatches.popitem(last=False)
+        else:
+            self.templateMatchHits += 1
+            atoms = [None] * len(positions)
+            for atom, position in positions.iteritems():
+                atoms[position] = atom
+            mappings = [dict([(atoms[position], groupAtom) for position, groupAtom in match]) for match in matches]
+        # Store the mappings as the most recently used ones
+        self.templateMatches[key] = matches
+
+        return mappings
+
+    def __findTemplateMappings(self, reactant, templateReactant):
+        """
+        Return all of the subgraph isomorphisms between the provided reactant
+        and the structure of the provided template reactant.
+        """
         struct = templateReactant.item
         
         if isinstance(struct, LogicNode):
@@ -2132,13 +2192,38 @@ class KineticsFamily(Database):
         then the entry is returned as the second element of the tuple.
         But if an average is used, or the 'group additivity' method, then the tuple
         returned is (kinetics, None).
+
+        The estimate for a single reaction path is kept in `templateKinetics`
+        for the most recently used templates, so that only the degeneracy has
+        to be applied to a copy when the same template is requested again.
         """
-        if method.lower() == 'group additivity':
-            return self.estimateKineticsUsingGroupAdditivity(template, degeneracy), None
-        elif method.lower() == 'rate rules':
-            return self.estimateKineticsUsingRateRules(template, degeneracy)  # This returns kinetics and entry data
-        else:
+        method = method.lower()
+        if method not in ('group additivity', 'rate rules'):
             raise ValueError('Invalid value "{0}" for method parameter; should be "group additivity" or "rate rules".'.format(method))
+
+        key = (tuple([entry.label for entry in template]), method)
+        try:
+            kinetics, entry = self.templateKinetics.pop(key)
+        except KeyError:
+            self.templateKineticsMisses += 1
+            if method == 'group additivity':
+                kinetics, entry = self.__estimateTemplateKineticsUsingGroupAdditivity(template), None
+            else:
+                kinetics, entry = self.rules.estimateTemplateKinetics(template)  # This returns kinetics and entry data
+            if len(self.templateKinetics) >= self.maxTemplateKinetics:
+                self.templateKinetics.popitem(last=False)
+        else:
+            self.templateKineticsHits += 1
+        # Store the estimate as the most recently used one
+        self.templateKinetics[key] = (kinetics, entry)
+
+        if kinetics is None:
+            return None, entry
+        kinetics = deepcopy(kinetics)
+        if method == 'group additivity':
+            return self.groups.applyDegeneracy(kinetics, degeneracy), entry
+        else:
+            return self.rules.applyDegeneracy(kinetics, degeneracy), entry
         
     def getKineticsFromDepository(self, depository, reaction, template, degeneracy):
         """
@@ -2250,6 +2335,18 @@ class KineticsFamily(Database):
         Determine the appropriate kinetics for a reaction with the given
         `template` using group additivity.
         
+        Returns just the kinetics, or None.
+        """
+        kinetics = self.__estimateTemplateKineticsUsingGroupAdditivity(template)
+        if kinetics is None:
+            return None
+        return self.groups.applyDegeneracy(kinetics, degeneracy)
+
+    def __estimateTemplateKineticsUsingGroupAdditivity(self, template):
+        """
+        Determine the appropriate kinetics for a single reaction path with the
+        given `template` using group additivity.
+
         Returns just the kinetics, or None.
         """
         warnings.warn("Group additivity is no longer supported and may be"
@@ -2266,7 +2363,7 @@ class KineticsFamily(Database):
             kinetics = kinetics[0]
             
         # Now add in more specific corrections if possible
-        return self.groups.estimateKineticsUsingGroupAdditivity(template, kinetics, degeneracy)        
+        return self.groups.estimateTemplateKineticsUsingGroupAdditivity(template, kinetics)
         
     def estimateKineticsUsingRateRules(self, template, degeneracy=1):
         """
@@ -2456,6 +2553,7 @@ class KineticsFamily(Database):
         group structure grp
         and group name name
         """
+        self.templateKinetics.clear()
         ind = len(self.groups.entries)-1
         entry = Entry(index=ind,label=name,item=grp,parent=parent)
         self.groups.entries[name] = entry
@@ -2677,7 +2775,7 @@ class KineticsFamily(Database):
         Constructs an extension to the group parent based on evaluation 
         of the objective function obj
         """
-        
+        self.templateKinetics.clear()
         exts = self.getExtensionEdge(parent,obj=obj,T=T)
         
         vals = []
@@ -2854,6 +2952,7 @@ class KineticsFamily(Database):
         Note this only works if a single top node (not a logic node)
         can be generated
         """
+        self.templateKinetics.clear()
         #find the starting node
         grp = None
         
@@ -3135,6 +3234,34 @@ class KineticsFamily(Database):
 
         return groupList
 
+def getTemplateMatchKey(molecule):
+    """
+    Return a hashable key describing the structure of `molecule` for matching
+    it to reaction templates, and a dictionary of the canonical position of
+    each atom. The positions come from the canonical atom ranking of RDKit, so
+    the key does not depend on the order or the ids of the atoms. Two
+    molecules with the same key have the same template mappings by canonical
+    position. Returns ``(None, None)`` if the molecule cannot be ranked.
+    """
+    try:
+        rdkitmol, rdAtomIndices = toRDKitMol(molecule, removeHs=False, returnMapping=True)
+        ranks = list(Chem.CanonicalRankAtoms(rdkitmol, breakTies=True))
+    except Exception:
+        return None, None
+    positions = dict([(atom, ranks[index]) for atom, index in rdAtomIndices.iteritems()])
+
+    atoms = [None] * len(positions)
+    bonds = []
+    for atom, position in positions.iteritems():
+        atoms[position] = (atom.element.symbol, atom.element.isotope, atom.atomType.label if atom.atomType else None,
+                           atom.radicalElectrons, atom.charge, atom.lonePairs)
+        for atom2, bond in atom.edges.iteritems():
+            position2 = positions[atom2]
+            if position < position2:
+                bonds.append((position, position2, bond.order))
+    bonds.sort()
+    return (molecule.multiplicity, tuple(atoms), tuple(bonds)), positions
+
 def informationGain(ks1,ks2):
     """
     calculates the information gain as the sum of the products of the standard deviations at each
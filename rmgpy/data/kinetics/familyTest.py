@@ -39,7 +39,7 @@ import logging
 from rmgpy import settings
 from rmgpy.data.thermo import ThermoDatabase
 from rmgpy.data.kinetics.database import KineticsDatabase
-from rmgpy.data.kinetics.family import TemplateReaction
+from rmgpy.data.kinetics.family import TemplateReaction, getTemplateMatchKey
 from rmgpy.data.rmg import RMGDatabase
 from rmgpy.molecule import Molecule
 from rmgpy.species import Species
@@ -617,6 +617,27 @@ multiplicity 2
             self.assertTrue(expected_products[0].isIsomorphic(products[0]))
 
 
+    def test_getKineticsForTemplate(self):
+        """
+        Test that repeated template estimates are reused and scaled by the degeneracy
+        """
+        family = self.database.families['H_Abstraction']
+        reaction = family.generateReactions([Molecule(SMILES='CC'), Molecule(SMILES='[OH]')])[0]
+        template = family.retrieveTemplate(reaction.template)
+        family.templateKinetics.clear()
+
+        hits, misses = family.templateKineticsHits, family.templateKineticsMisses
+        kinetics, entry = family.getKineticsForTemplate(template, degeneracy=1)
+        kinetics6, entry6 = family.getKineticsForTemplate(template, degeneracy=6)
+        self.assertEqual(family.templateKineticsMisses, misses + 1)
+        self.assertEqual(family.templateKineticsHits, hits + 1)
+
+        expected, expectedEntry = family.estimateKineticsUsingRateRules(template, degeneracy=6)
+        self.assertAlmostEqual(kinetics6.A.value_si, expected.A.value_si)
+        self.assertAlmostEqual(kinetics6.A.value_si, 6 * kinetics.A.value_si)
+        self.assertEqual(kinetics6.comment, expected.comment)
+        self.assertIs(entry6, expectedEntry)
+
     def testSaveFamily(self):
         """
 
@@ -870,6 +891,41 @@ multiplicity 2
 
             self.assertTrue(expected_products[i].isIsomorphic(product.molecule[0], mapping))
 
+    def test_template_matches(self):
+        """Test that stored template mappings are reused for freshly created species"""
+        family = self.database.kinetics.families['H_Abstraction']
+        family.templateMatches.clear()
+
+        reactionList = family.generateReactions([Species().fromSMILES('CC'), Species().fromSMILES('[OH]')])
+        self.assertNotEqual(len(family.templateMatches), 0)
+
+        hits, misses = family.templateMatchHits, family.templateMatchMisses
+        cachedReactionList = family.generateReactions([Species().fromSMILES('CC'), Species().fromSMILES('[OH]')])
+        self.assertGreater(family.templateMatchHits, hits)
+        self.assertEqual(family.templateMatchMisses, misses)
+
+        self.assertEqual(len(cachedReactionList), len(reactionList))
+        for reaction, cachedReaction in zip(reactionList, cachedReactionList):
+            self.assertTrue(reaction.isIsomorphic(cachedReaction))
+            self.assertEqual(reaction.template, cachedReaction.template)
+
+    def test_getTemplateMatchKey(self):
+        """Test that the template match key depends on the structure but not on the atom order or ids"""
+        molecule = Molecule(SMILES='C=CC')
+        key, positions = getTemplateMatchKey(molecule)
+        self.assertEqual(sorted(positions.values()), range(len(molecule.atoms)))
+        self.assertNotEqual(getTemplateMatchKey(Molecule(SMILES='CCC'))[0], key)
+
+        other = Molecule(SMILES='CC=C')
+        other.assignAtomIDs()
+        otherKey, otherPositions = getTemplateMatchKey(other)
+        self.assertEqual(otherKey, key)
+
+        # Atoms at the same canonical position form an isomorphism
+        atoms = dict([(position, atom) for atom, position in otherPositions.iteritems()])
+        mapping = dict([(atom, atoms[position]) for atom, position in positions.iteritems()])
+        self.assertTrue(molecule.isIsomorphic(other, initialMap=mapping))
+
     def test_irreversible_reaction(self):
         """Test that the Singlet_Val6_to_triplet and 1,2-Birad_to_alkene families generate irreversible reactions."""
 
@@ -184,6 +184,17 @@ class KineticsGroups(Database):
         Determine the appropriate kinetics for a reaction with the given
         `template` using group additivity.
         
+        Returns just the kinetics.
+        """
+        kinetics = self.estimateTemplateKineticsUsingGroupAdditivity(template, referenceKinetics)
+        return self.applyDegeneracy(kinetics, degeneracy)
+
+    def estimateTemplateKineticsUsingGroupAdditivity(self, template, referenceKinetics):
+        """
+        Determine the appropriate kinetics for a single reaction path with the
+        given `template` using group additivity. Use :meth:`applyDegeneracy`
+        to include the reaction-path degeneracy.
+
         Returns just the kinetics.
         """
         warnings.warn("Group additivity is no longer supported and may be"
@@ -207,8 +218,15 @@ class KineticsGroups(Database):
                 comment_line += "{0} (Top node)".format(entry.label)
             kinetics.comment += comment_line + '\n'
 
-        # Also include reaction-path degeneracy
+        return kinetics
 
+    def applyDegeneracy(self, kinetics, degeneracy=1):
+        """
+        Multiply the `kinetics` estimated by
+        :meth:`estimateTemplateKineticsUsingGroupAdditivity` by the
+        reaction-path `degeneracy`. The kinetics are modified in place and
+        returned.
+        """
         kinetics.changeRate(degeneracy)
 
         kinetics.comment += "Multiplied by reaction path degeneracy {0}".format(degeneracy)
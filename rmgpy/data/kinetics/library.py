@@ -55,6 +55,22 @@ import codecs
 
 ################################################################################
 
+def getSpeciesIndexKey(species):
+    """
+    Return the key of a :class:`Species` or :class:`Molecule` object used to
+    index the entries of a kinetics library. The key is made of the formula
+    and the resonance hash, so it is the same for all resonance structures.
+    """
+    if isinstance(species, Species):
+        if not species.molecule:
+            return None
+        molecule = species.molecule[0]
+    else:
+        molecule = species
+    return molecule.getFormula(), molecule.get_resonance_hash()
+
+################################################################################
+
 class LibraryReaction(Reaction):
     """
     A Reaction object generated from a reaction library. In addition to the
@@ -195,11 +211,17 @@ class LibraryReaction(Reaction):
 class KineticsLibrary(Database):
     """
     A class for working with an RMG kinetics library.
+
+    The entries are indexed by the species on each side of their reactions,
+    so that the entries involving a given set of reactants are found with a
+    dictionary lookup instead of an isomorphism check for every entry.
     """
 
     def __init__(self, label='', name='', solvent=None, shortDesc='', longDesc='', autoGenerated=False):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
         self.autoGenerated=autoGenerated
+        self.index = {}
+        self.indexSize = 0
         
     def __str__(self):
         return 'Kinetics Library {0}'.format(self.label)
@@ -207,6 +229,38 @@ class KineticsLibrary(Database):
     def __repr__(self):
         return '<KineticsLibrary "{0}">'.format(self.label)
     
+    def getIndexKey(self, speciesList):
+        """
+        Return the key of a reactant or product list in the index of the
+        library entries. The key does not depend on the order of the species,
+        and isomorphic species and resonance structures give the same key.
+        """
+        return tuple(sorted([getSpeciesIndexKey(spec) for spec in speciesList]))
+
+    def indexEntries(self):
+        """
+        Rebuild the index of the library entries. Each entry is stored under
+        the keys of both its reactants and its products, as reactions are
+        matched in either direction.
+        """
+        self.index = {}
+        for position, entry in enumerate(self.entries.itervalues()):
+            keys = set([self.getIndexKey(entry.item.reactants), self.getIndexKey(entry.item.products)])
+            for key in keys:
+                self.index.setdefault(key, []).append((position, entry))
+        self.indexSize = len(self.entries)
+
+    def getCandidateEntries(self, reactants):
+        """
+        Return the entries of the library whose reactants or products may be
+        isomorphic to the given list of `reactants`, in the order of the
+        library. The index is rebuilt first if the number of entries changed
+        since it was last built.
+        """
+        if self.indexSize != len(self.entries):
+            self.indexEntries()
+        return [entry for position, entry in self.index.get(self.getIndexKey(reactants), [])]
+
     def getLibraryReactions(self):
         """
         makes library and template reactions as appropriate from the library comments
@@ -274,7 +328,7 @@ class KineticsLibrary(Database):
             if not reaction0.duplicate:
                 # This reaction is not marked as a duplicate reaction
                 # This means that if we find any duplicate reactions, it is an error
-                for entry in self.entries.values():
+                for entry in self.getCandidateEntries(reaction0.reactants):
                     reaction = entry.item
                     if reaction0 is not reaction and reaction0.isIsomorphic(reaction): 
                         # We found a duplicate reaction that wasn't marked!
@@ -301,7 +355,7 @@ class KineticsLibrary(Database):
                 continue
             logging.debug("Found a duplicate reaction: {0}".format(reaction0))
             duplicates = [entry0]
-            for entry in self.entries.values():
+            for entry in self.getCandidateEntries(reaction0.reactants):
                 reaction = entry.item
                 if reaction0 is reaction:
                     continue
@@ -85,6 +85,19 @@ class TestLibrary(unittest.TestCase):
         finally:
             shutil.rmtree(os.path.join(settings['test_data.directory'], 'testing_database','kinetics','libraries','eth-oxcopy'))
 
+    def testGetCandidateEntries(self):
+        """
+        Test that the index of the library entries finds the same matching
+        entries as checking every entry of the library
+        """
+        library = self.libraries['GRI-Mech3.0']
+        for entry in library.entries.values()[:50]:
+            for speciesList in [entry.item.reactants, entry.item.products[::-1]]:
+                candidates = library.getCandidateEntries(speciesList)
+                self.assertIn(entry, candidates)
+                matches = [e for e in library.entries.values() if e.item.matchesSpecies(speciesList)]
+                self.assertEqual([e for e in candidates if e.item.matchesSpecies(speciesList)], matches)
+
     def test_generate_high_p_limit_kinetics(self):
         """
         Test that a :class:Arrhenius kinetics object representing the high pressure limit rate
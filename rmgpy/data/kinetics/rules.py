@@ -600,6 +600,17 @@ class KineticsRules(Database):
         entry used to determine the kinetics only if it is an exact match,
         and is None if some averaging or use of a parent node took place.
         """
+        kinetics, entry = self.estimateTemplateKinetics(template)
+        return self.applyDegeneracy(kinetics, degeneracy), entry
+
+    def estimateTemplateKinetics(self, template):
+        """
+        Determine the appropriate kinetics for a single reaction path with the
+        given `template` using rate rules. The family label is not yet added to
+        the comment; use :meth:`applyDegeneracy` to complete the estimate.
+
+        Returns a tuple (kinetics, entry) as :meth:`estimateKinetics`.
+        """
         entry = self.getRule(template)
         
         originalLeaves = getTemplateLabel(template)
@@ -707,6 +718,15 @@ class KineticsRules(Database):
                 
         kinetics.comment += ' for rate rule ' + originalLeaves
         kinetics.comment += '\nEuclidian distance = {}'.format(minNorm)
+
+        return kinetics, (entry if 'Exact' in kinetics.comment else None)
+
+    def applyDegeneracy(self, kinetics, degeneracy=1):
+        """
+        Multiply the `kinetics` estimated by :meth:`estimateTemplateKinetics`
+        by the reaction-path `degeneracy`, and complete the comment. The
+        kinetics are modified in place and returned.
+        """
         kinetics.A.value_si *= degeneracy
         if degeneracy > 1:
             kinetics.comment += "\n"
@@ -715,7 +735,7 @@ class KineticsRules(Database):
         kinetics.comment += "\n"
         kinetics.comment += "family: {0}".format(self.label.replace('/rules',''))
         
-        return kinetics, (entry if 'Exact' in kinetics.comment else None)
+        return kinetics
 
 def removeIdenticalKinetics(kList):
     """
@@ -35,6 +35,10 @@ for working with the RMG database.
 
 import os.path
 import logging
+import hashlib
+import cPickle
+
+import rmgpy
 
 from base import ForbiddenStructures
 from thermo import ThermoDatabase
@@ -191,6 +195,62 @@ class RMGDatabase:
         self.statmech.load(path, statmechLibraries, depository)
         broadcast(self.statmech, 'statmech')
 
+    def saveCache(self, path):
+        """
+        Save the loaded database components to a binary cache file at `path`,
+        which can be loaded again with :meth:`loadCache`. Returns ``True`` if
+        the cache file was written.
+        """
+        components = {
+            'thermo': self.thermo,
+            'transport': self.transport,
+            'forbidden': self.forbiddenStructures,
+            'kinetics': self.kinetics,
+            'statmech': self.statmech,
+            'solvation': self.solvation,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        tempPath = '{0}.{1:d}.tmp'.format(path, os.getpid())
+        try:
+            if not os.path.exists(directory): os.makedirs(directory)
+            with open(tempPath, 'wb') as f:
+                cPickle.dump(components, f, cPickle.HIGHEST_PROTOCOL)
+            # Replace the cache file in one step so that other jobs never read a partial file
+            os.rename(tempPath, path)
+        except Exception, e:
+            logging.warning('Could not save the database cache to {0}: {1!s}'.format(path, e))
+            if os.path.exists(tempPath): os.remove(tempPath)
+            return False
+        logging.info('Saved the database cache to {0}'.format(path))
+        return True
+
+    def loadCache(self, path):
+        """
+        Load the database components from a binary cache file at `path`, as
+        written by :meth:`saveCache`. Returns ``True`` if the database was
+        loaded, or ``False`` if the file does not exist or cannot be read.
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'rb') as f:
+                components = cPickle.load(f)
+        except Exception, e:
+            logging.warning('Could not load the database cache from {0}: {1!s}'.format(path, e))
+            return False
+
+        self.thermo = components['thermo']
+        self.transport = components['transport']
+        self.forbiddenStructures = components['forbidden']
+        self.kinetics = components['kinetics']
+        self.statmech = components['statmech']
+        self.solvation = components['solvation']
+        for key, component in components.iteritems():
+            if component is not None:
+                broadcast(component, key)
+        logging.info('Loaded the database from the cache {0}'.format(path))
+        return True
+
     def loadOld(self, path):
         """
         Load the old RMG database from the given `path` on disk, where `path`
@@ -234,6 +294,33 @@ class RMGDatabase:
         self.kinetics.saveOld(path)
         self.statmech.saveOld(path)
 
+def getDatabaseCacheKey(path, *options):
+    """
+    Return a key identifying the database loaded from `path` with the given
+    `options` (e.g. the selected libraries and families). The key is a hash of
+    the contents of the database source files, of the RMG-Py source files, and
+    of the options, so it changes whenever any of them changes. `path` can also
+    be a list of database directories.
+    """
+    paths = [path] if isinstance(path, basestring) else path
+    key = hashlib.sha1()
+    key.update(rmgpy.__version__)
+    key.update(repr(options))
+    directories = [(os.path.abspath(p), ('.py',)) for p in paths]
+    directories.append((os.path.dirname(os.path.abspath(rmgpy.__file__)), ('.py', '.pyx', '.pxd')))
+    for directory, extensions in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            if 'test_data' in dirs: dirs.remove('test_data')
+            for filename in sorted(files):
+                if not filename.endswith(extensions):
+                    continue
+                filePath = os.path.join(root, filename)
+                key.update(os.path.relpath(filePath, directory))
+                with open(filePath, 'rb') as f:
+                    key.update(hashlib.sha1(f.read()).digest())
+    return key.hexdigest()
+
 def getDB(name=''):
     """
     Returns the RMG database object that corresponds
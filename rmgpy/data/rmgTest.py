@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import rmgpy.data.rmg
+from rmgpy.data.rmg import RMGDatabase, getDatabaseCacheKey
+
+################################################################################
+
+class TestDatabaseCache(unittest.TestCase):
+    """
+    Contains unit tests for caching the loaded RMG database.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(os.path.join(self.directory, 'groups.py'), 'w') as f:
+            f.write('name = "test"\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        rmgpy.data.rmg.database = None
+
+    def testCacheKey(self):
+        """
+        Test that the cache key changes with the source files and the options.
+        """
+        key = getDatabaseCacheKey(self.directory, ['primaryThermoLibrary'])
+        self.assertEqual(getDatabaseCacheKey(self.directory, ['primaryThermoLibrary']), key)
+        self.assertNotEqual(getDatabaseCacheKey(self.directory, ['GRI-Mech3.0']), key)
+
+        with open(os.path.join(self.directory, 'groups.py'), 'w') as f:
+            f.write('name = "changed"\n')
+        self.assertNotEqual(getDatabaseCacheKey(self.directory, ['primaryThermoLibrary']), key)
+
+    def testSaveAndLoadCache(self):
+        """
+        Test that a saved database cache can be loaded again.
+        """
+        path = os.path.join(self.directory, 'cache', 'database.pkl')
+
+        database = RMGDatabase()
+        self.assertFalse(database.loadCache(path))
+        database.loadForbiddenStructures()
+        self.assertTrue(database.saveCache(path))
+
+        rmgpy.data.rmg.database = None
+        cached = RMGDatabase()
+        self.assertTrue(cached.loadCache(path))
+        self.assertEqual(len(cached.forbiddenStructures.entries), 0)
+        self.assertIsNone(cached.kinetics)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
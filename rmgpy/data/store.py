@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+"""
+This module contains an on-disk store of the estimated properties of species,
+so that the thermo, transport and statmech estimates of one job can be reused
+in later jobs.
+"""
+
+import os.path
+import logging
+import cPickle
+import sqlite3
+import threading
+
+from rmgpy.data.rmg import getDatabaseCacheKey
+from rmgpy.scoop_framework.util import inWorker
+
+################################################################################
+
+class SpeciesPropertyStore(object):
+    """
+    A store of species properties in an SQLite database file at `path`. The
+    properties are stored by the augmented InChI of the species, the name of
+    the property, and a `fingerprint` of the database the property was
+    estimated with, so that properties from a different database are never
+    returned.
+
+    New properties are collected and written to the file in batches of
+    `batchSize`, or when :meth:`flush` is called. Several processes can read
+    and write the same file at the same time; a process waits at most
+    `timeout` seconds for the file to be unlocked. A store that is inherited
+    by a forked worker process opens its own connection to the file, and the
+    worker writes its properties right away, because it may be stopped
+    without notice.
+
+    Errors in reading or writing the file are logged and otherwise ignored,
+    in which case the property is simply estimated again.
+    """
+
+    def __init__(self, path, fingerprint='', batchSize=100, timeout=60.0):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.fingerprint = fingerprint
+        self.batchSize = batchSize
+        self.timeout = timeout
+        self.pending = {}
+        self._connection = None
+        self._pid = os.getpid()
+        self._lock = threading.RLock()
+
+    def _checkProcess(self):
+        """
+        Drop the connection and the pending properties of the parent process
+        if this is a forked process.
+        """
+        if self._pid != os.getpid():
+            # A connection must not be used across a fork
+            self._connection = None
+            self.pending = {}
+            self._pid = os.getpid()
+
+    def _connect(self):
+        """
+        Return the connection to the store file, opening it if needed.
+        """
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if not os.path.exists(directory): os.makedirs(directory)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            # Let readers proceed while another process writes
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS properties ('
+                               'inchi TEXT NOT NULL, fingerprint TEXT NOT NULL, name TEXT NOT NULL, '
+                               'value BLOB NOT NULL, PRIMARY KEY (inchi, fingerprint, name))')
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def getKey(self, species):
+        """
+        Return the key of the :class:`Species` object `species` in the store,
+        or ``None`` if the species has no augmented InChI.
+        """
+        try:
+            return species.getAugmentedInChI()
+        except Exception, e:
+            logging.debug('Could not generate the augmented InChI of {0}: {1!s}'.format(species.label, e))
+            return None
+
+    def get(self, species, name):
+        """
+        Return the property `name` of the :class:`Species` object `species`,
+        or ``None`` if it is not in the store.
+        """
+        key = self.getKey(species)
+        if key is None:
+            return None
+        with self._lock:
+            self._checkProcess()
+            value = self.pending.get((key, name), None)
+            if value is None:
+                try:
+                    row = self._connect().execute(
+                        'SELECT value FROM properties WHERE inchi=? AND fingerprint=? AND name=?',
+                        (key, self.fingerprint, name)).fetchone()
+                except sqlite3.Error, e:
+                    logging.warning('Could not read from the property store {0}: {1!s}'.format(self.path, e))
+                    return None
+                if row is None:
+                    return None
+                value = str(row[0])
+        try:
+            return cPickle.loads(value)
+        except Exception, e:
+            logging.warning('Could not read the {0} of {1} from the property store: {2!s}'.format(name, key, e))
+            return None
+
+    def put(self, species, name, value):
+        """
+        Add the property `name` of the :class:`Species` object `species` with
+        the given `value` to the store.
+        """
+        key = self.getKey(species)
+        if key is None:
+            return
+        # Pickle right away, as the value may be changed later on
+        value = cPickle.dumps(value, cPickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._checkProcess()
+            self.pending[key, name] = value
+            if len(self.pending) >= self.batchSize or inWorker():
+                self.flush()
+
+    def flush(self):
+        """
+        Write the pending properties to the store file.
+        """
+        with self._lock:
+            self._checkProcess()
+            if not self.pending:
+                return
+            rows = [(key, self.fingerprint, name, sqlite3.Binary(value))
+                    for (key, name), value in self.pending.iteritems()]
+            self.pending = {}
+            try:
+                connection = self._connect()
+                with connection:
+                    connection.executemany('INSERT OR REPLACE INTO properties VALUES (?, ?, ?, ?)', rows)
+            except sqlite3.Error, e:
+                logging.warning('Could not write {0:d} properties to the property store {1}: {2!s}'.format(
+                    len(rows), self.path, e))
+
+    def close(self):
+        """
+        Write the pending properties and close the store file.
+        """
+        with self._lock:
+            self.flush()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+################################################################################
+
+def getPropertyStoreFingerprint(path, *options):
+    """
+    Return the fingerprint of the thermo, transport, statmech and solvation
+    databases in the database directory `path`, as loaded with the given
+    `options` (e.g. the selected libraries).
+    """
+    paths = [os.path.join(path, name) for name in ('thermo', 'transport', 'statmech', 'solvation')]
+    return getDatabaseCacheKey(paths, *options)
+
+# The property store in use, or None if properties are not stored
+_propertyStore = None
+
+def setPropertyStore(store):
+    """
+    Use the :class:`SpeciesPropertyStore` object `store` for the properties of
+    species, or stop storing properties if `store` is ``None``. The previous
+    store is closed.
+    """
+    global _propertyStore
+    if _propertyStore is not None and _propertyStore is not store:
+        _propertyStore.close()
+    _propertyStore = store
+
+def getPropertyStore():
+    """
+    Return the property store in use, or ``None``.
+    """
+    return _propertyStore
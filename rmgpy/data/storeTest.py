@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from rmgpy.data.store import SpeciesPropertyStore
+from rmgpy.species import Species
+
+################################################################################
+
+class TestSpeciesPropertyStore(unittest.TestCase):
+    """
+    Contains unit tests for the SpeciesPropertyStore class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'properties.db')
+        self.species = Species().fromSMILES('CCO')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testGetPending(self):
+        """
+        Test that a property can be read before it is written to the file.
+        """
+        store = SpeciesPropertyStore(self.path, 'abc', batchSize=10)
+        self.assertIsNone(store.get(self.species, 'transport'))
+        store.put(self.species, 'transport', (1.0, 'test'))
+        self.assertEqual(len(store.pending), 1)
+        self.assertEqual(store.get(self.species, 'transport'), (1.0, 'test'))
+        store.close()
+
+    def testFlush(self):
+        """
+        Test that flushed properties are found by another store on the same file.
+        """
+        store = SpeciesPropertyStore(self.path, 'abc', batchSize=10)
+        store.put(self.species, 'transport', (1.0, 'test'))
+        store.flush()
+        self.assertEqual(store.pending, {})
+        other = SpeciesPropertyStore(self.path, 'abc')
+        self.assertEqual(other.get(Species().fromSMILES('OCC'), 'transport'), (1.0, 'test'))
+        self.assertIsNone(other.get(Species().fromSMILES('COC'), 'transport'))
+        self.assertIsNone(other.get(self.species, 'statmech'))
+        store.close()
+        other.close()
+
+    def testBatch(self):
+        """
+        Test that the properties are written once a batch is complete.
+        """
+        store = SpeciesPropertyStore(self.path, 'abc', batchSize=2)
+        store.put(self.species, 'transport', 1)
+        self.assertEqual(len(store.pending), 1)
+        store.put(self.species, 'statmech', 2)
+        self.assertEqual(store.pending, {})
+        other = SpeciesPropertyStore(self.path, 'abc')
+        self.assertEqual(other.get(self.species, 'statmech'), 2)
+        store.close()
+        other.close()
+
+    def testFingerprint(self):
+        """
+        Test that properties stored for another database are not returned.
+        """
+        store = SpeciesPropertyStore(self.path, 'abc')
+        store.put(self.species, 'transport', 1)
+        store.close()
+        other = SpeciesPropertyStore(self.path, 'def')
+        self.assertIsNone(other.get(self.species, 'transport'))
+        other.close()
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
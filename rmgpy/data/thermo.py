@@ -583,10 +583,50 @@ class ThermoDepository(Database):
 class ThermoLibrary(Database):
     """
     A class for working with a RMG thermodynamics library.
+
+    The entries are indexed by the formula and resonance hash of their
+    molecules, so that the entries that may match a given species are found
+    with a dictionary lookup instead of an isomorphism check for every entry.
     """
 
     def __init__(self, label='', name='',solvent=None, shortDesc='', longDesc=''):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
+        self.index = {}
+        self.indexSize = 0
+
+    def getIndexKey(self, molecule):
+        """
+        Return the key of `molecule` in the index of the library entries.
+        Isomorphic molecules and resonance structures of the same species
+        always have the same key.
+        """
+        return molecule.getFormula(), molecule.get_resonance_hash()
+
+    def indexEntries(self):
+        """
+        Rebuild the index of the library entries.
+        """
+        self.index = {}
+        for position, entry in enumerate(self.entries.itervalues()):
+            if isinstance(entry.item, Molecule):
+                self.index.setdefault(self.getIndexKey(entry.item), []).append((position, entry))
+        self.indexSize = len(self.entries)
+
+    def getCandidateEntries(self, molecules):
+        """
+        Return the entries of the library that may be isomorphic to any of the
+        given `molecules`, in the order of the library. The index is rebuilt
+        first if entries were added since it was last built.
+        """
+        if self.indexSize != len(self.entries):
+            self.indexEntries()
+        keys = set([self.getIndexKey(molecule) for molecule in molecules])
+        candidates = []
+        for key in keys:
+            candidates.extend(self.index.get(key, []))
+        if len(keys) > 1:
+            candidates.sort(key=lambda candidate: candidate[0])
+        return [entry for position, entry in candidates]
 
     def loadEntry(self,
                   index,
@@ -606,7 +646,7 @@ class ThermoLibrary(Database):
         if label in self.entries.keys():
             raise DatabaseError('Found a duplicate molecule with label {0} in the thermo library {1}.  Please correct your library.'.format(label, self.name))
         
-        for entry in self.entries.values():
+        for entry in self.getCandidateEntries([molecule]):
             if molecule.isIsomorphic(entry.item):
                 if molecule.multiplicity == entry.item.multiplicity:
                     raise DatabaseError('Adjacency list and multiplicity of {0} matches that of existing molecule {1} in thermo library {2}.  Please correct your library.'.format(label, entry.label, self.name))
@@ -622,6 +662,10 @@ class ThermoLibrary(Database):
             longDesc = longDesc.strip(),
             rank = rank,
         )
+        # Keep the index up to date while the library is loaded
+        if self.indexSize == len(self.entries) - 1:
+            self.index.setdefault(self.getIndexKey(molecule), []).append((self.indexSize, self.entries[label]))
+            self.indexSize += 1
 
     def saveEntry(self, f, entry):
         """
@@ -648,10 +692,22 @@ class ThermoLibrary(Database):
 class ThermoGroups(Database):
     """
     A class for working with an RMG thermodynamics group additivity database.
+
+    The node found by descending the tree for a molecule depends only on the
+    atoms that the groups in the tree can reach from the labeled atoms. These
+    nodes are stored in `descentCache` under a description of that local
+    environment, so the same environment in another molecule is looked up
+    instead of matched against the groups again.
     """
 
+    # The maximum number of entries in `descentCache` before it is emptied
+    maxDescentCache = 100000
+
     def __init__(self, label='', name='', shortDesc='', longDesc=''):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
+        self.descentCache = {}
+        self.descentDepths = {}
+        self.descentCacheSize = 0
 
     def loadEntry(self,
                   index,
@@ -702,6 +758,121 @@ class ThermoGroups(Database):
         """
         return processOldLibraryEntry(data)
 
+    def clearDescentCache(self):
+        """
+        Empty the cache of matched nodes and the depths of the tree.
+        """
+        self.descentCache = {}
+        self.descentDepths = {}
+        self.descentCacheSize = len(self.entries)
+
+    def getDescentDepth(self, labels):
+        """
+        Return the largest number of bonds between an atom with one of the
+        given `labels` and any atom of a group in the tree, or ``None`` if a
+        group has atoms that cannot be reached from these labeled atoms.
+        """
+        try:
+            return self.descentDepths[labels]
+        except KeyError:
+            pass
+        depth = 0
+        for entry in self.entries.itervalues():
+            if not isinstance(entry.item, Group):
+                continue
+            group = entry.item
+            layer = [atom for atom in group.atoms if atom.label in labels]
+            visited = set(layer)
+            groupDepth = 0
+            while True:
+                nextLayer = []
+                for atom in layer:
+                    for atom2 in atom.edges:
+                        if atom2 not in visited:
+                            visited.add(atom2)
+                            nextLayer.append(atom2)
+                if not nextLayer:
+                    break
+                layer = nextLayer
+                groupDepth += 1
+            if not visited or len(visited) < len(group.atoms):
+                depth = None
+                break
+            depth = max(depth, groupDepth)
+        self.descentDepths[labels] = depth
+        return depth
+
+    def getEnvironmentKey(self, molecule, atoms):
+        """
+        Return a hashable description of the atoms of `molecule` within reach
+        of the groups in the tree from the labeled `atoms`, a dictionary of
+        label-atom pairs. Two molecules with the same key match the same node.
+        Returns ``None`` if the tree has groups that reach beyond a fixed
+        number of bonds from the labeled atoms.
+        """
+        labels = tuple(sorted(atoms.keys()))
+        depth = self.getDescentDepth(frozenset(labels))
+        if depth is None:
+            return None
+        order = [atoms[label] for label in labels]
+        indices = dict([(atom, index) for index, atom in enumerate(order)])
+        if len(indices) < len(order):
+            return None
+        layer = order[:]
+        for level in range(depth):
+            nextLayer = []
+            for atom in layer:
+                neighbors = [(self.getAtomEnvironmentKey(atom2), bond.order, atom2)
+                             for atom2, bond in atom.edges.iteritems() if atom2 not in indices]
+                neighbors.sort(key=lambda neighbor: neighbor[:2])
+                for atomKey, order2, atom2 in neighbors:
+                    if atom2 not in indices:
+                        indices[atom2] = len(order)
+                        order.append(atom2)
+                        nextLayer.append(atom2)
+            layer = nextLayer
+        bonds = []
+        for atom in order:
+            for atom2, bond in atom.edges.iteritems():
+                if atom2 in indices and indices[atom] < indices[atom2]:
+                    bonds.append((indices[atom], indices[atom2], bond.order))
+        bonds.sort()
+        return (molecule.multiplicity, labels,
+                tuple([self.getAtomEnvironmentKey(atom) for atom in order]), tuple(bonds))
+
+    def getAtomEnvironmentKey(self, atom):
+        """
+        Return the properties of `atom` that are compared with group atoms.
+        """
+        return (atom.element.symbol, atom.atomType.label if atom.atomType else None, atom.radicalElectrons,
+                atom.lonePairs, atom.charge, atom.label, atom.props.get('inRing'))
+
+    def descendTree(self, structure, atoms, root=None, strict=False):
+        """
+        Descend the tree in search of the functional group node that best
+        matches the local structure around `atoms` in `structure`.
+
+        Descents from the top of the tree for a :class:`Molecule` are stored
+        in `descentCache` by the key from :meth:`getEnvironmentKey`. The cache
+        is emptied when the number of entries in the tree changes.
+        """
+        if root is not None or strict or not isinstance(structure, Molecule):
+            return Database.descendTree(self, structure, atoms, root, strict)
+        if self.descentCacheSize != len(self.entries):
+            self.clearDescentCache()
+        key = self.getEnvironmentKey(structure, atoms)
+        if key is None:
+            return Database.descendTree(self, structure, atoms, root, strict)
+        try:
+            return self.descentCache[key]
+        except KeyError:
+            pass
+        node = Database.descendTree(self, structure, atoms, root, strict)
+        if len(self.descentCache) >= self.maxDescentCache:
+            self.descentCache = {}
+        self.descentCache[key] = node
+        return node
+
     def copyData(self, source, destination):
         """
         This method copys the ThermoData object and all meta data
@@ -732,6 +903,7 @@ class ThermoGroups(Database):
 
         #First call base class method
         Database.removeGroup(self, groupToRemove)
+        self.clearDescentCache()
 
         parentR = groupToRemove.parent
 
@@ -1372,7 +1544,7 @@ class ThermoDatabase(object):
         Returns a tuple: (ThermoData, library, entry)  or None.
         """
         match = None
-        for entry in library.entries.itervalues():
+        for entry in library.getCandidateEntries(species.molecule):
             for molecule in species.molecule:
                 if molecule.isIsomorphic(entry.item) and entry.data is not None:
                     thermoData = deepcopy(entry.data)
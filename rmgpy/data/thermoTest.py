@@ -262,6 +262,41 @@ class TestThermoDatabase(unittest.TestCase):
         self.assertEqual(set(initial), set(spec.molecule))
         self.assertTrue('group additivity' in thermo.comment, 'Thermo not found from GAV, test purpose not fulfilled.')
 
+    def testThermoLibraryIndex(self):
+        """
+        Test that the index of a thermo library finds the matching entries.
+        """
+        library = self.database.libraries['primaryThermoLibrary']
+        for entry in library.entries.itervalues():
+            candidates = library.getCandidateEntries([entry.item])
+            self.assertIn(entry, candidates)
+            self.assertLess(len(candidates), len(library.entries))
+
+        # Entries added after loading are indexed on the next lookup
+        library = ThermoLibrary()
+        methane = Molecule().fromSMILES('C')
+        library.entries['methane'] = Entry(index=1, label='methane', item=methane)
+        self.assertEqual(library.getCandidateEntries([Molecule().fromSMILES('C')]), [library.entries['methane']])
+        self.assertEqual(library.getCandidateEntries([Molecule().fromSMILES('CC')]), [])
+
+    def testGroupDescentCache(self):
+        """
+        Test that the nodes stored in the descent cache of a group tree are
+        the nodes found by descending the tree, and that they are reused.
+        """
+        groups = self.database.groups['group']
+        groups.clearDescentCache()
+        count = 0
+        for smiles in ['CCC', 'CCCC', 'CC(C)O', 'C=CCC=O']:
+            molecule = Molecule().fromSMILES(smiles)
+            for atom in molecule.atoms:
+                if atom.isNonHydrogen():
+                    count += 1
+                    node = groups.descendTree(molecule, {'*': atom})
+                    self.assertIs(node, Database.descendTree(groups, molecule, {'*': atom}))
+        self.assertGreater(len(groups.descentCache), 0)
+        self.assertLess(len(groups.descentCache), count)
+
     def testSpeciesThermoGenerationLibrary(self):
         """Test thermo generation for species objects for library value.
 
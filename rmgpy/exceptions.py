@@ -232,6 +232,13 @@ class SettingsError(Exception):
     """
     pass
 
+class SnapshotError(Exception):
+    """
+    An exception raised when a mechanism snapshot file cannot be read. Pass a
+    string describing the problem.
+    """
+    pass
+
 class SpeciesError(Exception):
     """
     An exception class for exceptional behavior that occurs while working with
@@ -0,0 +1,382 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains the :class:`KineticsTable` class, which packs the kinetics
+of a list of reactions into contiguous NumPy arrays so that the rate
+coefficients of the whole list can be evaluated in a handful of vectorized
+calls at a given temperature and pressure.
+"""
+
+import numpy
+
+import rmgpy.constants as constants
+from rmgpy.kinetics.arrhenius import Arrhenius, PDepArrhenius, MultiArrhenius, MultiPDepArrhenius
+from rmgpy.kinetics.chebyshev import Chebyshev
+from rmgpy.kinetics.falloff import ThirdBody, Lindemann, Troe
+from rmgpy.kinetics.diffusionLimited import diffusionLimiter
+
+################################################################################
+
+def packKinetics(kinetics):
+    """
+    Return a list of the components of the kinetics model `kinetics` in the
+    form used by :class:`KineticsTable`, or ``None`` if the model (or one of
+    its parts) cannot be evaluated in vectorized form. Each component is a
+    tuple whose first item identifies its type:
+
+    =============== ===========================================================
+    Type            Remaining items
+    =============== ===========================================================
+    ``'arrhenius'`` the Arrhenius parameters `(A, n, Ea, T0)`
+    ``'pdep'``      the pressures and the Arrhenius parameters at each pressure
+    ``'chebyshev'`` the rows of the coefficient matrix and `(Tmin, Tmax, Pmin,
+                    Pmax)`
+    ``'falloff'``   the form (0 = third-body, 1 = Lindemann, 2 = Troe), the low-
+                    and high-pressure Arrhenius parameters and `(alpha, T1, T2,
+                    T3)`
+    =============== ===========================================================
+
+    All values are in SI units, and the components only hold tuples and
+    floats so that two packings of the same parameters compare equal.
+    """
+    if isinstance(kinetics, Arrhenius):
+        return [('arrhenius', _packArrhenius(kinetics))]
+    elif isinstance(kinetics, MultiArrhenius):
+        components = []
+        for arrh in kinetics.arrhenius:
+            packed = packKinetics(arrh)
+            if packed is None:
+                return None
+            components.extend(packed)
+        return components
+    elif isinstance(kinetics, PDepArrhenius):
+        if not all([isinstance(arrh, Arrhenius) for arrh in kinetics.arrhenius]):
+            return None
+        pressures = [float(P) for P in kinetics.pressures.value_si]
+        return [('pdep', pressures, [_packArrhenius(arrh) for arrh in kinetics.arrhenius])]
+    elif isinstance(kinetics, MultiPDepArrhenius):
+        components = []
+        for arrh in kinetics.arrhenius:
+            packed = packKinetics(arrh)
+            if packed is None:
+                return None
+            components.extend(packed)
+        return components
+    elif isinstance(kinetics, Chebyshev):
+        coeffs = tuple([tuple(row) for row in numpy.array(kinetics.coeffs.value_si, numpy.float64)])
+        return [('chebyshev', coeffs,
+                 (kinetics.Tmin.value_si, kinetics.Tmax.value_si, kinetics.Pmin.value_si, kinetics.Pmax.value_si))]
+    elif isinstance(kinetics, ThirdBody):
+        if not isinstance(kinetics.arrheniusLow, Arrhenius):
+            return None
+        return [('falloff', 0, _packArrhenius(kinetics.arrheniusLow), None, (0.0, 0.0, 0.0, 0.0))]
+    elif isinstance(kinetics, (Lindemann, Troe)):
+        if not isinstance(kinetics.arrheniusLow, Arrhenius) or not isinstance(kinetics.arrheniusHigh, Arrhenius):
+            return None
+        if not isinstance(kinetics, Troe):
+            return [('falloff', 1, _packArrhenius(kinetics.arrheniusLow), _packArrhenius(kinetics.arrheniusHigh),
+                     (0.0, 0.0, 0.0, 0.0))]
+        T1 = kinetics.T1.value_si if kinetics.T1 is not None else 0.0
+        T2 = kinetics.T2.value_si if kinetics.T2 is not None else 0.0
+        T3 = kinetics.T3.value_si if kinetics.T3 is not None else 0.0
+        return [('falloff', 2, _packArrhenius(kinetics.arrheniusLow), _packArrhenius(kinetics.arrheniusHigh),
+                 (kinetics.alpha, T1, T2, T3))]
+    return None
+
+def _packArrhenius(arrh):
+    """
+    Return the parameters of the Arrhenius expression `arrh` as a tuple
+    `(A, n, Ea, T0)` in SI units.
+    """
+    return (arrh.A.value_si, arrh.n.value_si, arrh.Ea.value_si, arrh.T0.value_si)
+
+def _chebyshevPolynomials(x, degree):
+    """
+    Return an array whose columns are the Chebyshev polynomials of the first
+    kind of order 0 to `degree` - 1 evaluated at each value in `x`.
+    """
+    result = numpy.ones((x.shape[0], max(degree, 1)), numpy.float64)
+    if degree > 1:
+        result[:,1] = x
+    for i in range(2, degree):
+        result[:,i] = 2 * x * result[:,i-1] - result[:,i-2]
+    return result
+
+################################################################################
+
+class KineticsTable(object):
+    """
+    A struct-of-arrays representation of the kinetics of an ordered list of
+    reactions. Call :meth:`setReactions` with the reactions in the order used
+    by the caller, then :meth:`getRateCoefficients` to evaluate the forward
+    rate coefficients of all reactions at once. The attributes are:
+
+    =================== ===================================================
+    Attribute           Description
+    =================== ===================================================
+    `reactions`         The reactions in the order of the rows of the table
+    `packed`            A dictionary mapping each reaction to the packed
+                        components of its kinetics
+    `fallback`          The rows whose kinetics are evaluated one by one
+    `reversible`        A boolean array flagging the reversible reactions
+    =================== ===================================================
+
+    The packed components are compared by value rather than by kinetics
+    object, so kinetics replaced or edited in place (e.g. by
+    :meth:`Arrhenius.changeRate` or :meth:`Reaction.fixBarrierHeight`) are
+    always picked up, while a table kept alive across calls with unchanged
+    parameters skips rebuilding the arrays.
+    """
+
+    def __init__(self):
+        self.reactions = []
+        self.packed = {}
+        self.fallback = numpy.zeros(0, int)
+        self.reversible = numpy.zeros(0, bool)
+
+        # Arrhenius terms shared by all component types
+        self.A = numpy.zeros(0, numpy.float64)
+        self.n = numpy.zeros(0, numpy.float64)
+        self.Ea = numpy.zeros(0, numpy.float64)
+        self.T0 = numpy.ones(0, numpy.float64)
+
+        # Arrhenius and MultiArrhenius components
+        self.arrheniusRows = numpy.zeros(0, int)
+        self.arrheniusTerms = numpy.zeros(0, int)
+
+        # PDepArrhenius and MultiPDepArrhenius components
+        self.pdepRows = numpy.zeros(0, int)
+        self.pdepPressures = numpy.zeros((0,1), numpy.float64)
+        self.pdepTerms = numpy.zeros((0,1), int)
+        self.pdepCount = numpy.zeros(0, int)
+
+        # Chebyshev components
+        self.chebyshevRows = numpy.zeros(0, int)
+        self.chebyshevCoeffs = numpy.zeros((0,1,1), numpy.float64)
+        self.chebyshevLimits = numpy.zeros((0,4), numpy.float64)
+
+        # ThirdBody, Lindemann and Troe components
+        self.falloffRows = numpy.zeros(0, int)
+        self.falloffForm = numpy.zeros(0, int)
+        self.falloffLow = numpy.zeros(0, int)
+        self.falloffHigh = numpy.zeros(0, int)
+        self.falloffTroe = numpy.zeros((0,4), numpy.float64)
+
+    def setReactions(self, reactions):
+        """
+        Make the rows of the table correspond to the list of `reactions`.
+        The kinetics of every reaction are packed again and the arrays are
+        only rebuilt if the list, the reversibility or the packed parameter
+        values have changed.
+        """
+        packed = dict([(rxn, packKinetics(rxn.kinetics)) for rxn in reactions])
+        reversible = numpy.array([rxn.reversible for rxn in reactions], bool)
+        if len(reactions) == len(self.reactions) and all([rxn0 is rxn1 for rxn0, rxn1 in zip(reactions, self.reactions)]) \
+                and numpy.array_equal(reversible, self.reversible) \
+                and all([packed[rxn] == self.packed[rxn] for rxn in reactions]):
+            return
+
+        self.packed = packed
+        self.reactions = list(reactions)
+        self.reversible = reversible
+
+        A = []; n = []; Ea = []; T0 = []
+        def addTerm(params):
+            A.append(params[0]); n.append(params[1]); Ea.append(params[2]); T0.append(params[3])
+            return len(A) - 1
+
+        fallback = []
+        arrheniusRows = []; arrheniusTerms = []
+        pdepRows = []; pdepPressures = []; pdepTerms = []
+        chebyshevRows = []; chebyshevCoeffs = []; chebyshevLimits = []
+        falloffRows = []; falloffForm = []; falloffLow = []; falloffHigh = []; falloffTroe = []
+        for row, rxn in enumerate(self.reactions):
+            components = self.packed[rxn]
+            if components is None:
+                fallback.append(row)
+                continue
+            for component in components:
+                if component[0] == 'arrhenius':
+                    arrheniusRows.append(row)
+                    arrheniusTerms.append(addTerm(component[1]))
+                elif component[0] == 'pdep':
+                    pdepRows.append(row)
+                    pdepPressures.append(component[1])
+                    pdepTerms.append([addTerm(params) for params in component[2]])
+                elif component[0] == 'chebyshev':
+                    chebyshevRows.append(row)
+                    chebyshevCoeffs.append(component[1])
+                    chebyshevLimits.append(component[2])
+                elif component[0] == 'falloff':
+                    falloffRows.append(row)
+                    falloffForm.append(component[1])
+                    falloffLow.append(addTerm(component[2]))
+                    falloffHigh.append(addTerm(component[3]) if component[3] is not None else -1)
+                    falloffTroe.append(component[4])
+
+        self.fallback = numpy.array(fallback, int)
+
+        self.A = numpy.array(A, numpy.float64)
+        self.n = numpy.array(n, numpy.float64)
+        self.Ea = numpy.array(Ea, numpy.float64)
+        self.T0 = numpy.array(T0, numpy.float64)
+
+        self.arrheniusRows = numpy.array(arrheniusRows, int)
+        self.arrheniusTerms = numpy.array(arrheniusTerms, int)
+
+        # Pad the pressure lists with NaN (which fails every comparison)
+        Nmax = max([len(pressures) for pressures in pdepPressures] + [1])
+        self.pdepRows = numpy.array(pdepRows, int)
+        self.pdepCount = numpy.array([len(pressures) for pressures in pdepPressures], int)
+        self.pdepPressures = numpy.nan * numpy.ones((len(pdepRows), Nmax), numpy.float64)
+        self.pdepTerms = numpy.zeros((len(pdepRows), Nmax), int)
+        for i in range(len(pdepRows)):
+            self.pdepPressures[i,:self.pdepCount[i]] = pdepPressures[i]
+            self.pdepTerms[i,:self.pdepCount[i]] = pdepTerms[i]
+
+        # Pad the coefficient matrices with zeros
+        chebyshevCoeffs = [numpy.array(coeffs, numpy.float64) for coeffs in chebyshevCoeffs]
+        degreeT = max([coeffs.shape[0] for coeffs in chebyshevCoeffs] + [1])
+        degreeP = max([coeffs.shape[1] for coeffs in chebyshevCoeffs] + [1])
+        self.chebyshevRows = numpy.array(chebyshevRows, int)
+        self.chebyshevCoeffs = numpy.zeros((len(chebyshevRows), degreeT, degreeP), numpy.float64)
+        for i, coeffs in enumerate(chebyshevCoeffs):
+            self.chebyshevCoeffs[i,:coeffs.shape[0],:coeffs.shape[1]] = coeffs
+        self.chebyshevLimits = numpy.array(chebyshevLimits, numpy.float64).reshape(-1, 4)
+
+        self.falloffRows = numpy.array(falloffRows, int)
+        self.falloffForm = numpy.array(falloffForm, int)
+        self.falloffLow = numpy.array(falloffLow, int)
+        self.falloffHigh = numpy.array(falloffHigh, int)
+        self.falloffTroe = numpy.array(falloffTroe, numpy.float64).reshape(-1, 4)
+
+    def getRateCoefficients(self, T, P):
+        """
+        Return an array of the forward rate coefficients of all reactions in
+        the table, in the combination of m^3, mol, and s appropriate to each
+        reaction, at temperature `T` in K. The pressure `P` in Pa is either a
+        single value or an array of effective pressures, one per reaction.
+        The result matches calling :meth:`Reaction.getRateCoefficient` on
+        each reaction.
+        """
+        Nrxn = len(self.reactions)
+        P = numpy.ones(Nrxn, numpy.float64) * P
+        if diffusionLimiter.enabled:
+            # The diffusion limit is computed per reaction and cached on it
+            return numpy.array([rxn.getRateCoefficient(T, P[j]) for j, rxn in enumerate(self.reactions)], numpy.float64)
+
+        k = numpy.zeros(Nrxn, numpy.float64)
+        kterms = self.A * (T / self.T0)**self.n * numpy.exp(-self.Ea / (constants.R * T))
+
+        if self.arrheniusRows.shape[0] > 0:
+            k += numpy.bincount(self.arrheniusRows, weights=kterms[self.arrheniusTerms], minlength=Nrxn)
+
+        if self.pdepRows.shape[0] > 0:
+            k += numpy.bincount(self.pdepRows, weights=self.getPDepArrheniusRates(kterms, P[self.pdepRows]), minlength=Nrxn)
+
+        if self.chebyshevRows.shape[0] > 0:
+            k += numpy.bincount(self.chebyshevRows, weights=self.getChebyshevRates(T, P[self.chebyshevRows]), minlength=Nrxn)
+
+        if self.falloffRows.shape[0] > 0:
+            k += numpy.bincount(self.falloffRows, weights=self.getFalloffRates(kterms, T, P[self.falloffRows]), minlength=Nrxn)
+
+        for j in self.fallback:
+            k[j] = self.reactions[j].getRateCoefficient(T, P[j])
+
+        return k
+
+    def getPDepArrheniusRates(self, kterms, P):
+        """
+        Return the rate coefficients of the PDepArrhenius components, given
+        the evaluated Arrhenius terms `kterms` and the pressure `P` in Pa of
+        each component, by logarithmic interpolation between the bounding
+        pressures.
+        """
+        if numpy.any(P == 0):
+            raise ValueError('No pressure specified to pressure-dependent PDepArrhenius.getRateCoefficient().')
+        Ncomp, Nmax = self.pdepPressures.shape
+        rows = numpy.arange(Ncomp)
+        # Same bracketing as PDepArrhenius.getAdjacentExpressions()
+        below = self.pdepPressures <= P[:,numpy.newaxis]
+        above = self.pdepPressures >= P[:,numpy.newaxis]
+        ilow = numpy.where(below.any(axis=1), Nmax - 1 - numpy.argmax(below[:,::-1], axis=1), 0)
+        ihigh = numpy.where(above.any(axis=1), numpy.argmax(above, axis=1), self.pdepCount - 1)
+        Plow = self.pdepPressures[rows,ilow]
+        Phigh = self.pdepPressures[rows,ihigh]
+        klow = kterms[self.pdepTerms[rows,ilow]]
+        khigh = kterms[self.pdepTerms[rows,ihigh]]
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            x = numpy.where(Plow == Phigh, 0.0, numpy.log10(P / Plow) / numpy.log10(Phigh / Plow))
+            k = numpy.where(x == 0.0, klow, klow**(1 - x) * khigh**x)
+        return k
+
+    def getChebyshevRates(self, T, P):
+        """
+        Return the rate coefficients of the Chebyshev components at
+        temperature `T` in K and the pressure `P` in Pa of each component.
+        """
+        if numpy.any(P == 0):
+            raise ValueError('No pressure specified to pressure-dependent Chebyshev.getRateCoefficient().')
+        Tmin, Tmax, Pmin, Pmax = self.chebyshevLimits.T
+        Tred = (2.0/T - 1.0/Tmin - 1.0/Tmax) / (1.0/Tmax - 1.0/Tmin)
+        Pred = (2.0*numpy.log10(P) - numpy.log10(Pmin) - numpy.log10(Pmax)) / (numpy.log10(Pmax) - numpy.log10(Pmin))
+        Ncomp, degreeT, degreeP = self.chebyshevCoeffs.shape
+        chebT = _chebyshevPolynomials(Tred, degreeT)
+        chebP = _chebyshevPolynomials(Pred, degreeP)
+        return 10.0**numpy.einsum('itp,it,ip->i', self.chebyshevCoeffs, chebT, chebP)
+
+    def getFalloffRates(self, kterms, T, P):
+        """
+        Return the rate coefficients of the ThirdBody, Lindemann and Troe
+        components, given the evaluated Arrhenius terms `kterms`, the
+        temperature `T` in K and the pressure `P` in Pa of each component.
+        """
+        C = P / constants.R / T     # bath gas concentration in mol/m^3
+        k0 = kterms[self.falloffLow]
+        thirdBody = self.falloffForm == 0
+        # Third-body components have no high-pressure limit; use k0 as a placeholder
+        kinf = numpy.where(thirdBody, k0, kterms[self.falloffHigh])
+        Pr = k0 * C / kinf
+        k = numpy.where(thirdBody, k0 * C, kinf * (Pr / (1 + Pr)))
+
+        alpha, T1, T2, T3 = self.falloffTroe.T
+        troe = (self.falloffForm == 2) & ((T1 != 0) | (T3 != 0))
+        if numpy.any(troe):
+            with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                Fcent = (1 - alpha) * numpy.exp(-T / T3) + alpha * numpy.exp(-T / T1)
+                Fcent += numpy.where(T2 != 0, numpy.exp(-T2 / T), 0.0)
+                d = 0.14
+                n = 0.75 - 1.27 * numpy.log10(Fcent)
+                c = -0.4 - 0.67 * numpy.log10(Fcent)
+                logPr = numpy.log10(Pr)
+                F = 10.0**(numpy.log10(Fcent) / (1 + ((logPr + c) / (n - d * logPr))**2))
+            k = numpy.where(troe, k * F, k)
+        return k
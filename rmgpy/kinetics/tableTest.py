@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This script contains unit tests of the :mod:`rmgpy.kinetics.table` module.
+"""
+
+import unittest
+import numpy
+
+from rmgpy.kinetics import Arrhenius, ArrheniusEP, PDepArrhenius, MultiArrhenius, MultiPDepArrhenius, \
+                           Chebyshev, ThirdBody, Lindemann, Troe
+from rmgpy.kinetics.table import KineticsTable, packKinetics
+from rmgpy.reaction import Reaction
+
+################################################################################
+
+class TestKineticsTable(unittest.TestCase):
+    """
+    Contains unit tests of the :class:`KineticsTable` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        arrhenius0 = Arrhenius(A=(1.0e6,"s^-1"), n=1.0, Ea=(10.0,"kJ/mol"), T0=(300.0,"K"))
+        arrhenius1 = Arrhenius(A=(1.0e12,"s^-1"), n=1.0, Ea=(20.0,"kJ/mol"), T0=(300.0,"K"))
+        arrheniusHigh = Arrhenius(A=(1.39e+16,"cm^3/(mol*s)"), n=-0.534, Ea=(2.243,"kJ/mol"), T0=(1,"K"))
+        arrheniusLow = Arrhenius(A=(2.62e+33,"cm^6/(mol^2*s)"), n=-4.76, Ea=(10.21,"kJ/mol"), T0=(1,"K"))
+        pdepArrhenius0 = PDepArrhenius(pressures=([0.1, 10.0],"bar"), arrhenius=[arrhenius0, arrhenius1])
+        pdepArrhenius1 = PDepArrhenius(pressures=([0.01, 1.0, 100.0],"bar"), arrhenius=[arrhenius1, arrhenius0, arrhenius1])
+        coeffs = numpy.array([
+            [11.67723, 0.729281, -0.11984, 0.00882175],
+            [-1.02669, 0.853639, -0.0323485, -0.027367],
+            [-0.447011, 0.244144, 0.0559122, -0.0101723],
+            [-0.128261, 0.0111596, 0.0281176, 0.00604353],
+            [-0.0117034, -0.0235646, 0.00061009, 0.00401309],
+            [0.0155433, -0.0136846, -0.00463048, -0.000261353],
+        ])
+        self.kinetics = [
+            arrhenius0,
+            MultiArrhenius(arrhenius=[arrhenius0, arrhenius1]),
+            pdepArrhenius0,
+            MultiPDepArrhenius(arrhenius=[pdepArrhenius0, pdepArrhenius1]),
+            Chebyshev(coeffs=coeffs, kunits="cm^3/(mol*s)", Tmin=(300.,"K"), Tmax=(2000.,"K"), Pmin=(0.01,"bar"), Pmax=(100.,"bar")),
+            Chebyshev(coeffs=coeffs[:2,:3], kunits="cm^3/(mol*s)", Tmin=(300.,"K"), Tmax=(2000.,"K"), Pmin=(0.01,"bar"), Pmax=(100.,"bar")),
+            ThirdBody(arrheniusLow=arrheniusLow),
+            Lindemann(arrheniusHigh=arrheniusHigh, arrheniusLow=arrheniusLow),
+            Troe(arrheniusHigh=arrheniusHigh, arrheniusLow=arrheniusLow, alpha=0.783, T3=(74,"K"), T1=(2941,"K"), T2=(6964,"K")),
+            Troe(arrheniusHigh=arrheniusHigh, arrheniusLow=arrheniusLow, alpha=0.783, T3=(74,"K"), T1=(2941,"K")),
+            ArrheniusEP(A=(1.0e12,"cm^3/(mol*s)"), n=0.5, alpha=0.5, E0=(41.84,"kJ/mol")),
+        ]
+        self.reactions = [Reaction(kinetics=kinetics, reversible=(i % 2 == 0)) for i, kinetics in enumerate(self.kinetics)]
+        self.table = KineticsTable()
+        self.table.setReactions(self.reactions)
+
+    def test_packKinetics(self):
+        """
+        Test that only the supported kinetics models are packed.
+        """
+        for kinetics in self.kinetics[:-1]:
+            self.assertIsNotNone(packKinetics(kinetics))
+        self.assertIsNone(packKinetics(self.kinetics[-1]))
+        self.assertEqual(list(self.table.fallback), [len(self.kinetics) - 1])
+        self.assertEqual(list(self.table.reversible), [rxn.reversible for rxn in self.reactions])
+
+    def test_getRateCoefficients(self):
+        """
+        Test that the table reproduces the rate coefficient of each reaction.
+        """
+        for T in [300, 500, 1000, 1500, 2000]:
+            for P in [1e3, 5e4, 1e5, 2e6, 1e7]:
+                kact = self.table.getRateCoefficients(T, P)
+                for rxn, k in zip(self.reactions, kact):
+                    kexp = rxn.getRateCoefficient(T, P)
+                    self.assertAlmostEqual(k, kexp, delta=1e-6*kexp)
+
+    def test_getRateCoefficientsPerReactionPressure(self):
+        """
+        Test that the table accepts a different pressure for each reaction.
+        """
+        Plist = numpy.logspace(3, 7, len(self.reactions))
+        kact = self.table.getRateCoefficients(1000., Plist)
+        for rxn, P, k in zip(self.reactions, Plist, kact):
+            kexp = rxn.getRateCoefficient(1000., P)
+            self.assertAlmostEqual(k, kexp, delta=1e-6*kexp)
+
+    def test_setReactions(self):
+        """
+        Test that reordering the reactions only reorders the table, and that
+        reactions no longer present are dropped.
+        """
+        packed = dict(self.table.packed)
+        reactions = self.reactions[::-1][1:]
+        self.table.setReactions(reactions)
+        self.assertEqual(len(self.table.packed), len(reactions))
+        for rxn in reactions:
+            self.assertEqual(self.table.packed[rxn], packed[rxn])
+        kact = self.table.getRateCoefficients(1000., 1e5)
+        for rxn, k in zip(reactions, kact):
+            kexp = rxn.getRateCoefficient(1000., 1e5)
+            self.assertAlmostEqual(k, kexp, delta=1e-6*kexp)
+
+        # Replacing the kinetics of a reaction repacks it
+        reactions[0].kinetics = Arrhenius(A=(1.0e6,"s^-1"), n=0.0, Ea=(0.0,"kJ/mol"), T0=(1.0,"K"))
+        self.table.setReactions(reactions)
+        self.assertAlmostEqual(self.table.getRateCoefficients(1000., 1e5)[0], 1.0e6, delta=1e-6)
+
+    def test_setReactionsEditedInPlace(self):
+        """
+        Test that kinetics edited in place are repacked, and that the arrays
+        are kept when nothing has changed.
+        """
+        A = self.table.A
+        self.table.setReactions(self.reactions)
+        self.assertIs(self.table.A, A)
+
+        kinetics = self.reactions[0].kinetics
+        kinetics.changeRate(10.0)
+        kinetics.Ea.value_si += 5000.0
+        self.reactions[2].kinetics.arrhenius[1].changeRate(0.5)
+        self.reactions[4].kinetics.coeffs.value_si[0,0] += 1.0
+        self.reactions[1].reversible = not self.reactions[1].reversible
+        self.table.setReactions(self.reactions)
+        self.assertIsNot(self.table.A, A)
+        self.assertEqual(list(self.table.reversible), [rxn.reversible for rxn in self.reactions])
+        for P in [1e3, 1e5, 1e7]:
+            kact = self.table.getRateCoefficients(1000., P)
+            for rxn, k in zip(self.reactions, kact):
+                kexp = rxn.getRateCoefficient(1000., P)
+                self.assertAlmostEqual(k, kexp, delta=1e-6*kexp)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
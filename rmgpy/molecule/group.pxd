@@ -122,6 +122,7 @@ cdef class Group(Graph):
     # subgraph isomorphism checks
     cdef public dict elementCount
     cdef public short radicalCount
+    cdef public dict bondCount
 
     cpdef addAtom(self, GroupAtom atom)
 
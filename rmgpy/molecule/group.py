@@ -954,6 +954,7 @@ class Group(Graph):
         self.multiplicity = multiplicity or []
         self.elementCount = {}
         self.radicalCount = -1
+        self.bondCount = {}
         self.update()
 
     def __reduce__(self):
@@ -1549,13 +1550,20 @@ class Group(Graph):
         Update the molecular fingerprint used to accelerate the subgraph
         isomorphism checks.
         """
-        cython.declare(atom=GroupAtom)
+        cython.declare(atom=GroupAtom, bond=GroupBond, orders=tuple)
 
         self.elementCount = self.get_element_count()
         self.radicalCount = 0
         for atom in self.vertices:
             if len(atom.radicalElectrons) >= 1:
                 self.radicalCount += atom.radicalElectrons[0]
+        # Count the bonds by their allowed orders; a matching molecule needs
+        # a distinct bond with one of these orders for each of them
+        self.bondCount = {}
+        for bond in self.getAllEdges():
+            orders = tuple(sorted(bond.getOrderNum()))
+            if orders:
+                self.bondCount[orders] = self.bondCount.get(orders, 0) + 1
 
     def isIsomorphic(self, other, initialMap=None, saveOrder=False):
         """
@@ -1437,6 +1437,16 @@ graph G {
         result = group.get_element_count()
         self.assertEqual(expected, result)
 
+    def test_bond_count(self):
+        """Test that the fingerprint counts the bonds by their allowed orders."""
+        group = Group().fromAdjacencyList("""
+1 Cd u0 {2,D} {3,S}
+2 Cd u0 {1,D} {4,[S,D]}
+3 R!H u0 {1,S}
+4 R!H u0 {2,[S,D]}
+""")
+        self.assertEqual(group.bondCount, {(1,): 1, (2,): 1, (1, 2): 1})
+
 ################################################################################
 
 if __name__ == '__main__':
@@ -185,6 +185,8 @@ cdef class Molecule(Graph):
 
     cpdef dict get_element_count(self)
 
+    cpdef bint hasBondOrders(self, dict bondCount) except -2
+
     cpdef bint isIsomorphic(self, Graph other, dict initialMap=?, bint saveOrder=?) except -2
 
     cpdef list findIsomorphism(self, Graph other, dict initialMap=?, bint saveOrder=?)
@@ -1236,6 +1236,63 @@ class Molecule(Graph):
 
         return element_count
 
+    def hasBondOrders(self, bondCount):
+        """
+        Return ``True`` if the molecule has at least as many bonds with one of
+        the orders in each key of `bondCount` as the corresponding value, or
+        ``False`` otherwise. `bondCount` is the dictionary of bond counts in
+        the fingerprint of a :class:`Group`.
+        """
+        cython.declare(bonds=list, bond=Bond, orders=tuple, order=float, count=cython.int, found=cython.int)
+        if not bondCount:
+            return True
+        bonds = self.getAllEdges()
+        for orders, count in bondCount.iteritems():
+            if count > len(bonds):
+                return False
+            found = 0
+            for bond in bonds:
+                for order in orders:
+                    if bond.isOrder(order):
+                        found += 1
+                        break
+            if found < count:
+                return False
+        return True
+
+    def get_resonance_hash(self):
+        """
+        Return an integer hash of the molecular graph that does not depend on
+        the ordering of the atoms or on the choice of resonance structure.
+        Only the elements (and isotopes), the atom connectivity and the
+        multiplicity are used; bond orders and the placement of radicals, lone
+        pairs and charges are ignored. The atom labels are refined iteratively
+        from the labels of their neighbors (Weisfeiler-Lehman) until the
+        number of distinct labels stops growing.
+
+        Two molecules having the same hash is a necessary (but not sufficient)
+        condition for them to be isomorphic or resonance structures of one
+        another.
+        """
+        cython.declare(atom=Atom, neighbor=Atom, labels=dict, newLabels=dict, nClasses=cython.int, nNew=cython.int, i=cython.int)
+
+        labels = {}
+        for atom in self.vertices:
+            labels[atom] = hash((atom.element.symbol, atom.element.isotope))
+        nClasses = len(set(labels.itervalues()))
+
+        for i in range(len(self.vertices)):
+            newLabels = {}
+            for atom in self.vertices:
+                newLabels[atom] = hash((labels[atom], tuple(sorted([labels[neighbor] for neighbor in atom.edges]))))
+            labels = newLabels
+            nNew = len(set(labels.itervalues()))
+            if nNew == nClasses:
+                break
+            nClasses = nNew
+
+        return hash((self.multiplicity, tuple(sorted(labels.itervalues()))))
+
     def isIsomorphic(self, other, initialMap=None,saveOrder=False):
         """
         Returns :data:`True` if two graphs are isomorphic and :data:`False`
@@ -1320,6 +1377,10 @@ class Molecule(Graph):
                 return False
             elif element_count[element] < count:
                 return False
+
+        # Compare bond order counts
+        if not self.hasBondOrders(group.bondCount):
+            return False
         
         if generateInitialMap:
             initialMap = dict()
@@ -1370,6 +1431,10 @@ class Molecule(Graph):
             elif element_count[element] < count:
                 return []
 
+        # Compare bond order counts
+        if not self.hasBondOrders(group.bondCount):
+            return []
+
         # Do the isomorphism comparison
         result = Graph.findSubgraphIsomorphisms(self, other, initialMap, saveOrder=saveOrder)
         return result
@@ -889,6 +889,28 @@ class TestMolecule(unittest.TestCase):
         self.assertTrue(molecule1.isIsomorphic(molecule2))
         self.assertTrue(molecule2.isIsomorphic(molecule1))
 
+    def test_get_resonance_hash(self):
+        """
+        Test that Molecule.get_resonance_hash() is shared by isomorphic molecules and
+        resonance structures, but differs between constitutional isomers.
+        """
+        molecule1 = Molecule().fromSMILES('C=CC=C[CH]C')
+        molecule2 = Molecule().fromSMILES('C[CH]C=CC=C')
+        self.assertEqual(molecule1.get_resonance_hash(), molecule2.get_resonance_hash())
+        for structure in molecule1.generate_resonance_structures():
+            self.assertEqual(structure.get_resonance_hash(), molecule1.get_resonance_hash())
+
+        benzene1 = Molecule().fromSMILES('c1ccccc1')
+        benzene2 = Molecule().fromSMILES('C1=CC=CC=C1')
+        self.assertEqual(benzene1.get_resonance_hash(), benzene2.get_resonance_hash())
+
+        self.assertNotEqual(Molecule().fromSMILES('CCCO').get_resonance_hash(),
+                            Molecule().fromSMILES('CC(C)O').get_resonance_hash())
+        self.assertNotEqual(Molecule().fromSMILES('[CH2]CC').get_resonance_hash(),
+                            Molecule().fromSMILES('C[CH]C').get_resonance_hash())
+        self.assertNotEqual(Molecule().fromSMILES('[CH2]').get_resonance_hash(),
+                            Molecule(multiplicity=1).fromSMILES('[CH2]').get_resonance_hash())
+
     def testSubgraphIsomorphism(self):
         """
         Check the graph isomorphism functions.
@@ -1003,6 +1025,23 @@ class TestMolecule(unittest.TestCase):
         mapping = molecule.findSubgraphIsomorphisms(groupRing)
         self.assertEqual(len(mapping), 5)
 
+    def testSubgraphIsomorphismBondOrders(self):
+        """
+        Test that groups with more bonds of an order than the molecule are
+        rejected before the isomorphism search.
+        """
+        group = Group().fromAdjacencyList("""
+1 *1 C u0 {2,D}
+2    C u0 {1,D} {3,S}
+3    C u0 {2,S} {4,D}
+4    C u0 {3,D}
+        """)
+        self.assertTrue(Molecule(SMILES='C=CC=C').hasBondOrders(group.bondCount))
+        self.assertFalse(Molecule(SMILES='C=CCC').hasBondOrders(group.bondCount))
+        self.assertFalse(Molecule(SMILES='C=CCC').isSubgraphIsomorphic(group))
+        self.assertEqual(Molecule(SMILES='C=CCC').findSubgraphIsomorphisms(group), [])
+        self.assertTrue(Molecule(SMILES='C=CC=C').isSubgraphIsomorphic(group))
+
     def testAdjacencyList(self):
         """
         Check the adjacency list read/write functions for a full molecule.
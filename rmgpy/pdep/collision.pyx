@@ -32,11 +32,12 @@ This module contains classes and functions for working with collision models.
 """
 
 import numpy, logging
+import scipy.sparse
 cimport cython
 
 cimport rmgpy.constants as constants
 import rmgpy.quantity as quantity
-from libc.math cimport exp, sqrt
+from libc.math cimport exp, sqrt, log, ceil
 from rmgpy.exceptions import CollisionError
 
 ################################################################################
@@ -224,6 +225,100 @@ cdef class SingleExponentialDown(RMGObject):
             
         return P
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def generateSparseCollisionMatrix(self,
+        double T,
+        numpy.ndarray[numpy.float64_t,ndim=2] densStates,
+        numpy.ndarray[numpy.float64_t,ndim=1] Elist,
+        numpy.ndarray[numpy.int_t,ndim=1] Jlist=None,
+        double tol=1e-12):
+        """
+        Generate and return the collision matrix
+        :math:`\\matrix{M}_\\mathrm{coll} / \\omega = \\matrix{P} - \\matrix{I}`
+        as a :class:`scipy.sparse.csr_matrix`, with the same rows and columns
+        as that of :meth:`generateCollisionMatrix` reshaped to two dimensions.
+        Only transfers between grains closer than the energy step at which the
+        single exponential down factor falls below `tol` are computed, so the
+        matrix is banded in energy and its cost grows with the number of grains
+        rather than its square. With `tol` set to zero, the result is the same
+        as that of :meth:`generateCollisionMatrix`.
+        """
+
+        cdef double alpha, beta
+        cdef double C, left, right, val
+        cdef int Ngrains, NJ, start, halfbandwidth, r, s, u, v
+        cdef list rows, cols, vals
+        cdef numpy.ndarray[numpy.float64_t,ndim=1] rho
+        cdef numpy.ndarray[numpy.float64_t,ndim=2] phi, P0
+
+        Ngrains = Elist.shape[0]
+        NJ = Jlist.shape[0] if Jlist is not None else 1
+
+        alpha = 1.0 / self.getAlpha(T)
+        beta = 1.0 / (constants.R * T)
+        
+        if NJ > 1:
+            rho = numpy.zeros(Ngrains)
+            for r in range(Ngrains):
+                rho[r] = numpy.sum((2*Jlist+1) * densStates[r,:])
+        else:
+            rho = densStates[:,0]
+        
+        for start in range(Ngrains):
+            if rho[start] > 0:
+                break
+
+        # Determine the number of grains beyond which collisional transfer is
+        # negligible
+        if tol > 0 and Ngrains > 1:
+            halfbandwidth = min(Ngrains - 1, <int>ceil(-log(tol) / ((Elist[1] - Elist[0]) * alpha)))
+        else:
+            halfbandwidth = Ngrains - 1
+
+        # The unnormalized entries in the collisional transfer probability
+        # matrix are stored in banded form, such that P0[s,r-s+halfbandwidth]
+        # holds the probability of transfer from grain r to grain s
+        P0 = numpy.zeros((Ngrains,2*halfbandwidth+1), numpy.float64)
+        for r in range(start, Ngrains):
+            for s in range(max(start,r-halfbandwidth), r+1):
+                P0[s,r-s+halfbandwidth] = exp(-(Elist[r] - Elist[s]) * alpha)
+            for s in range(r+1, min(Ngrains,r+halfbandwidth+1)):
+                P0[s,r-s+halfbandwidth] = exp(-(Elist[s] - Elist[r]) * alpha) * rho[s] / rho[r] * exp(-(Elist[s] - Elist[r]) * beta)
+        
+        # Normalize using detailed balance, as in generateCollisionMatrix()
+        for r in range(start, Ngrains):
+            left = 0.0; right = 0.0
+            for s in range(max(start,r-halfbandwidth), r): left += P0[s,r-s+halfbandwidth]
+            for s in range(r, min(Ngrains,r+halfbandwidth+1)): right += P0[s,r-s+halfbandwidth]
+            C = (1 - left) / right
+            # Check for normalization consistency (i.e. all numbers are positive)
+            if C < 0: raise CollisionError('Encountered negative normalization coefficient while normalizing collisional transfer probabilities matrix.')
+            for s in range(r+1, min(Ngrains,r+halfbandwidth+1)):
+                P0[r,s-r+halfbandwidth] *= C
+                P0[s,r-s+halfbandwidth] *= C
+            P0[r,halfbandwidth] = P0[r,halfbandwidth] * C - 1
+
+        # If solving the 2D master equation, P(E,J,E',J') = P(E,E') phi(E,J)
+        # as in generateCollisionMatrix()
+        phi = numpy.ones((Ngrains,NJ), numpy.float64)
+        if NJ > 1:
+            for s in range(NJ):
+                phi[:,s] = (2*Jlist[s]+1) * densStates[:,s]
+            for r in range(start, Ngrains):
+                phi[r,:] /= rho[r]
+
+        rows = []; cols = []; vals = []
+        for r in range(start, Ngrains):
+            for u in range(max(start,r-halfbandwidth), min(Ngrains,r+halfbandwidth+1)):
+                val = P0[r,u-r+halfbandwidth]
+                if val == 0: continue
+                for s in range(NJ):
+                    for v in range(NJ):
+                        rows.append(r*NJ+s); cols.append(u*NJ+v); vals.append(val * phi[r,s])
+
+        return scipy.sparse.csr_matrix((vals, (rows, cols)), shape=(Ngrains*NJ,Ngrains*NJ))
+
     def calculateCollisionEfficiency(self,
         double T,
         numpy.ndarray[numpy.float64_t,ndim=1] Elist,
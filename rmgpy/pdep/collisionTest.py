@@ -82,6 +82,26 @@ class TestSingleExponentialDown(unittest.TestCase):
             dEdown = self.singleExponentialDown.getAlpha(T)
             self.assertAlmostEqual(dEdown0, dEdown, 6)
 
+    def test_generateSparseCollisionMatrix(self):
+        """
+        Test that the SingleExponentialDown.generateSparseCollisionMatrix()
+        method matches the dense collision matrix, and that it is banded.
+        """
+        T = 1000.
+        Ngrains = 200
+        Elist = numpy.linspace(0.0, 200000.0, Ngrains)
+        for NJ in [1, 3]:
+            Jlist = numpy.arange(NJ)
+            densStates = numpy.outer((Elist + 1000.0)**4, numpy.ones(NJ))
+            densStates[0:3,:] = 0.0
+            P = self.singleExponentialDown.generateCollisionMatrix(T, densStates, Elist, Jlist)
+            P = P.reshape(Ngrains*NJ, Ngrains*NJ)
+            Psparse = self.singleExponentialDown.generateSparseCollisionMatrix(T, densStates, Elist, Jlist, tol=0.0)
+            self.assertTrue(numpy.allclose(Psparse.toarray(), P, rtol=1e-12, atol=1e-15))
+            Psparse = self.singleExponentialDown.generateSparseCollisionMatrix(T, densStates, Elist, Jlist)
+            self.assertTrue(numpy.allclose(Psparse.toarray(), P, rtol=0, atol=1e-10))
+            self.assertLess(Psparse.nnz, numpy.count_nonzero(P) / 2)
+
     def test_pickle(self):
         """
         Test that a SingleExponentialDown object can be successfully pickled
@@ -79,6 +79,18 @@ cdef class Configuration:
         string += ')'
         return string
 
+    def __reduce__(self):
+        """
+        A helper function used when pickling a Configuration object.
+        """
+        return (Configuration, tuple(self.species), (self.Elist, self.densStates, self.sumStates, self.activeJRotor, self.activeKRotor))
+
+    def __setstate__(self, state):
+        """
+        A helper function used when unpickling a Configuration object.
+        """
+        self.Elist, self.densStates, self.sumStates, self.activeJRotor, self.activeKRotor = state
+
     property E0:
         """The ground-state energy of the configuration in J/mol."""
         def __get__(self):
@@ -213,6 +225,17 @@ cdef class Configuration:
         assert self.species[0].energyTransferModel is not None
         return self.species[0].energyTransferModel.generateCollisionMatrix(T, densStates, Elist, Jlist)
     
+    cpdef generateSparseCollisionMatrix(self, double T, numpy.ndarray densStates, numpy.ndarray Elist, numpy.ndarray Jlist=None):
+        """
+        Return the collisional energy transfer probabilities matrix for the
+        configuration as a sparse matrix, as :meth:`generateCollisionMatrix`
+        does in dense form, dropping the negligible transfers between grains
+        that are far apart in energy.
+        """
+        assert self.isUnimolecular()
+        assert self.species[0].energyTransferModel is not None
+        return self.species[0].energyTransferModel.generateSparseCollisionMatrix(T, densStates, Elist, Jlist)
+    
     cpdef calculateDensityOfStates(self, numpy.ndarray Elist, bint activeJRotor=True, bint activeKRotor=True, bint rmgmode=False):
         """
         Calculate the density (and sum) of states for the configuration at the
@@ -33,6 +33,9 @@ This script contains unit tests of the :mod:`rmgpy.pdep.network` module.
 """
 
 import unittest
+import cPickle
+
+import numpy
 
 from rmgpy.pdep.configuration import Configuration
 from rmgpy.transport import TransportData
@@ -142,6 +145,22 @@ class TestConfiguration(unittest.TestCase):
         for label in attributes:
             self.assertNotIn(label, output)
 
+    def test_pickle(self):
+        """
+        Test that a Configuration object can be pickled and unpickled with
+        its densities of states.
+        """
+        self.configuration.Elist = numpy.arange(0.0, 1000.0, 100.0)
+        self.configuration.densStates = numpy.ones(10)
+        self.configuration.activeJRotor = True
+        configuration = cPickle.loads(cPickle.dumps(self.configuration, -1))
+        self.assertEqual([spec.label for spec in configuration.species], ['n-C4H8', 'H2O'])
+        self.assertTrue(numpy.array_equal(configuration.Elist, self.configuration.Elist))
+        self.assertTrue(numpy.array_equal(configuration.densStates, self.configuration.densStates))
+        self.assertIsNone(configuration.sumStates)
+        self.assertTrue(configuration.activeJRotor)
+        self.assertFalse(configuration.activeKRotor)
+
 
 ################################################################################
 
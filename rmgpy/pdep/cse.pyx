@@ -35,12 +35,14 @@ import numpy
 cimport numpy
 import logging
 import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 
 from libc.math cimport exp, log, sqrt
 
 import rmgpy.constants as constants
 
-from rmgpy.pdep.me import generateFullMEMatrix
+from rmgpy.pdep.me import generateFullMEMatrix, generateSparseMEMatrix
 from rmgpy.exceptions import ChemicallySignificantEigenvaluesError
 
 ################################################################################
@@ -81,9 +83,16 @@ def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None)
     ymB = 1.0e-6 * P / constants.R / T
     
     # Generate the full master equation matrix
-    M, indices = generateFullMEMatrix(network, products=False)
-    Nrows = M.shape[0]
-    M[:,Nrows-Nreac:] *= ymB
+    if network.sparse:
+        Msparse, indices = generateSparseMEMatrix(network, products=False)
+        Nrows = Msparse.shape[0]
+        scale = numpy.ones(Nrows, numpy.float64)
+        scale[Nrows-Nreac:] = ymB
+        Msparse = Msparse.dot(scipy.sparse.diags(scale))
+    else:
+        M, indices = generateFullMEMatrix(network, products=False)
+        Nrows = M.shape[0]
+        M[:,Nrows-Nreac:] *= ymB
     
     # Generate symmetrization matrix and its inverse
     S = numpy.zeros(Nrows, numpy.float64)
@@ -100,31 +109,34 @@ def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None)
         S[index] = sqrt(eqRatios[n+Nisom] / ymB)
         Sinv[index] = 1.0 / S[index]
 
-    # Symmetrize master equation matrix: M = S * Msymm * Sinv
-    # Since S and Sinv are diagonal we can do this very efficiently
-    for r in range(Nrows):
-        for s in range(Nrows):
-            M[r,s] = Sinv[r] * M[r,s] * S[s]
-
-    # DEBUG: Check that the matrix has been properly symmetrized
-    properlySymmetrized = True
-    for r in range(Nrows):
-        for s in range(r):
-            if M[r,s] != 0:
-                if abs(M[r,s] - M[s,r]) > 0.01 * M[r,s]:
-                    if M[r,s] > 1e-200 or M[s,r] > 1e-200:
-                        print r, s, M[r,s], M[s,r]
-                        properlySymmetrized = False
-    if not properlySymmetrized:
-        raise ChemicallySignificantEigenvaluesError('Master equation matrix not properly symmetrized.')
+    if network.sparse:
+        W0, V0 = getSlowestEigenmodes(Msparse, S, Sinv, Nchem + 1)
+    else:
+        # Symmetrize master equation matrix: M = S * Msymm * Sinv
+        # Since S and Sinv are diagonal we can do this very efficiently
+        for r in range(Nrows):
+            for s in range(Nrows):
+                M[r,s] = Sinv[r] * M[r,s] * S[s]
 
-    # Get eigenvalues and eigenvectors
-    # We only need the slowest Nchem + 1 eigenmodes, so only compute those
-    try:
-        #W0, V0 = scipy.linalg.eigh(M, eigvals=(Nrows-Nchem-1,Nrows-1), overwrite_a=True, overwrite_b=True)
-        W0, V0 = scipy.linalg.eigh(M, overwrite_a=True, overwrite_b=True)
-    except numpy.linalg.LinAlgError:
-        raise ChemicallySignificantEigenvaluesError('Eigenvalue calculation failed to converge.')
+        # DEBUG: Check that the matrix has been properly symmetrized
+        properlySymmetrized = True
+        for r in range(Nrows):
+            for s in range(r):
+                if M[r,s] != 0:
+                    if abs(M[r,s] - M[s,r]) > 0.01 * M[r,s]:
+                        if M[r,s] > 1e-200 or M[s,r] > 1e-200:
+                            print r, s, M[r,s], M[s,r]
+                            properlySymmetrized = False
+        if not properlySymmetrized:
+            raise ChemicallySignificantEigenvaluesError('Master equation matrix not properly symmetrized.')
+
+        # Get eigenvalues and eigenvectors
+        # We only need the slowest Nchem + 1 eigenmodes, so only compute those
+        try:
+            #W0, V0 = scipy.linalg.eigh(M, eigvals=(Nrows-Nchem-1,Nrows-1), overwrite_a=True, overwrite_b=True)
+            W0, V0 = scipy.linalg.eigh(M, overwrite_a=True, overwrite_b=True)
+        except numpy.linalg.LinAlgError:
+            raise ChemicallySignificantEigenvaluesError('Eigenvalue calculation failed to converge.')
     
     # We can't assume that eigh returns them in sorted order
     ind = W0.argsort()
@@ -222,3 +234,46 @@ def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None)
 
     # Return the matrix of k(T,P) values and the pseudo-steady population distributions
     return K, pa
+
+def getSlowestEigenmodes(M, numpy.ndarray[numpy.float64_t,ndim=1] S, numpy.ndarray[numpy.float64_t,ndim=1] Sinv, int count):
+    """
+    Return the `count` eigenvalues of the sparse master equation matrix `M`
+    that are closest to zero, and the corresponding eigenvectors of the
+    matrix symmetrized using the diagonal matrix `S` and its inverse `Sinv`.
+    The eigenmodes are found by shift-invert iteration, which only needs a
+    sparse factorization of the matrix.
+    """
+    cdef numpy.ndarray[numpy.float64_t,ndim=1] lower, upper
+    cdef double sigma
+    cdef int Nrows
+
+    Nrows = M.shape[0]
+
+    # Symmetrize master equation matrix: M = S * Msymm * Sinv
+    M = scipy.sparse.diags(Sinv).dot(M).dot(scipy.sparse.diags(S)).tocsr()
+
+    # Check that the matrix has been properly symmetrized
+    L = scipy.sparse.tril(M, -1).tocoo()
+    lower = L.data
+    upper = numpy.asarray(M[L.col, L.row], numpy.float64).ravel()
+    if numpy.any((numpy.abs(lower - upper) > 0.01 * lower) & ((lower > 1e-200) | (upper > 1e-200))):
+        raise ChemicallySignificantEigenvaluesError('Master equation matrix not properly symmetrized.')
+
+    # Use the lower triangle, as scipy.linalg.eigh() does for dense matrices
+    M = (scipy.sparse.tril(M) + scipy.sparse.tril(M, -1).T).tocsc()
+
+    if count >= Nrows - 1:
+        # The iterative solver needs more rows than eigenmodes
+        try:
+            return scipy.linalg.eigh(M.toarray(), overwrite_a=True)
+        except numpy.linalg.LinAlgError:
+            raise ChemicallySignificantEigenvaluesError('Eigenvalue calculation failed to converge.')
+
+    # All of the eigenvalues are zero or negative, so shifting slightly above
+    # zero picks out the slowest eigenmodes while keeping the shifted matrix
+    # nonsingular if there is a zero eigenvalue
+    sigma = 1e-10 * numpy.max(numpy.abs(M.diagonal()))
+    try:
+        return scipy.sparse.linalg.eigsh(M, k=count, sigma=sigma, which='LM')
+    except scipy.sparse.linalg.ArpackError:
+        raise ChemicallySignificantEigenvaluesError('Eigenvalue calculation failed to converge.')
@@ -32,6 +32,7 @@ pressure-dependent reaction network.
 
 import numpy
 cimport numpy
+import scipy.sparse
 
 from libc.math cimport exp
 
@@ -39,6 +40,31 @@ import rmgpy.constants as constants
 
 ################################################################################
 
+cpdef numpy.ndarray generateAccountingMatrix(numpy.ndarray[numpy.float64_t,ndim=3] densStates):
+    """
+    Return the accounting matrix relating each isomer `i`, energy grain `r`
+    and angular momentum grain `s` to a row of the full master equation
+    matrix, or to -1 if the grain has no states.
+    """
+    cdef numpy.ndarray[numpy.int_t,ndim=3] indices
+    cdef int Nisom, Ngrains, NJ, Nrows
+    cdef int i, r, s
+    
+    Nisom = densStates.shape[0]
+    Ngrains = densStates.shape[1]
+    NJ = densStates.shape[2]
+    
+    indices = -numpy.ones((Nisom,Ngrains,NJ), numpy.int)
+    Nrows = 0
+    for r in range(Ngrains):
+        for s in range(NJ):
+            for i in range(Nisom):
+                if densStates[i,r,s] > 0:
+                    indices[i,r,s] = Nrows
+                    Nrows += 1
+    
+    return indices
+
 cpdef generateFullMEMatrix(network, bint products=True):
     """
     Generate the full master equation matrix for the network.
@@ -52,7 +78,7 @@ cpdef generateFullMEMatrix(network, bint products=True):
     cdef numpy.ndarray[numpy.float64_t,ndim=4] Kij, Gnj, Fim
     cdef numpy.ndarray[numpy.float64_t,ndim=5] Mcoll
     cdef double T, P, beta, val
-    cdef int Nisom, Nreac, Nprod, Ngrains, NJ
+    cdef int Nisom, Nreac, Nprod, Ngrains, NJ, Nrows
     cdef int i, n, r, s, u, v
 
     T = network.T
@@ -73,15 +99,8 @@ cpdef generateFullMEMatrix(network, bint products=True):
     beta = 1. / (constants.R * T)
     
     # Construct accounting matrix
-    indices = -numpy.ones((Nisom,Ngrains,NJ), numpy.int)
-    Nrows = 0
-    for r in range(Ngrains):
-        for s in range(NJ):
-            for i in range(Nisom):
-                if densStates[i,r,s] > 0:
-                    indices[i,r,s] = Nrows
-                    Nrows += 1
-    Nrows += Nreac
+    indices = generateAccountingMatrix(densStates)
+    Nrows = numpy.max(indices) + 1 + Nreac
     if products:
         Nrows += Nprod
     
@@ -132,3 +151,102 @@ cpdef generateFullMEMatrix(network, bint products=True):
                                 M[v,v] -= val
 
     return M, indices
+
+cpdef generateSparseMEMatrix(network, bint products=True):
+    """
+    Generate the full master equation matrix for the network as a
+    :class:`scipy.sparse.csr_matrix`. The collision terms are taken from the
+    sparse collision matrices of the network, which only hold the transfers
+    between nearby grains, so each isomer block of the result is banded and
+    its size grows with the number of grains rather than its square.
+    """
+    
+    cdef numpy.ndarray[numpy.int_t,ndim=1] Jlist, collRows, collCols
+    cdef numpy.ndarray[numpy.int_t,ndim=3] indices
+    cdef numpy.ndarray[numpy.float64_t,ndim=1] Elist, collVals
+    cdef numpy.ndarray[numpy.float64_t,ndim=3] densStates
+    cdef numpy.ndarray[numpy.float64_t,ndim=4] Kij, Gnj, Fim
+    cdef list Mcoll, rows, cols, vals
+    cdef double T, P, beta, val
+    cdef int Nisom, Nreac, Nprod, Ngrains, NJ, Nrows
+    cdef int i, j, k, n, r, s, u, v, a, b
+
+    T = network.T
+    P = network.P
+    Elist = network.Elist
+    Jlist = network.Jlist
+    densStates = network.densStates
+    Mcoll = network.Mcoll
+    Kij = network.Kij
+    Fim = network.Fim
+    Gnj = network.Gnj
+    Nisom = network.Nisom
+    Nreac = network.Nreac
+    Nprod = network.Nprod
+    Ngrains = network.Ngrains
+    NJ = network.NJ
+    
+    beta = 1. / (constants.R * T)
+    
+    # Construct accounting matrix
+    indices = generateAccountingMatrix(densStates)
+    Nrows = numpy.max(indices) + 1 + Nreac
+    if products:
+        Nrows += Nprod
+    
+    # Collect the nonzero entries in coordinate format; duplicate entries are
+    # summed when the matrix is constructed
+    rows = []; cols = []; vals = []
+    
+    # Collision terms
+    # As in generateFullMEMatrix(), only transfers between pairs of grains
+    # where one is not below the other in both energy and angular momentum
+    # are included
+    for i in range(Nisom):
+        coll = Mcoll[i].tocoo()
+        collRows = coll.row.astype(numpy.int)
+        collCols = coll.col.astype(numpy.int)
+        collVals = coll.data
+        for k in range(collVals.shape[0]):
+            r = collRows[k] // NJ; s = collRows[k] % NJ
+            u = collCols[k] // NJ; v = collCols[k] % NJ
+            if (u - r) * (v - s) < 0:
+                continue
+            a = indices[i,r,s]; b = indices[i,u,v]
+            if a > -1 and b > -1:
+                rows.append(a); cols.append(b); vals.append(collVals[k])
+    
+    # Isomerization terms
+    for i in range(Nisom):
+        for j in range(i):
+            if Kij[i,j,Ngrains-1,0] > 0 or Kij[j,i,Ngrains-1,0] > 0:
+                for r in range(Ngrains):
+                    for s in range(NJ):
+                        u = indices[i,r,s]; v = indices[j,r,s]
+                        if u > -1 and v > -1:
+                            rows.extend([v, u, u, v])
+                            cols.extend([u, u, v, v])
+                            vals.extend([Kij[j,i,r,s], -Kij[j,i,r,s], Kij[i,j,r,s], -Kij[i,j,r,s]])
+    
+    # Association/dissociation terms
+    for i in range(Nisom):
+        for n in range(Nreac+Nprod):
+            if Gnj[n,i,Ngrains-1,0] > 0:
+                for r in range(Ngrains):
+                    for s in range(NJ):
+                        u = indices[i,r,s]
+                        if products: 
+                            v = Nrows - Nreac - Nprod + n
+                        else:
+                            v = Nrows - Nreac + n
+                        if u > -1:
+                            rows.append(u); cols.append(u); vals.append(-Gnj[n,i,r,s])
+                            if n < Nreac or products:
+                                rows.append(v); cols.append(u); vals.append(Gnj[n,i,r,s])
+                            if n < Nreac:
+                                val = Fim[i,n,r,s] * densStates[n+Nisom,r,s] * (2*Jlist[s]+1) * exp(-Elist[r] * beta)
+                                rows.extend([u, v]); cols.extend([v, v]); vals.extend([val, -val])
+
+    M = scipy.sparse.coo_matrix((vals, (rows, cols)), shape=(Nrows,Nrows)).tocsr()
+    
+    return M, indices
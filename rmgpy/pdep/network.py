@@ -33,13 +33,16 @@ This module contains the :class:`Network` class, a representation of a
 pressure-dependent unimolecular reaction network
 """
 
+import copy
 import math
 import numpy
 import logging
+import hashlib
 
 import rmgpy.constants as constants
 from rmgpy.reaction import Reaction
 from rmgpy.exceptions import NetworkError, InvalidMicrocanonicalRateError
+from rmgpy.scoop_framework.util import map_
 
 ################################################################################
 
@@ -74,11 +77,15 @@ class Network:
     `activeKRotor`          ``True`` if the K-rotor is treated as active, ``False`` if treated as adiabatic
     `activeJRotor`          ``True`` if the J-rotor is treated as active, ``False`` if treated as adiabatic
     `rmgmode`               ``True`` if in RMG mode, ``False`` otherwise
+    `sparse`                ``True`` if the master equation is stored and solved in sparse form, ``False`` otherwise
     ----------------------- ----------------------------------------------------
     `eqRatios`              An array containing concentration of each isomer and reactant channel present at equilibrium
     `collFreq`              An array of the frequency of collision between
-    `Mcoll`                 Matrix of first-order rate coefficients for collisional population transfer between grains for each isomer
+    `Mcoll`                 Matrix of first-order rate coefficients for collisional population transfer between grains for each isomer (a list of sparse matrices if `sparse` is ``True``)
     `densStates`            3D np array of stable configurations, number of grains, and number of J
+    ----------------------- ----------------------------------------------------
+    `densStatesCache`       The densities of states of each configuration from previous calculations
+    `microcanonicalRateCache` The microcanonical rate coefficients of each path reaction from previous calculations
     ======================= ====================================================
     
     """
@@ -121,6 +128,11 @@ class Network:
         self.grainCount = grainCount
         self.E0 = E0
 
+        self.sparse = False
+
+        self.densStatesCache = {}
+        self.microcanonicalRateCache = {}
+
         self.valid = False
 
     def __repr__(self):
@@ -228,8 +240,20 @@ class Network:
         logging.debug('Finished initialization for network {0}.'.format(self.label))
         logging.debug('The network now has values of {0}'.format(repr(self)))
 
-    def calculateRateCoefficients(self, Tlist, Plist, method, errorCheck=True):
-        
+    def calculateRateCoefficients(self, Tlist, Plist, method, errorCheck=True, sparse=False):
+        """
+        Return the array of phenomenological rate coefficients at each of the
+        temperatures in `Tlist` in K and pressures in `Plist` in Pa, using the
+        master equation `method`. If `sparse` is ``True``, the collision
+        model and master equation are kept in sparse form, which allows much
+        finer energy grains to be used with the modified strong collision and
+        chemically-significant eigenvalues methods.
+        """
+        if sparse and method.lower() == 'reservoir state':
+            raise NetworkError('The reservoir state method does not support a sparse master equation; use the '
+                               '"modified strong collision" or "chemically-significant eigenvalues" method instead.')
+        self.sparse = sparse
+
         Nisom = len(self.isomers)
         Nreac = len(self.reactants)
         Nprod = len(self.products)
@@ -243,64 +267,91 @@ class Network:
         
         logging.info('Calculating phenomenological rate coefficients for {0}...'.format(rxn))
         K = numpy.zeros((len(Tlist),len(Plist),Nisom+Nreac+Nprod,Nisom+Nreac+Nprod), numpy.float64)
-        
-        for t, T in enumerate(Tlist):
-            for p, P in enumerate(Plist):
-                self.setConditions(T, P)
-                
-                # Apply method
-                if method.lower() == 'modified strong collision':
-                    self.applyModifiedStrongCollisionMethod()
-                elif method.lower() == 'reservoir state':
-                    self.applyReservoirStateMethod()
-                elif method.lower() == 'chemically-significant eigenvalues':
-                    self.applyChemicallySignificantEigenvaluesMethod()
-                else:
-                    raise NetworkError('Unknown method "{0}". Valid options are "modified strong collision", "reservoir state", or "chemically-significant eigenvalues"'.format(method))
 
-                K[t,p,:,:] = self.K
-                
-                # Check that the k(T,P) values satisfy macroscopic equilibrium
-                eqRatios = self.eqRatios
-                for i in range(Nisom+Nreac):
-                    for j in range(i):
-                        Keq0 = K[t,p,j,i] / K[t,p,i,j]
-                        Keq = eqRatios[j] / eqRatios[i]
-                        if Keq0 / Keq < 0.5 or Keq0 / Keq > 2.0:
-                            if i < Nisom:
-                                reactants = self.isomers[i]
-                            elif i < Nisom+Nreac:
-                                reactants = self.reactants[i-Nisom]
-                            else:
-                                reactants = self.products[i-Nisom-Nreac]
-                            if j < Nisom:
-                                products = self.isomers[j]
-                            elif j < Nisom+Nreac:
-                                products = self.reactants[j-Nisom]
-                            else:
-                                products = self.products[j-Nisom-Nreac]
-                            reaction = Reaction(reactants=reactants.species[:], products=products.species[:])
-                            logging.error('For net reaction {0!s}:'.format(reaction))
-                            logging.error('Expected Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq, T, P*1e-5))
-                            logging.error('  Actual Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq0, T, P*1e-5))
-                            raise NetworkError('Computed k(T,P) values for reaction {0!s} do not satisfy macroscopic equilibrium.'.format(reaction))
-                            
-                # Reject if any rate coefficients are negative
-                if errorCheck:
-                    negativeRate = False
-                    for i in range(Nisom+Nreac+Nprod):
-                        for j in range(i):
-                            if (K[t,p,i,j] < 0 or K[t,p,j,i] < 0) and not negativeRate:
-                                negativeRate = True
-                                logging.error('Negative rate coefficient generated; rejecting result.')
-                                logging.info(K[t,p,0:Nisom+Nreac+Nprod,0:Nisom+Nreac])
-                                K[t,p,:,:] = 0 * K[t,p,:,:]
-                                self.K = 0 * self.K
+        # Start every temperature from the densities of states of initialize()
+        self.T = None
+
+        # The temperatures are independent of each other, so they are
+        # distributed over the workers of the executor, each of which computes
+        # the energy grains and densities of states at its temperature once
+        # for all pressures on its own copy of the network
+        count = len(Tlist)
+        results = map_(calculateRateCoefficientsAtTemperature, [self] * count, Tlist,
+                       [Plist] * count, [method] * count, [errorCheck] * count)
+        for t, (Kt, microcanonicalRates) in enumerate(results):
+            K[t,:,:,:] = Kt
+            self.microcanonicalRateCache.update(microcanonicalRates)
+
         logging.debug('Finished calculating rate coefficients for network {0}.'.format(self.label))
         logging.debug('The network now has values of {0}'.format(repr(self)))
         logging.debug('Master equation matrix found for network {0} is {1}'.format(self.label, K))
         return K
 
+    def calculateRateCoefficientsAtTemperature(self, T, Plist, method, errorCheck=True):
+        """
+        Return the array of phenomenological rate coefficients at the
+        temperature `T` in K and each of the pressures in `Plist` in Pa, using
+        the master equation `method`.
+        """
+        Nisom = len(self.isomers)
+        Nreac = len(self.reactants)
+        Nprod = len(self.products)
+
+        K = numpy.zeros((len(Plist),Nisom+Nreac+Nprod,Nisom+Nreac+Nprod), numpy.float64)
+
+        for p, P in enumerate(Plist):
+            self.setConditions(T, P)
+            
+            # Apply method
+            if method.lower() == 'modified strong collision':
+                self.applyModifiedStrongCollisionMethod()
+            elif method.lower() == 'reservoir state':
+                self.applyReservoirStateMethod()
+            elif method.lower() == 'chemically-significant eigenvalues':
+                self.applyChemicallySignificantEigenvaluesMethod()
+            else:
+                raise NetworkError('Unknown method "{0}". Valid options are "modified strong collision", "reservoir state", or "chemically-significant eigenvalues"'.format(method))
+
+            K[p,:,:] = self.K
+            
+            # Check that the k(T,P) values satisfy macroscopic equilibrium
+            eqRatios = self.eqRatios
+            for i in range(Nisom+Nreac):
+                for j in range(i):
+                    Keq0 = K[p,j,i] / K[p,i,j]
+                    Keq = eqRatios[j] / eqRatios[i]
+                    if Keq0 / Keq < 0.5 or Keq0 / Keq > 2.0:
+                        if i < Nisom:
+                            reactants = self.isomers[i]
+                        elif i < Nisom+Nreac:
+                            reactants = self.reactants[i-Nisom]
+                        else:
+                            reactants = self.products[i-Nisom-Nreac]
+                        if j < Nisom:
+                            products = self.isomers[j]
+                        elif j < Nisom+Nreac:
+                            products = self.reactants[j-Nisom]
+                        else:
+                            products = self.products[j-Nisom-Nreac]
+                        reaction = Reaction(reactants=reactants.species[:], products=products.species[:])
+                        logging.error('For net reaction {0!s}:'.format(reaction))
+                        logging.error('Expected Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq, T, P*1e-5))
+                        logging.error('  Actual Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq0, T, P*1e-5))
+                        raise NetworkError('Computed k(T,P) values for reaction {0!s} do not satisfy macroscopic equilibrium.'.format(reaction))
+                        
+            # Reject if any rate coefficients are negative
+            if errorCheck:
+                negativeRate = False
+                for i in range(Nisom+Nreac+Nprod):
+                    for j in range(i):
+                        if (K[p,i,j] < 0 or K[p,j,i] < 0) and not negativeRate:
+                            negativeRate = True
+                            logging.error('Negative rate coefficient generated; rejecting result.')
+                            logging.info(K[p,0:Nisom+Nreac+Nprod,0:Nisom+Nreac])
+                            K[p,:,:] = 0 * K[p,:,:]
+                            self.K = 0 * self.K
+        return K
+
     def setConditions(self, T, P, ymB=None):
         """
         Set the current network conditions to the temperature `T` in K and
@@ -496,13 +547,13 @@ class Network:
         # Densities of states for isomers
         for i in range(Nisom):
             logging.debug('Calculating density of states for isomer "{0}"'.format(self.isomers[i]))
-            self.isomers[i].calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+            self.__calculateDensityOfStates(self.isomers[i], Elist)
         
         # Densities of states for reactant channels
         for n in range(Nreac):
             if self.reactants[n].hasStatMech():
                 logging.debug('Calculating density of states for reactant channel "{0}"'.format(self.reactants[n]))
-                self.reactants[n].calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+                self.__calculateDensityOfStates(self.reactants[n], Elist)
             else:
                 logging.warning('NOT calculating density of states for reactant channel "{0}". Missing Statmech.'.format(self.reactants[n]))
                 logging.warning('Reactants: {}'.format(repr(self.reactants[n])))
@@ -511,7 +562,7 @@ class Network:
             for n in range(Nprod):
                 if self.products[n].hasStatMech():
                     logging.debug('Calculating density of states for product channel "{0}"'.format(self.products[n]))
-                    self.products[n].calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+                    self.__calculateDensityOfStates(self.products[n], Elist)
                 else:
                     logging.warning('NOT calculating density of states for product channel "{0}" Missing Statmech.'.format(self.products[n]))
                     logging.warning('Products: {}'.format(repr(self.products[n])))
@@ -528,6 +579,31 @@ class Network:
 #                pylab.semilogy(Elist*0.001, self.products[n].densStates)
 #        pylab.show()
 
+    def __calculateDensityOfStates(self, configuration, Elist):
+        """
+        Calculate the density of states of the `configuration` at the energies
+        `Elist` in J/mol, which start at zero. The densities of states of a
+        previous calculation are reused if they were computed with the same
+        grain size and settings over at least the same range of energies.
+        """
+        key = tuple([str(spec) for spec in configuration.species])
+        settings = (self.activeJRotor, self.activeKRotor, self.rmgmode)
+        Ngrains = len(Elist)
+        
+        if key in self.densStatesCache:
+            Elist0, densStates, sumStates, settings0 = self.densStatesCache[key]
+            if settings0 == settings and len(Elist0) >= Ngrains and numpy.allclose(Elist0[:Ngrains], Elist, rtol=1e-9, atol=0):
+                logging.debug('Reusing density of states for configuration "{0}"'.format(configuration))
+                configuration.Elist = Elist
+                configuration.densStates = densStates[:Ngrains].copy()
+                configuration.sumStates = sumStates[:Ngrains].copy() if sumStates is not None else None
+                configuration.activeJRotor = self.activeJRotor
+                configuration.activeKRotor = self.activeKRotor
+                return
+        
+        configuration.calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+        self.densStatesCache[key] = (configuration.Elist, configuration.densStates, configuration.sumStates, settings)
+
     def mapDensitiesOfStates(self):
         """
         Map the overall densities of states to the current energy grains.
@@ -646,83 +722,17 @@ class Network:
                 logging.info('Path reaction {0} not found in reaction network {1}'.format(rxn,self.label))
                 continue
         
-            # Compute the microcanonical rate coefficient k(E)
-            reacDensStates = densStates[reac,:,:]
-            prodDensStates = densStates[prod,:,:]
-            kf, kr = rxn.calculateMicrocanonicalRateCoefficient(self.Elist, self.Jlist, reacDensStates, prodDensStates, T)
-
-            # Check for NaN (just to be safe)
-            if numpy.isnan(kf).any() or numpy.isnan(kr).any():
-                raise NetworkError('One or more k(E) values is NaN for path reaction "{0}".'.format(rxn))
-
-            # Determine the expected value of the rate coefficient k(T)
-            if rxn.canTST():
-                # RRKM theory was used to compute k(E), so use TST to compute k(T)
-                logging.debug('Using RRKM rate for Expected kf')
-                kf_expected = rxn.calculateTSTRateCoefficient(T)
+            # Compute the microcanonical rate coefficient k(E), unless it was
+            # already computed at these conditions by a previous calculation
+            key = (str(rxn), T)
+            fingerprint = self.__getMicrocanonicalRateFingerprint(rxn, reac, prod)
+            if key in self.microcanonicalRateCache and self.microcanonicalRateCache[key][0] == fingerprint:
+                logging.debug('Reusing k(E) for path reaction {0!s}.'.format(rxn))
+                kf, kr = self.microcanonicalRateCache[key][1:]
             else:
-                # ILT was used to compute k(E), so use high-P kinetics to compute k(T)
-                logging.debug('Using high pressure rate coefficient rate for Expected kf')
-                kf_expected = rxn.kinetics.getRateCoefficient(T) if rxn.network_kinetics is None else\
-                    rxn.network_kinetics.getRateCoefficient(T)
-            
-            # Determine the expected value of the equilibrium constant (Kc)
-            Keq_expected = self.eqRatios[prod] / self.eqRatios[reac] 
+                kf, kr = self.__calculateMicrocanonicalRate(rxn, reac, prod)
+                self.microcanonicalRateCache[key] = (fingerprint, kf, kr)
 
-            # Determine the actual values of k(T) and Keq
-            C0 = 1e5 / (constants.R * T)
-            kf0 = 0.0; kr0 = 0.0; Qreac = 0.0; Qprod = 0.0
-            for s in range(NJ):
-                kf0 += numpy.sum(kf[:,s] * reacDensStates[:,s] * (2*Jlist[s]+1) * numpy.exp(-Elist / constants.R / T)) 
-                kr0 += numpy.sum(kr[:,s] * prodDensStates[:,s] * (2*Jlist[s]+1) * numpy.exp(-Elist / constants.R / T)) 
-                Qreac += numpy.sum(reacDensStates[:,s] * (2*Jlist[s]+1) * numpy.exp(-Elist / constants.R / T)) 
-                Qprod += numpy.sum(prodDensStates[:,s] * (2*Jlist[s]+1) * numpy.exp(-Elist / constants.R / T)) 
-            kr0 *= C0 ** (len(rxn.products) - len(rxn.reactants))
-            Qprod *= C0 ** (len(rxn.products) - len(rxn.reactants))
-            kf_actual = kf0 / Qreac if Qreac > 0 else 0
-            kr_actual = kr0 / Qprod if Qprod > 0 else 0
-            Keq_actual = kf_actual / kr_actual if kr_actual > 0 else 0
-
-            error = False; warning = False
-            k_ratio = 1.0
-            Keq_ratio = 1.0
-            # Check that the forward rate coefficient is correct
-            if kf_actual > 0:
-                k_ratio = kf_expected / kf_actual
-                # Rescale kf and kr so that we get kf_expected
-                kf *= k_ratio
-                kr *= k_ratio
-                # Decide if the disagreement warrants a warning or error
-                if 0.8 < k_ratio < 1.25:
-                    # The difference is probably just due to numerical error
-                    pass
-                elif 0.5 < k_ratio < 2.0:
-                    # Might be numerical error, but is pretty large, so warn
-                    warning = True
-                else:
-                    # Disagreement is too large, so raise exception
-                    error = True
-                    
-            # Check that the equilibrium constant is correct
-            if Keq_actual > 0:
-                Keq_ratio = Keq_expected / Keq_actual
-                # Rescale kr so that we get Keq_expected
-                kr /= Keq_ratio
-                # In RMG jobs this never represents an error because we are
-                # missing or using approximate degrees of freedom anyway
-                if self.rmgmode:
-                    pass
-                # Decide if the disagreement warrants a warning or error
-                elif 0.8 < Keq_ratio < 1.25:
-                    # The difference is probably just due to numerical error
-                    pass
-                elif 0.5 < Keq_ratio < 2.0:
-                    # Might be numerical error, but is pretty large, so warn
-                    warning = True
-                else:
-                    # Disagreement is too large, so raise exception
-                    error = True
-                               
             if rxn.reactants[0] in isomers and rxn.products[0] in isomers:
                 # Isomerization
                 self.Kij[prod,reac,:,:] = kf
@@ -744,19 +754,6 @@ class Network:
             else:
                 raise NetworkError('Unexpected type of path reaction "{0}"'.format(rxn))
 
-            # If the k(E) values are invalid (in that they give the wrong 
-            # kf(T) or kr(T) when integrated), then raise an exception
-            if error or warning:
-                logging.warning('For path reaction {0!s}:'.format(rxn))
-                logging.warning('    Expected kf({0:g} K) = {1:g}'.format(T, kf_expected))
-                logging.warning('      Actual kf({0:g} K) = {1:g}'.format(T, kf_actual))
-                logging.warning('    Expected Keq({0:g} K) = {1:g}'.format(T, Keq_expected))
-                logging.warning('      Actual Keq({0:g} K) = {1:g}'.format(T, Keq_actual))
-                if error:
-                    raise InvalidMicrocanonicalRateError('Invalid k(E) values computed for path reaction "{0}".'.format(rxn), k_ratio, Keq_ratio)
-                else:
-                    logging.warning('Significant corrections to k(E) to be consistent with high-pressure limit for path reaction "{0}".'.format(rxn))
-
 #        import pylab
 #        for prod in range(Nisom):
 #            for reac in range(prod):
@@ -768,6 +765,124 @@ class Network:
 
         return self.Kij, self.Gnj, self.Fim
 
+    def __getMicrocanonicalRateFingerprint(self, rxn, reac, prod):
+        """
+        Return a string identifying everything the microcanonical rate
+        coefficients of the path reaction `rxn` from configuration `reac` to
+        configuration `prod` depend on at the current conditions.
+        """
+        digest = hashlib.sha1()
+        digest.update(repr((rxn.kinetics, rxn.network_kinetics, rxn.transitionState)))
+        digest.update(repr((self.eqRatios[reac], self.eqRatios[prod])))
+        for array in [self.Elist, self.Jlist, self.densStates[reac,:,:], self.densStates[prod,:,:]]:
+            digest.update(numpy.ascontiguousarray(array).tostring())
+        return digest.hexdigest()
+
+    def __calculateMicrocanonicalRate(self, rxn, reac, prod):
+        """
+        Calculate and return the microcanonical rate coefficients :math:`k(E)`
+        of the path reaction `rxn` from configuration `reac` to configuration
+        `prod` in the forward and reverse directions, scaled to be consistent
+        with the high-pressure limit kinetics and the equilibrium constant.
+        """
+        T = self.T
+        Elist = self.Elist
+        Jlist = self.Jlist
+        densStates = self.densStates
+        NJ = 1 if self.activeJRotor else len(Jlist)
+
+        # Compute the microcanonical rate coefficient k(E)
+        reacDensStates = densStates[reac,:,:]
+        prodDensStates = densStates[prod,:,:]
+        kf, kr = rxn.calculateMicrocanonicalRateCoefficient(self.Elist, self.Jlist, reacDensStates, prodDensStates, T)
+
+        # Check for NaN (just to be safe)
+        if numpy.isnan(kf).any() or numpy.isnan(kr).any():
+            raise NetworkError('One or more k(E) values is NaN for path reaction "{0}".'.format(rxn))
+
+        # Determine the expected value of the rate coefficient k(T)
+        if rxn.canTST():
+            # RRKM theory was used to compute k(E), so use TST to compute k(T)
+            logging.debug('Using RRKM rate for Expected kf')
+            kf_expected = rxn.calculateTSTRateCoefficient(T)
+        else:
+            # ILT was used to compute k(E), so use high-P kinetics to compute k(T)
+            logging.debug('Using high pressure rate coefficient rate for Expected kf')
+            kf_expected = rxn.kinetics.getRateCoefficient(T) if rxn.network_kinetics is None else\
+                rxn.network_kinetics.getRateCoefficient(T)
+        
+        # Determine the expected value of the equilibrium constant (Kc)
+        Keq_expected = self.eqRatios[prod] / self.eqRatios[reac] 
+
+        # Determine the actual values of k(T) and Keq
+        C0 = 1e5 / (constants.R * T)
+        kf0 = 0.0; kr0 = 0.0; Qreac = 0.0; Qprod = 0.0
+        for s in range(NJ):
+            kf0 += numpy.sum(kf[:,s] * reacDensStates[:,s] * (2*Jlist[s]+1) * numpy.exp(-Elist / constants.R / T)) 
+            kr0 += numpy.sum(kr[:,s] * prodDensStates[:,s] * (2*Jlist[s]+1) * numpy.exp(-Elist / constants.R / T)) 
+            Qreac += numpy.sum(reacDensStates[:,s] * (2*Jlist[s]+1) * numpy.exp(-Elist / constants.R / T)) 
+            Qprod += numpy.sum(prodDensStates[:,s] * (2*Jlist[s]+1) * numpy.exp(-Elist / constants.R / T)) 
+        kr0 *= C0 ** (len(rxn.products) - len(rxn.reactants))
+        Qprod *= C0 ** (len(rxn.products) - len(rxn.reactants))
+        kf_actual = kf0 / Qreac if Qreac > 0 else 0
+        kr_actual = kr0 / Qprod if Qprod > 0 else 0
+        Keq_actual = kf_actual / kr_actual if kr_actual > 0 else 0
+
+        error = False; warning = False
+        k_ratio = 1.0
+        Keq_ratio = 1.0
+        # Check that the forward rate coefficient is correct
+        if kf_actual > 0:
+            k_ratio = kf_expected / kf_actual
+            # Rescale kf and kr so that we get kf_expected
+            kf *= k_ratio
+            kr *= k_ratio
+            # Decide if the disagreement warrants a warning or error
+            if 0.8 < k_ratio < 1.25:
+                # The difference is probably just due to numerical error
+                pass
+            elif 0.5 < k_ratio < 2.0:
+                # Might be numerical error, but is pretty large, so warn
+                warning = True
+            else:
+                # Disagreement is too large, so raise exception
+                error = True
+                
+        # Check that the equilibrium constant is correct
+        if Keq_actual > 0:
+            Keq_ratio = Keq_expected / Keq_actual
+            # Rescale kr so that we get Keq_expected
+            kr /= Keq_ratio
+            # In RMG jobs this never represents an error because we are
+            # missing or using approximate degrees of freedom anyway
+            if self.rmgmode:
+                pass
+            # Decide if the disagreement warrants a warning or error
+            elif 0.8 < Keq_ratio < 1.25:
+                # The difference is probably just due to numerical error
+                pass
+            elif 0.5 < Keq_ratio < 2.0:
+                # Might be numerical error, but is pretty large, so warn
+                warning = True
+            else:
+                # Disagreement is too large, so raise exception
+                error = True
+
+        # If the k(E) values are invalid (in that they give the wrong 
+        # kf(T) or kr(T) when integrated), then raise an exception
+        if error or warning:
+            logging.warning('For path reaction {0!s}:'.format(rxn))
+            logging.warning('    Expected kf({0:g} K) = {1:g}'.format(T, kf_expected))
+            logging.warning('      Actual kf({0:g} K) = {1:g}'.format(T, kf_actual))
+            logging.warning('    Expected Keq({0:g} K) = {1:g}'.format(T, Keq_expected))
+            logging.warning('      Actual Keq({0:g} K) = {1:g}'.format(T, Keq_actual))
+            if error:
+                raise InvalidMicrocanonicalRateError('Invalid k(E) values computed for path reaction "{0}".'.format(rxn), k_ratio, Keq_ratio)
+            else:
+                logging.warning('Significant corrections to k(E) to be consistent with high-pressure limit for path reaction "{0}".'.format(rxn))
+
+        return kf, kr
+
     def calculateEquilibriumRatios(self):
         """
         Return an array containing the fraction of each isomer and reactant
@@ -801,12 +916,25 @@ class Network:
         """
         Calculate the matrix of first-order rate coefficients for collisional
         population transfer between grains for each isomer, including the
-        corresponding collision frequencies.
+        corresponding collision frequencies. If the network is `sparse`, the
+        matrix of each isomer is a sparse matrix whose rows and columns run
+        over the energy and angular momentum grains, and only the collisional
+        transfers within a cutoff of the average energy transferred are kept.
         """
         Nisom = len(self.isomers)
         Ngrains = len(self.Elist)
         NJ = 1 if self.Jlist is None else len(self.Jlist)
         
+        if self.sparse:
+            collFreq = numpy.zeros(Nisom, numpy.float64)
+            Mcoll = []
+            for i, isomer in enumerate(self.isomers):
+                collFreq[i] = isomer.calculateCollisionFrequency(self.T, self.P, self.bathGas)
+                Mcoll.append(collFreq[i] * isomer.generateSparseCollisionMatrix(self.T, self.densStates[i,:,:], self.Elist, self.Jlist))
+            self.collFreq = collFreq
+            self.Mcoll = Mcoll
+            return Mcoll
+
         try:
             collFreq = numpy.zeros(Nisom, numpy.float64)
             Mcoll = numpy.zeros((Nisom,Ngrains,NJ,Ngrains,NJ), numpy.float64)
@@ -859,11 +987,27 @@ class Network:
         self.K, self.p0 = cse.applyChemicallySignificantEigenvaluesMethod(self, lumpingOrder)
         return self.K, self.p0
     
-    def generateFullMEMatrix(self, products=True):
+    def generateFullMEMatrix(self, products=True, sparse=None):
+        """
+        Generate the full master equation matrix for the network at the
+        current conditions, along with the accounting matrix relating isomer
+        and energy grain indices to its rows. If `sparse` is ``True``, the
+        matrix is returned in compressed sparse row format with negligible
+        collision terms dropped, which keeps its size proportional to the
+        number of grains rather than its square. By default the format
+        matches the `sparse` attribute of the network.
+        """
         import rmgpy.pdep.me as me
+        if sparse is None:
+            sparse = self.sparse
+        elif sparse != self.sparse:
+            self.sparse = sparse
+            self.calculateCollisionModel()
+        if sparse:
+            return me.generateSparseMEMatrix(self, products=products)
         return me.generateFullMEMatrix(self, products=products)
 
-    def solveFullME(self, tlist, x0):
+    def solveFullME(self, tlist, x0, sparse=None):
         """
         Directly solve the full master equation using a stiff ODE solver. Pass the
         reaction `network` to solve, the temperature `T` in K and pressure `P` in
@@ -872,10 +1016,15 @@ class Network:
         equation matrix `M`, the accounting matrix `indices` relating isomer and
         energy grain indices to indices of the master equation matrix, and the
         densities of states `densStates` in mol/J of each isomer.
+        If `sparse` is ``True``, the master equation matrix is kept in sparse
+        format and integrated using a BDF method with sparse linear algebra,
+        which allows much finer energy grains to be used. By default the
+        `sparse` attribute of the network is used.
         Returns the times in s, population distributions for each isomer, and total
         population profiles for each configuration.
         """
         import scipy.integrate
+        import scipy.sparse
     
         Elist = self.Elist
         Jlist = self.Jlist
@@ -889,23 +1038,32 @@ class Network:
         Ntime = len(tlist)
         
         def residual(t, y, K):
-            return numpy.dot(K, y)
+            return K.dot(y)
         
         def jacobian(t, y, K):
             return K
     
         ymB = self.P / constants.R / self.T
-        M, indices = self.generateFullMEMatrix()
+        if sparse is None:
+            sparse = self.sparse
+        M, indices = self.generateFullMEMatrix(sparse=sparse)
         Nrows = M.shape[0]
-        M[:,Nrows-Nreac-Nprod:] *= ymB
         
+        # Scale the columns of the bimolecular configurations by their
+        # concentrations
+        scale = numpy.ones(Nrows, numpy.float64)
+        scale[Nrows-Nreac-Nprod:] *= ymB
         if self.ymB is not None:
             if isinstance(self.ymB, float):
                 assert Nreac <= 1
-                M[:,Nrows-Nreac-Nprod:] *= self.ymB
+                scale[Nrows-Nreac-Nprod:] *= self.ymB
             else:
                 for n in range(Nreac+Nprod):
-                    M[:,Nrows-Nreac-Nprod+n] *= self.ymB[n]
+                    scale[Nrows-Nreac-Nprod+n] *= self.ymB[n]
+        if sparse:
+            M = M.dot(scipy.sparse.diags(scale)).tocsc()
+        else:
+            M *= scale
         
         # Get equilibrium distributions
         eqDist = numpy.zeros_like(densStates)
@@ -925,26 +1083,36 @@ class Network:
         for i in range(Nreac+Nprod):
             p0[-Nreac-Nprod + i] = x0[i+Nisom]
     
-        # Set up ODEs
-        ode = scipy.integrate.ode(residual, jacobian).set_integrator('vode', method='bdf', with_jacobian=True, atol=1e-16, rtol=1e-8)
-        ode.set_initial_value(p0, 0.0).set_f_params(M).set_jac_params(M)
-    
         # Generate solution
         t = numpy.zeros([Ntime], float)
+        y = numpy.zeros([Ntime, Nrows], float)
+        if sparse:
+            sol = scipy.integrate.solve_ivp(lambda time, y0: residual(time, y0, M), (0.0, tlist[-1]), p0, method='BDF',
+                                            t_eval=tlist, jac=M, atol=1e-16, rtol=1e-8)
+            if not sol.success:
+                raise NetworkError('Integration of the sparse master equation failed: {0}'.format(sol.message))
+            t[:] = sol.t
+            y[:,:] = sol.y.T
+        else:
+            ode = scipy.integrate.ode(residual, jacobian).set_integrator('vode', method='bdf', with_jacobian=True, atol=1e-16, rtol=1e-8)
+            ode.set_initial_value(p0, 0.0).set_f_params(M).set_jac_params(M)
+            for m in range(Ntime):
+                ode.integrate(tlist[m])
+                t[m] = ode.t
+                y[m,:] = ode.y
+        
         p = numpy.zeros([Ntime, Nisom, Ngrains, NJ], float)
         x = numpy.zeros([Ntime, Nisom+Nreac+Nprod], float)
         for m in range(Ntime):
-            ode.integrate(tlist[m])
-            t[m] = ode.t
             for r in range(Ngrains):
                 for s in range(NJ):
                     for i in range(0, Nisom):
                         index = indices[i,r,s]
                         if index > 0:
-                            p[m,i,r,s] += ode.y[index]
-                            x[m,i] += ode.y[index]
+                            p[m,i,r,s] += y[m,index]
+                            x[m,i] += y[m,index]
             for n in range(Nisom, Nisom+Nreac+Nprod):
-                x[m,n] = ode.y[-(Nisom+Nreac+Nprod)+n]
+                x[m,n] = y[m,-(Nisom+Nreac+Nprod)+n]
     
         return t, p, x
 
@@ -1044,3 +1212,22 @@ class Network:
             logging.log(level, '    {0:<48s}'.format(rxn))
         logging.log(level, '========================================================================')
         logging.log(level, '')
+
+################################################################################
+
+def calculateRateCoefficientsAtTemperature(network, T, Plist, method, errorCheck=True):
+    """
+    Return the phenomenological rate coefficients of `network` at the
+    temperature `T` in K and each of the pressures in `Plist` in Pa, and the
+    entries of the k(E) cache at `T`. This function is passed to the workers
+    by :meth:`Network.calculateRateCoefficients`.
+
+    The calculation is done on a shallow copy of `network`, so that tasks
+    running at the same time in threads do not overwrite each other's
+    conditions and solution arrays, which :meth:`Network.setConditions`
+    replaces rather than modifies.
+    """
+    network = copy.copy(network)
+    K = network.calculateRateCoefficientsAtTemperature(T, Plist, method, errorCheck)
+    microcanonicalRates = dict([(key, value) for key, value in network.microcanonicalRateCache.items() if key[1] == T])
+    return K, microcanonicalRates
@@ -33,7 +33,10 @@ This script contains unit tests of the :mod:`rmgpy.pdep.network` module.
 """
 
 import unittest
+import numpy
+import scipy.sparse
 
+import rmgpy.pdep.me as me
 from rmgpy.pdep.network import Network
 from rmgpy.pdep.configuration import Configuration
 from rmgpy.transport import TransportData
@@ -45,6 +48,8 @@ from rmgpy.statmech.conformer import Conformer
 from rmgpy.species import Species, TransitionState
 from rmgpy.reaction import Reaction
 from rmgpy.pdep.collision import SingleExponentialDown
+from rmgpy.exceptions import NetworkError
+from rmgpy.scoop_framework.util import setExecutor
 
 ################################################################################
 
@@ -240,6 +245,105 @@ class TestNetwork(unittest.TestCase):
             raise AssertionError('Large collision matrix resulted in memory error, handling failed')
         except:
             pass
+
+    def test_densityOfStatesCache(self):
+        """
+        Test that the densities of states are reused when the network is
+        initialized again with the same energy grains.
+        """
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, maximumGrainSize=2000., minimumGrainCount=100)
+        isomer = self.network.isomers[0]
+        densStates0 = isomer.densStates.copy()
+        self.assertIn(('n-C4H10O',), self.network.densStatesCache)
+        # Mark the cached values so that we can tell that they were reused
+        self.network.densStatesCache[('n-C4H10O',)][1][:] *= 2
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, maximumGrainSize=2000., minimumGrainCount=100)
+        self.assertTrue(numpy.allclose(self.network.isomers[0].densStates, 2 * densStates0))
+
+    def test_generateSparseMEMatrix(self):
+        """
+        Test that the sparse master equation matrix matches the dense one.
+        """
+        Nisom, Nreac, Nprod, Ngrains, NJ = 2, 1, 1, 6, 2
+        net = Network()
+        net.T = 1000.0
+        net.P = 1.0e5
+        net.Elist = numpy.linspace(0.0, 50000.0, Ngrains)
+        net.Jlist = numpy.arange(NJ)
+        net.Nisom, net.Nreac, net.Nprod, net.Ngrains, net.NJ = Nisom, Nreac, Nprod, Ngrains, NJ
+        net.densStates = numpy.ones((Nisom+Nreac+Nprod,Ngrains,NJ))
+        net.densStates[1,0,:] = 0.0
+        numpy.random.seed(0)
+        net.Mcoll = numpy.random.rand(Nisom,Ngrains,NJ,Ngrains,NJ)
+        net.Mcoll[1,0,:,:,:] = 0.0
+        net.Mcoll[1,:,:,0,:] = 0.0
+        net.Kij = numpy.random.rand(Nisom,Nisom,Ngrains,NJ)
+        net.Gnj = numpy.random.rand(Nreac+Nprod,Nisom,Ngrains,NJ)
+        net.Fim = numpy.random.rand(Nisom,Nreac,Ngrains,NJ)
+        Mcoll = net.Mcoll
+        McollSparse = [scipy.sparse.csr_matrix(Mcoll[i].reshape(Ngrains*NJ,Ngrains*NJ)) for i in range(Nisom)]
+        for products in [True, False]:
+            net.Mcoll = Mcoll
+            M, indices = me.generateFullMEMatrix(net, products=products)
+            net.Mcoll = McollSparse
+            Msparse, indicesSparse = me.generateSparseMEMatrix(net, products=products)
+            self.assertTrue((indices == indicesSparse).all())
+            self.assertEqual(M.shape, Msparse.shape)
+            self.assertTrue(numpy.allclose(M, Msparse.toarray(), rtol=1e-12, atol=0))
+
+    def test_solveFullMESparse(self):
+        """
+        Test that solving the full master equation in sparse form gives the
+        same populations as solving it in dense form.
+        """
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, maximumGrainSize=2000., minimumGrainCount=100)
+        self.network.setConditions(1000., 1e5)
+        tlist = numpy.logspace(-8, 0, 9)
+        x0 = numpy.array([1.0, 0.0])
+        t, p, x = self.network.solveFullME(tlist, x0, sparse=False)
+        self.assertFalse(self.network.sparse)
+        tSparse, pSparse, xSparse = self.network.solveFullME(tlist, x0, sparse=True)
+        self.assertTrue(self.network.sparse)
+        self.assertTrue(isinstance(self.network.Mcoll[0], scipy.sparse.spmatrix))
+        self.assertTrue(numpy.allclose(t, tSparse))
+        self.assertTrue(numpy.allclose(x, xSparse, rtol=1e-4, atol=1e-8))
+        self.assertTrue(numpy.allclose(p, pSparse, rtol=1e-4, atol=1e-8 * numpy.max(p)))
+
+    def test_calculateRateCoefficientsSparse(self):
+        """
+        Test that the k(T,P) values computed from the sparse master equation
+        match those computed from the dense one.
+        """
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, maximumGrainSize=2000., minimumGrainCount=100)
+        Tlist = numpy.array([1000., 1500.])
+        Plist = numpy.array([1e4, 1e6])
+        for method in ['modified strong collision', 'chemically-significant eigenvalues']:
+            K = self.network.calculateRateCoefficients(Tlist, Plist, method)
+            Ksparse = self.network.calculateRateCoefficients(Tlist, Plist, method, sparse=True)
+            self.assertTrue(numpy.all(K[:,:,1,0] > 0))
+            self.assertTrue(numpy.allclose(K, Ksparse, rtol=1e-3, atol=0))
+        self.assertRaises(NetworkError, self.network.calculateRateCoefficients,
+                          Tlist, Plist, 'reservoir state', sparse=True)
+
+    def test_calculateRateCoefficientsThreads(self):
+        """
+        Test that computing the k(T,P) values of several temperatures at once
+        in threads gives the same values as computing them one by one.
+        """
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, maximumGrainSize=2000., minimumGrainCount=100)
+        Tlist = numpy.array([500., 1000., 1500., 2000.])
+        Plist = numpy.array([1e4, 1e6])
+        setExecutor('serial')
+        K = self.network.calculateRateCoefficients(Tlist, Plist, 'modified strong collision')
+        self.network.microcanonicalRateCache = {}
+        setExecutor('thread', 4)
+        try:
+            Kthreads = self.network.calculateRateCoefficients(Tlist, Plist, 'modified strong collision')
+        finally:
+            setExecutor('serial')
+        self.assertTrue(numpy.array_equal(K, Kthreads))
+        # The k(E) computed by the workers are kept for the next calculation
+        self.assertEqual(set([key[1] for key in self.network.microcanonicalRateCache]), set(Tlist))
         
 ################################################################################
 
@@ -61,6 +61,8 @@ def database(
              kineticsFamilies = 'default',
              kineticsDepositories = 'default',
              kineticsEstimator = 'rate rules',
+             cacheDirectory = None,
+             propertyStore = None,
              ):
     # This function just stores the information about the database to be loaded
     # We don't actually load the database until after we're finished reading
@@ -88,6 +90,8 @@ def database(
     rmg.seedMechanisms = seedMechanisms or []
     rmg.statmechLibraries = frequenciesLibraries or []
     rmg.kineticsEstimator = kineticsEstimator
+    rmg.databaseCacheDirectory = os.path.expanduser(cacheDirectory) if cacheDirectory else None
+    rmg.propertyStorePath = os.path.expanduser(propertyStore) if propertyStore else None
     if kineticsDepositories == 'default':
         rmg.kineticsDepositories = ['training']
     elif kineticsDepositories == 'all':
@@ -305,8 +309,8 @@ def liquidReactor(temperature,
     system = LiquidReactor(T, initialConcentrations, nSims, termination, sensitiveSpecies, sensitivityThreshold, sensConditions, constantSpecies)
     rmg.reactionSystems.append(system)
     
-def simulator(atol, rtol, sens_atol=1e-6, sens_rtol=1e-4):
-    rmg.simulatorSettingsList.append(SimulatorSettings(atol, rtol, sens_atol, sens_rtol))
+def simulator(atol, rtol, sens_atol=1e-6, sens_rtol=1e-4, coreOnlyResidual=False, vectorizedJacobian=False):
+    rmg.simulatorSettingsList.append(SimulatorSettings(atol, rtol, sens_atol, sens_rtol, coreOnlyResidual, vectorizedJacobian))
     
 def solvation(solvent):
     # If solvation module in input file, set the RMG solvent variable
@@ -478,7 +482,8 @@ def pressureDependence(
 
 def options(name='Seed', generateSeedEachIteration=False, saveSeedToDatabase=False, units='si', saveRestartPeriod=None, 
             generateOutputHTML=False, generatePlots=False, saveSimulationProfiles=False, verboseComments=False, 
-            saveEdgeSpecies=False, keepIrreversible=False, trimolecularProductReversible=True, wallTime='00:00:00:00'):
+            saveEdgeSpecies=False, keepIrreversible=False, trimolecularProductReversible=True, wallTime='00:00:00:00',
+            simulationProcesses=1, executor=None, executorProcesses=None, backgroundOutput=False):
     rmg.name = name
     rmg.generateSeedEachIteration=generateSeedEachIteration
     rmg.saveSeedToDatabase=saveSeedToDatabase
@@ -496,6 +501,10 @@ def options(name='Seed', generateSeedEachIteration=False, saveSeedToDatabase=Fal
     rmg.keepIrreversible = keepIrreversible
     rmg.trimolecularProductReversible = trimolecularProductReversible
     rmg.wallTime = wallTime
+    rmg.simulationProcesses = simulationProcesses
+    rmg.executor = executor
+    rmg.executorProcesses = executorProcesses
+    rmg.backgroundOutput = backgroundOutput
 
 def generatedSpeciesConstraints(**kwargs):
 
@@ -692,6 +701,10 @@ def saveInputFile(path, rmg):
     f.write('    kineticsDepositories = {0!r},\n'.format(rmg.kineticsDepositories))
     f.write('    kineticsFamilies = {0!r},\n'.format(rmg.kineticsFamilies))
     f.write('    kineticsEstimator = {0!r},\n'.format(rmg.kineticsEstimator))
+    if rmg.databaseCacheDirectory:
+        f.write('    cacheDirectory = {0!r},\n'.format(rmg.databaseCacheDirectory))
+    if rmg.propertyStorePath:
+        f.write('    propertyStore = {0!r},\n'.format(rmg.propertyStorePath))
     f.write(')\n\n')
 
     # Species
@@ -834,6 +847,10 @@ def saveInputFile(path, rmg):
     f.write('    trimolecularProductReversible = {0},\n'.format(rmg.trimolecularProductReversible))
     f.write('    verboseComments = {0},\n'.format(rmg.verboseComments))
     f.write('    wallTime = {0},\n'.format(rmg.wallTime))
+    f.write('    simulationProcesses = {0},\n'.format(rmg.simulationProcesses))
+    f.write('    executor = {0!r},\n'.format(rmg.executor))
+    f.write('    executorProcesses = {0},\n'.format(rmg.executorProcesses))
+    f.write('    backgroundOutput = {0},\n'.format(rmg.backgroundOutput))
     f.write(')\n\n')
     
     f.close()
@@ -52,7 +52,8 @@ from rmgpy.constraints import failsSpeciesConstraints
 from rmgpy.molecule import Molecule
 from rmgpy.solver.base import TerminationTime, TerminationConversion
 from rmgpy.solver.simple import SimpleReactor
-from rmgpy.data.rmg import RMGDatabase
+from rmgpy.data.rmg import RMGDatabase, getDatabaseCacheKey
+from rmgpy.data.store import SpeciesPropertyStore, getPropertyStoreFingerprint, setPropertyStore, getPropertyStore
 from rmgpy.exceptions import ForbiddenStructureException, DatabaseError, CoreError
 from rmgpy.data.kinetics.library import KineticsLibrary, LibraryReaction
 from rmgpy.data.kinetics.family import KineticsFamily, TemplateReaction
@@ -68,11 +69,15 @@ from model import Species, CoreEdgeReactionModel
 from rmgpy.reaction import Reaction
 from pdep import PDepNetwork
 import rmgpy.util as util
+from rmgpy.util import BackgroundWriter, BackgroundListener
 
 from rmgpy.chemkin import ChemkinWriter
 from rmgpy.rmg.output import OutputHTMLWriter
 from rmgpy.rmg.listener import SimulationProfileWriter, SimulationProfilePlotter
+from rmgpy.rmg.simulate import ParallelSimulator
+from rmgpy.scoop_framework.util import setExecutor, shutdown as shutdownExecutor
 from rmgpy.restart import RestartWriter
+from rmgpy.snapshot import SnapshotWriter, ModelCheckpoint, getSnapshotPath
 from rmgpy.qm.main import QMDatabaseWriter
 from rmgpy.stats import ExecutionStatsWriter
 from rmgpy.thermo.thermoengine import submit
@@ -99,6 +104,8 @@ class RMG(util.Subject):
     `kineticsFamilies`                  The kinetics families to use for reaction generation
     `kineticsDepositories`              The kinetics depositories to use for looking up kinetics in each family
     `kineticsEstimator`                 The method to use to estimate kinetics: 'group additivity' or 'rate rules'
+    `databaseCacheDirectory`            The directory for caching the loaded database between jobs, or ``None`` to not use a cache
+    `propertyStorePath`                 The file for storing the estimated species properties between jobs, or ``None`` to not use a store
     `solvent`                           If solvation estimates are required, the name of the solvent.
     ----------------------------------- ------------------------------------------------
     `reactionModel`                     The core-edge reaction model generated by this job
@@ -134,6 +141,9 @@ class RMG(util.Subject):
     `ml_settings`                       Settings for ML estimation
     `wallTime`                          The maximum amount of CPU time in the form DD:HH:MM:SS to expend on this job; used to stop gracefully so we can still get profiling information
     `kineticsdatastore`                 ``True`` if storing details of each kinetic database entry in text file, ``False`` otherwise
+    `executor`                          The executor used to distribute reaction generation and thermo estimation: 'serial', 'process', 'thread', 'scoop', or ``None`` to choose automatically
+    `executorProcesses`                 The number of workers used by the executor, or ``None`` for the number of CPUs
+    `backgroundOutput`                  ``True`` to write the Chemkin, HTML, restart, statistics and seed mechanism output in background processes, ``False`` otherwise
     ----------------------------------- ------------------------------------------------
     `initializationTime`                The time at which the job was initiated, in seconds since the epoch (i.e. from time.time())
     `done`                              Whether the job has completed (there is nothing new to add)
@@ -206,12 +216,19 @@ class RMG(util.Subject):
         self.ml_settings = None
         self.speciesConstraints = {}
         self.wallTime = '00:00:00:00'
+        self.simulationProcesses = 1
+        self.executor = None
+        self.executorProcesses = None
+        self.backgroundOutput = False
+        self.databaseCacheDirectory = None
+        self.propertyStorePath = None
         self.initializationTime = 0
         self.kineticsdatastore = None
         
         self.name = 'Seed'
         self.generateSeedEachIteration = True
         self.saveSeedToDatabase = False
+        self.seedWriter = BackgroundWriter('seed mechanism', enabled=False)
 
         self.thermoCentralDatabase = None
 
@@ -325,27 +342,48 @@ class RMG(util.Subject):
         
     def loadDatabase(self):
         
+        #set global variable solvent
+        if self.solvent:
+            global solvent
+            solvent=self.solvent
+
+        # The cache holds the database after the rate rules were filled in,
+        # so it is not used when the intermediate rules are written out
+        cacheFile = None
+        if self.databaseCacheDirectory and not self.kineticsdatastore:
+            key = getDatabaseCacheKey(self.databaseDirectory, self.thermoLibraries, self.transportLibraries,
+                                      self.reactionLibraries, self.seedMechanisms, self.kineticsFamilies,
+                                      self.kineticsDepositories, self.kineticsEstimator,
+                                      self.trimolecularProductReversible, self.verboseComments, self.solvent)
+            cacheFile = os.path.join(self.databaseCacheDirectory, 'database_{0}.pkl'.format(key))
+
         self.database = RMGDatabase()
-        self.database.load(
-            path = self.databaseDirectory,
-            thermoLibraries = self.thermoLibraries,
-            transportLibraries = self.transportLibraries,
-            reactionLibraries = [library for library, option in self.reactionLibraries],
-            seedMechanisms = self.seedMechanisms,
-            kineticsFamilies = self.kineticsFamilies,
-            kineticsDepositories = self.kineticsDepositories,
-            #frequenciesLibraries = self.statmechLibraries,
-            depository = False, # Don't bother loading the depository information, as we don't use it
-        )
-
-        # Turn off reversibility for families with three products if desired
-        if not self.trimolecularProductReversible:
-            for family in self.database.kinetics.families.itervalues():
-                if len(family.forwardTemplate.products) > 2:
-                    family.reversible = False
-                    family.reverseTemplate = None
-                    family.reverseRecipe = None
-                    family.reverse = None
+        if cacheFile is None or not self.database.loadCache(cacheFile):
+            self.database.load(
+                path = self.databaseDirectory,
+                thermoLibraries = self.thermoLibraries,
+                transportLibraries = self.transportLibraries,
+                reactionLibraries = [library for library, option in self.reactionLibraries],
+                seedMechanisms = self.seedMechanisms,
+                kineticsFamilies = self.kineticsFamilies,
+                kineticsDepositories = self.kineticsDepositories,
+                #frequenciesLibraries = self.statmechLibraries,
+                depository = False, # Don't bother loading the depository information, as we don't use it
+            )
+
+            # Turn off reversibility for families with three products if desired
+            if not self.trimolecularProductReversible:
+                for family in self.database.kinetics.families.itervalues():
+                    if len(family.forwardTemplate.products) > 2:
+                        family.reversible = False
+                        family.reverseTemplate = None
+                        family.reverseRecipe = None
+                        family.reverse = None
+
+            self.fillKineticsRules()
+
+            if cacheFile is not None:
+                self.database.saveCache(cacheFile)
 
         # Determine if trimolecular families are present
         for family in self.database.kinetics.families.itervalues():
@@ -363,12 +401,34 @@ class RMG(util.Subject):
 
         #check libraries
         self.checkLibraries()
-        
-        #set global variable solvent
-        if self.solvent:
-            global solvent
-            solvent=self.solvent
-        
+
+        self.openPropertyStore()
+
+    def openPropertyStore(self):
+        """
+        Open the store of estimated species properties, if a file for it was
+        given. The properties are stored together with a fingerprint of the
+        thermo, transport, statmech and solvation databases and of the
+        settings that affect the estimates.
+        """
+        if not self.propertyStorePath:
+            return
+        qmSettings = None
+        if self.quantumMechanics:
+            settings = self.quantumMechanics.settings
+            qmSettings = (settings.software, settings.method, settings.onlyCyclics, settings.maxRadicalNumber)
+        mlSettings = sorted(self.ml_settings.items()) if self.ml_settings else None
+        fingerprint = getPropertyStoreFingerprint(self.databaseDirectory, self.thermoLibraries,
+                                                  self.transportLibraries, self.statmechLibraries,
+                                                  qmSettings, mlSettings)
+        setPropertyStore(SpeciesPropertyStore(self.propertyStorePath, fingerprint))
+        logging.info('Using the species property store {0}'.format(self.propertyStorePath))
+
+    def fillKineticsRules(self):
+        """
+        Add the rate rules from the training set to the kinetics families if
+        requested, and fill in the remaining rate rules by averaging.
+        """
         if self.kineticsEstimator == 'rate rules':
             if '!training' not in self.kineticsDepositories:
                 logging.info('Adding rate rules from training set in kinetics families...')
@@ -418,8 +478,12 @@ class RMG(util.Subject):
             restart = False
 
         if restart:
-            if not os.path.exists(os.path.join(self.outputDirectory,'restart.pkl')):
-                logging.error("Could not find restart file (restart.pkl). Please run without --restart option.")
+            # Prefer the model snapshot, which is much faster to load than the restart file
+            restartPath = getSnapshotPath(self.outputDirectory)
+            if not os.path.exists(restartPath):
+                restartPath = os.path.join(self.outputDirectory,'restart.pkl')
+            if not os.path.exists(restartPath):
+                logging.error("Could not find model snapshot (restart/snapshot.bin) or restart file (restart.pkl). Please run without --restart option.")
                 raise Exception("No restart file")
             
         # Read input file
@@ -427,6 +491,16 @@ class RMG(util.Subject):
 
         # Check input file 
         self.checkInput()
+
+        # Select the executor for distributing tasks; command-line options take precedence.
+        # The workers are only started when the first task is distributed, after the database is loaded.
+        if kwargs.get('executor', None) is not None:
+            self.executor = kwargs['executor']
+        if kwargs.get('processes', None) is not None:
+            self.executorProcesses = kwargs['processes']
+        executor = setExecutor(self.executor, self.executorProcesses)
+        if executor.name != 'serial':
+            logging.info('Distributing tasks with the {0} executor.'.format(executor.name))
         
         #Properly set filterReactions to initialize flags properly
         if len(self.modelSettingsList) > 0:
@@ -480,7 +554,7 @@ class RMG(util.Subject):
 
         # Initialize reaction model
         if restart:
-            self.initializeRestartRun(os.path.join(self.outputDirectory,'restart.pkl'))
+            self.initializeRestartRun(restartPath)
         else:
     
             # Seed mechanisms: add species and reactions from seed mechanism
@@ -541,6 +615,7 @@ class RMG(util.Subject):
 
             for spec in self.initialSpecies:
                 submit(spec,self.solvent)
+                self.reactionModel.trackThermoEstimate(spec)
                 
             # Add nonreactive species (e.g. bath gases) to core first
             # This is necessary so that the PDep algorithm can identify the bath gas            
@@ -570,20 +645,31 @@ class RMG(util.Subject):
         found in the RMG input file.
         """
 
-        self.attach(ChemkinWriter(self.outputDirectory))
+        def attachOutputWriter(listener):
+            # Listeners that keep no state between updates can write their
+            # output in the background
+            if self.backgroundOutput:
+                listener = BackgroundListener(listener)
+            self.attach(listener)
+
+        attachOutputWriter(ChemkinWriter(self.outputDirectory))
+
+        self.attach(SnapshotWriter(self.outputDirectory))
 
         if self.generateOutputHTML:
-            self.attach(OutputHTMLWriter(self.outputDirectory))
+            attachOutputWriter(OutputHTMLWriter(self.outputDirectory))
 
         if self.saveRestartPeriod:
             warnings.warn("The option saveRestartPeriod is no longer supported and may be"
                           " removed in version 2.3.", DeprecationWarning)
-            self.attach(RestartWriter()) 
+            attachOutputWriter(RestartWriter())
 
         if self.quantumMechanics:
             self.attach(QMDatabaseWriter()) 
 
-        self.attach(ExecutionStatsWriter(self.outputDirectory))
+        self.attach(ExecutionStatsWriter(self.outputDirectory, background=self.backgroundOutput))
+
+        self.seedWriter.enabled = self.backgroundOutput
 
         if self.saveSimulationProfiles:
 
@@ -683,6 +769,14 @@ class RMG(util.Subject):
             self.makeSeedMech(firstTime=True)
 
         maxNumSpcsHit = False #default
+
+        parallelSimulator = None
+        if self.simulationProcesses > 1:
+            if self.saveSimulationProfiles:
+                logging.warning('Reaction systems are simulated serially because saveSimulationProfiles is turned on.')
+            else:
+                logging.info('Simulating reaction systems with up to {0:d} processes.'.format(self.simulationProcesses))
+                parallelSimulator = ParallelSimulator(self, self.simulationProcesses)
         
         for q,modelSettings in enumerate(self.modelSettingsList):
             if len(self.simulatorSettingsList) > 1: 
@@ -707,6 +801,9 @@ class RMG(util.Subject):
                 
                 prunableSpecies = self.reactionModel.edge.species[:]
                 prunableNetworks = self.reactionModel.networkList[:]
+
+                if parallelSimulator is not None:
+                    parallelSimulator.clear()
                 
                 for index, reactionSystem in enumerate(self.reactionSystems):
                     
@@ -728,19 +825,28 @@ class RMG(util.Subject):
                             # Turn pruning off if we haven't reached minimum core size.
                             prune = False
                             
-                        try: terminated,resurrected,obj,newSurfaceSpecies,newSurfaceReactions,t,x = reactionSystem.simulate(
-                            coreSpecies = self.reactionModel.core.species,
-                            coreReactions = self.reactionModel.core.reactions,
-                            edgeSpecies = self.reactionModel.edge.species,
-                            edgeReactions = self.reactionModel.edge.reactions,
-                            surfaceSpecies = self.reactionModel.surface.species,
-                            surfaceReactions = self.reactionModel.surface.reactions,
-                            pdepNetworks = self.reactionModel.networkList,
-                            prune = prune,
-                            modelSettings=modelSettings,
-                            simulatorSettings = simulatorSettings,
-                            conditions = self.rmg_memories[index].get_cond()
-                        )
+                        try:
+                            result = None
+                            if parallelSimulator is not None and p == 0:
+                                # Falls back to the serial call below if the worker failed; later samples
+                                # depend on the results of the earlier ones, so they are always run here
+                                result = parallelSimulator.simulate(index, prune, modelSettings, simulatorSettings,
+                                                                    prunableSpecies, prunableNetworks)
+                            if result is None:
+                                result = reactionSystem.simulate(
+                                    coreSpecies = self.reactionModel.core.species,
+                                    coreReactions = self.reactionModel.core.reactions,
+                                    edgeSpecies = self.reactionModel.edge.species,
+                                    edgeReactions = self.reactionModel.edge.reactions,
+                                    surfaceSpecies = self.reactionModel.surface.species,
+                                    surfaceReactions = self.reactionModel.surface.reactions,
+                                    pdepNetworks = self.reactionModel.networkList,
+                                    prune = prune,
+                                    modelSettings=modelSettings,
+                                    simulatorSettings = simulatorSettings,
+                                    conditions = self.rmg_memories[index].get_cond()
+                                )
+                            terminated,resurrected,obj,newSurfaceSpecies,newSurfaceReactions,t,x = result
                         except:
                             logging.error("Model core reactions:")
                             if len(self.reactionModel.core.reactions) > 5:
@@ -885,6 +991,9 @@ class RMG(util.Subject):
                         coreSpec, coreReac, edgeSpec, edgeReac = self.reactionModel.getModelSize()
                         logging.info('The current model core has %s species and %s reactions' % (coreSpec, coreReac))
                         logging.info('The current model edge has %s species and %s reactions' % (edgeSpec, edgeReac))
+                        if parallelSimulator is not None:
+                            parallelSimulator.shutdown()
+                        self.waitForOutput()
                         return
                     
             if maxNumSpcsHit: #resets maxNumSpcsHit and continues the settings for loop
@@ -892,6 +1001,9 @@ class RMG(util.Subject):
                 maxNumSpcsHit = False
                 continue
         
+        if parallelSimulator is not None:
+            parallelSimulator.shutdown()
+
         if not self.generateSeedEachIteration:
             self.makeSeedMech(firstTime=True)
             
@@ -927,6 +1039,7 @@ class RMG(util.Subject):
                 plot_sensitivity(self.outputDirectory, index, reactionSystem.sensitiveSpecies)
 
         # generate Cantera files chem.cti & chem_annotated.cti in a designated `cantera` output folder
+        self.waitForOutput()
         try:
             self.generateCanteraFiles(os.path.join(self.outputDirectory, 'chemkin', 'chem.inp'))
             self.generateCanteraFiles(os.path.join(self.outputDirectory, 'chemkin', 'chem_annotated.inp'))
@@ -1030,6 +1143,8 @@ class RMG(util.Subject):
         
         if run with firstTime=True it will change self.name to be unique within the thermo/kinetics libraries
         by adding integers to the end of the name to prevent overwritting
+
+        if self.backgroundOutput is True the seed mechanism is saved in a background process
         """
         
         logging.info('Making seed mechanism...')
@@ -1046,6 +1161,14 @@ class RMG(util.Subject):
                     q += 1
                 self.name = name + str(q)
         
+        # The name is chosen here, since changes made while saving in the background are discarded
+        self.seedWriter.submit(self.saveSeedMech, name, firstTime)
+
+    def saveSeedMech(self, name, firstTime=False):
+        """
+        Save the seed mechanism `name` made from the current core and edge to the seed folder,
+        and to the database if self.saveSeedToDatabase is True
+        """
         seedDir = os.path.join(self.outputDirectory,'seed')
         
         if firstTime and not os.path.exists(seedDir): #if seed directory does not exist make it
@@ -1342,6 +1465,9 @@ class RMG(util.Subject):
         
         The restart file is only saved if self.saveRestartPeriod or self.done.
         """
+        # Thermo estimates still running on the executor cannot be pickled
+        self.reactionModel.collectThermoEstimates()
+
         # If the user specifies it, add unused reaction library reactions to
         # an additional output species and reaction list which is written to the ouput HTML
         # file as well as the chemkin file
@@ -1356,13 +1482,35 @@ class RMG(util.Subject):
         
         self.execTime.append(time.time() - self.initializationTime)
 
+        store = getPropertyStore()
+        if store is not None:
+            store.flush()
+
         # Notify registered listeners:
         self.notify()
             
+    def waitForOutput(self):
+        """
+        Wait for the output being written in the background, if any, to be
+        saved.
+        """
+        for listener in self._observers:
+            if isinstance(listener, (BackgroundListener, ExecutionStatsWriter)):
+                listener.wait()
+        self.seedWriter.wait()
+
     def finish(self):
         """
         Complete the model generation.
         """
+        self.waitForOutput()
+
+        # Stop the workers of the executor
+        shutdownExecutor()
+
+        # Write the remaining species properties
+        setPropertyStore(None)
+
         # Log end timestamp
         logging.info('')
         logging.info('RMG execution terminated at ' + time.asctime())
@@ -1425,8 +1573,11 @@ class RMG(util.Subject):
 
         from rmgpy.rmg.model import getFamilyLibraryObject
 
-        # read restart file
-        self.loadRestartFile(path)
+        # read model snapshot or restart file
+        if path.endswith('.pkl'):
+            self.loadRestartFile(path)
+        else:
+            self.loadSnapshotFile(path)
 
         # A few things still point to the species in the input file, so update
         # those to point to the equivalent species loaded from the restart file
@@ -1509,6 +1660,56 @@ class RMG(util.Subject):
             self.bimolecularThreshold = rmg_restart.bimolecularThreshold
             self.trimolecularThreshold = rmg_restart.trimolecularThreshold
         
+    def loadSnapshotFile(self, path):
+        """
+        Load the core, edge and surface of the reaction model, along with its
+        pressure-dependent networks, the bounds of the thermodynamic filter
+        and the reaction flags, from the model snapshot at `path` on disk and
+        the journal of the changes made to the model since the snapshot was
+        written.
+        """
+        logging.info('Loading previous model snapshot...')
+        checkpoint = ModelCheckpoint(path)
+        if checkpoint.numRecords:
+            logging.info('Applied {0:d} iterations from the snapshot journal.'.format(checkpoint.numRecords))
+
+        reactionModel = self.reactionModel
+        reactionModel.core.species = checkpoint.coreSpecies
+        reactionModel.edge.species = checkpoint.edgeSpecies
+        reactionModel.core.reactions = checkpoint.coreReactions
+        reactionModel.edge.reactions = checkpoint.edgeReactions
+        for spec in checkpoint.coreSpecies + checkpoint.edgeSpecies:
+            reactionModel.registerSpecies(spec)
+        for rxn in checkpoint.coreReactions + checkpoint.edgeReactions:
+            if isinstance(rxn, (TemplateReaction, LibraryReaction)):
+                reactionModel.registerReaction(rxn)
+        reactionModel.surface.species = checkpoint.surfaceSpecies
+        reactionModel.surface.reactions = checkpoint.surfaceReactions
+        reactionModel.networkList = checkpoint.networkList
+        for network in checkpoint.networkList:
+            source = tuple(sorted(network.source))
+            if source in reactionModel.networkDict:
+                reactionModel.networkDict[source].append(network)
+            else:
+                reactionModel.networkDict[source] = [network]
+        reactionModel.speciesCounter = checkpoint.metadata['speciesCounter']
+        reactionModel.reactionCounter = checkpoint.metadata['reactionCounter']
+        reactionModel.networkCount = checkpoint.metadata['networkCount']
+        reactionModel.iterationNum = checkpoint.metadata['iteration']
+        # Snapshots written before the bounds were stored keep the defaults
+        for key in ('Gfmax', 'Gmax', 'Gmin'):
+            if key in checkpoint.metadata:
+                setattr(reactionModel, key, checkpoint.metadata[key])
+
+        flags = checkpoint.flags
+        self.unimolecularReact = flags.get('unimolecularReact')
+        self.bimolecularReact = flags.get('bimolecularReact')
+        self.trimolecularReact = flags.get('trimolecularReact')
+        if self.filterReactions:
+            self.unimolecularThreshold = flags.get('unimolecularThreshold')
+            self.bimolecularThreshold = flags.get('bimolecularThreshold')
+            self.trimolecularThreshold = flags.get('trimolecularThreshold')
+
     def loadRMGJavaInput(self, path):
         """
         Load an RMG-Java job from the input file located at `inputFile`, or
@@ -45,7 +45,9 @@ import rmgpy.constants as constants
 from rmgpy.constraints import failsSpeciesConstraints
 from rmgpy.quantity import Quantity
 from rmgpy.species import Species
+from rmgpy.thermo import NASA, Wilhoit, ThermoData
 from rmgpy.thermo.thermoengine import submit
+from rmgpy.thermo.table import ThermoTable
 from rmgpy.reaction import Reaction
 from rmgpy.exceptions import ForbiddenStructureException
 from rmgpy.data.kinetics.depository import DepositoryReaction
@@ -57,9 +59,10 @@ from rmgpy.kinetics import KineticsData, Arrhenius
 from rmgpy.data.rmg import getDB
         
 import rmgpy.data.rmg
+from rmgpy.scoop_framework.util import map_
 from .react import reactAll
 
-from pdep import PDepReaction, PDepNetwork
+from pdep import PDepReaction, PDepNetwork, calculateNetKinetics
 
 # generateThermoDataFromQM under the Species class imports the qm package
 
@@ -177,6 +180,9 @@ class CoreEdgeReactionModel:
     `networkList`              A list of pressure-dependent reaction networks (:class:`Network` objects)
     `networkCount`             A counter for the number of pressure-dependent networks created
     `indexSpeciesDict`         A dictionary with a unique index pointing to the species objects
+    `speciesDict`              A dictionary of all species in the model indexed by molecular formula
+    `speciesRegistry`          A dictionary of all species in the model indexed by their resonance-invariant graph hash
+    `thermoTable`              A :class:`ThermoTable` of the species being evaluated, used to evaluate Gibbs energies in bulk
     `solventName`              String describing solvent name for liquid reactions. Empty for non-liquid estimation
     =========================  ==============================================================
 
@@ -204,12 +210,14 @@ class CoreEdgeReactionModel:
         self.networkList = []
         self.networkCount = 0
         self.speciesDict = {}
+        self.speciesRegistry = {}
+        self.thermoTable = ThermoTable()
         self.reactionDict = {}
-        self.speciesCache = [None for i in range(4)]
         self.speciesCounter = 0
         self.reactionCounter = 0
         self.newSpeciesList = []
         self.newReactionList = []
+        self.pendingThermoSpecies = []
         self.outputSpeciesList = []
         self.outputReactionList = []
         self.pressureDependence = None
@@ -261,25 +269,15 @@ class CoreEdgeReactionModel:
             aromaticIsomers = generate_optimal_aromatic_resonance_structures(molecule)
             obj.molecule.extend(aromaticIsomers)
 
-        # First check cache and return if species is found
-        for i, spec in enumerate(self.speciesCache):
-            if spec is not None:
-                for mol in spec.molecule:
-                    if obj.isIsomorphic(mol):
-                        self.speciesCache.pop(i)
-                        self.speciesCache.insert(0, spec)
-                        return True, True, spec
-
         # Return an existing species if a match is found
-        formula = molecule.getFormula()
+        # The registry is keyed by a resonance-invariant hash of the molecular
+        # graph, so the isomorphism check is only needed to rule out collisions
         try:
-            speciesList = self.speciesDict[formula]
+            speciesList = self.speciesRegistry[molecule.get_resonance_hash()]
         except KeyError:
             return False, False, None
         for spec in speciesList:
             if spec.isIsomorphic(obj):
-                self.speciesCache.pop()
-                self.speciesCache.insert(0, spec)
                 return True, True, spec
 
         # As a last resort, check using molecule.fingerprint if the object matches any existing species,
@@ -369,11 +367,12 @@ class CoreEdgeReactionModel:
         
         if not spec.thermo:
             submit(spec,self.solventName)
+        self.trackThermoEstimate(spec)
         
         if spec.label == '':
-            if spec.thermo and spec.thermo.label != '': #check if thermo libraries have a name for it
-                logging.info('Species with SMILES of {0} named {1} based on thermo library name'.format(molecule.toSMILES().replace('/','').replace('\\',''),spec.thermo.label))
-                spec.label = spec.thermo.label
+            if spec not in self.pendingThermoSpecies:
+                self.applyThermoLibraryLabel(spec) #check if thermo libraries have a name for it
+            if spec.label != '':
                 label = spec.label
             else:
                 # Use SMILES as default format for label
@@ -386,12 +385,7 @@ class CoreEdgeReactionModel:
         logging.debug('Creating new species {0}'.format(label))
         
         spec.generateEnergyTransferModel()
-        formula = molecule.getFormula()
-        if formula in self.speciesDict:
-            self.speciesDict[formula].append(spec)
-        else:
-            self.speciesDict[formula] = [spec]
-
+        self.registerSpecies(spec)
 
         # Since the species is new, add it to the list of new species
         self.newSpeciesList.append(spec)
@@ -401,6 +395,37 @@ class CoreEdgeReactionModel:
 
         return spec, True
 
+    def trackThermoEstimate(self, spec):
+        """
+        Remember `spec` if its thermo estimate is still running on the
+        executor, so that it is collected by :meth:`collectThermoEstimates`.
+        """
+        if spec.thermo is not None and not isinstance(spec.thermo, (NASA, Wilhoit, ThermoData)):
+            if spec not in self.pendingThermoSpecies:
+                self.pendingThermoSpecies.append(spec)
+
+    def applyThermoLibraryLabel(self, spec):
+        """
+        Name the unlabeled species `spec` after its thermo data, if a thermo
+        library has a name for it.
+        """
+        if spec.thermo and spec.thermo.label != '':
+            logging.info('Species with SMILES of {0} named {1} based on thermo library name'.format(spec.molecule[0].toSMILES().replace('/','').replace('\\',''),spec.thermo.label))
+            spec.label = spec.thermo.label
+
+    def collectThermoEstimates(self):
+        """
+        Wait for the thermo estimates of new species that are still running
+        on the executor, and replace the futures in their thermo attributes
+        with the results. This must be done before the thermo of the species
+        is read or the species are pickled.
+        """
+        for spec in self.pendingThermoSpecies:
+            spec.getThermoData()
+            if spec.label == '':
+                self.applyThermoLibraryLabel(spec)
+        self.pendingThermoSpecies = []
+
     def checkForExistingReaction(self, rxn):
         """
         Check to see if an existing reaction has the same reactants, products, and
@@ -690,6 +715,8 @@ class CoreEdgeReactionModel:
         ################################################################
         # Begin processing the new species and reactions
         
+        self.collectThermoEstimates()
+
         # Generate kinetics of new reactions
         if self.newReactionList:
             logging.info('Generating kinetics for new reactions...')
@@ -1043,6 +1070,9 @@ class CoreEdgeReactionModel:
         logging.info('After model enlargement:')
         logging.info('    The model core has {0:d} species and {1:d} reactions'.format(coreSpeciesCount, coreReactionCount))
         logging.info('    The model edge has {0:d} species and {1:d} reactions'.format(edgeSpeciesCount, edgeReactionCount))
+        hits, misses = getDB('kinetics').getTemplateKineticsStatistics()
+        if hits + misses > 0:
+            logging.info('    Template kinetics estimates: {0:d} reused, {1:d} computed'.format(hits, misses))
         logging.info('')
 
     def addSpeciesToCore(self, spec):
@@ -1119,7 +1149,7 @@ class CoreEdgeReactionModel:
         reactionSystems is a list of reactionSystem objects
         """
         self.Tmax = Tmax
-        Gs = [spc.thermo.getFreeEnergy(Tmax) for spc in self.core.species]
+        Gs = self.getFreeEnergies(self.core.species, Tmax)
         self.Gmax = max(Gs)
         self.Gmin = min(Gs)
         
@@ -1129,14 +1159,25 @@ class CoreEdgeReactionModel:
         self.reactionSystems = reactionSystems
         self.maximumEdgeSpecies = maximumEdgeSpecies
     
+    def getFreeEnergies(self, spcs, T):
+        """
+        Return an array of the Gibbs free energies in J/mol of the species
+        `spcs` at temperature `T` in K. Only these species are packed into the
+        thermo table and evaluated at once, so the cost does not grow with the
+        size of the model.
+        """
+        self.thermoTable.setSpecies(spcs)
+        return self.thermoTable.getFreeEnergies(T)
+
     def thermoFilterSpecies(self, spcs):
         """
         checks Gibbs energy of the species in species against the
         maximum allowed Gibbs energy
         """
         Tmax = self.Tmax
+        Gs = dict(zip(spcs, self.getFreeEnergies(spcs, Tmax)))
         for spc in spcs:
-            G = spc.thermo.getFreeEnergy(Tmax)
+            G = Gs[spc]
             if G > self.Gfmax:
                 Gn = (G-self.Gmax)/(self.Gmax-self.Gmin)
                 logging.info('Removing species {0} with Gibbs energy {1} from edge because it\'s Gibbs number {2} is greater than the toleranceThermoKeepSpeciesInEdge of {3} '.format(spc,G,Gn,self.toleranceThermoKeepSpeciesInEdge))
@@ -1164,7 +1205,7 @@ class CoreEdgeReactionModel:
             logging.info('Reached maximum number of edge species')
             logging.info('Attempting to remove excess edge species with Thermodynamic filtering')
             spcs = self.edge.species
-            Gfs = numpy.array([spc.thermo.getFreeEnergy(Tmax) for spc in spcs])
+            Gfs = self.getFreeEnergies(spcs, Tmax)
             Gns = (Gfs-self.Gmax)/(self.Gmax-self.Gmin) 
             inds = numpy.argsort(Gns) #could actually do this with the Gfs, but want to print the Gn value later
             inds = inds[::-1] #get in order of increasing Gf
@@ -1379,9 +1420,10 @@ class CoreEdgeReactionModel:
         # remove from the global list of species, to free memory
         formula = spec.molecule[0].getFormula()
         self.speciesDict[formula].remove(spec)
-        if spec in self.speciesCache:
-            self.speciesCache.remove(spec)
-            self.speciesCache.append(None)
+        key = spec.molecule[0].get_resonance_hash()
+        self.speciesRegistry[key].remove(spec)
+        if not self.speciesRegistry[key]:
+            del self.speciesRegistry[key]
 
     def addReactionToCore(self, rxn):
         """
@@ -1518,9 +1560,12 @@ class CoreEdgeReactionModel:
         for spec in self.newSpeciesList:            
             if spec.reactive:
                 submit(spec,self.solventName)
+                self.trackThermoEstimate(spec)
 
             self.addSpeciesToCore(spec)
 
+        self.collectThermoEstimates()
+
         for rxn in self.newReactionList:
             if self.pressureDependence and rxn.isUnimolecular():
                 # If this is going to be run through pressure dependence code,
@@ -1528,6 +1573,8 @@ class CoreEdgeReactionModel:
                 # ...but are Seed Mechanisms run through PDep? Perhaps not.
                 for spec in itertools.chain(rxn.reactants, rxn.products):
                     submit(spec,self.solventName)
+                    self.trackThermoEstimate(spec)
+                self.collectThermoEstimates()
 
                 rxn.fixBarrierHeight(forcePositive=True)
             self.addReactionToCore(rxn)
@@ -1607,9 +1654,12 @@ class CoreEdgeReactionModel:
         for spec in self.newSpeciesList:
             if spec.reactive: 
                 submit(spec,self.solventName)
+                self.trackThermoEstimate(spec)
 
             self.addSpeciesToEdge(spec)
 
+        self.collectThermoEstimates()
+
         for rxn in self.newReactionList:
             # Note that we haven't actually evaluated any fluxes at this point
             # Instead, we remove the comment below if the reaction is moved to
@@ -1760,11 +1810,15 @@ class CoreEdgeReactionModel:
         
         # Iterate over all the networks, updating the invalid ones as necessary
         # self = reactionModel object
-        updatedNetworks = []
-        for network in self.networkList:
-            if not network.valid:
-                network.update(self, self.pressureDependence)
-                updatedNetworks.append(network)
+        networks = [network for network in self.networkList
+                    if not network.valid and network.prepareUpdate(self, self.pressureDependence)]
+        # The master equations do not depend on the reaction model, so they
+        # are solved by the workers of the executor for copies of the networks
+        self.pressureDependence.network = None
+        results = map_(calculateNetKinetics, networks, [self.pressureDependence] * len(networks))
+        for network, (K, netKinetics, caches) in itertools.izip(networks, results):
+            network.densStatesCache, network.microcanonicalRateCache = caches
+            network.applyUpdate(self, self.pressureDependence, K, netKinetics)
             
         # PDepReaction objects generated from partial networks are irreversible
         # However, it makes more sense to have reversible reactions in the core
@@ -1774,16 +1828,17 @@ class CoreEdgeReactionModel:
         # that they skip over is not itself in the core
         index = 0
         coreReactionCount = len(self.core.reactions)
+        self.thermoTable.setReactions([reaction for reaction in self.core.reactions if isinstance(reaction, PDepReaction)])
         while index < coreReactionCount:
             reaction = self.core.reactions[index]
             if isinstance(reaction, PDepReaction):
                 for reaction2 in self.core.reactions[index+1:]:
                     if isinstance(reaction2, PDepReaction) and reaction.reactants == reaction2.products and reaction.products == reaction2.reactants:
                         # We've found the PDepReaction for the reverse direction
-                        dGrxn = reaction.getFreeEnergyOfReaction(300.)
+                        dGrxn = self.thermoTable.getFreeEnergyOfReaction(reaction, 300.)
                         kf = reaction.getRateCoefficient(1000,1e5)
-                        kr = reaction.getRateCoefficient(1000,1e5) / reaction.getEquilibriumConstant(1000)
-                        kf2 = reaction2.getRateCoefficient(1000,1e5) / reaction2.getEquilibriumConstant(1000)
+                        kr = reaction.getRateCoefficient(1000,1e5) / self.thermoTable.getEquilibriumConstant(reaction, 1000)
+                        kf2 = reaction2.getRateCoefficient(1000,1e5) / self.thermoTable.getEquilibriumConstant(reaction2, 1000)
                         kr2 = reaction2.getRateCoefficient(1000,1e5)
                         if kf / kf2 < 0.5 or kf / kf2 > 2.0:
                             # Most pairs of reactions should satisfy thermodynamic consistency (or at least be "close")
@@ -1827,6 +1882,30 @@ class CoreEdgeReactionModel:
         markDuplicateReactions(rxnList)
         
     
+    def registerSpecies(self, spec):
+        """
+        Adds the species to the species dictionaries used to check for
+        existing species.
+
+        The species is stored both under its molecular formula in
+        `speciesDict` and under the resonance-invariant hash of its
+        molecular graph in `speciesRegistry`. Since all resonance structures
+        of a species share the same hash, a lookup in `speciesRegistry`
+        returns at most a handful of candidates regardless of the size of
+        the model.
+        """
+        formula = spec.molecule[0].getFormula()
+        if formula in self.speciesDict:
+            self.speciesDict[formula].append(spec)
+        else:
+            self.speciesDict[formula] = [spec]
+
+        key = spec.molecule[0].get_resonance_hash()
+        if key in self.speciesRegistry:
+            self.speciesRegistry[key].append(spec)
+        else:
+            self.speciesRegistry[key] = [spec]
+
     def registerReaction(self, rxn):
         """
         Adds the reaction to the reaction database.
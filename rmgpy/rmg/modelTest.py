@@ -29,17 +29,20 @@
 ###############################################################################
 
 import os
+import cPickle
 import unittest 
 
 from rmgpy import settings
 from rmgpy.data.rmg import RMGDatabase, database
 from rmgpy.rmg.main import RMG
 from rmgpy.reaction import Reaction
+from rmgpy.molecule import Molecule
 from rmgpy.rmg.react import react
 from rmgpy.rmg.model import *
 from rmgpy.data.base import ForbiddenStructures
 from rmgpy.data.kinetics.family import TemplateReaction
 from rmgpy.data.thermo import *
+from rmgpy.scoop_framework.util import setExecutor
 ###################################################
 
 
@@ -89,6 +92,75 @@ class TestSpecies(unittest.TestCase):
         import rmgpy.data.rmg
         rmgpy.data.rmg.database = None
 
+class TestThermoEstimates(unittest.TestCase):
+    """
+    Contains unit tests of new species whose thermo is estimated by an
+    executor running in the background.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        A method that is run before each unit test in this class.
+        """
+        cls.rmg = RMG()
+        cls.rmg.database = RMGDatabase()
+        path = os.path.join(settings['database.directory'])
+        cls.rmg.database.loadThermo(os.path.join(path, 'thermo'))
+
+    def makeNewSpecies(self, executor):
+        """
+        Make new species while the thermo estimates are run by the executor
+        with the given name, and return them once the estimates are collected.
+        """
+        setExecutor(executor, 2)
+        try:
+            cerm = CoreEdgeReactionModel()
+            species = []
+            for smiles in ['CCC', '[CH3]', 'O=C=O']:
+                spc, isNew = cerm.makeNewSpecies(Species().fromSMILES(smiles))
+                self.assertTrue(isNew)
+                species.append(spc)
+            cerm.collectThermoEstimates()
+            self.assertEqual(cerm.pendingThermoSpecies, [])
+        finally:
+            setExecutor('serial')
+        return species
+
+    def checkMakeNewSpecies(self, executor):
+        """
+        Check that the species made while the thermo estimates are run by
+        the executor with the given name match those made serially, and
+        that they can be pickled.
+        """
+        expected = self.makeNewSpecies('serial')
+        for spc0, spc in zip(expected, self.makeNewSpecies(executor)):
+            self.assertTrue(isinstance(spc.thermo, (NASA, Wilhoit, ThermoData)))
+            self.assertEqual(spc.label, spc0.label)
+            self.assertAlmostEqual(spc.getEnthalpy(298), spc0.getEnthalpy(298), 6)
+            spc = cPickle.loads(cPickle.dumps(spc, -1))
+            self.assertTrue(isinstance(spc.thermo, (NASA, Wilhoit, ThermoData)))
+            self.assertAlmostEqual(spc.getEnthalpy(298), spc0.getEnthalpy(298), 6)
+
+    def testMakeNewSpeciesWithThreads(self):
+        """
+        Test that makeNewSpecies works with the thread executor.
+        """
+        self.checkMakeNewSpecies('thread')
+
+    def testMakeNewSpeciesWithProcesses(self):
+        """
+        Test that makeNewSpecies works with the process executor.
+        """
+        self.checkMakeNewSpecies('process')
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Reset the loaded database
+        """
+        import rmgpy.data.rmg
+        rmgpy.data.rmg.database = None
+
 class TestCoreEdgeReactionModel(unittest.TestCase):
     """
     Contains unit tests of the CoreEdgeReactionModel class.
@@ -213,6 +285,33 @@ class TestCoreEdgeReactionModel(unittest.TestCase):
         self.assertEquals(len(cerm.speciesDict), len(spcs) - 1)    
         self.assertEquals(len(cerm.indexSpeciesDict), len(spcs) - 1)
 
+    def test_checkForExistingSpecies(self):
+        """
+        Test that CoreEdgeReactionModel.checkForExistingSpecies finds registered species
+        from any of their resonance structures, and does not match other isomers.
+        """
+        cerm = CoreEdgeReactionModel()
+
+        spcs = [Species().fromSMILES('C=CC=C[CH]C'),
+                Species().fromSMILES('CCCO'),
+                Species().fromSMILES('c1ccccc1')]
+        for spc in spcs:
+            cerm.makeNewSpecies(spc)
+
+        found, reactive, spec = cerm.checkForExistingSpecies(Molecule().fromSMILES('C[CH]C=CC=C'))
+        self.assertTrue(found)
+        self.assertTrue(spec is cerm.indexSpeciesDict[1])
+        found, reactive, spec = cerm.checkForExistingSpecies(Molecule().fromSMILES('[CH2]C=CC=CC'))
+        self.assertTrue(found)
+        self.assertTrue(spec is cerm.indexSpeciesDict[1])
+        found, reactive, spec = cerm.checkForExistingSpecies(Molecule().fromSMILES('C1=CC=CC=C1'))
+        self.assertTrue(found)
+        self.assertTrue(spec is cerm.indexSpeciesDict[3])
+
+        found, reactive, spec = cerm.checkForExistingSpecies(Molecule().fromSMILES('CC(C)O'))
+        self.assertFalse(found)
+        self.assertTrue(spec is None)
+
     def test_append_unreactive_structure(self):
         """
         Test that the CoreEdgeReactionModel.makeNewSpecies method correctly appends a non-representative resonance
@@ -316,7 +415,9 @@ class TestCoreEdgeReactionModel(unittest.TestCase):
                                                  maximumEdgeSpecies=1,
                                                  reactionSystems=[])
         
+        edgeSpecies = cerm.edge.species[:]
         cerm.thermoFilterSpecies(cerm.edge.species) #should not do anythinb because toleranceThermoKeepSpeciesInEdge is high
+        self.assertEqual(cerm.thermoTable.species, edgeSpecies) #only the filtered species are evaluated
         
         
         difset = set([x.molecule[0].toSMILES() for x in cerm.edge.species])-set([x.molecule[0].toSMILES() for x in cerm.core.species])
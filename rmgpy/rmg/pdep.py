@@ -154,8 +154,18 @@ class PDepNetwork(rmgpy.pdep.network.Network):
 
     def cleanup(self):
         """
-        Delete intermedate arrays used to compute k(T,P) values.
-        """
+        Delete intermedate arrays used to compute k(T,P) values. The cached
+        densities of states and :math:`k(E)` values of the current
+        configurations and path reactions are kept for the next update.
+        """
+        configurations = set([tuple([str(spec) for spec in configuration.species])
+                              for configuration in self.isomers + self.reactants + self.products])
+        self.densStatesCache = dict([(key, value) for key, value in self.densStatesCache.iteritems()
+                                     if key in configurations])
+        pathReactions = set([str(rxn) for rxn in self.pathReactions])
+        self.microcanonicalRateCache = dict([(key, value) for key, value in self.microcanonicalRateCache.iteritems()
+                                             if key[0] in pathReactions])
+        
         for isomer in self.isomers:
             isomer.cleanup()
         for reactant in self.reactants:
@@ -575,6 +585,10 @@ class PDepNetwork(rmgpy.pdep.network.Network):
             if not found:
                 self.netReactions.append(reaction)
 
+        # Reuse the densities of states and k(E) values of the other network
+        self.densStatesCache.update(other.densStatesCache)
+        self.microcanonicalRateCache.update(other.microcanonicalRateCache)
+
         # Mark this network as invalid
         self.valid = False
 
@@ -652,9 +666,18 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         Regenerate the :math:`k(T,P)` values for this partial network if the
         network is marked as invalid.
         """
+        if self.prepareUpdate(reactionModel, pdepSettings):
+            K, netKinetics = self.calculateNetKinetics(pdepSettings)
+            self.applyUpdate(reactionModel, pdepSettings, K, netKinetics)
+
+    def prepareUpdate(self, reactionModel, pdepSettings):
+        """
+        Prepare this partial network for the calculation of its :math:`k(T,P)`
+        values by generating the states data of its species and the energies
+        of its transition states. Returns ``True`` if the network is invalid
+        and its :math:`k(T,P)` values need to be calculated.
+        """
         from rmgpy.kinetics import Arrhenius, KineticsData, MultiArrhenius
-        from rmgpy.pdep.collision import SingleExponentialDown
-        from rmgpy.pdep.reaction import fitInterpolationModel
         
         # Get the parameters for the pressure dependence calculation
         job = pdepSettings
@@ -663,17 +686,6 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         
         Tmin = job.Tmin.value_si
         Tmax = job.Tmax.value_si
-        Pmin = job.Pmin.value_si
-        Pmax = job.Pmax.value_si
-        Tlist = job.Tlist.value_si
-        Plist = job.Plist.value_si
-        maximumGrainSize = job.maximumGrainSize.value_si if job.maximumGrainSize is not None else 0.0
-        minimumGrainCount = job.minimumGrainCount
-        method = job.method
-        interpolationModel = job.interpolationModel
-        activeJRotor = job.activeJRotor
-        activeKRotor = job.activeKRotor
-        rmgmode = job.rmgmode
         
         # Figure out which configurations are isomers, reactant channels, and product channels
         self.updateConfigurations(reactionModel)
@@ -686,9 +698,9 @@ class PDepNetwork(rmgpy.pdep.network.Network):
                 raise PressureDependenceError('Pressure-dependent kinetics encountered for path reaction {0} in PDepNetwork #{1:d}.'.format(rxn, self.index))
         
         # Do nothing if the network is already valid
-        if self.valid: return
+        if self.valid: return False
         # Do nothing if there are no explored wells
-        if len(self.explored) == 0 and len(self.source) > 1: return
+        if len(self.explored) == 0 and len(self.source) > 1: return False
         # Log the network being updated
         logging.info("Updating {0:s}".format(self))
 
@@ -759,9 +771,62 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         
         self.printSummary(level=logging.INFO)
 
+        return True
+
+    def calculateNetKinetics(self, pdepSettings):
+        """
+        Calculate the :math:`k(T,P)` values of this partial network, which
+        must have been prepared using :meth:`prepareUpdate`, and fit the
+        interpolation model to the values of each net reaction from the source.
+        Returns the array of :math:`k(T,P)` values and a list of the fitted
+        kinetics of the net reactions to each configuration, with ``None`` for
+        the source.
+
+        This method does not use the reaction model, so it can be evaluated on
+        a copy of the network in a worker process.
+        """
+        job = pdepSettings
+        Tlist = job.Tlist.value_si
+        Plist = job.Plist.value_si
+        maximumGrainSize = job.maximumGrainSize.value_si if job.maximumGrainSize is not None else 0.0
+
         # Calculate the rate coefficients
-        self.initialize(Tmin, Tmax, Pmin, Pmax, maximumGrainSize, minimumGrainCount, activeJRotor, activeKRotor, rmgmode)
-        K = self.calculateRateCoefficients(Tlist, Plist, method)
+        self.initialize(job.Tmin.value_si, job.Tmax.value_si, job.Pmin.value_si, job.Pmax.value_si,
+                        maximumGrainSize, job.minimumGrainCount, job.activeJRotor, job.activeKRotor, job.rmgmode)
+        K = self.calculateRateCoefficients(Tlist, Plist, job.method)
+
+        # Fit the net reaction kinetics using interpolation model
+        configurations = []
+        configurations.extend([isom.species[:] for isom in self.isomers])
+        configurations.extend([reactant.species[:] for reactant in self.reactants])
+        configurations.extend([product.species[:] for product in self.products])
+        j = configurations.index(self.source)
+        netKinetics = []
+        for i in range(K.shape[2]):
+            if i == j:
+                netKinetics.append(None)
+            else:
+                # Use the order of the existing net reaction, if there is one
+                order = len(self.source)
+                for r in self.netReactions:
+                    if r.hasTemplate(configurations[j], configurations[i]):
+                        order = len(r.reactants)
+                kdata = K[:,:,i,j].copy()
+                kdata *= 1e6 ** (order-1)
+                kunits = {1: 's^-1', 2: 'cm^3/(mol*s)', 3: 'cm^6/(mol^2*s)'}[order]
+                netKinetics.append(job.fitInterpolationModel(Tlist, Plist, kdata, kunits))
+
+        return K, netKinetics
+
+    def applyUpdate(self, reactionModel, pdepSettings, K, netKinetics):
+        """
+        Set the kinetics of the net reactions of this partial network to the
+        `netKinetics` calculated with :meth:`calculateNetKinetics` from the
+        :math:`k(T,P)` values `K`, adding new net reactions to the reaction
+        model, and mark the network as valid.
+        """
+        Tlist = pdepSettings.Tlist.value_si
+        Plist = pdepSettings.Plist.value_si
 
         # Generate PDepReaction objects
         configurations = []
@@ -816,12 +881,8 @@ class PDepNetwork(rmgpy.pdep.network.Network):
                         else:
                             reactionModel.addReactionToEdge(netReaction)
 
-                # Set/update the net reaction kinetics using interpolation model
-                kdata = K[:,:,i,j].copy()
-                order = len(netReaction.reactants)
-                kdata *= 1e6 ** (order-1)
-                kunits = {1: 's^-1', 2: 'cm^3/(mol*s)', 3: 'cm^6/(mol^2*s)'}[order]
-                netReaction.kinetics = job.fitInterpolationModel(Tlist, Plist, kdata, kunits)
+                # Set/update the net reaction kinetics
+                netReaction.kinetics = netKinetics[i]
 
                 # Check: For each net reaction that has a path reaction, make
                 # sure the k(T,P) values for the net reaction do not exceed
@@ -863,3 +924,16 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         
         # We're done processing this network, so mark it as valid
         self.valid = True
+
+################################################################################
+
+def calculateNetKinetics(network, pdepSettings):
+    """
+    Calculate the :math:`k(T,P)` values and the fitted net reaction kinetics
+    of the prepared partial `network`. This function is passed to the workers
+    by :meth:`CoreEdgeReactionModel.updateUnimolecularReactionNetworks`, so it
+    also returns the cached densities of states and :math:`k(E)` values of the
+    network, which would otherwise be lost with the worker's copy of it.
+    """
+    K, netKinetics = network.calculateNetKinetics(pdepSettings)
+    return K, netKinetics, (network.densStatesCache, network.microcanonicalRateCache)
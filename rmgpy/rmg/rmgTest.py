@@ -123,7 +123,7 @@ class TestRMGWorkFlow(unittest.TestCase):
     def testCheckForExistingSpeciesForBiAromatics(self):
         """
         Test RMG checkForExistingSpecies can correctly check isomorphism for biaromatics. 
-        In this test, DPP is a species already stored in rmg speciesDict, mol_test is a newly
+        In this test, DPP is a species already registered in the rmg species dictionaries, mol_test is a newly
         created molecule which has one kekulized benzene ring and one double_bond-single_bond
         benzene ring.
         """
@@ -132,11 +132,7 @@ class TestRMGWorkFlow(unittest.TestCase):
         rmg_test.reactionModel = CoreEdgeReactionModel()
         DPP = Species().fromSMILES('C1=CC=C(C=C1)CCCC1C=CC=CC=1')
         DPP.generate_resonance_structures()
-        formula = DPP.molecule[0].getFormula()
-        if formula in rmg_test.reactionModel.speciesDict:
-            rmg_test.reactionModel.speciesDict[formula].append(DPP)
-        else:
-            rmg_test.reactionModel.speciesDict[formula] = [DPP]
+        rmg_test.reactionModel.registerSpecies(DPP)
 
         mol_test = Molecule().fromAdjacencyList(
 """
@@ -260,6 +256,8 @@ class TestRMGScript(unittest.TestCase):
         self.assertEqual(args.quiet, False)
         self.assertEqual(args.restart, False)
         self.assertEqual(args.verbose, False)
+        self.assertEqual(args.executor, None)
+        self.assertEqual(args.processes, None)
 
     def test_parse_command_line_non_defaults(self):
         """
@@ -268,7 +266,7 @@ class TestRMGScript(unittest.TestCase):
 
         # Acquire arguments
         args = parse_command_line_arguments(['other_name.py', '-d', '-o', '/test/output/dir/', '-r', '-P',
-                                            '-t', '01:20:33:45', '-k'])
+                                            '-t', '01:20:33:45', '-k', '-e', 'process', '-n', '4'])
 
         # Test expected values
         self.assertEqual(args.walltime, '01:20:33:45')
@@ -279,3 +277,5 @@ class TestRMGScript(unittest.TestCase):
         self.assertEqual(args.postprocess, True)
         self.assertEqual(args.profile, True)
         self.assertEqual(args.restart, True)
+        self.assertEqual(args.executor, 'process')
+        self.assertEqual(args.processes, 4)
@@ -35,6 +35,8 @@ This module contains settings classes for manipulation of RMG run parameters
     `rtol`                                          The relative tolerance used in the ODE/DAE solver
     `sens_atol`                                     The absolute tolerance used in the ODE/DAE solver for the sensitivities
     `sens_rtol`                                     The relative tolerance used in the ODE/DAE solver for the sensitivities
+    `coreOnlyResidual`                              Only evaluate core reactions in the residual and compute edge fluxes once per time step
+    `vectorizedJacobian`                            Assemble the analytical Jacobian in one vectorized pass over the reactant/product indices
     `toleranceKeepInEdge`                           The relative species flux below which species are discarded from the edge
     `toleranceMoveToCore`                           The relative species flux above which species are moved from the edge to the core
     `toleranceInterruptSimulation`                  The relative species flux above which the simulation will halt
@@ -118,8 +120,10 @@ class SimulatorSettings(object):
     """
     class for holding the parameters affecting the behavior of the solver
     """
-    def __init__(self,atol=1e-16, rtol=1e-8, sens_atol=1e-6, sens_rtol=1e-4):
+    def __init__(self,atol=1e-16, rtol=1e-8, sens_atol=1e-6, sens_rtol=1e-4, coreOnlyResidual=False, vectorizedJacobian=False):
         self.atol = atol
         self.rtol = rtol
         self.sens_atol = sens_atol
-        self.sens_rtol = sens_rtol
\ No newline at end of file
+        self.sens_rtol = sens_rtol
+        self.coreOnlyResidual = coreOnlyResidual
+        self.vectorizedJacobian = vectorizedJacobian
\ No newline at end of file
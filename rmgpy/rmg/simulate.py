@@ -0,0 +1,610 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+Contains the :class:`ParallelSimulator` class, which runs the reaction system
+simulations of an RMG iteration in a pool of worker processes.
+
+When the main loop of :meth:`RMG.execute` reaches the first sample of a
+reaction system, that sample and the first sample of every following
+reaction system are simulated at the same time on the current model. The
+results are handed back in the order of the reaction systems as soon as each
+one is done, so the enlarge step for one reaction system overlaps with the
+simulations of the others. The following reaction systems are therefore
+simulated on the model as it was before the earlier ones enlarged it, and
+objects that have left the edge in the meantime are dropped from their
+results. Later samples of a ranged reaction system are run serially, since
+their conditions are chosen from the results of the earlier samples.
+
+The worker processes are forked once per run, so they start with a
+copy-on-write view of the model instead of receiving a pickled copy. A
+:class:`ModelMirror` then keeps their copy up to date: before each dispatch,
+the species, reactions and networks added to the model, the ones that
+changed and the new contents of the model lists are appended to an update
+log, which each worker reads up to the point given with its task. Objects
+returned by a worker (species, reactions and networks to enlarge, and the
+surface) are passed back as their rows in the mirror and looked up again in
+the parent process.
+"""
+
+import os
+import struct
+import logging
+import tempfile
+import traceback
+import multiprocessing
+import cPickle
+import cStringIO
+
+from rmgpy.rmg.pdep import PDepReaction
+from rmgpy.snapshot import getFingerprint
+
+# Attributes of a reaction system that the main loop reads after a simulation
+REACTION_SYSTEM_STATE = ['maxEdgeSpeciesRateRatios', 'maxNetworkLeakRateRatios',
+                         'prunableSpeciesIndices', 'prunableNetworkIndices',
+                         'unimolecularThreshold', 'bimolecularThreshold', 'trimolecularThreshold',
+                         'snapshots', 'T', 'P', 'V']
+
+# The lists of the job that are mirrored in the worker processes, and the
+# tables of the objects that they contain
+MIRRORED_LISTS = [
+    ('coreSpecies', 'species'),
+    ('edgeSpecies', 'species'),
+    ('coreReactions', 'reactions'),
+    ('edgeReactions', 'reactions'),
+    ('surfaceSpecies', 'species'),
+    ('surfaceReactions', 'reactions'),
+    ('networks', 'networks'),
+    ('prunableSpecies', 'species'),
+    ('prunableNetworks', 'networks'),
+]
+
+# The tables of a model mirror, and the prefixes of the references to their rows
+TABLES = [('species', 'S'), ('reactions', 'R'), ('networks', 'N')]
+
+# The length of each update in the update log
+_UPDATE_HEADER = struct.Struct('<Q')
+
+# The job state inherited by the forked worker processes
+_context = {}
+
+################################################################################
+
+def getMirroredLists(reactionModel, prunableSpecies, prunableNetworks):
+    """
+    Return a dict of the lists of `reactionModel` that are mirrored in the
+    worker processes, along with the lists of `prunableSpecies` and
+    `prunableNetworks` of the current iteration.
+    """
+    return {
+        'coreSpecies': reactionModel.core.species,
+        'edgeSpecies': reactionModel.edge.species,
+        'coreReactions': reactionModel.core.reactions,
+        'edgeReactions': reactionModel.edge.reactions,
+        'surfaceSpecies': reactionModel.surface.species,
+        'surfaceReactions': reactionModel.surface.reactions,
+        'networks': reactionModel.networkList,
+        'prunableSpecies': prunableSpecies,
+        'prunableNetworks': prunableNetworks,
+    }
+
+class ModelMirror(object):
+    """
+    The species, reactions and networks of an RMG job as seen by the worker
+    processes of a :class:`ParallelSimulator`. Each object is given a row in
+    its table when it is first seen. The workers are forked with a copy of
+    the mirror, so the rows are the same in every process. :meth:`sync`
+    packs the changes made to the mirrored lists since the previous call
+    into an update, and :meth:`apply` applies an update to the copy of a
+    worker. The attributes are:
+
+    =================== ===================================================
+    Attribute           Description
+    =================== ===================================================
+    `objects`           The objects of each table, in the order of their
+                        rows; the rows of removed objects are ``None``
+    `rows`              The rows of the objects of each table, indexed by
+                        the ids of the objects
+    `members`           The rows of the objects in each mirrored list
+    `fingerprints`      The fingerprints of the objects as of the last
+                        update, indexed by the ids of the objects
+    `version`           The number of updates made to the mirror
+    =================== ===================================================
+
+    The mirror keeps the objects that have a row alive, so their ids are not
+    reused by other objects. The version therefore changes whenever the
+    mirrored lists, or the objects in them, do.
+    """
+
+    def __init__(self, lists):
+        self.objects = dict([(table, []) for table, prefix in TABLES])
+        self.rows = dict([(table, {}) for table, prefix in TABLES])
+        self.members = {}
+        self.fingerprints = {}
+        self.version = 0
+        # The ids of the objects pickled in full by the update being packed
+        self.inline = set()
+        for name, table in MIRRORED_LISTS:
+            for obj in lists[name]:
+                if id(obj) not in self.rows[table]:
+                    self.add(table, obj)
+                    self.fingerprints[id(obj)] = getFingerprint(obj)
+            self.members[name] = [self.rows[table][id(obj)] for obj in lists[name]]
+
+    def add(self, table, obj):
+        """
+        Give the next row of `table` to `obj`.
+        """
+        self.rows[table][id(obj)] = len(self.objects[table])
+        self.objects[table].append(obj)
+
+    def getLists(self):
+        """
+        Return a dict of the mirrored lists.
+        """
+        return dict([(name, [self.objects[table][row] for row in self.members[name]])
+                     for name, table in MIRRORED_LISTS])
+
+    def sync(self, lists):
+        """
+        Bring the mirror up to date with the dict `lists` of mirrored lists.
+        Return the pickled update that does the same to a copy of the
+        mirror, or ``None`` if nothing changed.
+        """
+        new = dict([(table, []) for table, prefix in TABLES])
+        modified = dict([(table, []) for table, prefix in TABLES])
+        seen = set()
+        for name, table in MIRRORED_LISTS:
+            rows = self.rows[table]
+            for obj in lists[name]:
+                key = id(obj)
+                if key in seen:
+                    continue
+                seen.add(key)
+                fingerprint = getFingerprint(obj)
+                if key not in rows:
+                    new[table].append(obj)
+                elif fingerprint != self.fingerprints[key]:
+                    modified[table].append((obj, self.fingerprints[key]))
+                self.fingerprints[key] = fingerprint
+
+        removed = {}
+        for table, prefix in TABLES:
+            removed[table] = sorted([row for key, row in self.rows[table].iteritems() if key not in seen])
+            for obj in new[table]:
+                self.add(table, obj)
+        members = {}
+        for name, table in MIRRORED_LISTS:
+            rows = [self.rows[table][id(obj)] for obj in lists[name]]
+            if rows != self.members[name]:
+                members[name] = rows
+        if not (members or any(new.values()) or any(modified.values()) or any(removed.values())):
+            return None
+
+        species = []
+        for spec, fingerprint in modified['species']:
+            species.append((self.rows['species'][id(spec)], {
+                'thermo': spec.thermo,
+                'conformer': spec.conformer,
+                'transportData': spec.transportData,
+                'energyTransferModel': spec.energyTransferModel,
+                'reactive': spec.reactive,
+                # Resonance structures are only ever appended to a species
+                'addedMolecules': spec.molecule[fingerprint[-1]:],
+            }))
+        reactions = [(self.rows['reactions'][id(rxn)], {'kinetics': rxn.kinetics, 'reversible': rxn.reversible, 'duplicate': rxn.duplicate})
+                     for rxn, fingerprint in modified['reactions']]
+        networks = [(self.rows['networks'][id(network)], network) for network, fingerprint in modified['networks']]
+        update = {
+            'new': new,
+            'species': species,
+            'reactions': reactions,
+            'networks': networks,
+            'removed': removed,
+            'members': members,
+        }
+
+        # New and changed networks are pickled in full, and the other objects
+        # of the mirror as references to their rows
+        self.inline = set([id(obj) for objects in new.values() for obj in objects] + [id(network) for row, network in networks])
+        f = cStringIO.StringIO()
+        pickler = cPickle.Pickler(f, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self.persistentID
+        try:
+            pickler.dump(update)
+        finally:
+            self.inline = set()
+
+        self.remove(removed)
+        self.members.update(members)
+        self.version += 1
+        return f.getvalue()
+
+    def apply(self, data):
+        """
+        Apply the update `data` returned by :meth:`sync` to the mirror.
+        """
+        unpickler = cPickle.Unpickler(cStringIO.StringIO(data))
+        unpickler.persistent_load = self.persistentLoad
+        update = unpickler.load()
+
+        for table, prefix in TABLES:
+            for obj in update['new'][table]:
+                self.add(table, obj)
+        for row, attributes in update['species']:
+            spec = self.objects['species'][row]
+            spec.molecule.extend(attributes.pop('addedMolecules'))
+            for attribute, value in attributes.iteritems():
+                setattr(spec, attribute, value)
+        for row, attributes in update['reactions']:
+            reaction = self.objects['reactions'][row]
+            for attribute, value in attributes.iteritems():
+                setattr(reaction, attribute, value)
+        for row, network in update['networks']:
+            del self.rows['networks'][id(self.objects['networks'][row])]
+            self.objects['networks'][row] = network
+            self.rows['networks'][id(network)] = row
+            # The net reactions of a network that changed are kept, so they
+            # must refer to its new copy
+            for reaction in network.netReactions:
+                if isinstance(reaction, PDepReaction):
+                    reaction.network = network
+
+        self.remove(update['removed'])
+        self.members.update(update['members'])
+        self.version += 1
+
+    def remove(self, removed):
+        """
+        Release the objects at the rows in the dict `removed` of lists of
+        rows, indexed by table.
+        """
+        for table, rows in removed.iteritems():
+            for row in rows:
+                key = id(self.objects[table][row])
+                del self.rows[table][key]
+                self.fingerprints.pop(key, None)
+                self.objects[table][row] = None
+
+    def persistentID(self, obj):
+        key = id(obj)
+        if key in self.inline:
+            return None
+        for table, prefix in TABLES:
+            row = self.rows[table].get(key)
+            if row is not None:
+                return prefix + str(row)
+        return None
+
+    def persistentLoad(self, pid):
+        for table, prefix in TABLES:
+            if pid[0] == prefix:
+                return self.objects[table][int(pid[1:])]
+
+################################################################################
+
+def encodeObjects(objects, mirror):
+    """
+    Return the list of species, reactions and networks `objects` as a list of
+    ``(table, row)`` tuples giving their rows in the model `mirror`.
+    """
+    codes = []
+    for obj in objects:
+        for table, prefix in TABLES:
+            row = mirror.rows[table].get(id(obj))
+            if row is not None:
+                codes.append((table, row))
+                break
+        else:
+            raise ValueError('Object {0!r} returned by the simulation is not part of the model.'.format(obj))
+    return codes
+
+def decodeObjects(codes, mirror):
+    """
+    Return the objects at the rows of the model `mirror` given by `codes`,
+    the output of :func:`encodeObjects`.
+    """
+    return [mirror.objects[table][row] for table, row in codes]
+
+class _LogCollector(logging.Handler):
+    """
+    A logging handler that keeps the level and message of every record, so
+    that a worker's log output can be replayed by the parent process if and
+    when its result is used.
+    """
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.levelno, record.getMessage()))
+
+def _appendUpdate(path, data):
+    """
+    Append the update `data` to the update log at `path` on disk. Returns
+    the number of bytes written.
+    """
+    with open(path, 'ab') as f:
+        f.write(_UPDATE_HEADER.pack(len(data)))
+        f.write(data)
+    return _UPDATE_HEADER.size + len(data)
+
+def _readUpdates(path, start, end):
+    """
+    Return the list of the updates in the update log at `path` on disk
+    between the byte offsets `start` and `end`.
+    """
+    updates = []
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while f.tell() < end:
+            length, = _UPDATE_HEADER.unpack(f.read(_UPDATE_HEADER.size))
+            updates.append(f.read(length))
+    return updates
+
+def _simulate(task):
+    """
+    Simulate the reaction system given by `task` in a worker process, using
+    the job state in `_context`, after bringing the model mirror up to date
+    with the update log. Return the task, the captured log records, and
+    either ``('ok', result, state, surface)`` or ``('error', message)``.
+    """
+    index, conditions, first, end, settings = task
+
+    rootLogger = logging.getLogger()
+    for handler in rootLogger.handlers[:]:
+        rootLogger.removeHandler(handler)
+    collector = _LogCollector()
+    rootLogger.addHandler(collector)
+
+    try:
+        rmg = _context['rmg']
+        mirror = _context['mirror']
+        reactionModel = rmg.reactionModel
+        reactionSystem = rmg.reactionSystems[index]
+        if end > _context['offset']:
+            for data in _readUpdates(_context['logPath'], _context['offset'], end):
+                mirror.apply(data)
+            _context['offset'] = end
+        lists = mirror.getLists()
+        reactionModel.core.species = lists['coreSpecies']
+        reactionModel.edge.species = lists['edgeSpecies']
+        reactionModel.core.reactions = lists['coreReactions']
+        reactionModel.edge.reactions = lists['edgeReactions']
+        reactionModel.surface.species = lists['surfaceSpecies']
+        reactionModel.surface.reactions = lists['surfaceReactions']
+        reactionModel.networkList = lists['networks']
+
+        # Start from the state of the reaction system in the parent process
+        for attr, value in settings['state'].iteritems():
+            setattr(reactionSystem, attr, value)
+        reactionSystem.prunableSpecies = lists['prunableSpecies']
+        reactionSystem.prunableNetworks = lists['prunableNetworks']
+        if first:
+            # Mirror the reset done by the main loop before the first sample
+            reactionSystem.reset_max_edge_species_rate_ratios()
+        terminated, resurrected, obj, newSurfaceSpecies, newSurfaceReactions, t, x = reactionSystem.simulate(
+            coreSpecies = reactionModel.core.species,
+            coreReactions = reactionModel.core.reactions,
+            edgeSpecies = reactionModel.edge.species,
+            edgeReactions = reactionModel.edge.reactions,
+            surfaceSpecies = reactionModel.surface.species,
+            surfaceReactions = reactionModel.surface.reactions,
+            pdepNetworks = reactionModel.networkList,
+            prune = settings['prune'],
+            modelSettings = settings['modelSettings'],
+            simulatorSettings = settings['simulatorSettings'],
+            conditions = conditions
+        )
+        result = (terminated, resurrected, encodeObjects(obj, mirror) if obj is not None else None,
+                  encodeObjects(newSurfaceSpecies, mirror), encodeObjects(newSurfaceReactions, mirror), t, x)
+        state = dict([(attr, getattr(reactionSystem, attr)) for attr in REACTION_SYSTEM_STATE if hasattr(reactionSystem, attr)])
+        # The simulation edits the surface lists of the model in place
+        surface = (encodeObjects(reactionModel.surface.species, mirror), encodeObjects(reactionModel.surface.reactions, mirror))
+        return task, collector.records, ('ok', result, state, surface)
+    except Exception:
+        return task, collector.records, ('error', traceback.format_exc())
+    finally:
+        rootLogger.removeHandler(collector)
+
+################################################################################
+
+class ParallelSimulator(object):
+    """
+    Runs the simulations of the reaction systems of an RMG job in parallel
+    worker processes. The attributes are:
+
+    =================== ===================================================
+    Attribute           Description
+    =================== ===================================================
+    `rmg`               The :class:`RMG` job
+    `processes`         The number of worker processes
+    `pool`              The pool of worker processes, or ``None`` if it
+                        was not started yet
+    `mirror`            The :class:`ModelMirror` of the model as seen by
+                        the workers
+    `logPath`           The path of the update log read by the workers
+    `logSize`           The size of the update log in bytes
+    `batch`             The iterator over the results of the simulations
+                        in progress, or ``None``
+    `pending`           The indices of the reaction systems whose results
+                        have not been taken from `batch` yet
+    =================== ===================================================
+
+    The workers are started on the first simulation and kept until
+    :meth:`shutdown` is called, or until a simulation fails in a worker.
+    """
+
+    def __init__(self, rmg, processes):
+        self.rmg = rmg
+        self.processes = processes
+        self.pool = None
+        self.mirror = None
+        self.logPath = None
+        self.logSize = 0
+        self.batch = None
+        self.pending = []
+
+    def clear(self):
+        """
+        Wait for the simulations in progress and discard their results.
+        """
+        if self.batch is not None:
+            for result in self.batch:
+                pass
+        self.batch = None
+        self.pending = []
+
+    def start(self, lists):
+        """
+        Fork the worker processes, which inherit the job and a new mirror of
+        the dict `lists` of mirrored lists.
+        """
+        self.mirror = ModelMirror(lists)
+        fd, self.logPath = tempfile.mkstemp(prefix='rmg_simulation_', suffix='.log')
+        os.close(fd)
+        self.logSize = 0
+        _context.update({
+            'rmg': self.rmg,
+            'mirror': self.mirror,
+            'logPath': self.logPath,
+            'offset': 0,
+        })
+        try:
+            self.pool = multiprocessing.Pool(processes=self.processes)
+        finally:
+            _context.clear()
+
+    def shutdown(self):
+        """
+        Stop the worker processes and discard the results in progress.
+        """
+        if self.pool is not None:
+            if self.batch is not None:
+                self.pool.terminate()
+            else:
+                self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.logPath is not None:
+            os.remove(self.logPath)
+            self.logPath = None
+        self.mirror = None
+        self.batch = None
+        self.pending = []
+
+    def sync(self, prunableSpecies, prunableNetworks):
+        """
+        Bring the model mirror, and through the update log the copies of the
+        workers, up to date with the model, starting the workers if needed.
+        """
+        lists = getMirroredLists(self.rmg.reactionModel, prunableSpecies, prunableNetworks)
+        if self.pool is None:
+            self.start(lists)
+        else:
+            data = self.mirror.sync(lists)
+            if data is not None:
+                self.logSize += _appendUpdate(self.logPath, data)
+
+    def simulate(self, index, prune, modelSettings, simulatorSettings, prunableSpecies, prunableNetworks):
+        """
+        Return the result of simulating the first sample of reaction system
+        `index`, in the form returned by :meth:`ReactionSystem.simulate`.
+
+        If no simulation of reaction system `index` is in progress, it is
+        started together with the first samples of all of the following
+        reaction systems on the current model. Their results are then
+        returned by the following calls in the order of the reaction
+        systems, as soon as each is done, while the others keep running.
+
+        The reaction system state read by the main loop, and the surface of
+        the model, are updated as if the simulation had run in this process.
+        Species, reactions and networks that have left the model since the
+        simulation started are dropped from the objects to enlarge. Return
+        ``None`` if the simulation failed in the worker, so the caller can
+        run it serially and handle the error as usual.
+        """
+        rmg = self.rmg
+        if not self.pending or self.pending[0] != index:
+            self.clear()
+            self.dispatch(index, prune, modelSettings, simulatorSettings, prunableSpecies, prunableNetworks)
+        self.pending.pop(0)
+        task, records, outcome = self.batch.next()
+        if not self.pending:
+            self.batch = None
+
+        for level, message in records:
+            logging.log(level, message)
+        if outcome[0] != 'ok':
+            logging.debug('Parallel simulation of reaction system {0} failed:\n{1}'.format(index + 1, outcome[1]))
+            # The model mirror of the worker may be incomplete, so the
+            # workers are started again for the next simulation
+            self.shutdown()
+            return None
+
+        terminated, resurrected, obj, newSurfaceSpecies, newSurfaceReactions, t, x = outcome[1]
+        reactionModel = rmg.reactionModel
+        reactionSystem = rmg.reactionSystems[index]
+        for attr, value in outcome[2].iteritems():
+            setattr(reactionSystem, attr, value)
+        surfaceSpecies, surfaceReactions = outcome[3]
+        reactionModel.surface.species[:] = decodeObjects(surfaceSpecies, self.mirror)
+        reactionModel.surface.reactions[:] = decodeObjects(surfaceReactions, self.mirror)
+
+        if obj is not None:
+            current = set([id(o) for o in reactionModel.edge.species + reactionModel.edge.reactions + reactionModel.networkList])
+            obj = [o for o in decodeObjects(obj, self.mirror) if id(o) in current]
+        return (terminated, resurrected, obj, decodeObjects(newSurfaceSpecies, self.mirror),
+                decodeObjects(newSurfaceReactions, self.mirror), t, x)
+
+    def dispatch(self, index, prune, modelSettings, simulatorSettings, prunableSpecies, prunableNetworks):
+        """
+        Start simulating the first sample of reaction system `index` and of
+        each following reaction system on the current model in the worker
+        processes.
+        """
+        rmg = self.rmg
+        self.sync(prunableSpecies, prunableNetworks)
+        tasks = []
+        for i in xrange(index, len(rmg.reactionSystems)):
+            reactionSystem = rmg.reactionSystems[i]
+            settings = {
+                'prune': prune,
+                'modelSettings': modelSettings,
+                'simulatorSettings': simulatorSettings,
+                'state': dict([(attr, getattr(reactionSystem, attr)) for attr in REACTION_SYSTEM_STATE
+                               if hasattr(reactionSystem, attr)]),
+            }
+            tasks.append((i, rmg.rmg_memories[i].get_cond(), i != index, self.logSize, settings))
+
+        logging.debug('Simulating {0:d} reaction system(s) in parallel...'.format(len(tasks)))
+        self.batch = self.pool.imap(_simulate, tasks)
+        self.pending = [task[0] for task in tasks]
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains unit tests of the :mod:`rmgpy.rmg.simulate` module.
+"""
+
+import os.path
+import sys
+import unittest
+import multiprocessing
+
+import rmgpy
+from rmgpy.rmg.main import RMG_Memory
+from rmgpy.rmg.model import CoreEdgeReactionModel
+from rmgpy.rmg.settings import ModelSettings, SimulatorSettings
+from rmgpy.rmg.simulate import ModelMirror, ParallelSimulator, getMirroredLists, encodeObjects, decodeObjects
+from rmgpy.tools.loader import loadRMGPyJob
+from rmgpy.species import Species
+from rmgpy.reaction import Reaction
+from rmgpy.kinetics import Arrhenius
+
+################################################################################
+
+class TestParallelSimulation(unittest.TestCase):
+    """
+    Contains unit tests of the helper functions of the parallel simulator.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.model = CoreEdgeReactionModel()
+        self.CH4 = Species(label='CH4').fromSMILES('C')
+        self.CH3 = Species(label='CH3').fromSMILES('[CH3]')
+        self.H = Species(label='H').fromSMILES('[H]')
+        self.model.core.species = [self.CH4]
+        self.model.edge.species = [self.CH3, self.H]
+        self.reaction = Reaction(reactants=[self.CH4], products=[self.CH3, self.H],
+                                 kinetics=Arrhenius(A=(1e13,'s^-1'), n=0, Ea=(400,'kJ/mol'), T0=(1,'K')))
+        self.model.edge.reactions = [self.reaction]
+
+    def test_encodeObjects(self):
+        """
+        Test that model objects survive a round trip through their mirror rows.
+        """
+        mirror = ModelMirror(getMirroredLists(self.model, [], []))
+        objects = [self.H, self.CH4, self.reaction]
+        codes = encodeObjects(objects, mirror)
+        self.assertEqual(codes, [('species', 2), ('species', 0), ('reactions', 0)])
+
+        # The rows do not change when the model lists do
+        self.model.edge.species.remove(self.CH3)
+        self.model.core.species.append(self.CH3)
+        mirror.sync(getMirroredLists(self.model, [], []))
+        self.assertEqual(encodeObjects(objects, mirror), codes)
+        decoded = decodeObjects(codes, mirror)
+        for obj0, obj1 in zip(objects, decoded):
+            self.assertIs(obj0, obj1)
+        self.assertRaises(ValueError, encodeObjects, [Species().fromSMILES('O')], mirror)
+
+    def test_syncModelMirror(self):
+        """
+        Test that the model mirror is updated whenever a simulation could change.
+        """
+        mirror = ModelMirror(getMirroredLists(self.model, [], []))
+        self.assertIsNone(mirror.sync(getMirroredLists(self.model, [], [])))
+        self.assertEqual(mirror.version, 0)
+
+        # Moving a species from the edge to the core
+        self.model.edge.species.remove(self.CH3)
+        self.model.core.species.append(self.CH3)
+        self.assertIsNotNone(mirror.sync(getMirroredLists(self.model, [], [])))
+        self.assertEqual(mirror.version, 1)
+        self.assertEqual(mirror.members['coreSpecies'], [0, 1])
+
+        # Replacing the kinetics of a reaction
+        self.reaction.kinetics = Arrhenius(A=(2e13,'s^-1'), n=0, Ea=(400,'kJ/mol'), T0=(1,'K'))
+        self.assertIsNotNone(mirror.sync(getMirroredLists(self.model, [], [])))
+        self.assertEqual(mirror.version, 2)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"),
+                         "test currently only runs on linux")
+    def test_applyModelMirror(self):
+        """
+        Test that an update brings the mirror of a forked process up to date.
+        """
+        mirror = ModelMirror(getMirroredLists(self.model, [], []))
+        _mirrors[:] = [mirror]
+        pool = multiprocessing.Pool(1)
+        try:
+            C2H6 = Species(label='C2H6').fromSMILES('CC')
+            reaction = Reaction(reactants=[self.CH3, self.CH3], products=[C2H6],
+                                kinetics=Arrhenius(A=(6.8e13,'cm^3/(mol*s)'), n=0, Ea=(0,'kJ/mol'), T0=(1,'K')))
+            self.model.edge.species.remove(self.CH3)
+            self.model.core.species.append(self.CH3)
+            self.model.edge.species.append(C2H6)
+            self.model.edge.reactions.append(reaction)
+            self.reaction.kinetics = Arrhenius(A=(2e13,'s^-1'), n=0, Ea=(400,'kJ/mol'), T0=(1,'K'))
+            data = mirror.sync(getMirroredLists(self.model, [], []))
+            coreSpecies, edgeSpecies, edgeReactions, A, shared = pool.apply(_applyUpdate, (data,))
+        finally:
+            pool.close()
+            pool.join()
+            _mirrors[:] = []
+        self.assertEqual(coreSpecies, ['CH4', 'CH3'])
+        self.assertEqual(edgeSpecies, ['H', 'C2H6'])
+        self.assertEqual(edgeReactions, [str(self.reaction), str(reaction)])
+        self.assertAlmostEqual(A, 2e13, delta=1)
+        self.assertTrue(shared)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"),
+                         "test currently only runs on linux")
+    def test_parallelSimulationMatchesSerial(self):
+        """
+        Test that a simulation in a worker process gives the same result and
+        surface as a serial one when the surface is tracked.
+        """
+        folder = os.path.join(os.path.dirname(rmgpy.__file__), 'solver/files/listener/')
+        modelSettings = ModelSettings(toleranceMoveToCore=1, toleranceKeepInEdge=0, toleranceInterruptSimulation=1,
+                                      toleranceMoveEdgeReactionToSurface=0.1, toleranceMoveSurfaceSpeciesToCore=10,
+                                      toleranceMoveSurfaceReactionToCore=10)
+        simulatorSettings = SimulatorSettings()
+
+        results = []
+        for parallel in [False, True]:
+            rmg = loadRMGPyJob(os.path.join(folder, 'input.py'), os.path.join(folder, 'chemkin/chem.inp'),
+                               os.path.join(folder, 'chemkin/species_dictionary.txt'),
+                               generateImages=False, checkDuplicates=False)
+            reactionModel = rmg.reactionModel
+            reactionSystem = rmg.reactionSystems[0]
+            rmg.rmg_memories = [RMG_Memory(rxnSys, None) for rxnSys in rmg.reactionSystems]
+            # Start from a surface that the simulation has to trim
+            coreSpecies = reactionModel.core.species
+            coreReactions = reactionModel.core.reactions
+            reactionModel.surface.species = [coreSpecies[7], coreSpecies[6]]
+            reactionModel.surface.reactions = [coreReactions[0], coreReactions[2], coreReactions[3]]
+            prunableSpecies = reactionModel.edge.species[:]
+            prunableNetworks = reactionModel.networkList[:]
+            reactionSystem.prunableSpecies = prunableSpecies
+            reactionSystem.prunableNetworks = prunableNetworks
+            reactionSystem.reset_max_edge_species_rate_ratios()
+
+            if parallel:
+                simulator = ParallelSimulator(rmg, 2)
+                try:
+                    result = simulator.simulate(0, False, modelSettings, simulatorSettings,
+                                                prunableSpecies, prunableNetworks)
+                finally:
+                    simulator.shutdown()
+                self.assertIsNotNone(result)
+            else:
+                result = reactionSystem.simulate(
+                    coreSpecies = reactionModel.core.species,
+                    coreReactions = reactionModel.core.reactions,
+                    edgeSpecies = reactionModel.edge.species,
+                    edgeReactions = reactionModel.edge.reactions,
+                    surfaceSpecies = reactionModel.surface.species,
+                    surfaceReactions = reactionModel.surface.reactions,
+                    pdepNetworks = reactionModel.networkList,
+                    prune = False,
+                    modelSettings = modelSettings,
+                    simulatorSettings = simulatorSettings,
+                    conditions = rmg.rmg_memories[0].get_cond()
+                )
+            terminated, resurrected, obj, newSurfaceSpecies, newSurfaceReactions, t, x = result
+            surface = (sorted([spc.label for spc in reactionModel.surface.species]),
+                       sorted([str(rxn) for rxn in reactionModel.surface.reactions]))
+            reactionModel.addNewSurfaceObjects(obj, newSurfaceSpecies, newSurfaceReactions, reactionSystem)
+            adjustments = [sorted([str(o) for o in objects]) for objects in
+                           (reactionModel.newSurfaceSpcsAdd, reactionModel.newSurfaceSpcsLoss,
+                            reactionModel.newSurfaceRxnsAdd, reactionModel.newSurfaceRxnsLoss)]
+            results.append((terminated, resurrected, sorted([str(o) for o in obj]),
+                            sorted([spc.label for spc in newSurfaceSpecies]),
+                            sorted([str(rxn) for rxn in newSurfaceReactions]),
+                            surface, adjustments, t, x))
+
+        serial, parallel = results
+        self.assertEqual(parallel[:7], serial[:7])
+        self.assertAlmostEqual(parallel[7], serial[7], delta=1e-6*serial[7])
+        self.assertAlmostEqual(parallel[8], serial[8], delta=1e-6*abs(serial[8]))
+
+# The model mirrors inherited by the forked processes of the tests
+_mirrors = []
+
+def _applyUpdate(data):
+    """
+    Apply the update `data` to the inherited model mirror. Returns the labels
+    of the core and edge species, the edge reactions, the A factor of the
+    first edge reaction, and whether the new reaction refers to the core
+    species of the mirror.
+    """
+    mirror = _mirrors[0]
+    mirror.apply(data)
+    lists = mirror.getLists()
+    return ([spc.label for spc in lists['coreSpecies']], [spc.label for spc in lists['edgeSpecies']],
+            [str(rxn) for rxn in lists['edgeReactions']], lists['edgeReactions'][0].kinetics.A.value_si,
+            lists['edgeReactions'][1].reactants[0] is lists['coreSpecies'][1])
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -27,12 +27,35 @@
 # DEALINGS IN THE SOFTWARE.                                                   #
 #                                                                             #
 ###############################################################################
-
 """
 This module contains functionality for the parallel execution of RMG-Py.
+
+Tasks are distributed by an executor, selected with :func:`setExecutor`.
+The following executors are available:
+
+=========== ===================================================================
+Name        Description
+=========== ===================================================================
+`serial`    Runs all tasks in the calling process
+`process`   Runs tasks in a pool of forked worker processes
+`thread`    Runs tasks in a pool of worker threads
+`scoop`     Distributes tasks with SCOOP (requires starting with ``-m scoop``)
+=========== ===================================================================
+
+If no executor was selected, SCOOP is used when the program was started with
+``-m scoop``, and the serial executor otherwise.
 """
 
+import cPickle
+import itertools
+import math
+import multiprocessing
+import multiprocessing.pool
+import os
+import shutil
 import sys
+import tempfile
+import threading
 import traceback
 import warnings
 from functools import wraps
@@ -51,6 +74,19 @@ except ImportError:
     logger = logging.getLogger()
     logger.debug("Could not properly import SCOOP.")
 
+# The executor in use, created by setExecutor() or on first use
+_executor = None
+
+# The objects shared with the workers of the serial, process and thread executors
+_sharedObjects = {}
+
+# The object most recently loaded by a process worker from the file it was
+# written to, as a (key, object) tuple
+_loadedObject = (None, None)
+
+# Marks the workers of a pool, so that nested tasks are run serially
+_workerState = threading.local()
+
 def warnScoopStartedProperly(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -89,6 +125,38 @@ def warnScoopStartedProperly(func):
         return func(*args, **kwargs)
     return wrapper
 
+def scoopStarted():
+    """
+    Return ``True`` if the program was started with ``-m scoop``.
+    """
+    try:
+        return bool(sys.modules['scoop.futures'].__dict__.get("_controller", None))
+    except KeyError:
+        return False
+
+def inWorker():
+    """
+    Return ``True`` if called from a worker of a process or thread pool.
+    """
+    return getattr(_workerState, 'worker', False)
+
+def _initializeWorker():
+    """
+    Mark the current process or thread as a pool worker.
+    """
+    _workerState.worker = True
+
+def getChunkSize(numTasks, processes):
+    """
+    Return the number of tasks to send to a worker at once when distributing
+    `numTasks` tasks over `processes` workers. Every worker receives about four
+    chunks, which balances the load when the task durations differ while
+    keeping the communication overhead low for many short tasks.
+    """
+    if processes < 1 or numTasks < 1:
+        return 1
+    return max(1, int(math.ceil(numTasks / (4.0 * processes))))
+
 class WorkerWrapper(object):
     """
     This class can be used to expose the exception trace of a worker
@@ -116,56 +184,383 @@ class WorkerWrapper(object):
             print ''.join(lines)
             raise
 
-@warnScoopStartedProperly
-def broadcast(obj, key):
+class ArgumentUnpacker(object):
     """
-    Broadcasts the object across the workers using the key parameter as the key.
-    """      
-    
-    kwargs = {key : obj}
-    try:
-        if shared.getConst(key):
+    Calls the wrapped function with the items of a tuple of arguments, so
+    that functions of several arguments can be mapped by pools that only
+    pass a single argument.
+    """
+    __name__ = 'ArgumentUnpacker'
+
+    def __init__(self, myfn):
+        self.myfn = myfn
+
+    def __call__(self, args):
+        return self.myfn(*args)
+
+class Future(object):
+    """
+    The result of a task submitted to a process or thread pool. A blocking
+    call to :meth:`result` returns the value of the task, or raises the
+    exception of the task.
+    """
+
+    def __init__(self, asyncResult):
+        self.asyncResult = asyncResult
+
+    def done(self):
+        """
+        Return ``True`` if the task has finished.
+        """
+        return self.asyncResult.ready()
+
+    def result(self, timeout=None):
+        """
+        Return the value of the task, waiting at most `timeout` seconds.
+        """
+        return self.asyncResult.get(timeout)
+
+################################################################################
+
+class SerialExecutor(object):
+    """
+    An executor that runs all tasks in the calling process. Submitted tasks
+    are evaluated immediately and return their value instead of a future.
+    """
+    name = 'serial'
+
+    def __init__(self, processes=None):
+        self.processes = 1
+
+    def map(self, func, iterable):
+        """
+        Lazily apply `func` to each item in `iterable`.
+        """
+        return itertools.imap(func, iterable)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Evaluate `func` for the given arguments.
+        """
+        return func(*args, **kwargs)
+
+    def broadcast(self, obj, key, restart=True):
+        """
+        Share the object `obj` with the workers under the given `key`.
+        Returns ``True`` if the workers can retrieve the object with
+        :meth:`get`.
+        """
+        if _sharedObjects.get(key, None):
             logger.debug('An object with the key {} was already broadcasted.'.format(key))
         else:
-            shared.setConst(**kwargs)
-    except NameError, e:
+            _sharedObjects[key] = obj
+        return True
+
+    def get(self, key):
+        """
+        Return the shared object with the given `key`, or ``None``.
+        """
+        return _sharedObjects.get(key, None)
+
+    def discard(self, key):
+        """
+        Stop sharing the object with the given `key`, if any.
+        """
+        _sharedObjects.pop(key, None)
+
+    def shutdown(self):
+        """
+        Release the workers of the executor.
+        """
+        pass
+
+class ProcessExecutor(SerialExecutor):
+    """
+    An executor that runs tasks in a pool of `processes` worker processes.
+
+    The pool is created when the first task is distributed, and the workers
+    are forked from the main process. They therefore inherit the loaded
+    database and all broadcasted objects without copying or pickling them.
+    The pool is restarted on the next task when an object is broadcasted, so
+    that the workers see the new object. Callers that broadcast with
+    ``restart=False`` leave a running pool alone; the object is then pickled
+    once to a file in a temporary directory of the pool, which each worker
+    loads the first time it retrieves the object.
+
+    Tasks are sent to the workers in chunks of a size that depends on the
+    number of tasks, and the results of :meth:`map` are returned in order as
+    soon as they arrive. Tasks distributed from within a worker are run
+    serially in that worker.
+    """
+    name = 'process'
+
+    def __init__(self, processes=None):
+        self.processes = processes or multiprocessing.cpu_count()
+        self.pool = None
+        self.directory = None
+
+    def createPool(self):
+        # Created before forking so that the workers know where to look
+        self.directory = tempfile.mkdtemp(prefix='rmg_shared_')
+        return multiprocessing.Pool(self.processes, _initializeWorker)
+
+    def getPool(self):
         """
-        Name error will be caught when the SCOOP library is not imported properly.
+        Return the worker pool, creating it if needed.
         """
-        logger.debug('SCOOP not loaded. Not broadcasting the object {}'.format(obj))
+        if self.pool is None:
+            self.pool = self.createPool()
+        return self.pool
+
+    def map(self, func, iterable):
+        """
+        Apply `func` to each item in `iterable` on the workers, and return an
+        iterator over the results in order.
+        """
+        if inWorker():
+            return itertools.imap(func, iterable)
+        tasks = list(iterable)
+        if len(tasks) <= 1:
+            return itertools.imap(func, tasks)
+        chunksize = getChunkSize(len(tasks), self.processes)
+        return self.getPool().imap(WorkerWrapper(func), tasks, chunksize)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Evaluate `func` for the given arguments on a worker, and return a
+        :class:`Future` for the result.
+        """
+        if inWorker():
+            return func(*args, **kwargs)
+        return Future(self.getPool().apply_async(WorkerWrapper(func), args, kwargs))
+
+    def broadcast(self, obj, key, restart=True):
+        """
+        Share the object `obj` with the workers under the given `key`.
+        Returns ``True`` if the workers can retrieve the object with
+        :meth:`get`. If `restart` is ``False``, a running pool is not
+        stopped and the object is written to a file for its workers instead.
+        """
+        if self.pool is not None and not _sharedObjects.get(key, None):
+            # Workers forked before this call would not see the object
+            if restart:
+                self.shutdown()
+            elif self.directory is not None:
+                with open(os.path.join(self.directory, key), 'wb') as f:
+                    cPickle.dump(obj, f, cPickle.HIGHEST_PROTOCOL)
+        return super(ProcessExecutor, self).broadcast(obj, key)
+
+    def get(self, key):
+        """
+        Return the shared object with the given `key`, or ``None``. A worker
+        loads an object broadcasted after it was forked from its file, and
+        keeps the last one loaded.
+        """
+        global _loadedObject
+        obj = _sharedObjects.get(key, None)
+        if obj is not None or not inWorker() or self.directory is None:
+            return obj
+        path = os.path.join(self.directory, key)
+        if not os.path.exists(path):
+            # Not broadcasted, or discarded since
+            return None
+        if _loadedObject[0] != key:
+            with open(path, 'rb') as f:
+                _loadedObject = (key, cPickle.load(f))
+        return _loadedObject[1]
+
+    def discard(self, key):
+        """
+        Stop sharing the object with the given `key`, if any.
+        """
+        super(ProcessExecutor, self).discard(key)
+        if self.directory is not None:
+            path = os.path.join(self.directory, key)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def shutdown(self):
+        """
+        Wait for the running tasks to finish and stop the workers.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+class ThreadExecutor(ProcessExecutor):
+    """
+    An executor that runs tasks in a pool of `processes` worker threads.
+    Because of the global interpreter lock, this executor is mainly useful
+    for tasks that wait on external programs or release the lock, such as
+    quantum chemistry calculations.
+    """
+    name = 'thread'
+
+    def createPool(self):
+        return multiprocessing.pool.ThreadPool(self.processes, _initializeWorker)
+
+    def broadcast(self, obj, key, restart=True):
+        """
+        Share the object `obj` with the workers under the given `key`.
+        """
+        # The workers share the memory of the main thread
+        return SerialExecutor.broadcast(self, obj, key)
+
+class ScoopExecutor(SerialExecutor):
+    """
+    An executor that distributes tasks with SCOOP. The program must be
+    started with the ``-m scoop`` parameter.
+    """
+    name = 'scoop'
+
+    def __init__(self, processes=None):
+        self.processes = processes
+
+    def map(self, func, iterable, **kwargs):
+        return map(WorkerWrapper(func), iterable, **kwargs)
+
+    def submit(self, func, *args, **kwargs):
+        try:
+            task = submit(WorkerWrapper(func), *args, **kwargs)#returns immediately
+            return task
+        except Exception, e:
+            """
+            Name error will be caught when the SCOOP library is not imported properly.
+            """
+            logger.debug('SCOOP not loaded. Submitting serial mode.')
+            return func(*args, **kwargs)
+
+    @warnScoopStartedProperly
+    def broadcast(self, obj, key, restart=True):
+        kwargs = {key : obj}
+        try:
+            if shared.getConst(key):
+                logger.debug('An object with the key {} was already broadcasted.'.format(key))
+            else:
+                shared.setConst(**kwargs)
+        except NameError, e:
+            """
+            Name error will be caught when the SCOOP library is not imported properly.
+            """
+            logger.debug('SCOOP not loaded. Not broadcasting the object {}'.format(obj))
+            return False
+        return True
+
+    @warnScoopStartedProperly
+    def get(self, key):
+        try:
+            data = shared.getConst(key, timeout=1e-9)
+            return data
+        except NameError:
+            """
+            Name error will be caught when the SCOOP library is not imported properly.
+            """
+            logger.debug('SCOOP not loaded. Not retrieving the shared object with key {}'.format(key))
+
+    def discard(self, key):
+        """
+        SCOOP constants cannot be removed once they are set.
+        """
+        pass
+
+executorTypes = {
+    'serial': SerialExecutor,
+    'process': ProcessExecutor,
+    'thread': ThreadExecutor,
+    'scoop': ScoopExecutor,
+}
+
+def setExecutor(name=None, processes=None):
+    """
+    Select the executor with the given `name` for distributing tasks, using
+    at most `processes` workers. If `name` is ``None``, SCOOP is used when it
+    was started properly, and the serial executor otherwise. The workers of
+    the previous executor are stopped.
+
+    Returns the new executor.
+    """
+    global _executor
+
+    if name is None:
+        name = 'scoop' if scoopStarted() else 'serial'
+    try:
+        executorType = executorTypes[name]
+    except KeyError:
+        raise ValueError('Unknown executor "{0}"; valid executors are {1}.'.format(
+            name, ', '.join(sorted(executorTypes))))
+    if processes is not None and processes < 1:
+        raise ValueError('The number of processes must be at least 1, got {0}.'.format(processes))
+
+    if _executor is not None:
+        _executor.shutdown()
+    _executor = executorType(processes)
+    return _executor
+
+def configureExecutor(name=None, processes=None):
+    """
+    Select the executor for a tool from its `name` and `processes` options.
+    The process executor is used if only `processes` is given, and the
+    executor in use is kept if neither is given.
+    """
+    if name is None and processes is None:
+        return getExecutor()
+    return setExecutor(name or 'process', processes)
+
+def getExecutor():
+    """
+    Return the executor in use, selecting the default one if needed.
+    """
+    if _executor is None:
+        return setExecutor()
+    return _executor
+
+def shutdown():
+    """
+    Stop the workers of the executor in use.
+    """
+    if _executor is not None:
+        _executor.shutdown()
+
+def broadcast(obj, key, restart=True):
+    """
+    Broadcasts the object across the workers using the key parameter as the key.
+    If `restart` is ``False``, running workers are not restarted to see the
+    object. Returns ``True`` if the workers can retrieve the object with
+    :func:`get`.
+    """      
+    return getExecutor().broadcast(obj, key, restart)
 
-@warnScoopStartedProperly
 def get(key):    
     """
     Searches for the shared variable to retrieve identified by the 
     parameter key.
     """
+    return getExecutor().get(key)
 
-    try:
-        data = shared.getConst(key, timeout=1e-9)
-        return data
-    except NameError:
-        """
-        Name error will be caught when the SCOOP library is not imported properly.
-        """
-        logger.debug('SCOOP not loaded. Not retrieving the shared object with key {}'.format(key))
+def discard(key):
+    """
+    Stop sharing the object broadcasted with the given `key`.
+    """
+    getExecutor().discard(key)
 
 def map_(*args, **kwargs):
-    return map(WorkerWrapper(args[0]), *args[1:], **kwargs)
+    """
+    Map the function in the first argument over the iterables in the
+    remaining arguments, and return an iterator over the results in order.
+    """
+    if len(args) > 2:
+        return getExecutor().map(ArgumentUnpacker(args[0]), itertools.izip(*args[1:]), **kwargs)
+    return getExecutor().map(args[0], args[1], **kwargs)
 
 def submit_(func, *args, **kwargs):
     """
     Task submission of a function.
 
     returns the return value of the called function, or
-    when SCOOP is loaded, the future object.
+    when a process, thread or SCOOP executor is used, the future object.
     """
-    try:
-        task = submit(WorkerWrapper(func), *args, **kwargs)#returns immediately
-        return task
-    except Exception, e:
-        """
-        Name error will be caught when the SCOOP library is not imported properly.
-        """
-        logger.debug('SCOOP not loaded. Submitting serial mode.')
-        return func(*args, **kwargs)
+    return getExecutor().submit(func, *args, **kwargs)
@@ -62,6 +62,131 @@ class WorkerWrapperTest(unittest.TestCase):
             f()
 
 
+def square(x):
+    return x * x
+
+def add(x, y):
+    return x + y
+
+def squareAll(n):
+    return list(map_(square, range(n)))
+
+class ExecutorTest(unittest.TestCase):
+
+    def tearDown(self):
+        setExecutor('serial')
+
+    def test_getChunkSize(self):
+        """
+        Test that every worker receives about four chunks of tasks.
+        """
+        self.assertEqual(getChunkSize(1000, 4), 63)
+        self.assertEqual(getChunkSize(3, 8), 1)
+        self.assertEqual(getChunkSize(0, 4), 1)
+
+    def test_setExecutor(self):
+        """
+        Test that executors are selected by name, and that invalid names are rejected.
+        """
+        self.assertIsInstance(setExecutor('process', 2), ProcessExecutor)
+        self.assertEqual(getExecutor().processes, 2)
+        self.assertIsInstance(setExecutor('serial'), SerialExecutor)
+        with self.assertRaises(ValueError):
+            setExecutor('foo')
+        with self.assertRaises(ValueError):
+            setExecutor('process', 0)
+
+    def test_serial(self):
+        """
+        Test that the serial executor maps in order and evaluates submitted tasks immediately.
+        """
+        setExecutor('serial')
+        self.assertEqual(list(map_(square, range(10))), [x * x for x in range(10)])
+        self.assertEqual(list(map_(add, range(5), range(5))), [0, 2, 4, 6, 8])
+        self.assertEqual(submit_(square, 3), 9)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"),
+                         "test currently only runs on linux")
+    def test_process(self):
+        """
+        Test that the process executor returns the results in order, including nested tasks.
+        """
+        setExecutor('process', 2)
+        self.assertEqual(list(map_(square, range(50))), [x * x for x in range(50)])
+        self.assertEqual(list(map_(add, range(5), range(5))), [0, 2, 4, 6, 8])
+        self.assertEqual(list(map_(squareAll, [2, 3])), [[0, 1], [0, 1, 4]])
+        self.assertEqual(submit_(square, 3).result(), 9)
+        with self.assertRaises(ZeroDivisionError):
+            list(map_(boom2, range(3)))
+
+    def test_thread(self):
+        """
+        Test that the thread executor returns the results in order.
+        """
+        setExecutor('thread', 2)
+        self.assertEqual(list(map_(square, range(50))), [x * x for x in range(50)])
+        self.assertEqual(submit_(square, 3).result(), 9)
+
+    def test_broadcast(self):
+        """
+        Test that broadcasted objects can be retrieved without SCOOP.
+        """
+        setExecutor('process', 2)
+        broadcast('foo', 'executorTestKey')
+        self.assertEqual(get('executorTestKey'), 'foo')
+        self.assertIsNone(get('executorTestMissingKey'))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"),
+                         "test currently only runs on linux")
+    def test_broadcastRunningPool(self):
+        """
+        Test that a running pool is only restarted for a broadcast if requested,
+        and that its workers can still retrieve the object otherwise.
+        """
+        executor = setExecutor('process', 2)
+        self.assertTrue(broadcast('foo', 'executorPoolKey', restart=False))
+        self.assertEqual(list(map_(square, range(10))), [x * x for x in range(10)])
+        pool = executor.pool
+        self.assertTrue(broadcast('bar', 'executorRunningPoolKey', restart=False))
+        self.assertIs(executor.pool, pool)
+        self.assertEqual(get('executorRunningPoolKey'), 'bar')
+        self.assertEqual(list(map_(getShared, ['executorRunningPoolKey'] * 10)), ['bar'] * 10)
+        self.assertEqual(list(map_(getShared, ['executorPoolKey'] * 10)), ['foo'] * 10)
+        discard('executorRunningPoolKey')
+        self.assertEqual(list(map_(getShared, ['executorRunningPoolKey', 'executorPoolKey'] * 5)), [None, 'foo'] * 5)
+        self.assertTrue(broadcast('baz', 'executorRestartKey'))
+        self.assertIsNone(executor.pool)
+        self.assertIsNone(executor.directory)
+        discard('executorPoolKey')
+        discard('executorRestartKey')
+
+    def test_discard(self):
+        """
+        Test that discarded objects are no longer shared.
+        """
+        setExecutor('serial')
+        broadcast('foo', 'executorDiscardKey')
+        discard('executorDiscardKey')
+        self.assertIsNone(get('executorDiscardKey'))
+        broadcast('bar', 'executorDiscardKey')
+        self.assertEqual(get('executorDiscardKey'), 'bar')
+        discard('executorDiscardKey')
+
+    def test_configureExecutor(self):
+        """
+        Test that tool options select the process executor by default and keep the executor in use otherwise.
+        """
+        self.assertIsInstance(configureExecutor(processes=2), ProcessExecutor)
+        self.assertIs(configureExecutor(), getExecutor())
+        self.assertIsInstance(getExecutor(), ProcessExecutor)
+        self.assertIsInstance(configureExecutor('thread', 2), ThreadExecutor)
+
+def boom2(x):
+    return x / 0
+
+def getShared(key):
+    return get(key)
+
 def funcBroadcast():
     """
     Broadcast the data with the given key, 
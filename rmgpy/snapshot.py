@@ -0,0 +1,1497 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains functions for saving the core and edge of a reaction
+model to a compact binary snapshot file, and for loading them back.
+
+The snapshot is columnar: each attribute of the species, molecules, atoms,
+bonds, thermodynamics and kinetics models is stored as one contiguous array,
+so the file can be opened with memory mapping and the objects are only
+constructed when they are needed. NASA thermodynamics and Arrhenius and
+Chebyshev kinetics are packed by type. Anything else, such as other
+thermodynamics and kinetics models, conformers and pressure-dependent
+networks, is pickled per object, with the species, molecules and reactions
+of the snapshot replaced by references to their rows.
+
+The file starts with the magic string ``RMGSNAP1`` and the length of a JSON
+header, which holds the metadata and the data type, shape and offset of
+each column. The columns follow the header, each aligned to 64 bytes.
+
+During a job, a snapshot is followed by a journal of the changes made to the
+model since it was written. The journal starts with the magic string
+``RMGJRNL1`` and a JSON header holding the id of its snapshot, and each
+iteration appends one record to it: the length and CRC-32 checksum of the
+record, followed by the same layout of header and columns as a snapshot.
+A record holds the species and reactions added to the model, the new
+attributes of the ones that changed, the rows removed from and added to the
+core, the edge, the surface and the list of networks, the networks that
+changed, the flag arrays, stored as the indices of their true entries, and
+the bounds of the thermodynamic filter. Objects keep the row they were given
+when first written, so a record only refers to the snapshot and the earlier
+records. Once the journal grows larger than its snapshot, it is compacted
+into a new snapshot.
+"""
+
+import os
+import os.path
+import json
+import struct
+import time
+import uuid
+import zlib
+import logging
+import cPickle
+import cStringIO
+import numpy
+
+import rmgpy
+from rmgpy.exceptions import SnapshotError
+from rmgpy.quantity import ScalarQuantity
+from rmgpy.molecule import Atom, Bond, Molecule
+from rmgpy.molecule.element import getElement
+from rmgpy.species import Species
+from rmgpy.reaction import Reaction
+from rmgpy.thermo import NASA, NASAPolynomial
+from rmgpy.kinetics import Arrhenius, Chebyshev
+from rmgpy.data.kinetics.family import TemplateReaction
+from rmgpy.data.kinetics.library import LibraryReaction
+from rmgpy.rmg.pdep import PDepReaction
+
+_MAGIC = 'RMGSNAP1'
+_JOURNAL_MAGIC = 'RMGJRNL1'
+_ALIGNMENT = 64
+
+# The length and CRC-32 checksum of each journal record
+_RECORD_HEADER = struct.Struct('<QI')
+
+# The lists of the reaction model whose membership is recorded in a journal,
+# and the rows of the objects that they contain
+_MODEL_LISTS = [
+    ('coreSpecies', 'species'),
+    ('edgeSpecies', 'species'),
+    ('coreReactions', 'reactions'),
+    ('edgeReactions', 'reactions'),
+    ('networks', 'networks'),
+]
+
+# The lists of the reaction model that only hold objects of the core, whose
+# membership is recorded in the snapshot as well
+_SURFACE_LISTS = [
+    ('surfaceSpecies', 'species'),
+    ('surfaceReactions', 'reactions'),
+]
+
+# The bounds of the thermodynamic filter of the reaction model, which are
+# stored in the metadata
+_FILTER_BOUNDS = ('Gfmax', 'Gmax', 'Gmin')
+
+# The types of reactions stored in the snapshot; reactions of any other type
+# are pickled
+_REACTION = 0
+_TEMPLATE_REACTION = 1
+_LIBRARY_REACTION = 2
+_PDEP_REACTION = 3
+_PICKLED_REACTION = 4
+
+# The types of kinetics models stored in the snapshot; kinetics models of
+# any other type are pickled
+_NO_KINETICS = 0
+_ARRHENIUS = 1
+_CHEBYSHEV = 2
+_PICKLED_KINETICS = 3
+
+# The bits of the reaction flags
+_REVERSIBLE = 1
+_DUPLICATE = 2
+_ALLOW_PDEP_ROUTE = 4
+_ELEMENTARY_HIGH_P = 8
+_ALLOW_MAX_RATE_VIOLATION = 16
+_IS_FORWARD = 32
+_HAS_PAIRS = 64
+
+################################################################################
+
+def saveSnapshot(path, reactionModel, flags=None):
+    """
+    Save the core and edge of the given `reactionModel`, along with its
+    pressure-dependent networks, to a snapshot file at `path` on disk. The
+    optional dict `flags` of arrays, such as the reaction flags of an RMG job,
+    is saved as well. The snapshot is first written to a temporary file,
+    which then replaces any existing file at `path`.
+    """
+    _saveSnapshot(path, reactionModel, flags, _Rows())
+
+def _saveSnapshot(path, reactionModel, flags, rows):
+    """
+    Save a snapshot as :func:`saveSnapshot` does, giving the saved species,
+    molecules, reactions and networks their rows in the empty table `rows`.
+    Returns the id of the snapshot.
+    """
+    coreSpecies = reactionModel.core.species
+    edgeSpecies = reactionModel.edge.species
+    coreReactions = reactionModel.core.reactions
+    edgeReactions = reactionModel.edge.reactions
+    speciesList = coreSpecies + edgeSpecies
+    reactionList = coreReactions + edgeReactions
+    networkList = reactionModel.networkList
+
+    columns = {}
+    units = []
+    _packSpecies(columns, speciesList, rows)
+    for reaction in reactionList:
+        rows.add('reactions', reaction)
+    for network in networkList:
+        rows.add('networks', network)
+    pickler = _Pickler(rows)
+
+    _packThermo(columns, speciesList, units, pickler)
+    _packReactions(columns, reactionList, rows, units, pickler)
+    _packBlobs(columns, 'networks.pickled', [pickler.dumps(network) for network in networkList])
+    modelLists = _getModelLists(reactionModel)
+    for name, table in _SURFACE_LISTS:
+        tableRows = getattr(rows, table)
+        columns['members.' + name + '.rows'] = numpy.array([tableRows[id(obj)] for obj in modelLists[name]], numpy.int32)
+    if flags:
+        for name, value in flags.iteritems():
+            if value is not None:
+                columns['flags.' + name] = numpy.asarray(value)
+
+    snapshotID = uuid.uuid4().hex
+    metadata = {
+        'id': snapshotID,
+        'rmgVersion': rmgpy.__version__,
+        'created': time.time(),
+        'iteration': reactionModel.iterationNum,
+        'numCoreSpecies': len(coreSpecies),
+        'numEdgeSpecies': len(edgeSpecies),
+        'numCoreReactions': len(coreReactions),
+        'numEdgeReactions': len(edgeReactions),
+        'numNetworks': len(networkList),
+        'speciesCounter': reactionModel.speciesCounter,
+        'reactionCounter': reactionModel.reactionCounter,
+        'networkCount': reactionModel.networkCount,
+        'units': units,
+    }
+    for key in _FILTER_BOUNDS:
+        metadata[key] = float(getattr(reactionModel, key))
+    _writeColumns(path, columns, metadata)
+    return snapshotID
+
+def loadSnapshot(path):
+    """
+    Load the snapshot file at `path` on disk. Returns the lists of the core
+    species, core reactions, edge species and edge reactions.
+    """
+    return MechanismSnapshot(path).getReactionModel()
+
+################################################################################
+
+class MechanismSnapshot(object):
+    """
+    A read-only view of a mechanism snapshot file. The attributes are:
+
+    =================== ======================= ================================
+    Attribute           Type                    Description
+    =================== ======================= ================================
+    `path`              ``str``                 The path of the snapshot file
+    `metadata`          ``dict``                The metadata of the snapshot, such as the numbers of core and edge species and reactions
+    `columns`           ``dict``                The data type, shape and offset of each column, indexed by name
+    `units`             ``list``                The units of the quantities in the snapshot
+    =================== ======================= ================================
+
+    The columns are accessed by name, e.g. ``snapshot['species.index']``, and
+    are returned as read-only memory-mapped arrays.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise SnapshotError('{0} is not a mechanism snapshot file.'.format(path))
+            headerLength, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(headerLength))
+        self.dataOffset = _align(len(_MAGIC) + 8 + headerLength)
+        self._setHeader(header)
+
+    def _setHeader(self, header):
+        """
+        Set the metadata, columns and units from the decoded JSON `header`.
+        """
+        self.metadata = header['metadata']
+        self.columns = header['columns']
+        self.units = [str(units) for units in self.metadata['units']]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        try:
+            dtype, shape, offset = self.columns[name]
+        except KeyError:
+            raise SnapshotError('Snapshot {0} has no column {1!r}.'.format(self.path, name))
+        dtype = numpy.dtype(str(dtype))
+        shape = tuple(shape)
+        if numpy.prod(shape) == 0:
+            # Empty files and regions cannot be memory mapped
+            return numpy.zeros(shape, dtype)
+        return self._getArray(dtype, shape, self.dataOffset + offset)
+
+    def _getArray(self, dtype, shape, offset):
+        """
+        Return the array of the given `dtype` and `shape` stored at `offset`.
+        """
+        return numpy.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+    @property
+    def numCoreSpecies(self):
+        return self.metadata['numCoreSpecies']
+
+    @property
+    def numEdgeSpecies(self):
+        return self.metadata['numEdgeSpecies']
+
+    @property
+    def numCoreReactions(self):
+        return self.metadata['numCoreReactions']
+
+    @property
+    def numEdgeReactions(self):
+        return self.metadata['numEdgeReactions']
+
+    def getStrings(self, name):
+        """
+        Return the list of strings stored in the string column `name`.
+        """
+        offsets = self[name + '.offsets'].tolist()
+        data = self[name + '.data'].tostring()
+        return [data[offsets[i]:offsets[i+1]] for i in xrange(len(offsets) - 1)]
+
+    def getFlags(self):
+        """
+        Return a dict of writable copies of the flag arrays in the snapshot.
+        """
+        flags = {}
+        for name in self.columns:
+            if not name.startswith('flags.') or name.endswith('.indices'):
+                continue
+            elif name.endswith('.shape'):
+                # Boolean flags in journal records are stored as the indices
+                # of their true entries
+                key = name[len('flags.'):-len('.shape')]
+                value = numpy.zeros(tuple(self[name].tolist()), numpy.bool_)
+                value[tuple(self['flags.' + key + '.indices'].T)] = True
+                flags[key] = value
+            else:
+                flags[name[len('flags.'):]] = numpy.array(self[name])
+        return flags
+
+    def getMembership(self, name, previous):
+        """
+        Return the rows of the objects in the model list `name` after this
+        snapshot or record, given the list of rows `previous` before it.
+        """
+        if 'members.' + name + '.rows' in self:
+            return self['members.' + name + '.rows'].tolist()
+        elif 'members.' + name + '.added' not in self:
+            # Written before the list was recorded
+            return previous
+        removed = set(self['members.' + name + '.removed'].tolist())
+        return [row for row in previous if row not in removed] + self['members.' + name + '.added'].tolist()
+
+    def getReactionModel(self):
+        """
+        Construct the species, reactions and pressure-dependent networks in
+        the snapshot. Returns the lists of the core species, core reactions,
+        edge species and edge reactions.
+        """
+        speciesList, reactionList, networkList = self.getObjects()
+        numCoreSpecies = self.numCoreSpecies
+        numCoreReactions = self.numCoreReactions
+        return speciesList[:numCoreSpecies], reactionList[:numCoreReactions], \
+            speciesList[numCoreSpecies:], reactionList[numCoreReactions:]
+
+    def getObjects(self):
+        """
+        Construct the species, reactions and pressure-dependent networks in
+        the snapshot. Returns the list of all species, the list of all
+        reactions, with the core species and reactions first, and the list of
+        networks.
+        """
+        molecules, speciesList, reactionList, networkList = self._getObjects()
+        return speciesList, reactionList, networkList
+
+    def _getObjects(self):
+        """
+        Construct the objects in the snapshot. Returns the lists of all
+        molecules, species, reactions and networks, in the order of their rows.
+        """
+        molecules = self._unpackMolecules()
+        speciesList = self._unpackSpecies(molecules)
+        reactionList = []
+        unpickler = _Unpickler(speciesList, molecules, reactionList)
+
+        self._unpackThermo(speciesList, unpickler)
+        reactionList.extend(self._unpackReactions(speciesList, unpickler))
+        networkList = [unpickler.loads(data) for data in self.getStrings('networks.pickled')]
+        for reaction, row in zip(reactionList, self['reactions.network'].tolist()):
+            if row >= 0:
+                reaction.network = networkList[row]
+
+        return molecules, speciesList, reactionList, networkList
+
+    def _unpackQuantities(self, name):
+        """
+        Return the list of scalar quantities stored in the columns with the
+        prefix `name`, with ``None`` for the missing quantities.
+        """
+        values = self[name + '.value'].tolist()
+        uncertainties = self[name + '.uncertainty'].tolist()
+        unitIndices = self[name + '.units'].tolist()
+        multiplicative = self[name + '.multiplicative'].tolist()
+        quantities = []
+        for value, uncertainty, index, isMultiplicative in zip(values, uncertainties, unitIndices, multiplicative):
+            if index < 0:
+                quantities.append(None)
+                continue
+            quantity = ScalarQuantity(0.0, self.units[index], 0.0, '*|/' if isMultiplicative else '+|-')
+            quantity.value_si = value
+            quantity.uncertainty_si = uncertainty
+            quantities.append(quantity)
+        return quantities
+
+    def _unpackMolecules(self):
+        """
+        Return the list of molecules in the snapshot.
+        """
+        atomOffsets = self['molecule.atomOffsets'].tolist()
+        bondOffsets = self['molecule.bondOffsets'].tolist()
+        multiplicities = self['molecule.multiplicity'].tolist()
+        reactive = self['molecule.reactive'].tolist()
+        numbers = self['atom.number'].tolist()
+        isotopes = self['atom.isotope'].tolist()
+        radicalElectrons = self['atom.radicalElectrons'].tolist()
+        charges = self['atom.charge'].tolist()
+        lonePairs = self['atom.lonePairs'].tolist()
+        bondAtoms = self['bond.atoms'].tolist()
+        bondOrders = self['bond.order'].tolist()
+
+        elements = {}
+        molecules = []
+        for i in xrange(len(multiplicities)):
+            atoms = []
+            for j in xrange(atomOffsets[i], atomOffsets[i+1]):
+                key = (numbers[j], isotopes[j])
+                try:
+                    element = elements[key]
+                except KeyError:
+                    element = elements[key] = getElement(numbers[j], isotopes[j])
+                atoms.append(Atom(element=element, radicalElectrons=radicalElectrons[j],
+                                  charge=charges[j], lonePairs=lonePairs[j]))
+            molecule = Molecule(atoms=atoms, multiplicity=multiplicities[i], reactive=bool(reactive[i]))
+            for j in xrange(bondOffsets[i], bondOffsets[i+1]):
+                atom1, atom2 = bondAtoms[j]
+                molecule.addBond(Bond(atoms[atom1], atoms[atom2], order=bondOrders[j]))
+            molecule.updateAtomTypes()
+            molecule.identifyRingMembership()
+            molecules.append(molecule)
+        return molecules
+
+    def _unpackSpecies(self, molecules):
+        """
+        Return the list of species in the snapshot, using the given list of
+        all `molecules`. The thermodynamics models and other attributes of the
+        species are set by :meth:`_unpackThermo`.
+        """
+        labels = self.getStrings('species.label')
+        indices = self['species.index'].tolist()
+        reactive = self['species.reactive'].tolist()
+        symmetryNumbers = self['species.symmetryNumber'].tolist()
+        creationIterations = self['species.creationIteration'].tolist()
+        moleculeOffsets = self['species.moleculeOffsets'].tolist()
+
+        speciesList = []
+        for i in xrange(len(labels)):
+            speciesList.append(Species(index=indices[i], label=labels[i],
+                                       molecule=molecules[moleculeOffsets[i]:moleculeOffsets[i+1]],
+                                       reactive=bool(reactive[i]), symmetryNumber=symmetryNumbers[i],
+                                       creationIteration=creationIterations[i]))
+        return speciesList
+
+    def _unpackThermo(self, speciesList, unpickler):
+        """
+        Set the thermodynamics models and the pickled attributes of the
+        species in `speciesList`.
+        """
+        polynomialOffsets = self['nasa.polynomialOffsets'].tolist()
+        labels = self.getStrings('nasa.label')
+        comments = self.getStrings('nasa.comment')
+        Tmin = self._unpackQuantities('nasa.Tmin')
+        Tmax = self._unpackQuantities('nasa.Tmax')
+        E0 = self._unpackQuantities('nasa.E0')
+        Cp0 = self._unpackQuantities('nasa.Cp0')
+        CpInf = self._unpackQuantities('nasa.CpInf')
+        coeffs = self['polynomial.coeffs'].tolist()
+        polynomialTmin = self._unpackQuantities('polynomial.Tmin')
+        polynomialTmax = self._unpackQuantities('polynomial.Tmax')
+
+        thermoList = []
+        for i in xrange(len(labels)):
+            polynomials = []
+            for j in xrange(polynomialOffsets[i], polynomialOffsets[i+1]):
+                polynomial = NASAPolynomial(coeffs=coeffs[j])
+                polynomial._Tmin = polynomialTmin[j]
+                polynomial._Tmax = polynomialTmax[j]
+                polynomials.append(polynomial)
+            thermo = NASA(polynomials=polynomials, label=labels[i], comment=comments[i])
+            thermo._Tmin = Tmin[i]
+            thermo._Tmax = Tmax[i]
+            thermo._E0 = E0[i]
+            thermo._Cp0 = Cp0[i]
+            thermo._CpInf = CpInf[i]
+            thermoList.append(thermo)
+
+        for spec, row, data in zip(speciesList, self['species.thermoRow'].tolist(), self.getStrings('species.pickled')):
+            if row >= 0:
+                spec.thermo = thermoList[row]
+            if data:
+                for attribute, value in unpickler.loads(data).iteritems():
+                    setattr(spec, attribute, value)
+
+    def _unpackKinetics(self):
+        """
+        Return the lists of the Arrhenius and the Chebyshev kinetics models
+        in the snapshot, without their comments.
+        """
+        A = self._unpackQuantities('arrhenius.A')
+        n = self._unpackQuantities('arrhenius.n')
+        Ea = self._unpackQuantities('arrhenius.Ea')
+        T0 = self._unpackQuantities('arrhenius.T0')
+        Tmin = self._unpackQuantities('arrhenius.Tmin')
+        Tmax = self._unpackQuantities('arrhenius.Tmax')
+        Pmin = self._unpackQuantities('arrhenius.Pmin')
+        Pmax = self._unpackQuantities('arrhenius.Pmax')
+        arrheniusList = []
+        for i in xrange(len(A)):
+            kinetics = Arrhenius()
+            kinetics._A = A[i]
+            kinetics._n = n[i]
+            kinetics._Ea = Ea[i]
+            kinetics._T0 = T0[i]
+            kinetics._Tmin = Tmin[i]
+            kinetics._Tmax = Tmax[i]
+            kinetics._Pmin = Pmin[i]
+            kinetics._Pmax = Pmax[i]
+            arrheniusList.append(kinetics)
+
+        coeffOffsets = self['chebyshev.coeffOffsets'].tolist()
+        degrees = self['chebyshev.degrees'].tolist()
+        coeffs = self['chebyshev.coeffs']
+        kunits = self['chebyshev.kunits'].tolist()
+        Tmin = self._unpackQuantities('chebyshev.Tmin')
+        Tmax = self._unpackQuantities('chebyshev.Tmax')
+        Pmin = self._unpackQuantities('chebyshev.Pmin')
+        Pmax = self._unpackQuantities('chebyshev.Pmax')
+        chebyshevList = []
+        for i in xrange(len(kunits)):
+            # The stored coefficients already include the conversion of the
+            # rate coefficient units, so they are not passed to the constructor
+            kinetics = Chebyshev(kunits=self.units[kunits[i]])
+            kinetics.coeffs = numpy.array(coeffs[coeffOffsets[i]:coeffOffsets[i+1]]).reshape(degrees[i])
+            kinetics.degreeT, kinetics.degreeP = degrees[i]
+            kinetics._Tmin = Tmin[i]
+            kinetics._Tmax = Tmax[i]
+            kinetics._Pmin = Pmin[i]
+            kinetics._Pmax = Pmax[i]
+            chebyshevList.append(kinetics)
+
+        return arrheniusList, chebyshevList
+
+    def _unpackReactions(self, speciesList, unpickler):
+        """
+        Return the list of reactions in the snapshot, using the given list of
+        all species. The `network` attributes of the pressure-dependent
+        reactions are set by :meth:`getObjects`.
+        """
+        arrheniusList, chebyshevList = self._unpackKinetics()
+
+        types = self['reactions.type'].tolist()
+        indices = self['reactions.index'].tolist()
+        flags = self['reactions.flags'].tolist()
+        degeneracies = self['reactions.degeneracy'].tolist()
+        specificColliders = self['reactions.specificCollider'].tolist()
+        labels = self.getStrings('reactions.label')
+        comments = self.getStrings('reactions.comment')
+        sources = self.getStrings('reactions.source')
+        templates = self.getStrings('reactions.template')
+        estimators = self.getStrings('reactions.estimator')
+        kineticsTypes = self['reactions.kineticsType'].tolist()
+        kineticsRows = self['reactions.kineticsRow'].tolist()
+        kineticsComments = self.getStrings('reactions.kineticsComment')
+        pickled = self.getStrings('reactions.pickled')
+        reactantOffsets = self['reactions.reactantOffsets'].tolist()
+        reactants = self['reactions.reactants'].tolist()
+        productOffsets = self['reactions.productOffsets'].tolist()
+        products = self['reactions.products'].tolist()
+        pairOffsets = self['reactions.pairOffsets'].tolist()
+        pairs = self['reactions.pairs'].tolist()
+
+        reactionList = []
+        for i in xrange(len(types)):
+            if types[i] == _PICKLED_REACTION:
+                reactionList.append(unpickler.loads(pickled[i]))
+                continue
+            extra = unpickler.loads(pickled[i]) if pickled[i] else {}
+
+            if types[i] == _TEMPLATE_REACTION:
+                reaction = TemplateReaction(family=sources[i], estimator=estimators[i] or None,
+                                            template=templates[i].split(';') if templates[i] else None)
+            elif types[i] == _LIBRARY_REACTION:
+                reaction = LibraryReaction(library=sources[i])
+            elif types[i] == _PDEP_REACTION:
+                reaction = PDepReaction()
+            else:
+                reaction = Reaction()
+
+            reaction.index = indices[i]
+            reaction.label = labels[i]
+            reaction.comment = comments[i]
+            reaction.reactants = [speciesList[row] for row in reactants[reactantOffsets[i]:reactantOffsets[i+1]]]
+            reaction.products = [speciesList[row] for row in products[productOffsets[i]:productOffsets[i+1]]]
+            if specificColliders[i] >= 0:
+                reaction.specificCollider = speciesList[specificColliders[i]]
+            if flags[i] & _HAS_PAIRS:
+                reaction.pairs = [(speciesList[row1], speciesList[row2])
+                                  for row1, row2 in pairs[pairOffsets[i]:pairOffsets[i+1]]]
+            # Set the degeneracy directly, since the property would also scale the kinetics
+            reaction._degeneracy = degeneracies[i]
+            reaction.reversible = bool(flags[i] & _REVERSIBLE)
+            reaction.duplicate = bool(flags[i] & _DUPLICATE)
+            reaction.allow_pdep_route = bool(flags[i] & _ALLOW_PDEP_ROUTE)
+            reaction.elementary_high_p = bool(flags[i] & _ELEMENTARY_HIGH_P)
+            reaction.allow_max_rate_violation = bool(flags[i] & _ALLOW_MAX_RATE_VIOLATION)
+            reaction.is_forward = bool(flags[i] & _IS_FORWARD)
+
+            if kineticsTypes[i] == _ARRHENIUS:
+                reaction.kinetics = arrheniusList[kineticsRows[i]]
+                reaction.kinetics.comment = kineticsComments[i]
+            elif kineticsTypes[i] == _CHEBYSHEV:
+                reaction.kinetics = chebyshevList[kineticsRows[i]]
+                reaction.kinetics.comment = kineticsComments[i]
+            for attribute, value in extra.iteritems():
+                setattr(reaction, attribute, value)
+
+            reactionList.append(reaction)
+        return reactionList
+
+class _JournalRecord(MechanismSnapshot):
+    """
+    A record of a snapshot journal, read from the byte string `payload`. Its
+    columns are accessed in the same way as those of a snapshot, but are
+    read from memory.
+    """
+
+    def __init__(self, path, payload):
+        self.path = path
+        self.payload = payload
+        headerLength, = struct.unpack_from('<Q', payload)
+        self.dataOffset = _align(8 + headerLength)
+        self._setHeader(json.loads(payload[8:8 + headerLength]))
+
+    def _getArray(self, dtype, shape, offset):
+        """
+        Return the array of the given `dtype` and `shape` stored at `offset`.
+        """
+        return numpy.frombuffer(self.payload, dtype, int(numpy.prod(shape)), offset).reshape(shape)
+
+################################################################################
+
+class ModelCheckpoint(object):
+    """
+    The reaction model of a job as of its last checkpoint, restored from a
+    snapshot and the journal of the changes made since it was written. The
+    attributes are:
+
+    =================== ======================= ================================
+    Attribute           Type                    Description
+    =================== ======================= ================================
+    `path`              ``str``                 The path of the snapshot file
+    `journalPath`       ``str``                 The path of the journal file
+    `metadata`          ``dict``                The metadata of the snapshot, updated by each journal record
+    `flags`             ``dict``                The flag arrays of the last checkpoint
+    `coreSpecies`       ``list``                The species in the model core
+    `coreReactions`     ``list``                The reactions in the model core
+    `edgeSpecies`       ``list``                The species in the model edge
+    `edgeReactions`     ``list``                The reactions in the model edge
+    `networkList`       ``list``                The pressure-dependent networks of the model
+    `surfaceSpecies`    ``list``                The species in the surface of the core
+    `surfaceReactions`  ``list``                The reactions in the surface of the core
+    `numRecords`        ``int``                 The number of journal records applied to the snapshot
+    `molecules`         ``list``                All of the molecules written to the snapshot and journal, in the order of their rows
+    `species`           ``list``                All of the species written to the snapshot and journal, in the order of their rows
+    `reactions`         ``list``                All of the reactions written to the snapshot and journal, in the order of their rows
+    `networks`          ``list``                All of the networks written to the snapshot and journal, in the order of their rows
+    =================== ======================= ================================
+
+    If `journalPath` is not given, the journal is looked for next to the
+    snapshot. A journal written after a different snapshot is ignored.
+    """
+
+    def __init__(self, path, journalPath=None):
+        self.path = path
+        self.journalPath = journalPath or os.path.join(os.path.dirname(path), 'journal.bin')
+
+        snapshot = MechanismSnapshot(path)
+        self.metadata = dict(snapshot.metadata)
+        self.flags = snapshot.getFlags()
+        self.molecules, self.species, self.reactions, self.networks = snapshot._getObjects()
+        numCoreSpecies = snapshot.numCoreSpecies
+        numCoreReactions = snapshot.numCoreReactions
+        members = {
+            'coreSpecies': range(numCoreSpecies),
+            'edgeSpecies': range(numCoreSpecies, len(self.species)),
+            'coreReactions': range(numCoreReactions),
+            'edgeReactions': range(numCoreReactions, len(self.reactions)),
+            'networks': range(len(self.networks)),
+        }
+        for name, table in _SURFACE_LISTS:
+            members[name] = snapshot.getMembership(name, [])
+
+        self.numRecords = 0
+        if os.path.exists(self.journalPath):
+            snapshotID, records = _readJournal(self.journalPath)
+            if snapshotID != snapshot.metadata.get('id'):
+                logging.warning('Ignoring snapshot journal {0}, which was not written after snapshot {1}.'.format(self.journalPath, path))
+            else:
+                for record in records:
+                    self.applyRecord(record, members)
+                    self.numRecords += 1
+
+        self.coreSpecies = [self.species[row] for row in members['coreSpecies']]
+        self.edgeSpecies = [self.species[row] for row in members['edgeSpecies']]
+        self.coreReactions = [self.reactions[row] for row in members['coreReactions']]
+        self.edgeReactions = [self.reactions[row] for row in members['edgeReactions']]
+        self.networkList = [self.networks[row] for row in members['networks']]
+        self.surfaceSpecies = [self.species[row] for row in members['surfaceSpecies']]
+        self.surfaceReactions = [self.reactions[row] for row in members['surfaceReactions']]
+
+    def applyRecord(self, record, members):
+        """
+        Apply the changes in the journal `record` to the objects of the
+        checkpoint and to the dict `members` of the rows in each model list.
+        """
+        metadata = record.metadata
+        if (metadata['firstMoleculeRow'] != len(self.molecules) or metadata['firstSpeciesRow'] != len(self.species)
+                or metadata['firstReactionRow'] != len(self.reactions)):
+            raise SnapshotError('Snapshot journal {0} does not match snapshot {1}.'.format(self.journalPath, self.path))
+        unpickler = _Unpickler(self.species, self.molecules, self.reactions)
+
+        molecules = record._unpackMolecules()
+        self.molecules.extend(molecules)
+        speciesList = record._unpackSpecies(molecules)
+        self.species.extend(speciesList)
+        record._unpackThermo(speciesList, unpickler)
+        reactionList = record._unpackReactions(self.species, unpickler)
+        self.reactions.extend(reactionList)
+
+        for row, data in zip(record['species.modifiedRows'].tolist(), record.getStrings('species.modified')):
+            spec = self.species[row]
+            attributes = unpickler.loads(data)
+            spec.molecule.extend(attributes.pop('addedMolecules'))
+            for attribute, value in attributes.iteritems():
+                setattr(spec, attribute, value)
+        for row, data in zip(record['reactions.modifiedRows'].tolist(), record.getStrings('reactions.modified')):
+            reaction = self.reactions[row]
+            for attribute, value in unpickler.loads(data).iteritems():
+                setattr(reaction, attribute, value)
+
+        for row, data in zip(record['networks.rows'].tolist(), record.getStrings('networks.pickled')):
+            network = unpickler.loads(data)
+            if row == len(self.networks):
+                self.networks.append(network)
+            else:
+                self.networks[row] = network
+            # The net reactions of a network that changed are kept, so they
+            # must refer to its new copy
+            for reaction in network.netReactions:
+                if isinstance(reaction, PDepReaction):
+                    reaction.network = network
+        for reaction, row in zip(reactionList, record['reactions.network'].tolist()):
+            if row >= 0:
+                reaction.network = self.networks[row]
+
+        for name in members:
+            members[name] = record.getMembership(name, members[name])
+        self.flags = record.getFlags()
+        for key in ('iteration', 'speciesCounter', 'reactionCounter', 'networkCount'):
+            self.metadata[key] = metadata[key]
+        for key in _FILTER_BOUNDS:
+            if key in metadata:
+                self.metadata[key] = metadata[key]
+
+################################################################################
+
+class _Rows(object):
+    """
+    The rows given to the species, molecules, reactions and networks written
+    to a snapshot and its journal, indexed by the ids of the objects. The
+    objects are kept alive until they are forgotten, so that their ids are
+    not reused by other objects.
+    """
+
+    def __init__(self):
+        self.species = {}
+        self.molecules = {}
+        self.reactions = {}
+        self.networks = {}
+        self.counts = {'species': 0, 'molecules': 0, 'reactions': 0, 'networks': 0}
+        self.objects = {}
+
+    def add(self, table, obj):
+        """
+        Give the next row of `table` to `obj`, and return it.
+        """
+        row = self.counts[table]
+        self.counts[table] += 1
+        getattr(self, table)[id(obj)] = row
+        self.objects[id(obj)] = obj
+        return row
+
+    def forget(self, table, obj):
+        """
+        Remove `obj` from `table`, if present.
+        """
+        getattr(self, table).pop(id(obj), None)
+        self.objects.pop(id(obj), None)
+
+################################################################################
+
+class _Pickler(object):
+    """
+    Pickles the objects of a snapshot that are not stored in columns. The
+    species, molecules and reactions of the snapshot are replaced by
+    references to their rows, so they keep their identity when loaded.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.obj = None
+
+    def persistentID(self, obj):
+        if obj is self.obj:
+            return None
+        elif isinstance(obj, Species):
+            row = self.rows.species.get(id(obj))
+            return None if row is None else 'S{0:d}'.format(row)
+        elif isinstance(obj, Molecule):
+            row = self.rows.molecules.get(id(obj))
+            return None if row is None else 'M{0:d}'.format(row)
+        elif isinstance(obj, Reaction):
+            row = self.rows.reactions.get(id(obj))
+            return None if row is None else 'R{0:d}'.format(row)
+        return None
+
+    def dumps(self, obj):
+        f = cStringIO.StringIO()
+        pickler = cPickle.Pickler(f, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self.persistentID
+        self.obj = obj
+        try:
+            pickler.dump(obj)
+        finally:
+            self.obj = None
+        return f.getvalue()
+
+class _Unpickler(object):
+    """
+    Unpickles the objects pickled by :class:`_Pickler`, using the given lists
+    of species, molecules and reactions to resolve the references.
+    """
+
+    def __init__(self, speciesList, moleculeList, reactionList):
+        self.objects = {'S': speciesList, 'M': moleculeList, 'R': reactionList}
+
+    def persistentLoad(self, pid):
+        return self.objects[pid[0]][int(pid[1:])]
+
+    def loads(self, data):
+        unpickler = cPickle.Unpickler(cStringIO.StringIO(data))
+        unpickler.persistent_load = self.persistentLoad
+        return unpickler.load()
+
+################################################################################
+
+def _align(offset):
+    """
+    Return the smallest multiple of the column alignment not below `offset`.
+    """
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+def _getUnitsIndex(units, string):
+    """
+    Return the index of the units `string` in the list `units`, adding it if
+    necessary.
+    """
+    try:
+        return units.index(string)
+    except ValueError:
+        units.append(string)
+        return len(units) - 1
+
+def _packOffsets(counts):
+    """
+    Return the offsets of consecutive runs of the given lengths `counts`.
+    """
+    offsets = numpy.zeros(len(counts) + 1, numpy.int64)
+    offsets[1:] = numpy.cumsum(counts)
+    return offsets
+
+def _packBlobs(columns, name, blobs):
+    """
+    Add a column `name` of the byte strings `blobs` to `columns`.
+    """
+    blobs = [blob.encode('utf-8') if isinstance(blob, unicode) else (blob or '') for blob in blobs]
+    data = ''.join(blobs)
+    columns[name + '.offsets'] = _packOffsets([len(blob) for blob in blobs])
+    columns[name + '.data'] = numpy.frombuffer(data, numpy.uint8) if data else numpy.zeros(0, numpy.uint8)
+
+def _packQuantities(columns, name, quantities, units):
+    """
+    Add the columns of the scalar `quantities`, any of which may be ``None``,
+    to `columns` under the prefix `name`. The quantities are stored in SI
+    units, along with the index of their original units in `units`.
+    """
+    count = len(quantities)
+    values = numpy.zeros(count, numpy.float64)
+    uncertainties = numpy.zeros(count, numpy.float64)
+    unitIndices = -numpy.ones(count, numpy.int16)
+    multiplicative = numpy.zeros(count, numpy.uint8)
+    for i, quantity in enumerate(quantities):
+        if quantity is not None:
+            values[i] = quantity.value_si
+            uncertainties[i] = quantity.uncertainty_si
+            unitIndices[i] = _getUnitsIndex(units, quantity.units)
+            multiplicative[i] = quantity.isUncertaintyMultiplicative()
+    columns[name + '.value'] = values
+    columns[name + '.uncertainty'] = uncertainties
+    columns[name + '.units'] = unitIndices
+    columns[name + '.multiplicative'] = multiplicative
+
+def _packSpecies(columns, speciesList, rows):
+    """
+    Add the columns of the species in `speciesList` and their molecules,
+    atoms and bonds to `columns`, giving the species and molecules the next
+    rows in `rows`.
+    """
+    multiplicities = []; moleculeReactive = []; atomCounts = []; bondCounts = []
+    numbers = []; isotopes = []; radicalElectrons = []; charges = []; lonePairs = []
+    bondAtoms = []; bondOrders = []
+    for spec in speciesList:
+        rows.add('species', spec)
+        for molecule in spec.molecule:
+            rows.add('molecules', molecule)
+            multiplicities.append(molecule.multiplicity)
+            moleculeReactive.append(molecule.reactive)
+            atomIndices = {}
+            for atom in molecule.atoms:
+                atomIndices[id(atom)] = len(atomIndices)
+                numbers.append(atom.element.number)
+                isotopes.append(atom.element.isotope)
+                radicalElectrons.append(atom.radicalElectrons)
+                charges.append(atom.charge)
+                lonePairs.append(atom.lonePairs)
+            bonds = molecule.getAllEdges()
+            for bond in bonds:
+                bondAtoms.append((atomIndices[id(bond.vertex1)], atomIndices[id(bond.vertex2)]))
+                bondOrders.append(bond.order)
+            atomCounts.append(len(atomIndices))
+            bondCounts.append(len(bonds))
+
+    columns['species.index'] = numpy.array([spec.index for spec in speciesList], numpy.int32)
+    columns['species.reactive'] = numpy.array([spec.reactive for spec in speciesList], numpy.uint8)
+    columns['species.symmetryNumber'] = numpy.array([spec.symmetryNumber for spec in speciesList], numpy.float64)
+    columns['species.creationIteration'] = numpy.array([spec.creationIteration for spec in speciesList], numpy.int32)
+    columns['species.moleculeOffsets'] = _packOffsets([len(spec.molecule) for spec in speciesList])
+    _packBlobs(columns, 'species.label', [spec.label for spec in speciesList])
+    columns['molecule.multiplicity'] = numpy.array(multiplicities, numpy.int16)
+    columns['molecule.reactive'] = numpy.array(moleculeReactive, numpy.uint8)
+    columns['molecule.atomOffsets'] = _packOffsets(atomCounts)
+    columns['molecule.bondOffsets'] = _packOffsets(bondCounts)
+    columns['atom.number'] = numpy.array(numbers, numpy.int16)
+    columns['atom.isotope'] = numpy.array(isotopes, numpy.int16)
+    columns['atom.radicalElectrons'] = numpy.array(radicalElectrons, numpy.int8)
+    columns['atom.charge'] = numpy.array(charges, numpy.int8)
+    columns['atom.lonePairs'] = numpy.array(lonePairs, numpy.int8)
+    columns['bond.atoms'] = numpy.array(bondAtoms, numpy.int32).reshape(-1, 2)
+    columns['bond.order'] = numpy.array(bondOrders, numpy.float32)
+
+def _packThermo(columns, speciesList, units, pickler):
+    """
+    Add the columns of the NASA thermodynamics models of the species in
+    `speciesList` to `columns`. Other thermodynamics models and the
+    conformers, transport data and energy transfer models of the species are
+    pickled.
+    """
+    thermoRows = []
+    pickled = []
+    nasaList = []
+    for spec in speciesList:
+        extra = {}
+        if type(spec.thermo) is NASA:
+            thermoRows.append(len(nasaList))
+            nasaList.append(spec.thermo)
+        else:
+            thermoRows.append(-1)
+            if spec.thermo is not None:
+                extra['thermo'] = spec.thermo
+        for attribute in ('conformer', 'transportData', 'energyTransferModel'):
+            value = getattr(spec, attribute)
+            if value is not None:
+                extra[attribute] = value
+        if spec.props:
+            extra['props'] = spec.props
+        if spec.explicitlyAllowed:
+            extra['explicitlyAllowed'] = spec.explicitlyAllowed
+        if spec.isSolvent:
+            extra['isSolvent'] = spec.isSolvent
+        pickled.append(pickler.dumps(extra) if extra else '')
+    columns['species.thermoRow'] = numpy.array(thermoRows, numpy.int32)
+    _packBlobs(columns, 'species.pickled', pickled)
+
+    polynomials = [thermo.polynomials for thermo in nasaList]
+    columns['nasa.polynomialOffsets'] = _packOffsets([len(polys) for polys in polynomials])
+    _packBlobs(columns, 'nasa.label', [thermo.label for thermo in nasaList])
+    _packBlobs(columns, 'nasa.comment', [thermo.comment for thermo in nasaList])
+    for attribute in ('Tmin', 'Tmax', 'E0', 'Cp0', 'CpInf'):
+        _packQuantities(columns, 'nasa.' + attribute, [getattr(thermo, attribute) for thermo in nasaList], units)
+
+    polynomials = [poly for polys in polynomials for poly in polys]
+    columns['polynomial.coeffs'] = numpy.array([[poly.cm2, poly.cm1, poly.c0, poly.c1, poly.c2, poly.c3, poly.c4, poly.c5, poly.c6]
+                                                for poly in polynomials], numpy.float64).reshape(-1, 9)
+    _packQuantities(columns, 'polynomial.Tmin', [poly.Tmin for poly in polynomials], units)
+    _packQuantities(columns, 'polynomial.Tmax', [poly.Tmax for poly in polynomials], units)
+
+def _packReactions(columns, reactionList, rows, units, pickler):
+    """
+    Add the columns of the reactions in `reactionList` and of their
+    Arrhenius and Chebyshev kinetics to `columns`. The species of the
+    reactions and the networks of the pressure-dependent reactions are
+    stored as their rows in `rows`.
+    """
+    def getSpeciesRow(spec, reaction):
+        try:
+            return rows.species[id(spec)]
+        except KeyError:
+            raise SnapshotError('Species {0} of reaction {1} is not in the model.'.format(spec, reaction))
+
+    networkRows = rows.networks
+    types = []; indices = []; flags = []; degeneracies = []; specificColliders = []; networks = []
+    labels = []; comments = []; sources = []; templates = []; estimators = []; pickled = []
+    reactants = []; reactantCounts = []; products = []; productCounts = []; pairs = []; pairCounts = []
+    kineticsTypes = []; kineticsRows = []; kineticsComments = []
+    arrheniusList = []; chebyshevList = []
+    for reaction in reactionList:
+        extra = {}
+        networks.append(-1)
+        if isinstance(reaction, TemplateReaction):
+            types.append(_TEMPLATE_REACTION)
+            sources.append(reaction.family)
+            templates.append(';'.join(reaction.template) if reaction.template else '')
+            estimators.append(reaction.estimator)
+        elif isinstance(reaction, LibraryReaction):
+            types.append(_LIBRARY_REACTION)
+            sources.append(reaction.library)
+            templates.append('')
+            estimators.append('')
+        elif isinstance(reaction, PDepReaction):
+            types.append(_PDEP_REACTION)
+            networks[-1] = networkRows.get(id(reaction.network), -1)
+            sources.append('')
+            templates.append('')
+            estimators.append('')
+        elif type(reaction) is Reaction:
+            types.append(_REACTION)
+            sources.append('')
+            templates.append('')
+            estimators.append('')
+        else:
+            # Reactions of any other type are pickled whole, but still need
+            # an entry in each of the other columns
+            types.append(_PICKLED_REACTION)
+            sources.append('')
+            templates.append('')
+            estimators.append('')
+
+        indices.append(reaction.index)
+        labels.append(reaction.label)
+        comments.append(reaction.comment)
+        degeneracies.append(reaction.degeneracy)
+        flags.append((_REVERSIBLE if reaction.reversible else 0) |
+                     (_DUPLICATE if reaction.duplicate else 0) |
+                     (_ALLOW_PDEP_ROUTE if reaction.allow_pdep_route else 0) |
+                     (_ELEMENTARY_HIGH_P if reaction.elementary_high_p else 0) |
+                     (_ALLOW_MAX_RATE_VIOLATION if reaction.allow_max_rate_violation else 0) |
+                     (_IS_FORWARD if reaction.is_forward else 0) |
+                     (_HAS_PAIRS if reaction.pairs is not None else 0))
+        reactants.extend([getSpeciesRow(spec, reaction) for spec in reaction.reactants])
+        reactantCounts.append(len(reaction.reactants))
+        products.extend([getSpeciesRow(spec, reaction) for spec in reaction.products])
+        productCounts.append(len(reaction.products))
+        if reaction.pairs is not None:
+            pairs.extend([(getSpeciesRow(spec1, reaction), getSpeciesRow(spec2, reaction)) for spec1, spec2 in reaction.pairs])
+        pairCounts.append(len(reaction.pairs or []))
+        specificColliders.append(-1 if reaction.specificCollider is None else getSpeciesRow(reaction.specificCollider, reaction))
+
+        kinetics = reaction.kinetics
+        kineticsComments.append('')
+        if kinetics is None or types[-1] == _PICKLED_REACTION:
+            kineticsTypes.append(_NO_KINETICS)
+            kineticsRows.append(-1)
+        elif type(kinetics) is Arrhenius:
+            kineticsTypes.append(_ARRHENIUS)
+            kineticsRows.append(len(arrheniusList))
+            kineticsComments[-1] = kinetics.comment
+            arrheniusList.append(kinetics)
+        elif type(kinetics) is Chebyshev and kinetics.highPlimit is None:
+            kineticsTypes.append(_CHEBYSHEV)
+            kineticsRows.append(len(chebyshevList))
+            kineticsComments[-1] = kinetics.comment
+            chebyshevList.append(kinetics)
+        else:
+            kineticsTypes.append(_PICKLED_KINETICS)
+            kineticsRows.append(-1)
+            extra['kinetics'] = kinetics
+
+        if types[-1] == _PICKLED_REACTION:
+            pickled.append(pickler.dumps(reaction))
+            continue
+        for attribute in ('network_kinetics', 'transitionState'):
+            value = getattr(reaction, attribute)
+            if value is not None:
+                extra[attribute] = value
+        pickled.append(pickler.dumps(extra) if extra else '')
+
+    columns['reactions.type'] = numpy.array(types, numpy.uint8)
+    columns['reactions.index'] = numpy.array(indices, numpy.int32)
+    columns['reactions.flags'] = numpy.array(flags, numpy.uint8)
+    columns['reactions.degeneracy'] = numpy.array(degeneracies, numpy.float64)
+    columns['reactions.specificCollider'] = numpy.array(specificColliders, numpy.int32)
+    columns['reactions.network'] = numpy.array(networks, numpy.int32)
+    columns['reactions.kineticsType'] = numpy.array(kineticsTypes, numpy.uint8)
+    columns['reactions.kineticsRow'] = numpy.array(kineticsRows, numpy.int32)
+    columns['reactions.reactantOffsets'] = _packOffsets(reactantCounts)
+    columns['reactions.reactants'] = numpy.array(reactants, numpy.int32)
+    columns['reactions.productOffsets'] = _packOffsets(productCounts)
+    columns['reactions.products'] = numpy.array(products, numpy.int32)
+    columns['reactions.pairOffsets'] = _packOffsets(pairCounts)
+    columns['reactions.pairs'] = numpy.array(pairs, numpy.int32).reshape(-1, 2)
+    _packBlobs(columns, 'reactions.label', labels)
+    _packBlobs(columns, 'reactions.comment', comments)
+    _packBlobs(columns, 'reactions.source', sources)
+    _packBlobs(columns, 'reactions.template', templates)
+    _packBlobs(columns, 'reactions.estimator', estimators)
+    _packBlobs(columns, 'reactions.kineticsComment', kineticsComments)
+    _packBlobs(columns, 'reactions.pickled', pickled)
+
+    for attribute in ('A', 'n', 'Ea', 'T0', 'Tmin', 'Tmax', 'Pmin', 'Pmax'):
+        _packQuantities(columns, 'arrhenius.' + attribute, [getattr(kinetics, attribute) for kinetics in arrheniusList], units)
+
+    coeffs = [kinetics.coeffs.value_si for kinetics in chebyshevList]
+    columns['chebyshev.coeffOffsets'] = _packOffsets([c.size for c in coeffs])
+    columns['chebyshev.coeffs'] = numpy.concatenate([c.flatten() for c in coeffs]) if coeffs else numpy.zeros(0, numpy.float64)
+    columns['chebyshev.degrees'] = numpy.array([c.shape for c in coeffs], numpy.int32).reshape(-1, 2)
+    columns['chebyshev.kunits'] = numpy.array([_getUnitsIndex(units, kinetics.kunits) for kinetics in chebyshevList], numpy.int16)
+    for attribute in ('Tmin', 'Tmax', 'Pmin', 'Pmax'):
+        _packQuantities(columns, 'chebyshev.' + attribute, [getattr(kinetics, attribute) for kinetics in chebyshevList], units)
+
+def _packFlags(columns, flags):
+    """
+    Add the flag arrays in the dict `flags` to `columns`. Boolean arrays,
+    which are mostly false, are stored as their shape and the indices of
+    their true entries.
+    """
+    for name, value in flags.iteritems():
+        if value is None:
+            continue
+        value = numpy.asarray(value)
+        if value.dtype == numpy.bool_:
+            columns['flags.' + name + '.shape'] = numpy.array(value.shape, numpy.int64)
+            columns['flags.' + name + '.indices'] = numpy.argwhere(value).astype(numpy.int32)
+        else:
+            columns['flags.' + name] = value
+
+def _packMembership(columns, name, previous, current):
+    """
+    Add the change of the model list `name` from the list of rows `previous`
+    to the list of rows `current` to `columns`. The change is stored as the
+    removed and the appended rows, unless the list was reordered, in which
+    case all of its rows are stored.
+    """
+    previousSet = set(previous)
+    added = [row for row in current if row not in previousSet]
+    removed = previousSet.difference(current)
+    if [row for row in previous if row not in removed] + added == current:
+        columns['members.' + name + '.removed'] = numpy.array(sorted(removed), numpy.int32)
+        columns['members.' + name + '.added'] = numpy.array(added, numpy.int32)
+    else:
+        columns['members.' + name + '.rows'] = numpy.array(current, numpy.int32)
+
+def _dumpColumns(f, columns, metadata, origin=0):
+    """
+    Write the length of a JSON header holding the dict `metadata` and the
+    layout of the arrays in the dict `columns`, the header and the arrays to
+    the file object `f`. The arrays are aligned relative to the position
+    `origin` in `f`.
+    """
+    names = sorted(columns.keys())
+    layout = {}
+    offset = 0
+    for name in names:
+        array = numpy.ascontiguousarray(columns[name])
+        columns[name] = array
+        layout[name] = (array.dtype.str, array.shape, offset)
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({'metadata': metadata, 'columns': layout})
+
+    f.write(struct.pack('<Q', len(header)))
+    f.write(header)
+    dataOffset = origin + _align(f.tell() - origin)
+    for name in names:
+        f.write('\0' * (dataOffset + layout[name][2] - f.tell()))
+        f.write(columns[name].tostring())
+
+def _writeColumns(path, columns, metadata):
+    """
+    Write the arrays in the dict `columns` and the dict `metadata` to a
+    snapshot file at `path` on disk.
+    """
+    tempPath = path + '.tmp'
+    with open(tempPath, 'wb') as f:
+        f.write(_MAGIC)
+        _dumpColumns(f, columns, metadata)
+        f.flush()
+        os.fsync(f.fileno())
+    _replaceFile(tempPath, path)
+
+def _replaceFile(tempPath, path):
+    """
+    Move the file at `tempPath` to `path`, replacing any existing file.
+    """
+    try:
+        os.rename(tempPath, path)
+    except OSError:
+        # Windows does not allow renaming onto an existing file
+        os.remove(path)
+        os.rename(tempPath, path)
+
+def _startJournal(path, snapshotID):
+    """
+    Replace the journal at `path` on disk with an empty journal of the
+    snapshot with id `snapshotID`.
+    """
+    header = json.dumps({'snapshot': snapshotID})
+    tempPath = path + '.tmp'
+    with open(tempPath, 'wb') as f:
+        f.write(_JOURNAL_MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        f.flush()
+        os.fsync(f.fileno())
+    _replaceFile(tempPath, path)
+
+def _appendRecord(path, columns, metadata):
+    """
+    Append a record of the arrays in the dict `columns` and the dict
+    `metadata` to the journal at `path` on disk.
+    """
+    f = cStringIO.StringIO()
+    _dumpColumns(f, columns, metadata)
+    payload = f.getvalue()
+    with open(path, 'ab') as f:
+        f.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload) & 0xffffffff))
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+def _readJournal(path):
+    """
+    Read the journal at `path` on disk. Returns the id of the snapshot that
+    the journal follows and the list of its records. A record that was only
+    partly written, e.g. because the job was killed, ends the journal.
+    """
+    records = []
+    with open(path, 'rb') as f:
+        if f.read(len(_JOURNAL_MAGIC)) != _JOURNAL_MAGIC:
+            raise SnapshotError('{0} is not a snapshot journal file.'.format(path))
+        headerLength, = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(headerLength))
+        while True:
+            data = f.read(_RECORD_HEADER.size)
+            if not data:
+                break
+            if len(data) == _RECORD_HEADER.size:
+                length, checksum = _RECORD_HEADER.unpack(data)
+                payload = f.read(length)
+                if len(payload) == length and zlib.crc32(payload) & 0xffffffff == checksum:
+                    records.append(_JournalRecord(path, payload))
+                    continue
+            logging.warning('Ignoring the incomplete last record of snapshot journal {0}.'.format(path))
+            break
+    return header['snapshot'], records
+
+def getFingerprint(obj):
+    """
+    Return a tuple of the attributes of the species, reaction or network
+    `obj` that can change after it is added to the model. Objects are
+    compared by identity, so the tuple changes whenever one is replaced.
+    """
+    if isinstance(obj, Species):
+        return (obj.thermo, obj.conformer, obj.transportData, obj.energyTransferModel, obj.reactive, len(obj.molecule))
+    elif isinstance(obj, Reaction):
+        return (obj.kinetics, obj.reversible, obj.duplicate)
+    else:
+        return (obj.valid, len(obj.explored), len(obj.isomers), len(obj.reactants), len(obj.products),
+                tuple(obj.pathReactions), tuple([(rxn, rxn.kinetics) for rxn in obj.netReactions]))
+
+def _getModelLists(reactionModel):
+    """
+    Return a dict of the lists of `reactionModel` recorded in a journal.
+    """
+    return {
+        'coreSpecies': reactionModel.core.species,
+        'edgeSpecies': reactionModel.edge.species,
+        'coreReactions': reactionModel.core.reactions,
+        'edgeReactions': reactionModel.edge.reactions,
+        'networks': reactionModel.networkList,
+        'surfaceSpecies': reactionModel.surface.species,
+        'surfaceReactions': reactionModel.surface.reactions,
+    }
+
+################################################################################
+
+class SnapshotWriter(object):
+    """
+    This class listens to a RMG subject
+    and writes a snapshot of the core and edge of the RMG model,
+    to a restart subfolder.
+
+    The first update writes a full snapshot, and each later update appends
+    the changes made to the model since the previous update to the journal
+    of the snapshot. When the journal grows larger than the snapshot, it is
+    compacted into a new snapshot.
+
+    A new instance of the class can be appended to a subject as follows:
+
+    rmg = ...
+    listener = SnapshotWriter(outputDirectory)
+    rmg.attach(listener)
+
+    Whenever the subject calls the .notify() method, the
+    .update() method of the listener will be called.
+
+    To stop listening to the subject, the class can be detached
+    from its subject:
+
+    rmg.detach(listener)
+
+    """
+    def __init__(self, outputDirectory=''):
+        super(SnapshotWriter, self).__init__()
+        self.path = getSnapshotPath(outputDirectory)
+        self.journalPath = getJournalPath(outputDirectory)
+        # Unlike the other output subfolders, an existing restart folder is
+        # kept, since it holds the snapshot that a restarted job is loaded from
+        directory = os.path.dirname(self.path)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.rows = None
+        self.fingerprints = {}
+        self.members = {}
+
+    def update(self, rmg):
+        if self.rows is None or os.path.getsize(self.journalPath) > os.path.getsize(self.path):
+            logging.info('Saving model snapshot...')
+            self.saveSnapshot(rmg.reactionModel, getFlags(rmg))
+        else:
+            logging.info('Saving changes to model snapshot journal...')
+            self.saveChanges(rmg.reactionModel, getFlags(rmg))
+
+    def saveSnapshot(self, reactionModel, flags):
+        """
+        Save a full snapshot of `reactionModel` and the dict `flags` of flag
+        arrays, and start a new journal after it.
+        """
+        rows = _Rows()
+        snapshotID = _saveSnapshot(self.path, reactionModel, flags, rows)
+        _startJournal(self.journalPath, snapshotID)
+        self.rows = rows
+        self.fingerprints = {}
+        self.members = {}
+        modelLists = _getModelLists(reactionModel)
+        for name, table in _MODEL_LISTS:
+            tableRows = getattr(rows, table)
+            self.members[name] = [tableRows[id(obj)] for obj in modelLists[name]]
+            for obj in modelLists[name]:
+                self.fingerprints[id(obj)] = getFingerprint(obj)
+        for name, table in _SURFACE_LISTS:
+            tableRows = getattr(rows, table)
+            self.members[name] = [tableRows[id(obj)] for obj in modelLists[name]]
+
+    def saveChanges(self, reactionModel, flags):
+        """
+        Append a record of the changes made to `reactionModel` since the
+        previous update, along with the dict `flags` of flag arrays, to the
+        journal.
+        """
+        rows = self.rows
+        modelLists = _getModelLists(reactionModel)
+        firstRows = dict(rows.counts)
+
+        # Sort the objects in the model into new ones, which are packed into
+        # the record, and known ones, which are recorded if they changed
+        objects = {'species': [], 'reactions': [], 'networks': []}
+        new = {'species': [], 'reactions': [], 'networks': []}
+        for name, table in _MODEL_LISTS:
+            tableRows = getattr(rows, table)
+            for obj in modelLists[name]:
+                objects[table].append(obj)
+                if id(obj) not in tableRows:
+                    new[table].append(obj)
+        modified = {}
+        for table in objects:
+            newIDs = set([id(obj) for obj in new[table]])
+            modified[table] = []
+            for obj in objects[table]:
+                if id(obj) in newIDs:
+                    continue
+                fingerprint = getFingerprint(obj)
+                if fingerprint != self.fingerprints[id(obj)]:
+                    modified[table].append((obj, self.fingerprints[id(obj)]))
+                    self.fingerprints[id(obj)] = fingerprint
+
+        # Forget the objects that were removed from the model
+        for table in objects:
+            present = set([id(obj) for obj in objects[table]])
+            for key in [key for key in getattr(rows, table) if key not in present]:
+                obj = rows.objects[key]
+                if table == 'species':
+                    for molecule in obj.molecule:
+                        rows.forget('molecules', molecule)
+                rows.forget(table, obj)
+                del self.fingerprints[key]
+
+        columns = {}
+        units = []
+        _packSpecies(columns, new['species'], rows)
+        for reaction in new['reactions']:
+            rows.add('reactions', reaction)
+        for network in new['networks']:
+            rows.add('networks', network)
+        pickler = _Pickler(rows)
+        _packThermo(columns, new['species'], units, pickler)
+        _packReactions(columns, new['reactions'], rows, units, pickler)
+
+        speciesRows = []; speciesAttributes = []
+        for spec, fingerprint in modified['species']:
+            speciesRows.append(rows.species[id(spec)])
+            speciesAttributes.append(pickler.dumps({
+                'thermo': spec.thermo,
+                'conformer': spec.conformer,
+                'transportData': spec.transportData,
+                'energyTransferModel': spec.energyTransferModel,
+                'reactive': spec.reactive,
+                # Resonance structures are only ever appended to a species
+                'addedMolecules': spec.molecule[fingerprint[-1]:],
+            }))
+        columns['species.modifiedRows'] = numpy.array(speciesRows, numpy.int32)
+        _packBlobs(columns, 'species.modified', speciesAttributes)
+        columns['reactions.modifiedRows'] = numpy.array([rows.reactions[id(rxn)] for rxn, fingerprint in modified['reactions']], numpy.int32)
+        _packBlobs(columns, 'reactions.modified', [pickler.dumps({'kinetics': rxn.kinetics, 'reversible': rxn.reversible, 'duplicate': rxn.duplicate})
+                                                   for rxn, fingerprint in modified['reactions']])
+        networks = [network for network, fingerprint in modified['networks']] + new['networks']
+        columns['networks.rows'] = numpy.array([rows.networks[id(network)] for network in networks], numpy.int32)
+        _packBlobs(columns, 'networks.pickled', [pickler.dumps(network) for network in networks])
+
+        # The surface lists only hold objects of the core, so they are not
+        # searched for new objects above
+        for name, table in _MODEL_LISTS + _SURFACE_LISTS:
+            tableRows = getattr(rows, table)
+            members = [tableRows[id(obj)] for obj in modelLists[name]]
+            _packMembership(columns, name, self.members[name], members)
+            self.members[name] = members
+        for table in new:
+            for obj in new[table]:
+                self.fingerprints[id(obj)] = getFingerprint(obj)
+        _packFlags(columns, flags)
+
+        metadata = {
+            'created': time.time(),
+            'iteration': reactionModel.iterationNum,
+            'firstSpeciesRow': firstRows['species'],
+            'firstMoleculeRow': firstRows['molecules'],
+            'firstReactionRow': firstRows['reactions'],
+            'speciesCounter': reactionModel.speciesCounter,
+            'reactionCounter': reactionModel.reactionCounter,
+            'networkCount': reactionModel.networkCount,
+            'units': units,
+        }
+        for key in _FILTER_BOUNDS:
+            metadata[key] = float(getattr(reactionModel, key))
+        _appendRecord(self.journalPath, columns, metadata)
+
+def getFlags(rmg):
+    """
+    Return a dict of the reaction flag arrays of the RMG job `rmg` that are
+    saved with its snapshots.
+    """
+    flags = {
+        'unimolecularReact': rmg.unimolecularReact,
+        'bimolecularReact': rmg.bimolecularReact,
+        'trimolecularReact': rmg.trimolecularReact,
+    }
+    if rmg.filterReactions:
+        flags['unimolecularThreshold'] = rmg.unimolecularThreshold
+        flags['bimolecularThreshold'] = rmg.bimolecularThreshold
+        flags['trimolecularThreshold'] = rmg.trimolecularThreshold
+    return flags
+
+def getSnapshotPath(outputDirectory):
+    """
+    Return the path of the snapshot file written by :class:`SnapshotWriter`
+    for a job with the given `outputDirectory`.
+    """
+    return os.path.join(outputDirectory, 'restart', 'snapshot.bin')
+
+def getJournalPath(outputDirectory):
+    """
+    Return the path of the snapshot journal written by :class:`SnapshotWriter`
+    for a job with the given `outputDirectory`.
+    """
+    return os.path.join(outputDirectory, 'restart', 'journal.bin')
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains unit tests of the rmgpy.snapshot module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+
+from rmgpy.exceptions import SnapshotError
+from rmgpy.species import Species
+from rmgpy.thermo import NASA, NASAPolynomial, ThermoData
+from rmgpy.kinetics import Arrhenius, Chebyshev, ThirdBody
+from rmgpy.data.kinetics.family import TemplateReaction
+from rmgpy.data.kinetics.library import LibraryReaction
+from rmgpy.rmg.pdep import PDepReaction
+from rmgpy.rmg.model import CoreEdgeReactionModel
+from rmgpy.rmg.main import RMG
+from rmgpy.snapshot import saveSnapshot, loadSnapshot, MechanismSnapshot, ModelCheckpoint, SnapshotWriter
+
+################################################################################
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Contains unit tests of saving and loading mechanism snapshots.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'snapshot.bin')
+
+        nasa = NASA(
+            polynomials = [
+                NASAPolynomial(coeffs=[5.15, -0.0136, 4.91e-05, -4.84e-08, 1.67e-11, -10246.6, -4.64], Tmin=(100,'K'), Tmax=(1084,'K')),
+                NASAPolynomial(coeffs=[0.90, 0.0114, -4.23e-06, 7.22e-10, -4.48e-14, -9747.6, 17.88], Tmin=(1084,'K'), Tmax=(5000,'K')),
+            ],
+            Tmin = (100,'K'),
+            Tmax = (5000,'K'),
+            comment = 'Thermo library: primaryThermoLibrary',
+        )
+        self.ch4 = Species(index=1, label='CH4').fromSMILES('C')
+        self.ch4.thermo = nasa
+        self.ch3 = Species(index=2, label='CH3').fromSMILES('[CH3]')
+        self.ch3.thermo = ThermoData(Tdata=([300,400,500,600,800,1000,1500],'K'), Cpdata=([9.2,10,10.8,11.5,12.8,13.9,15.8],'cal/(mol*K)'),
+                                     H298=(34.8,'kcal/mol'), S298=(46.4,'cal/(mol*K)'), Cp0=(33.258,'J/(mol*K)'), CpInf=(83.145,'J/(mol*K)'))
+        self.h = Species(index=3, label='H').fromSMILES('[H]')
+        self.h2 = Species(index=4, label='H2').fromSMILES('[H][H]')
+        self.c3h5 = Species(index=5, label='C3H5').fromSMILES('C=C[CH2]')
+        self.c3h5.generate_resonance_structures()
+
+        self.libraryReaction = LibraryReaction(
+            index = 1,
+            reactants = [self.ch3, self.h],
+            products = [self.ch4],
+            kinetics = Arrhenius(A=(1.93e14,'cm^3/(mol*s)'), n=-0.4, Ea=(0.5,'kcal/mol'), T0=(1,'K'), comment='from library'),
+            library = 'primaryReactionLibrary',
+            pairs = [(self.ch3, self.ch4), (self.h, self.ch4)],
+        )
+        self.templateReaction = TemplateReaction(
+            index = 2,
+            reactants = [self.ch4, self.h],
+            products = [self.ch3, self.h2],
+            kinetics = Arrhenius(A=(4.1e3,'cm^3/(mol*s)'), n=3.156, Ea=(8.755,'kcal/mol'), T0=(1,'K')),
+            degeneracy = 4,
+            family = 'H_Abstraction',
+            template = ['C_methane', 'H_rad'],
+            estimator = 'rate rules',
+        )
+        self.thirdBodyReaction = LibraryReaction(
+            index = 3,
+            reactants = [self.h, self.h],
+            products = [self.h2],
+            kinetics = ThirdBody(arrheniusLow=Arrhenius(A=(1e18,'cm^6/(mol^2*s)'), n=-1, Ea=(0,'kcal/mol'), T0=(1,'K')),
+                                 efficiencies={self.h2.molecule[0]: 0.0}),
+            library = 'primaryReactionLibrary',
+            reversible = False,
+        )
+        self.pdepReaction = PDepReaction(
+            index = 4,
+            reactants = [self.ch3, self.h],
+            products = [self.ch4],
+            kinetics = Chebyshev(coeffs=[[11.67, -0.1, 0.0], [0.17, 0.2, -0.03], [-0.05, 0.07, 0.01]], kunits='cm^3/(mol*s)',
+                                 Tmin=(300,'K'), Tmax=(2000,'K'), Pmin=(0.01,'bar'), Pmax=(100,'bar')),
+        )
+
+        self.reactionModel = CoreEdgeReactionModel()
+        self.reactionModel.core.species = [self.ch4, self.ch3, self.h, self.h2]
+        self.reactionModel.edge.species = [self.c3h5]
+        self.reactionModel.core.reactions = [self.libraryReaction, self.templateReaction, self.thirdBodyReaction]
+        self.reactionModel.edge.reactions = [self.pdepReaction]
+        self.reactionModel.speciesCounter = 5
+        self.reactionModel.reactionCounter = 4
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        shutil.rmtree(self.directory)
+
+    def testSaveAndLoadSpecies(self):
+        """
+        Test that the species and their thermodynamics are restored from a snapshot.
+        """
+        saveSnapshot(self.path, self.reactionModel)
+        coreSpecies, coreReactions, edgeSpecies, edgeReactions = loadSnapshot(self.path)
+
+        self.assertEqual([str(spec) for spec in coreSpecies], ['CH4(1)', 'CH3(2)', 'H(3)', 'H2(4)'])
+        self.assertEqual([str(spec) for spec in edgeSpecies], ['C3H5(5)'])
+        for spec0, spec in zip(self.reactionModel.core.species + self.reactionModel.edge.species, coreSpecies + edgeSpecies):
+            self.assertEqual(len(spec.molecule), len(spec0.molecule))
+            for molecule0, molecule in zip(spec0.molecule, spec.molecule):
+                self.assertTrue(molecule.isIsomorphic(molecule0))
+                self.assertEqual(molecule.multiplicity, molecule0.multiplicity)
+
+        self.assertTrue(isinstance(coreSpecies[0].thermo, NASA))
+        self.assertEqual(coreSpecies[0].thermo.comment, self.ch4.thermo.comment)
+        self.assertEqual(len(coreSpecies[0].thermo.polynomials), 2)
+        self.assertTrue(isinstance(coreSpecies[1].thermo, ThermoData))
+        self.assertIsNone(coreSpecies[2].thermo)
+        for T in [300, 1000, 2000]:
+            self.assertAlmostEqual(coreSpecies[0].thermo.getEnthalpy(T), self.ch4.thermo.getEnthalpy(T), 6)
+            self.assertAlmostEqual(coreSpecies[0].thermo.getEntropy(T), self.ch4.thermo.getEntropy(T), 6)
+            self.assertAlmostEqual(coreSpecies[1].thermo.getHeatCapacity(T), self.ch3.thermo.getHeatCapacity(T), 6)
+
+    def testSaveAndLoadReactions(self):
+        """
+        Test that the reactions and their kinetics are restored from a
+        snapshot, and that they refer to the restored species.
+        """
+        saveSnapshot(self.path, self.reactionModel)
+        coreSpecies, coreReactions, edgeSpecies, edgeReactions = loadSnapshot(self.path)
+        ch4, ch3, h, h2 = coreSpecies
+
+        self.assertEqual(len(coreReactions), 3)
+        self.assertEqual(len(edgeReactions), 1)
+        libraryReaction, templateReaction, thirdBodyReaction = coreReactions
+        pdepReaction = edgeReactions[0]
+
+        self.assertTrue(isinstance(libraryReaction, LibraryReaction))
+        self.assertEqual(libraryReaction.library, 'primaryReactionLibrary')
+        self.assertEqual(libraryReaction.kinetics.comment, 'from library')
+        self.assertIs(libraryReaction.reactants[0], ch3)
+        self.assertIs(libraryReaction.products[0], ch4)
+        self.assertEqual(libraryReaction.pairs, [(ch3, ch4), (h, ch4)])
+
+        self.assertTrue(isinstance(templateReaction, TemplateReaction))
+        self.assertEqual(templateReaction.family, 'H_Abstraction')
+        self.assertEqual(templateReaction.template, ['C_methane', 'H_rad'])
+        self.assertEqual(templateReaction.estimator, 'rate rules')
+        self.assertEqual(templateReaction.degeneracy, 4)
+        self.assertIsNone(templateReaction.pairs)
+
+        self.assertFalse(thirdBodyReaction.reversible)
+        self.assertTrue(isinstance(thirdBodyReaction.kinetics, ThirdBody))
+        self.assertIs(thirdBodyReaction.kinetics.efficiencies.keys()[0], h2.molecule[0])
+
+        self.assertTrue(isinstance(pdepReaction, PDepReaction))
+        self.assertIsNone(pdepReaction.network)
+
+        for reaction0, reaction in zip(self.reactionModel.core.reactions + self.reactionModel.edge.reactions, coreReactions + edgeReactions):
+            self.assertEqual(reaction.index, reaction0.index)
+            for T in [300, 1000, 2000]:
+                for P in [1e3, 1e5, 1e7]:
+                    self.assertAlmostEqual(reaction.getRateCoefficient(T, P) / reaction0.getRateCoefficient(T, P), 1.0, 6)
+
+    def testMetadataAndFlags(self):
+        """
+        Test that the metadata and the flag arrays are stored in a snapshot,
+        and that the columns are memory mapped.
+        """
+        unimolecularReact = numpy.array([True, False, True, False, False])
+        bimolecularReact = numpy.zeros((5, 5), bool)
+        bimolecularReact[1, 2] = True
+        saveSnapshot(self.path, self.reactionModel, {'unimolecularReact': unimolecularReact,
+                                                     'bimolecularReact': bimolecularReact,
+                                                     'trimolecularReact': None})
+
+        snapshot = MechanismSnapshot(self.path)
+        self.assertEqual(snapshot.numCoreSpecies, 4)
+        self.assertEqual(snapshot.numEdgeSpecies, 1)
+        self.assertEqual(snapshot.numCoreReactions, 3)
+        self.assertEqual(snapshot.numEdgeReactions, 1)
+        self.assertEqual(snapshot.metadata['reactionCounter'], 4)
+        self.assertTrue(isinstance(snapshot['species.index'], numpy.memmap))
+        self.assertEqual(snapshot['species.index'].tolist(), [1, 2, 3, 4, 5])
+        self.assertEqual(snapshot.getStrings('reactions.source'), ['primaryReactionLibrary', 'H_Abstraction', 'primaryReactionLibrary', ''])
+
+        flags = snapshot.getFlags()
+        self.assertEqual(sorted(flags.keys()), ['bimolecularReact', 'unimolecularReact'])
+        self.assertTrue((flags['unimolecularReact'] == unimolecularReact).all())
+        self.assertTrue((flags['bimolecularReact'] == bimolecularReact).all())
+        # The flags are modified during a job, so they must be writable
+        flags['unimolecularReact'][1] = True
+
+    def testInvalidSnapshot(self):
+        """
+        Test that a file that is not a snapshot is rejected.
+        """
+        with open(self.path, 'w') as f:
+            f.write('This is not a snapshot\n')
+        self.assertRaises(SnapshotError, MechanismSnapshot, self.path)
+
+    def testJournal(self):
+        """
+        Test that the changes made to a model after its snapshot are restored
+        from the snapshot journal, and that an incomplete last record and a
+        journal of an older snapshot are ignored.
+        """
+        rmg = RMG(outputDirectory=self.directory)
+        rmg.reactionModel = self.reactionModel
+        rmg.unimolecularReact = numpy.zeros(4, bool)
+        rmg.bimolecularReact = numpy.zeros((4, 4), bool)
+        rmg.trimolecularReact = None
+        self.reactionModel.surface.species = [self.ch3]
+        self.reactionModel.surface.reactions = [self.libraryReaction]
+        writer = SnapshotWriter(self.directory)
+        writer.update(rmg)
+        checkpoint = ModelCheckpoint(writer.path)
+        self.assertEqual([str(spec) for spec in checkpoint.surfaceSpecies], ['CH3(2)'])
+        self.assertIs(checkpoint.surfaceReactions[0], checkpoint.coreReactions[0])
+        self.assertEqual(checkpoint.metadata['Gfmax'], numpy.inf)
+        self.assertEqual(checkpoint.metadata['Gmin'], -numpy.inf)
+
+        # Move C3H5 to the core, add C2H6 and its formation to the edge,
+        # remove the pressure-dependent reaction and update some kinetics
+        c2h6 = Species(index=6, label='C2H6').fromSMILES('CC')
+        recombination = TemplateReaction(
+            index = 5,
+            reactants = [self.ch3, self.ch3],
+            products = [c2h6],
+            kinetics = Arrhenius(A=(6.8e13,'cm^3/(mol*s)'), n=0, Ea=(0,'kcal/mol'), T0=(1,'K')),
+            family = 'R_Recombination',
+        )
+        self.reactionModel.core.species.append(self.c3h5)
+        self.reactionModel.edge.species = [c2h6]
+        self.reactionModel.edge.reactions = [recombination]
+        self.templateReaction.kinetics = Arrhenius(A=(8.2e3,'cm^3/(mol*s)'), n=3.156, Ea=(8.755,'kcal/mol'), T0=(1,'K'))
+        self.reactionModel.iterationNum = 1
+        self.reactionModel.speciesCounter = 6
+        self.reactionModel.reactionCounter = 5
+        self.reactionModel.surface.species = [self.c3h5, self.h]
+        self.reactionModel.surface.reactions = [self.templateReaction]
+        self.reactionModel.Gmax = 1.2e5
+        self.reactionModel.Gmin = -8.0e4
+        self.reactionModel.Gfmax = 2.2e5
+        rmg.unimolecularReact = numpy.zeros(5, bool)
+        rmg.bimolecularReact = numpy.zeros((5, 5), bool)
+        rmg.bimolecularReact[1, 1] = True
+        writer.update(rmg)
+
+        checkpoint = ModelCheckpoint(writer.path)
+        self.assertEqual(checkpoint.numRecords, 1)
+        self.assertEqual([str(spec) for spec in checkpoint.coreSpecies], ['CH4(1)', 'CH3(2)', 'H(3)', 'H2(4)', 'C3H5(5)'])
+        self.assertEqual([str(spec) for spec in checkpoint.edgeSpecies], ['C2H6(6)'])
+        self.assertEqual([rxn.index for rxn in checkpoint.coreReactions], [1, 2, 3])
+        self.assertEqual([rxn.index for rxn in checkpoint.edgeReactions], [5])
+        self.assertEqual(checkpoint.edgeReactions[0].reactants, [checkpoint.coreSpecies[1], checkpoint.coreSpecies[1]])
+        self.assertIs(checkpoint.edgeReactions[0].products[0], checkpoint.edgeSpecies[0])
+        self.assertAlmostEqual(checkpoint.coreReactions[1].kinetics.A.value_si, 8.2e-3, 10)
+        self.assertEqual(checkpoint.metadata['iteration'], 1)
+        self.assertEqual(checkpoint.metadata['reactionCounter'], 5)
+        self.assertEqual(sorted(checkpoint.flags.keys()), ['bimolecularReact', 'unimolecularReact'])
+        self.assertTrue((checkpoint.flags['bimolecularReact'] == rmg.bimolecularReact).all())
+        self.assertEqual([str(spec) for spec in checkpoint.surfaceSpecies], ['C3H5(5)', 'H(3)'])
+        self.assertIs(checkpoint.surfaceSpecies[0], checkpoint.coreSpecies[4])
+        self.assertEqual([rxn.index for rxn in checkpoint.surfaceReactions], [2])
+        self.assertEqual([checkpoint.metadata[key] for key in ('Gfmax', 'Gmax', 'Gmin')], [2.2e5, 1.2e5, -8.0e4])
+
+        with open(writer.journalPath, 'ab') as f:
+            f.write('\x40\x00\x00')
+        self.assertEqual(ModelCheckpoint(writer.path).numRecords, 1)
+
+        saveSnapshot(writer.path, self.reactionModel)
+        checkpoint = ModelCheckpoint(writer.path)
+        self.assertEqual(checkpoint.numRecords, 0)
+        self.assertEqual([str(spec) for spec in checkpoint.edgeSpecies], ['C2H6(6)'])
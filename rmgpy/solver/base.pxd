@@ -63,6 +63,8 @@ cdef class ReactionSystem(DASx):
     cdef public numpy.ndarray kf # forward rate coefficients
     cdef public numpy.ndarray kb # reverse rate coefficients
     cdef public numpy.ndarray Keq # equilibrium constants
+    cdef public object kineticsTable # struct-of-arrays kinetics of the core and edge reactions
+    cdef public object thermoTable # struct-of-arrays thermo of the core and edge species
     cdef public numpy.ndarray networkLeakCoefficients
     cdef public numpy.ndarray jacobianMatrix
 
@@ -83,6 +85,14 @@ cdef class ReactionSystem(DASx):
 
     cdef public numpy.ndarray networkLeakRates    
 
+    # whether the residual only evaluates the core, with the edge rates
+    # computed separately once per accepted time step
+    cdef public bint coreOnlyResidual
+    cdef public bint supportsCoreOnlyResidual
+
+    # whether the analytical Jacobian is assembled in one vectorized pass
+    cdef public bint vectorizedJacobian
+
     # variables that cache maximum rate (ratio) data
     cdef public numpy.ndarray maxEdgeSpeciesRateRatios
     cdef public numpy.ndarray maxNetworkLeakRateRatios
@@ -54,6 +54,8 @@ from cpython cimport bool
 from rmgpy.quantity import Quantity
 from rmgpy.chemkin import getSpeciesIdentifier
 from rmgpy.reaction import Reaction
+from rmgpy.kinetics.table import KineticsTable
+from rmgpy.thermo.table import ThermoTable
 from rmgpy.species import Species
 
 ################################################################################
@@ -124,6 +126,12 @@ cdef class ReactionSystem(DASx):
         self.kf = None # forward rate coefficients
         self.kb = None # reverse rate coefficients
         self.Keq = None # equilibrium constants
+        # packed kinetics of the core and edge reactions, kept across calls to
+        # initializeModel() so that only newly added reactions are unpacked
+        self.kineticsTable = KineticsTable()
+        # packed thermo of the species taking part in the core and edge reactions,
+        # used to compute all equilibrium constants at once
+        self.thermoTable = ThermoTable()
         self.networkLeakCoefficients = None
         self.jacobianMatrix = None
         
@@ -138,6 +146,18 @@ cdef class ReactionSystem(DASx):
         self.edgeReactionRates = None
 
         self.networkLeakRates = None
+
+        # If True, the residual function only evaluates the core reactions and
+        # the edge reaction, edge species and network leak rates are computed
+        # by compute_edge_rates() once per accepted time step instead
+        self.coreOnlyResidual = False
+        # Whether the residual function of the reactor honors coreOnlyResidual;
+        # reactors that always evaluate the edge leave this False
+        self.supportsCoreOnlyResidual = False
+
+        # If True, the analytical Jacobian is assembled by compute_vectorized_jacobian()
+        # from the reactant and product index arrays instead of reaction by reaction
+        self.vectorizedJacobian = False
         
         #surface indices
         self.surfaceSpeciesIndices = None
@@ -496,6 +516,108 @@ cdef class ReactionSystem(DASx):
                     i = -2
                 self.networkIndices[j,l] = i
    
+    def compute_edge_rates(self):
+        """
+        Compute the edge reaction rates, edge species rates and network leak
+        rates from the current core species concentrations.
+
+        This is the vectorized counterpart of the edge part of the residual
+        function, used when `coreOnlyResidual` is set so that the edge fluxes
+        are only evaluated once per accepted time step rather than on every
+        residual call made by the solver.
+        """
+        cdef numpy.ndarray[numpy.int_t, ndim=2] ir, ip, inet
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] C, forwardRates, reverseRates, reactionRates, edgeSpeciesRates
+        cdef numpy.ndarray[numpy.int_t, ndim=1] indices
+        cdef numpy.ndarray mask
+        cdef int numCoreSpecies, numCoreReactions, l
+
+        numCoreSpecies = self.numCoreSpecies
+        numCoreReactions = self.numCoreReactions
+
+        # Edge species are not integrated, so their concentrations are zero
+        # and any edge reaction with an edge reactant has a zero rate in that direction
+        C = numpy.zeros(numCoreSpecies + self.numEdgeSpecies, numpy.float64)
+        C[:numCoreSpecies] = self.coreSpeciesConcentrations
+
+        ir = self.reactantIndices[numCoreReactions:numCoreReactions + self.numEdgeReactions, :]
+        ip = self.productIndices[numCoreReactions:numCoreReactions + self.numEdgeReactions, :]
+        forwardRates = self.kf[numCoreReactions:] * numpy.prod(numpy.where(ir == -1, 1.0, C[ir]), axis=1)
+        reverseRates = self.kb[numCoreReactions:] * numpy.prod(numpy.where(ip == -1, 1.0, C[ip]), axis=1)
+        reactionRates = forwardRates - reverseRates
+
+        # Only the edge species rates are of interest
+        edgeSpeciesRates = numpy.zeros(self.numEdgeSpecies, numpy.float64)
+        if self.numEdgeSpecies > 0:
+            for l in xrange(3):
+                indices = ir[:, l]
+                mask = indices >= numCoreSpecies
+                edgeSpeciesRates -= numpy.bincount(indices[mask] - numCoreSpecies, weights=reactionRates[mask],
+                                                   minlength=self.numEdgeSpecies)
+                indices = ip[:, l]
+                mask = indices >= numCoreSpecies
+                edgeSpeciesRates += numpy.bincount(indices[mask] - numCoreSpecies, weights=reactionRates[mask],
+                                                   minlength=self.numEdgeSpecies)
+
+        self.edgeReactionRates = reactionRates
+        self.edgeSpeciesRates = edgeSpeciesRates
+
+        inet = self.networkIndices
+        if inet is not None and inet.shape[0] > 0:
+            C = self.coreSpeciesConcentrations
+            self.networkLeakRates = self.networkLeakCoefficients * numpy.prod(numpy.where(inet == -1, 1.0, C[inet]), axis=1)
+
+    def compute_vectorized_jacobian(self, numpy.ndarray[numpy.float64_t, ndim=1] C, double Ctot=0.0):
+        """
+        Assemble the analytical Jacobian of the core species rates with respect
+        to the core species moles in a single vectorized pass over the reactant
+        and product index arrays, using the core species concentrations `C`.
+
+        The derivatives of each core reaction with respect to its own reactants
+        and products are scattered into a dense matrix, which is the form the
+        DAE solver factorizes. The correction due to the change in volume with
+        the number of moles at constant pressure couples every species; it is
+        computed once per row and added to all columns at the end rather than
+        column by column for each reaction. The total concentration `Ctot` is
+        only needed for this correction; if it is zero the volume is taken as
+        constant and no correction is made.
+        """
+        cdef numpy.ndarray ir, ip, reac, prod, k, deriv, jac, corr, conc, valid, mask
+        cdef int numCoreSpecies, numCoreReactions, a, b
+        cdef double sign
+
+        numCoreSpecies = self.numCoreSpecies
+        numCoreReactions = self.numCoreReactions
+        ir = self.reactantIndices[:numCoreReactions, :]
+        ip = self.productIndices[:numCoreReactions, :]
+
+        jac = numpy.zeros((numCoreSpecies, numCoreSpecies), numpy.float64)
+        corr = numpy.zeros(numCoreSpecies, numpy.float64)
+
+        # Treat the forward and reverse directions in turn as irreversible reactions
+        for reac, prod, k in ((ir, ip, self.kf[:numCoreReactions]), (ip, ir, self.kb[:numCoreReactions])):
+            valid = reac != -1
+            conc = numpy.where(valid, C[reac], 1.0)
+            for a in xrange(3):
+                # Derivative of the rate with respect to the reactant in position a;
+                # repeated reactants are summed over by the unbuffered addition
+                deriv = k * numpy.prod(numpy.delete(conc, a, axis=1), axis=1)
+                for side, sign in ((reac, -1.0), (prod, 1.0)):
+                    for b in xrange(3):
+                        mask = valid[:, a] & (side[:, b] != -1)
+                        numpy.add.at(jac, (side[mask, b], reac[mask, a]), sign * deriv[mask])
+            if Ctot != 0:
+                # Each reactant beyond the first adds a factor of 1/V to the rate in mol/s
+                deriv = -(numpy.sum(valid, axis=1) - 1) * k * numpy.prod(conc, axis=1) / Ctot
+                for side, sign in ((reac, -1.0), (prod, 1.0)):
+                    for b in xrange(3):
+                        mask = side[:, b] != -1
+                        corr += sign * numpy.bincount(side[mask, b], weights=deriv[mask], minlength=numCoreSpecies)
+
+        if Ctot != 0:
+            jac += corr[:, numpy.newaxis]
+        return jac
+
     @cython.boundscheck(False)                               
     cpdef getLayeringIndices(self):
         """
@@ -658,6 +780,9 @@ cdef class ReactionSystem(DASx):
         speciesIndex = {}
         for index, spec in enumerate(coreSpecies):
             speciesIndex[spec] = index
+
+        self.coreOnlyResidual = simulatorSettings.coreOnlyResidual and self.supportsCoreOnlyResidual
+        self.vectorizedJacobian = simulatorSettings.vectorizedJacobian
         
         self.initializeModel(coreSpecies, coreReactions, edgeSpecies, edgeReactions, surfaceSpecies, surfaceReactions, 
                              pdepNetworks, absoluteTolerance, relativeTolerance, sensitivity,
@@ -762,6 +887,11 @@ cdef class ReactionSystem(DASx):
                         logging.error("Network leak rates: {!r}".format(self.networkLeakRates))
                         raise ValueError('invalidObjects could not be filled during resurrection process')
             
+            if self.coreOnlyResidual:
+                # The residual function skipped the edge, so evaluate the edge fluxes
+                # once for this accepted time step
+                self.compute_edge_rates()
+
             y_coreSpecies = self.y[:numCoreSpecies]
             totalMoles = numpy.sum(y_coreSpecies)
             if sensitivity:
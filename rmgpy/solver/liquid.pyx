@@ -42,6 +42,7 @@ import rmgpy.constants as constants
 cimport rmgpy.constants as constants
 from rmgpy.quantity import Quantity
 from rmgpy.quantity cimport ScalarQuantity, ArrayQuantity
+from rmgpy.exceptions import ReactionError
 
 cdef class LiquidReactor(ReactionSystem):
     """
@@ -150,12 +151,18 @@ cdef class LiquidReactor(ReactionSystem):
         reacion system.
         """
         
-        for rxn in itertools.chain(coreReactions, edgeReactions):
-            j = self.reactionIndex[rxn]
-            self.kf[j] = rxn.getRateCoefficient(self.T.value_si, self.P.value_si)
-            if rxn.reversible:
-                self.Keq[j] = rxn.getEquilibriumConstant(self.T.value_si)
-                self.kb[j] = self.kf[j] / self.Keq[j]
+        reactions = list(itertools.chain(coreReactions, edgeReactions))
+        self.kineticsTable.setReactions(reactions)
+
+        self.kf[:len(reactions)] = self.kineticsTable.getRateCoefficients(self.T.value_si, self.P.value_si)
+
+        reversible = numpy.flatnonzero(self.kineticsTable.reversible)
+        self.thermoTable.setReactions(reactions)
+        self.Keq[reversible] = self.thermoTable.getEquilibriumConstants(self.T.value_si)[reversible]
+        zero = reversible[self.Keq[reversible] == 0]
+        if zero.shape[0] > 0:
+            raise ReactionError('Got equilibrium constant of 0 for reaction {0!s}'.format(reactions[zero[0]]))
+        self.kb[reversible] = self.kf[reversible] / self.Keq[reversible]
 
     def get_threshold_rate_constants(self, modelSettings):
         """
@@ -414,6 +421,12 @@ cdef class LiquidReactor(ReactionSystem):
         for j in xrange(numCoreSpecies):
             C[j] = y[j] / V
 
+        if self.vectorizedJacobian:
+            # The volume is constant, so there is no volume correction
+            pd += self.compute_vectorized_jacobian(C)
+            self.jacobianMatrix = pd + cj * numpy.identity(numCoreSpecies, numpy.float64)
+            return pd
+
         for j in xrange(numCoreReactions):
 
             k = kf[j]
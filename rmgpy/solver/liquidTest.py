@@ -153,6 +153,74 @@ class LiquidReactorCheck(unittest.TestCase):
         # Check that we've reached equilibrium 
         self.assertAlmostEqual(reactionRates[-1, 0], 0.0, delta=1e-2)
 
+    def testVectorizedJacobian(self):
+        """
+        Test that the liquid batch reactor gives the same solution when the
+        Jacobian is assembled in one vectorized pass.
+        """
+        rxn1 = Reaction(
+            reactants=[self.C2H6, self.CH3],
+            products=[self.C2H5, self.CH4],
+            kinetics=Arrhenius(A=(686.375*6, 'm^3/(mol*s)'), n=4.40721, Ea=(7.82799, 'kcal/mol'), T0=(298.15, 'K'))
+        )
+        rxn2 = Reaction(
+            reactants=[self.CH3, self.CH3],
+            products=[self.C2H6],
+            kinetics=Arrhenius(A=(6.8e7, 'm^3/(mol*s)'), n=0, Ea=(0, 'kcal/mol'), T0=(298.15, 'K'))
+        )
+
+        coreSpecies = [self.CH4, self.CH3, self.C2H6, self.C2H5]
+        coreReactions = [rxn1, rxn2]
+        c0 = {self.C2H5: 0.1, self.CH3: 0.1, self.CH4: 0.4, self.C2H6: 0.4}
+        tlist = numpy.array([10**(i/10.0) for i in xrange(-130, -49)], numpy.float64)
+
+        solutions = []
+        for vectorizedJacobian in [False, True]:
+            rxnSystem = LiquidReactor(self.T, c0, 1, termination=[])
+            rxnSystem.initializeModel(coreSpecies, coreReactions, [], [])
+            rxnSystem.vectorizedJacobian = vectorizedJacobian
+            jacobian = rxnSystem.jacobian(0.0, rxnSystem.y, rxnSystem.dydt, 0.0)
+            y = []
+            for t1 in tlist:
+                rxnSystem.advance(t1)
+                y.append(rxnSystem.y.copy())
+            solutions.append((jacobian, numpy.array(y, numpy.float64)))
+
+        (jacobian0, y0), (jacobian1, y1) = solutions
+        for i in xrange(len(coreSpecies)):
+            for j in xrange(len(coreSpecies)):
+                self.assertAlmostEqual(jacobian0[i, j], jacobian1[i, j], delta=abs(1e-8*jacobian0[i, j]))
+        for i in xrange(tlist.shape[0]):
+            for j in xrange(len(coreSpecies)):
+                self.assertAlmostEqual(y0[i, j], y1[i, j], delta=1e-6*max(y0[i, j], 1e-12))
+
+    def testCoreOnlyResidualIgnored(self):
+        """
+        Test that the core-only residual setting is not used by the liquid
+        reactor, whose residual function always evaluates the edge.
+        """
+        rxn1 = Reaction(
+            reactants=[self.C2H6, self.CH3],
+            products=[self.C2H5, self.CH4],
+            kinetics=Arrhenius(A=(686.375*6, 'm^3/(mol*s)'), n=4.40721, Ea=(7.82799, 'kcal/mol'), T0=(298.15, 'K'))
+        )
+        rxn2 = Reaction(
+            reactants=[self.CH3, self.CH3],
+            products=[self.C2H6],
+            kinetics=Arrhenius(A=(6.8e7, 'm^3/(mol*s)'), n=0, Ea=(0, 'kcal/mol'), T0=(298.15, 'K'))
+        )
+        c0 = {self.CH3: 0.1, self.CH4: 0.4, self.C2H6: 0.5}
+        rxnSystem = LiquidReactor(self.T, c0, 1, termination=[TerminationTime((1e-8, 's'))])
+        self.assertFalse(rxnSystem.supportsCoreOnlyResidual)
+
+        modelSettings = ModelSettings(toleranceKeepInEdge=0, toleranceMoveToCore=1, toleranceInterruptSimulation=1)
+        simulatorSettings = SimulatorSettings(coreOnlyResidual=True)
+        rxnSystem.simulate([self.CH4, self.CH3, self.C2H6], [rxn2], [self.C2H5], [rxn1], [], [],
+                           modelSettings=modelSettings, simulatorSettings=simulatorSettings)
+
+        self.assertFalse(rxnSystem.coreOnlyResidual)
+        self.assertTrue(rxnSystem.edgeReactionRates[0] > 0)
+
     def test_jacobian(self):
         """
         Unit test for the jacobian function:
@@ -291,6 +359,13 @@ class LiquidReactorCheck(unittest.TestCase):
                 for i in xrange(numCoreSpecies):
                     for j in xrange(numCoreSpecies):
                         self.assertAlmostEqual(jacobian[i, j], solverJacobian[i, j], delta=abs(1e-4*jacobian[i, j]))
+
+            # The Jacobian assembled in one vectorized pass should match as well
+            rxnSystem0.vectorizedJacobian = True
+            vectorizedJacobian = rxnSystem0.jacobian(0.0, rxnSystem0.y, dydt0, 0.0)
+            for i in xrange(numCoreSpecies):
+                for j in xrange(numCoreSpecies):
+                    self.assertAlmostEqual(jacobian[i, j], vectorizedJacobian[i, j], delta=abs(1e-4*jacobian[i, j]))
      
     def test_compute_derivative(self):
         rxnList = []
@@ -42,6 +42,7 @@ import rmgpy.constants as constants
 cimport rmgpy.constants as constants
 from rmgpy.quantity import Quantity
 from rmgpy.quantity cimport ScalarQuantity, ArrayQuantity
+from rmgpy.exceptions import ReactionError
 
 cdef class SimpleReactor(ReactionSystem):
     """
@@ -111,6 +112,8 @@ cdef class SimpleReactor(ReactionSystem):
     def __init__(self, T, P, initialMoleFractions, nSims=1, termination=None, sensitiveSpecies=None, sensitivityThreshold=1e-3,sensConditions=None):
         ReactionSystem.__init__(self, termination, sensitiveSpecies, sensitivityThreshold)
         
+        # The residual function can skip the edge
+        self.supportsCoreOnlyResidual = True
         
         if type(T) != list:
             self.T = Quantity(T)
@@ -233,15 +236,25 @@ cdef class SimpleReactor(ReactionSystem):
         and (effective) pressure of the reaction system.
         """
 
-        for rxn in itertools.chain(coreReactions, edgeReactions):
-            j = self.reactionIndex[rxn]
-            Peff = self.calculate_effective_pressure(rxn)
-            self.kf[j] = rxn.getRateCoefficient(self.T.value_si, Peff)
+        reactions = list(itertools.chain(coreReactions, edgeReactions))
+        self.kineticsTable.setReactions(reactions)
+
+        # Only the reactions with collider efficiencies have an effective pressure different from P
+        Peff = self.P.value_si * numpy.ones(len(reactions), numpy.float64)
+        for i in xrange(self.pdepColliderReactionIndices.shape[0]):
+            j = self.pdepColliderReactionIndices[i]
+            Peff[j] = self.calculate_effective_pressure(reactions[j])
+
+        self.kf[:len(reactions)] = self.kineticsTable.getRateCoefficients(self.T.value_si, Peff)
+
+        reversible = numpy.flatnonzero(self.kineticsTable.reversible)
+        self.thermoTable.setReactions(reactions)
+        self.Keq[reversible] = self.thermoTable.getEquilibriumConstants(self.T.value_si)[reversible]
+        zero = reversible[self.Keq[reversible] == 0]
+        if zero.shape[0] > 0:
+            raise ReactionError('Got equilibrium constant of 0 for reaction {0!s}'.format(reactions[zero[0]]))
+        self.kb[reversible] = self.kf[reversible] / self.Keq[reversible]
 
-            if rxn.reversible:
-                self.Keq[j] = rxn.getEquilibriumConstant(self.T.value_si)
-                self.kb[j] = self.kf[j] / self.Keq[j]
-                
     def get_threshold_rate_constants(self, modelSettings):
         """
         Get the threshold rate constants for reaction filtering.
@@ -324,7 +337,7 @@ cdef class SimpleReactor(ReactionSystem):
         """
         cdef numpy.ndarray[numpy.int_t, ndim=2] ir, ip, inet
         cdef numpy.ndarray[numpy.float64_t, ndim=1] res, kf, kr, knet, delta, equilibriumConstants
-        cdef int numCoreSpecies, numCoreReactions, numEdgeSpecies, numEdgeReactions, numPdepNetworks
+        cdef int numCoreSpecies, numCoreReactions, numEdgeSpecies, numEdgeReactions, numPdepNetworks, numReactions
         cdef int i, j, z, first, second, third
         cdef double k, V, reactionRate, revReactionRate, T, P, Peff
         cdef numpy.ndarray[numpy.float64_t, ndim=1] coreSpeciesConcentrations, coreSpeciesRates, coreReactionRates, edgeSpeciesRates, edgeReactionRates, networkLeakRates, coreSpeciesConsumptionRates, coreSpeciesProductionRates
@@ -385,9 +398,10 @@ cdef class SimpleReactor(ReactionSystem):
         coreReactionRates = numpy.zeros_like(self.coreReactionRates)
         coreSpeciesConsumptionRates = numpy.zeros_like(self.coreSpeciesConsumptionRates)
         coreSpeciesProductionRates = numpy.zeros_like(self.coreSpeciesProductionRates)
-        edgeSpeciesRates = numpy.zeros_like(self.edgeSpeciesRates)
-        edgeReactionRates = numpy.zeros_like(self.edgeReactionRates)
-        networkLeakRates = numpy.zeros_like(self.networkLeakRates)
+        if not self.coreOnlyResidual:
+            edgeSpeciesRates = numpy.zeros_like(self.edgeSpeciesRates)
+            edgeReactionRates = numpy.zeros_like(self.edgeReactionRates)
+            networkLeakRates = numpy.zeros_like(self.networkLeakRates)
 
         C = numpy.zeros_like(self.coreSpeciesConcentrations)
         
@@ -398,8 +412,12 @@ cdef class SimpleReactor(ReactionSystem):
         for j in xrange(numCoreSpecies):
             C[j] = y[j] / V
             coreSpeciesConcentrations[j] = C[j]
+
+        # In core-only mode the edge fluxes are evaluated separately by
+        # compute_edge_rates() once per accepted time step
+        numReactions = numCoreReactions if self.coreOnlyResidual else ir.shape[0]
         
-        for j in xrange(ir.shape[0]):
+        for j in xrange(numReactions):
             k = kf[j]
             if ir[j,0] >= numCoreSpecies or ir[j,1] >= numCoreSpecies or ir[j,2] >= numCoreSpecies:
                 fReactionRate = 0.0
@@ -483,24 +501,26 @@ cdef class SimpleReactor(ReactionSystem):
                     if third != -1:
                         if third >= numCoreSpecies: edgeSpeciesRates[third-numCoreSpecies] += reactionRate
 
-        for j in xrange(inet.shape[0]):
-            k = knet[j]
-            if inet[j,1] == -1: # only one reactant
-                reactionRate = k * C[inet[j,0]]
-            elif inet[j,2] == -1: # only two reactants
-                reactionRate = k * C[inet[j,0]] * C[inet[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate = k * C[inet[j,0]] * C[inet[j,1]] * C[inet[j,2]]
-            networkLeakRates[j] = reactionRate
+        if not self.coreOnlyResidual:
+            for j in xrange(inet.shape[0]):
+                k = knet[j]
+                if inet[j,1] == -1: # only one reactant
+                    reactionRate = k * C[inet[j,0]]
+                elif inet[j,2] == -1: # only two reactants
+                    reactionRate = k * C[inet[j,0]] * C[inet[j,1]]
+                else: # three reactants!! (really?)
+                    reactionRate = k * C[inet[j,0]] * C[inet[j,1]] * C[inet[j,2]]
+                networkLeakRates[j] = reactionRate
+
+            self.edgeSpeciesRates = edgeSpeciesRates
+            self.edgeReactionRates = edgeReactionRates
+            self.networkLeakRates = networkLeakRates
 
         self.coreSpeciesConcentrations = coreSpeciesConcentrations
         self.coreSpeciesRates = coreSpeciesRates
         self.coreSpeciesProductionRates = coreSpeciesProductionRates
         self.coreSpeciesConsumptionRates = coreSpeciesConsumptionRates
         self.coreReactionRates = coreReactionRates
-        self.edgeSpeciesRates = edgeSpeciesRates
-        self.edgeReactionRates = edgeReactionRates
-        self.networkLeakRates = networkLeakRates
 
         res = coreSpeciesRates * V 
         
@@ -555,6 +575,11 @@ cdef class SimpleReactor(ReactionSystem):
         for j in xrange(numCoreSpecies):
             C[j] = y[j] / V
 
+        if self.vectorizedJacobian:
+            pd += self.compute_vectorized_jacobian(C, Ctot)
+            self.jacobianMatrix = pd + cj * numpy.identity(numCoreSpecies, numpy.float64)
+            return pd
+
         for j in xrange(numCoreReactions):
            
             k = kf[j]
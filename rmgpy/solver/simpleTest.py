@@ -42,6 +42,7 @@ from rmgpy.thermo import ThermoData
 from rmgpy.solver.simple import SimpleReactor
 from rmgpy.solver.base import TerminationTime, TerminationConversion
 import rmgpy.constants as constants
+from rmgpy.exceptions import ReactionError
 from rmgpy.chemkin import loadChemkinFile
 from rmgpy.rmg.settings import ModelSettings, SimulatorSettings
 
@@ -167,6 +168,13 @@ class SimpleReactorCheck(unittest.TestCase):
                 for j in range(numCoreSpecies):
                     jacobian[i,j] = (dydt[j][i]-dydt0[i])/dN
                     self.assertAlmostEqual(jacobian[i,j], solverJacobian[i,j], delta=abs(1e-4*jacobian[i,j]))
+
+            # The Jacobian assembled in one vectorized pass should match as well
+            rxnSystem0.vectorizedJacobian = True
+            vectorizedJacobian = rxnSystem0.jacobian(0.0, rxnSystem0.y, dydt0, 0.0)
+            for i in range(numCoreSpecies):
+                for j in range(numCoreSpecies):
+                    self.assertAlmostEqual(jacobian[i,j], vectorizedJacobian[i,j], delta=abs(1e-4*jacobian[i,j]))
         
         #print 'Solver jacobian'
         #print solverJacobian
@@ -247,6 +255,141 @@ class SimpleReactorCheck(unittest.TestCase):
 #        pylab.show()
 
 
+    def testCoreOnlyResidual(self):
+        """
+        Test that the edge fluxes computed once per time step by compute_edge_rates()
+        when using the core-only residual match those computed by the full residual.
+        """
+        CH4 = Species(
+            molecule=[Molecule().fromSMILES("C")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([ 8.615, 9.687,10.963,12.301,14.841,16.976,20.528],"cal/(mol*K)"), H298=(-17.714,"kcal/mol"), S298=(44.472,"cal/(mol*K)"))
+            )
+        CH3 = Species(
+            molecule=[Molecule().fromSMILES("[CH3]")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([ 9.397,10.123,10.856,11.571,12.899,14.055,16.195],"cal/(mol*K)"), H298=(  9.357,"kcal/mol"), S298=(45.174,"cal/(mol*K)"))
+            )
+        C2H6 = Species(
+            molecule=[Molecule().fromSMILES("CC")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([12.684,15.506,18.326,20.971,25.500,29.016,34.595],"cal/(mol*K)"), H298=(-19.521,"kcal/mol"), S298=(54.799,"cal/(mol*K)"))
+            )
+        C2H5 = Species(
+            molecule=[Molecule().fromSMILES("C[CH2]")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([11.635,13.744,16.085,18.246,21.885,24.676,29.107],"cal/(mol*K)"), H298=( 29.496,"kcal/mol"), S298=(56.687,"cal/(mol*K)"))
+            )
+
+        coreSpecies = [CH4,CH3,C2H6]
+        edgeSpecies = [C2H5]
+        coreReactions = [
+            Reaction(reactants=[C2H6], products=[CH3,CH3], kinetics=Arrhenius(A=(686.375*6,'1/s'), n=4.40721, Ea=(7.82799,'kcal/mol'), T0=(298.15,'K'))),
+        ]
+        edgeReactions = [
+            Reaction(reactants=[C2H6,CH3], products=[C2H5,CH4], kinetics=Arrhenius(A=(686.375*6,'m^3/(mol*s)'), n=4.40721, Ea=(7.82799,'kcal/mol'), T0=(298.15,'K'))),
+            Reaction(reactants=[CH3,CH3], products=[C2H5,CH4], kinetics=Arrhenius(A=(1.0e6,'m^3/(mol*s)'), n=0, Ea=(10,'kcal/mol'), T0=(1,'K'))),
+        ]
+
+        T = 1000; P = 1.0e5
+        rxnSystem = SimpleReactor(T, P, initialMoleFractions={CH3: 0.1, CH4: 0.4, C2H6: 0.5}, nSims=1, termination=[])
+        rxnSystem.initializeModel(coreSpecies, coreReactions, edgeSpecies, edgeReactions)
+        rxnSystem.advance(1.0e-6)
+        y = rxnSystem.y.copy()
+
+        rxnSystem.residual(rxnSystem.t, y, numpy.zeros_like(y))
+        coreSpeciesRates = rxnSystem.coreSpeciesRates.copy()
+        edgeSpeciesRates = rxnSystem.edgeSpeciesRates.copy()
+        edgeReactionRates = rxnSystem.edgeReactionRates.copy()
+        self.assertTrue(numpy.all(edgeReactionRates != 0))
+
+        self.assertTrue(rxnSystem.supportsCoreOnlyResidual)
+        rxnSystem.coreOnlyResidual = True
+        rxnSystem.edgeSpeciesRates = numpy.zeros_like(edgeSpeciesRates)
+        rxnSystem.edgeReactionRates = numpy.zeros_like(edgeReactionRates)
+        rxnSystem.residual(rxnSystem.t, y, numpy.zeros_like(y))
+
+        # The core is unaffected, and the edge is left alone by the residual
+        for i in range(len(coreSpecies)):
+            self.assertAlmostEqual(rxnSystem.coreSpeciesRates[i], coreSpeciesRates[i], delta=1e-12*abs(coreSpeciesRates[i]))
+        self.assertTrue(numpy.all(rxnSystem.edgeReactionRates == 0))
+
+        rxnSystem.compute_edge_rates()
+        for i in range(len(edgeReactions)):
+            self.assertAlmostEqual(rxnSystem.edgeReactionRates[i], edgeReactionRates[i], delta=1e-12*abs(edgeReactionRates[i]))
+        for i in range(len(edgeSpecies)):
+            self.assertAlmostEqual(rxnSystem.edgeSpeciesRates[i], edgeSpeciesRates[i], delta=1e-12*abs(edgeSpeciesRates[i]))
+
+    def testVectorizedJacobianSolve(self):
+        """
+        Test that integrating the simple batch reactor with the vectorized
+        Jacobian assembly gives the same profiles as the default assembly.
+        """
+        CH4 = Species(
+            molecule=[Molecule().fromSMILES("C")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([ 8.615, 9.687,10.963,12.301,14.841,16.976,20.528],"cal/(mol*K)"), H298=(-17.714,"kcal/mol"), S298=(44.472,"cal/(mol*K)"))
+            )
+        CH3 = Species(
+            molecule=[Molecule().fromSMILES("[CH3]")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([ 9.397,10.123,10.856,11.571,12.899,14.055,16.195],"cal/(mol*K)"), H298=(  9.357,"kcal/mol"), S298=(45.174,"cal/(mol*K)"))
+            )
+        C2H6 = Species(
+            molecule=[Molecule().fromSMILES("CC")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([12.684,15.506,18.326,20.971,25.500,29.016,34.595],"cal/(mol*K)"), H298=(-19.521,"kcal/mol"), S298=(54.799,"cal/(mol*K)"))
+            )
+        C2H5 = Species(
+            molecule=[Molecule().fromSMILES("C[CH2]")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([11.635,13.744,16.085,18.246,21.885,24.676,29.107],"cal/(mol*K)"), H298=( 29.496,"kcal/mol"), S298=(56.687,"cal/(mol*K)"))
+            )
+
+        coreSpecies = [CH4,CH3,C2H6,C2H5]
+        coreReactions = [
+            Reaction(reactants=[C2H6], products=[CH3,CH3], kinetics=Arrhenius(A=(686.375*6,'1/s'), n=4.40721, Ea=(7.82799,'kcal/mol'), T0=(298.15,'K'))),
+            Reaction(reactants=[C2H6,CH3], products=[C2H5,CH4], kinetics=Arrhenius(A=(46.375*6,'m^3/(mol*s)'), n=3.40721, Ea=(6.82799,'kcal/mol'), T0=(298.15,'K'))),
+            Reaction(reactants=[C2H5,CH4], products=[CH3,CH3,CH3], kinetics=Arrhenius(A=(246.375*6,'m^3/(mol*s)'), n=1.40721, Ea=(3.82799,'kcal/mol'), T0=(298.15,'K'))),
+        ]
+
+        T = 1000; P = 1.0e5
+        tlist = numpy.array([10**(i/10.0) for i in range(-130, -49)], numpy.float64)
+
+        profiles = []
+        for vectorizedJacobian in [False, True]:
+            rxnSystem = SimpleReactor(T, P, initialMoleFractions={CH4:0.2,CH3:0.1,C2H6:0.55,C2H5:0.15}, nSims=1, termination=[])
+            rxnSystem.initializeModel(coreSpecies, coreReactions, [], [])
+            rxnSystem.vectorizedJacobian = vectorizedJacobian
+            y = []
+            for t1 in tlist:
+                rxnSystem.advance(t1)
+                y.append(rxnSystem.y.copy())
+            profiles.append(numpy.array(y, numpy.float64))
+
+        y0, y1 = profiles
+        for i in range(tlist.shape[0]):
+            for j in range(len(coreSpecies)):
+                self.assertAlmostEqual(y0[i,j], y1[i,j], delta=1e-6*max(y0[i,j], 1e-12))
+
+    def testZeroEquilibriumConstant(self):
+        """
+        Test that a reversible reaction with an equilibrium constant of zero is rejected.
+        """
+        CH4 = Species(
+            label='CH4',
+            molecule=[Molecule().fromSMILES("C")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([ 8.615, 9.687,10.963,12.301,14.841,16.976,20.528],"cal/(mol*K)"), H298=(-17.714,"kcal/mol"), S298=(44.472,"cal/(mol*K)"))
+            )
+        CH3 = Species(
+            label='CH3',
+            molecule=[Molecule().fromSMILES("[CH3]")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([ 9.397,10.123,10.856,11.571,12.899,14.055,16.195],"cal/(mol*K)"), H298=(1.0e5,"kcal/mol"), S298=(45.174,"cal/(mol*K)"))
+            )
+        reaction = Reaction(reactants=[CH4], products=[CH3], kinetics=Arrhenius(A=(1.0e13,'1/s'), n=0, Ea=(100,'kcal/mol'), T0=(1,'K')))
+
+        rxnSystem = SimpleReactor(1000, 1.0e5, initialMoleFractions={CH4: 1.0}, nSims=1, termination=[])
+        with self.assertRaises(ReactionError):
+            rxnSystem.initializeModel([CH4, CH3], [reaction], [], [])
+
+        # Irreversible reactions do not need an equilibrium constant
+        reaction.reversible = False
+        rxnSystem = SimpleReactor(1000, 1.0e5, initialMoleFractions={CH4: 1.0}, nSims=1, termination=[])
+        rxnSystem.initializeModel([CH4, CH3], [reaction], [], [])
+        self.assertEqual(rxnSystem.kb[0], 0)
+
     def testColliderModel(self):
         """
         Test the solver's ability to simulate a model with collision efficiencies.
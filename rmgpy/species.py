@@ -46,6 +46,7 @@ transition states (first-order saddle points on a potential energy surface).
 import numpy
 import cython
 import logging
+import hashlib
 from operator import itemgetter
 
 import rmgpy.quantity as quantity
@@ -629,7 +630,8 @@ class Species(object):
             
     def generateTransportData(self):
         """
-        Generate the transportData parameters for the species.
+        Generate the transportData parameters for the species. The parameters
+        are taken from the property store if one is in use.
         """
         from rmgpy.data.rmg import getDB
         try:
@@ -639,9 +641,19 @@ class Species(object):
             logging.debug('Could not obtain the transport database. Not generating transport...')
             raise e
 
+        from rmgpy.data.store import getPropertyStore
+        store = getPropertyStore()
+        if store is not None:
+            self.transportData = store.get(self, 'transport')
+            if self.transportData is not None:
+                return
+
         #count = sum([1 for atom in self.molecule[0].vertices if atom.isNonHydrogen()])
         self.transportData = transportDB.getTransportProperties(self)[0]
 
+        if store is not None:
+            store.put(self, 'transport', self.transportData)
+
 
     def getTransportData(self):
         """
@@ -658,7 +670,8 @@ class Species(object):
         """
         Generate molecular degree of freedom data for the species. You must
         have already provided a thermodynamics model using e.g.
-        :meth:`generateThermoData()`.
+        :meth:`generateThermoData()`. The data are taken from the property
+        store if one is in use.
         """
         logging.debug("Generating statmech for species {}".format(self.label))
         from rmgpy.data.rmg import getDB
@@ -669,8 +682,20 @@ class Species(object):
             logging.debug('Could not obtain the stat. mech database. Not generating stat. mech...')
             raise e
 
-        molecule = self.molecule[0]
-        conformer = statmechDB.getStatmechData(molecule, self.getThermoData())
+        from rmgpy.data.store import getPropertyStore
+        store = getPropertyStore()
+        thermo = self.getThermoData()
+        conformer = None
+        if store is not None:
+            # The group estimates depend on the thermo, so it is part of the name in the store
+            storeName = 'statmech/{0}'.format(hashlib.sha1(repr(thermo)).hexdigest())
+            conformer = store.get(self, storeName)
+
+        if conformer is None:
+            molecule = self.molecule[0]
+            conformer = statmechDB.getStatmechData(molecule, thermo)
+            if store is not None:
+                store.put(self, storeName, conformer)
 
         if self.conformer is None:
             self.conformer = Conformer()
@@ -196,18 +196,50 @@ cpdef numpy.ndarray getDensityOfStates(numpy.ndarray Elist, energy, degeneracy=u
 
 ################################################################################
 
+# The number of energy grains above which convolutions are evaluated using
+# fast Fourier transforms instead of direct summation
+fftThreshold = 1024
+
+def convolve(numpy.ndarray[numpy.float64_t,ndim=1] rho1, numpy.ndarray[numpy.float64_t,ndim=1] rho2):
+    """
+    Return the convolution of two arrays `rho1` and `rho2`. For arrays longer
+    than `fftThreshold`, the convolution is evaluated using fast Fourier
+    transforms (see :func:`convolveFFT`).
+    """
+    if rho1.shape[0] != rho2.shape[0]:
+        raise ValueError('Attempted to convolve an array of length {0:d} with an array of length {1:d}.'.format(len(rho1), len(rho2)))
+    
+    if rho1.shape[0] > fftThreshold:
+        return convolveFFT([rho1, rho2])
+    return convolveDirect(rho1, rho2)
+
+def convolveMany(list rhoList):
+    """
+    Return the convolution of all of the arrays in `rhoList`, which must have
+    the same length. For arrays longer than `fftThreshold`, the arrays are
+    convolved at once by multiplying their Fourier transforms, which is much
+    faster than convolving them one after the other.
+    """
+    cdef int nE = rhoList[0].shape[0]
+    
+    for rho in rhoList:
+        if rho.shape[0] != nE:
+            raise ValueError('Attempted to convolve an array of length {0:d} with an array of length {1:d}.'.format(nE, len(rho)))
+    
+    if nE > fftThreshold:
+        return convolveFFT(rhoList)
+    return convolveDirectMany(rhoList)
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def convolve(numpy.ndarray[numpy.float64_t,ndim=1] rho1, numpy.ndarray[numpy.float64_t,ndim=1] rho2):
+def convolveDirect(numpy.ndarray[numpy.float64_t,ndim=1] rho1, numpy.ndarray[numpy.float64_t,ndim=1] rho2):
     """
-    Return the convolution of two arrays `rho1` and `rho2`.
+    Return the convolution of two arrays `rho1` and `rho2` of the same length
+    by direct summation.
     """
     cdef numpy.ndarray[numpy.float64_t,ndim=1] rho
     cdef int i, j, nE
     
-    if rho1.shape[0] != rho2.shape[0]:
-        raise ValueError('Attempted to convolve an array of length {0:d} with an array of length {1:d}.'.format(len(rho1), len(rho2)))
-    
     nE = rho1.shape[0]
     rho = numpy.zeros_like(rho1)
     
@@ -217,6 +249,64 @@ def convolve(numpy.ndarray[numpy.float64_t,ndim=1] rho1, numpy.ndarray[numpy.flo
 
     return rho
 
+def convolveDirectMany(list rhoList):
+    """
+    Return the convolution of all of the arrays in `rhoList` by convolving
+    them one after the other by direct summation.
+    """
+    rho = rhoList[0].copy()
+    for rho2 in rhoList[1:]:
+        rho = convolveDirect(rho, rho2)
+    return rho
+
+def convolveFFT(list rhoList):
+    """
+    Return the convolution of all of the arrays in `rhoList`, which must have
+    the same length, using fast Fourier transforms.
+    
+    Densities of states span many orders of magnitude, and the round-off error
+    of the transforms is relative to the largest values. The convolution at
+    each energy only depends on the arrays at lower energies, so the values
+    that are not well above the round-off error, which are usually at the
+    lowest energies, are evaluated again from the corresponding leading parts
+    of the arrays. This keeps the relative error of every value below about
+    :math:`10^{-6}`.
+    """
+    cdef int nE = rhoList[0].shape[0], m = len(rhoList), nFFT, k
+    cdef double error
+    
+    if m == 1:
+        return rhoList[0].copy()
+    if nE <= fftThreshold:
+        return convolveDirectMany(rhoList)
+    
+    # Pad the arrays so that the circular convolution does not wrap around
+    nFFT = 1
+    while nFFT < m * (nE - 1) + 1:
+        nFFT *= 2
+    spectrum = numpy.fft.rfft(rhoList[0], nFFT)
+    for rho2 in rhoList[1:]:
+        spectrum *= numpy.fft.rfft(rho2, nFFT)
+    rho = numpy.fft.irfft(spectrum, nFFT)[:nE]
+    
+    # Estimate the round-off error from a bound on the convolution
+    with numpy.errstate(over='ignore'):
+        error = numpy.sqrt(numpy.sum(rhoList[0] * rhoList[0]) * numpy.sum(rhoList[1] * rhoList[1]))
+        for rho2 in rhoList[2:]:
+            error *= numpy.sum(numpy.abs(rho2))
+    error *= numpy.finfo(numpy.float64).eps * m * math.log(nFFT, 2)
+    
+    inaccurate = numpy.flatnonzero(numpy.abs(rho) < 1e6 * error)
+    if inaccurate.shape[0] > 0:
+        k = inaccurate[-1] + 1
+        if k == nE:
+            # No gain from the transforms, e.g. if the bound overflowed
+            rho = convolveDirectMany(rhoList)
+        else:
+            rho[:k] = convolveFFT([rho2[:k] for rho2 in rhoList])
+    
+    return rho
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def convolveBS(numpy.ndarray[numpy.float64_t,ndim=1] Elist,
@@ -37,6 +37,7 @@ import unittest
 
 import numpy
 from rmgpy.statmech.schrodinger import getPartitionFunction, getHeatCapacity, getEnthalpy, getEntropy, getDensityOfStates
+from rmgpy.statmech.schrodinger import convolve, convolveMany, convolveDirect, convolveFFT
 import rmgpy.constants as constants
 
 ################################################################################
@@ -118,7 +119,75 @@ class TestSchrodinger(unittest.TestCase):
             Qact = numpy.sum(densStates * numpy.exp(-Elist / constants.R / T))
             Qexp = getPartitionFunction(T, self.energy, self.degeneracy, self.n0)
             self.assertAlmostEqual(Qexp / Qact, 1.0, 2, '{0} != {1} within 2 figures'.format(Qexp, Qact))
-            
+
+################################################################################
+
+class TestConvolve(unittest.TestCase):
+    """
+    Contains unit tests of the functions used to convolve densities of states.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        # Densities of states spanning many orders of magnitude, as for a
+        # polyatomic molecule on a fine energy grain
+        Elist = numpy.arange(0, 4096, dtype=numpy.float64)
+        self.rho1 = Elist ** 12
+        self.rho2 = numpy.sqrt(Elist)
+        self.rho3 = numpy.zeros_like(Elist)
+        self.rho3[100:] = numpy.exp(-Elist[100:] / 500.)
+
+    def assertArraysAlmostEqual(self, actual, expected, places=7):
+        self.assertEqual(actual.shape, expected.shape)
+        for a, e in zip(actual, expected):
+            if e == 0:
+                self.assertEqual(a, 0)
+            else:
+                self.assertAlmostEqual(a / e, 1.0, places, '{0} != {1}'.format(a, e))
+
+    def test_convolveFFT(self):
+        """
+        Test that the FFT convolution matches the direct convolution, including
+        at the low-energy end where the densities are tiny.
+        """
+        expected = convolveDirect(self.rho1, self.rho2)
+        actual = convolveFFT([self.rho1, self.rho2])
+        self.assertArraysAlmostEqual(actual, expected)
+        expected = convolveDirect(self.rho2, self.rho3)
+        actual = convolveFFT([self.rho2, self.rho3])
+        self.assertArraysAlmostEqual(actual, expected)
+
+    def test_convolveMany(self):
+        """
+        Test that convolving several densities at once matches convolving them
+        one at a time.
+        """
+        expected = convolveDirect(convolveDirect(self.rho1, self.rho2), self.rho3)
+        actual = convolveMany([self.rho1, self.rho2, self.rho3])
+        self.assertArraysAlmostEqual(actual, expected)
+        self.assertArraysAlmostEqual(convolveMany([self.rho1]), self.rho1)
+
+    def test_convolve(self):
+        """
+        Test that convolve() gives the same result on either side of the
+        FFT threshold.
+        """
+        expected = convolveDirect(self.rho1, self.rho3)
+        self.assertArraysAlmostEqual(convolve(self.rho1, self.rho3), expected)
+        self.assertArraysAlmostEqual(convolve(self.rho1[:100], self.rho2[:100]), convolveDirect(self.rho1[:100], self.rho2[:100]))
+
+    def test_convolveLengthMismatch(self):
+        """
+        Test that convolving densities of states on different energy grains
+        raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            convolve(self.rho1, self.rho2[:100])
+        with self.assertRaises(ValueError):
+            convolveMany([self.rho1, self.rho2, self.rho3[:100]])
+
 ################################################################################
 
 if __name__ == '__main__':
@@ -40,7 +40,7 @@ except ImportError:
 
 import matplotlib.pyplot as plt
 
-from rmgpy.util import makeOutputSubdirectory
+from rmgpy.util import makeOutputSubdirectory, BackgroundWriter
 
 class ExecutionStatsWriter(object):
     """
@@ -67,11 +67,16 @@ class ExecutionStatsWriter(object):
     from its subject:
 
     rmg.detach(listener)
+
+    If `background` is ``True``, the statistics are still recorded in every
+    update, but the spreadsheet and the plots are written in the background
+    with a :class:`BackgroundWriter`.
     
     """
-    def __init__(self, outputDirectory):
+    def __init__(self, outputDirectory, background=False):
         super(ExecutionStatsWriter, self).__init__()
         makeOutputSubdirectory(outputDirectory, 'plot')
+        self.writer = BackgroundWriter('execution statistics', enabled=background)
 
         # RMG execution statistics
         self.coreSpeciesCount = []
@@ -114,11 +119,25 @@ class ExecutionStatsWriter(object):
             logging.info('    Restart file size: %.2f MB' % (self.restartSize[-1]))
         else:
             self.restartSize.append(0.0)
+        self.writer.submit(self.saveExecutionOutput, rmg)
+
+        logging.info('')
+
+    def saveExecutionOutput(self, rmg):
+        """
+        Save the statistics spreadsheet of the RMG job, and the plots of the
+        statistics if requested.
+        """
         self.saveExecutionStatistics(rmg)
         if rmg.generatePlots:
             self.generateExecutionPlots(rmg)
 
-        logging.info('')
+    def wait(self):
+        """
+        Wait for the spreadsheet and plots being written in the background,
+        if any, to be saved.
+        """
+        self.writer.wait()
 
     def saveExecutionStatistics(self, rmg):
         """
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains the :class:`ThermoTable` class, which packs the NASA and
+Wilhoit thermodynamics of a list of species into NumPy arrays so that the
+enthalpy, entropy and Gibbs free energy of every species are evaluated once
+per temperature, and the equilibrium constants of a list of reactions follow
+from a sparse stoichiometry-matrix product.
+"""
+
+import numpy
+import scipy.sparse
+
+import rmgpy.constants as constants
+from rmgpy.exceptions import ReactionError
+from rmgpy.thermo.nasa import NASA
+from rmgpy.thermo.wilhoit import Wilhoit
+
+################################################################################
+
+def packThermo(thermo):
+    """
+    Return the parameters of the thermodynamics model `thermo` in the form
+    used by :class:`ThermoTable`, or ``None`` if the model cannot be
+    evaluated in vectorized form. NASA models are packed as ``('nasa',
+    coeffs, Tmin, Tmax)``, with one row of nine coefficients and one valid
+    temperature range per polynomial. Wilhoit models are packed as
+    ``('wilhoit', (Cp0, CpInf, B, a0, a1, a2, a3, H0, S0))``. All values
+    are in SI units.
+    """
+    if isinstance(thermo, NASA):
+        coeffs = []; Tmin = []; Tmax = []
+        for poly in [thermo.poly1, thermo.poly2, thermo.poly3]:
+            if poly is None:
+                continue
+            coeffs.append([poly.cm2, poly.cm1, poly.c0, poly.c1, poly.c2, poly.c3, poly.c4, poly.c5, poly.c6])
+            Tmin.append(poly.Tmin.value_si if poly.Tmin is not None else -numpy.inf)
+            Tmax.append(poly.Tmax.value_si if poly.Tmax is not None else numpy.inf)
+        return ('nasa', coeffs, Tmin, Tmax)
+    elif isinstance(thermo, Wilhoit):
+        return ('wilhoit', (thermo.Cp0.value_si, thermo.CpInf.value_si, thermo.B.value_si,
+                            thermo.a0, thermo.a1, thermo.a2, thermo.a3, thermo.H0.value_si, thermo.S0.value_si))
+    return None
+
+################################################################################
+
+class ThermoTable(object):
+    """
+    A struct-of-arrays representation of the thermodynamics of an ordered
+    list of species, and optionally of the stoichiometry of a list of
+    reactions between them. The attributes are:
+
+    =================== ===================================================
+    Attribute           Description
+    =================== ===================================================
+    `species`           The species in the order of the rows of the table
+    `speciesIndex`      A dictionary mapping each species to its row
+    `packed`            A dictionary mapping each species to its thermo
+                        object and packed parameters
+    `fallback`          The rows whose thermo is evaluated one by one
+    `reactions`         The reactions set by :meth:`setReactions`
+    `stoichiometry`     The sparse reactions-by-species stoichiometry matrix
+    `deltaN`            The change in the number of molecules of each
+                        reaction
+    =================== ===================================================
+
+    Species are only unpacked the first time they are seen, or after their
+    thermo object has been replaced. The species properties at the most
+    recently requested temperatures are cached, so they are computed once no
+    matter how many reactions a species takes part in.
+    """
+
+    def __init__(self):
+        self.species = []
+        self.speciesIndex = {}
+        self.packed = {}
+        self.fallback = numpy.zeros(0, int)
+        self.reactions = []
+        self.stoichiometry = scipy.sparse.csr_matrix((0, 0))
+        self.deltaN = numpy.zeros(0, numpy.float64)
+        self.cache = {}
+
+        # NASA polynomials, padded to three per species
+        self.nasaRows = numpy.zeros(0, int)
+        self.nasaCoeffs = numpy.zeros((0,3,9), numpy.float64)
+        self.nasaTmin = numpy.zeros((0,3), numpy.float64)
+        self.nasaTmax = numpy.zeros((0,3), numpy.float64)
+
+        # Wilhoit parameters (Cp0, CpInf, B, a0, a1, a2, a3, H0, S0)
+        self.wilhoitRows = numpy.zeros(0, int)
+        self.wilhoitParams = numpy.zeros((0,9), numpy.float64)
+
+    def setSpecies(self, species):
+        """
+        Make the rows of the table correspond to the list of `species`.
+        Nothing is done if the list is unchanged; otherwise only the species
+        not seen before are unpacked and the arrays are rebuilt. Species no
+        longer in the list are forgotten.
+        """
+        if len(species) == len(self.species) and all([spc0 is spc1 for spc0, spc1 in zip(species, self.species)]) \
+                and all([self.packed[spc][0] is spc.thermo for spc in species]):
+            return
+
+        packed = {}
+        for spc in species:
+            try:
+                thermo, params = self.packed[spc]
+            except KeyError:
+                thermo, params = None, None
+            if thermo is not spc.thermo or thermo is None:
+                thermo, params = spc.thermo, packThermo(spc.thermo)
+            packed[spc] = (thermo, params)
+        self.packed = packed
+        self.species = list(species)
+        self.speciesIndex = dict([(spc, i) for i, spc in enumerate(self.species)])
+        self.reactions = []
+        self.cache = {}
+
+        fallback = []
+        nasaRows = []; nasaCoeffs = []; nasaTmin = []; nasaTmax = []
+        wilhoitRows = []; wilhoitParams = []
+        for row, spc in enumerate(self.species):
+            params = self.packed[spc][1]
+            if params is None:
+                fallback.append(row)
+            elif params[0] == 'nasa':
+                # Missing polynomials get a NaN range, which fails every comparison
+                npoly = len(params[1])
+                nasaRows.append(row)
+                nasaCoeffs.append(params[1] + [[0.0] * 9] * (3 - npoly))
+                nasaTmin.append(params[2] + [numpy.nan] * (3 - npoly))
+                nasaTmax.append(params[3] + [numpy.nan] * (3 - npoly))
+            elif params[0] == 'wilhoit':
+                wilhoitRows.append(row)
+                wilhoitParams.append(params[1])
+
+        self.fallback = numpy.array(fallback, int)
+        self.nasaRows = numpy.array(nasaRows, int)
+        self.nasaCoeffs = numpy.array(nasaCoeffs, numpy.float64).reshape(-1, 3, 9)
+        self.nasaTmin = numpy.array(nasaTmin, numpy.float64).reshape(-1, 3)
+        self.nasaTmax = numpy.array(nasaTmax, numpy.float64).reshape(-1, 3)
+        self.wilhoitRows = numpy.array(wilhoitRows, int)
+        self.wilhoitParams = numpy.array(wilhoitParams, numpy.float64).reshape(-1, 9)
+
+    def setReactions(self, reactions):
+        """
+        Build the stoichiometry matrix of the list of `reactions`. The
+        species of the table are set to the reactants and products of the
+        reactions, in order of first appearance. Nothing but the species
+        thermo is checked if the list is unchanged.
+        """
+        if len(reactions) == len(self.reactions) and all([rxn0 is rxn1 for rxn0, rxn1 in zip(reactions, self.reactions)]):
+            self.setSpecies(self.species)
+            if self.reactions:
+                return
+
+        species = []; seen = set()
+        for rxn in reactions:
+            for spc in rxn.reactants + rxn.products:
+                if spc not in seen:
+                    seen.add(spc)
+                    species.append(spc)
+        self.setSpecies(species)
+
+        rows = []; cols = []; data = []
+        for j, rxn in enumerate(reactions):
+            for spc in rxn.reactants:
+                rows.append(j); cols.append(self.speciesIndex[spc]); data.append(-1.0)
+            for spc in rxn.products:
+                rows.append(j); cols.append(self.speciesIndex[spc]); data.append(1.0)
+        # Duplicate entries (e.g. A + A) are summed on conversion to CSR
+        self.stoichiometry = scipy.sparse.coo_matrix((data, (rows, cols)),
+            shape=(len(reactions), len(self.species))).tocsr()
+        self.deltaN = numpy.array([len(rxn.products) - len(rxn.reactants) for rxn in reactions], numpy.float64)
+        self.reactions = list(reactions)
+
+    def getEnthalpies(self, T):
+        """
+        Return an array of the enthalpies in J/mol of all species in the
+        table at temperature `T` in K.
+        """
+        return self.evaluate(T)[0]
+
+    def getEntropies(self, T):
+        """
+        Return an array of the entropies in J/mol*K of all species in the
+        table at temperature `T` in K.
+        """
+        return self.evaluate(T)[1]
+
+    def getFreeEnergies(self, T):
+        """
+        Return an array of the Gibbs free energies in J/mol of all species in
+        the table at temperature `T` in K.
+        """
+        H, S = self.evaluate(T)
+        return H - T * S
+
+    def evaluate(self, T):
+        """
+        Return arrays of the enthalpies in J/mol and entropies in J/mol*K of
+        all species in the table at temperature `T` in K. The results for the
+        most recent temperatures are cached.
+        """
+        try:
+            return self.cache[T]
+        except KeyError:
+            pass
+
+        H = numpy.zeros(len(self.species), numpy.float64)
+        S = numpy.zeros(len(self.species), numpy.float64)
+
+        if self.nasaRows.shape[0] > 0:
+            # Same polynomial selection as NASA.selectPolynomial()
+            valid = (self.nasaTmin <= T) & (T <= self.nasaTmax)
+            if not numpy.all(valid.any(axis=1)):
+                raise ValueError('No valid NASA polynomial at temperature {0:g} K.'.format(T))
+            cm2, cm1, c0, c1, c2, c3, c4, c5, c6 = self.nasaCoeffs[numpy.arange(self.nasaRows.shape[0]), numpy.argmax(valid, axis=1)].T
+            T2 = T * T
+            T4 = T2 * T2
+            H[self.nasaRows] = ((-cm2 / T + cm1 * numpy.log(T)) / T + c0 + c1*T/2. + c2*T2/3. + c3*T2*T/4. + c4*T4/5. + c5/T) * constants.R * T
+            S[self.nasaRows] = ((-cm2 / T / 2. - cm1) / T + c0*numpy.log(T) + c1*T + c2*T2/2. + c3*T2*T/3. + c4*T4/4. + c6) * constants.R
+
+        if self.wilhoitRows.shape[0] > 0:
+            Cp0, CpInf, B, a0, a1, a2, a3, H0, S0 = self.wilhoitParams.T
+            y = T / (T + B)
+            H[self.wilhoitRows] = H0 + Cp0 * T - (CpInf - Cp0) * T * (
+                y * y * ((3 * a0 + a1 + a2 + a3) / 6. +
+                         (4 * a1 + a2 + a3) * y / 12. +
+                         (5 * a2 + a3) * y * y / 20. +
+                         a3 * y * y * y / 5.) +
+                (2 + a0 + a1 + a2 + a3) * (y / 2. - 1 + (1.0 / y - 1.) * numpy.log(B + T))
+            )
+            S[self.wilhoitRows] = S0 + CpInf * numpy.log(T) - (CpInf - Cp0) * (
+                numpy.log(y) + y * (1 + y * (a0 / 2. + y * (a1 / 3. + y * (a2 / 4. + y * a3 / 5.))))
+            )
+
+        for i in self.fallback:
+            H[i] = self.species[i].getEnthalpy(T)
+            S[i] = self.species[i].getEntropy(T)
+
+        if len(self.cache) >= 8:
+            self.cache = {}
+        self.cache[T] = (H, S)
+        return H, S
+
+    def getFreeEnergiesOfReaction(self, T):
+        """
+        Return an array of the Gibbs free energies of reaction in J/mol of the
+        reactions set by :meth:`setReactions` at temperature `T` in K.
+        """
+        return self.stoichiometry.dot(self.getFreeEnergies(T))
+
+    def getEquilibriumConstants(self, T, type='Kc'):
+        """
+        Return an array of the equilibrium constants of the reactions set by
+        :meth:`setReactions` at temperature `T` in K. As in
+        :meth:`Reaction.getEquilibriumConstant`, the `type` parameter is
+        ``Ka`` for activities, ``Kc`` for concentrations (default), or ``Kp``
+        for pressures, assuming an ideal gas mixture.
+        """
+        K = numpy.exp(-self.getFreeEnergiesOfReaction(T) / constants.R / T)
+        return K * self.getStandardStateFactor(T, self.deltaN, type)
+
+    def getFreeEnergyOfReaction(self, reaction, T):
+        """
+        Return the Gibbs free energy of reaction in J/mol of a single
+        `reaction` at temperature `T` in K, using the cached free energies of
+        its species. Species not in the table are evaluated individually.
+        """
+        G = self.getFreeEnergies(T)
+        index = self.speciesIndex
+        getG = lambda spc: G[index[spc]] if spc in index else spc.getFreeEnergy(T)
+        return sum([getG(spc) for spc in reaction.products]) - sum([getG(spc) for spc in reaction.reactants])
+
+    def getEquilibriumConstant(self, reaction, T, type='Kc'):
+        """
+        Return the equilibrium constant of a single `reaction` at temperature
+        `T` in K, using the cached free energies of its species. Species not
+        in the table are evaluated individually.
+        """
+        K = numpy.exp(-self.getFreeEnergyOfReaction(reaction, T) / constants.R / T)
+        K *= self.getStandardStateFactor(T, len(reaction.products) - len(reaction.reactants), type)
+        if K == 0:
+            raise ReactionError('Got equilibrium constant of 0')
+        return K
+
+    def getStandardStateFactor(self, T, deltaN, type):
+        """
+        Return the factor converting the equilibrium constant in terms of
+        activities to the given `type` for a change of `deltaN` in the number
+        of molecules at temperature `T` in K.
+        """
+        P0 = 1e5
+        if type == 'Kc':
+            # C0 is the reference concentration
+            return (P0 / constants.R / T) ** deltaN
+        elif type == 'Kp':
+            return P0 ** deltaN
+        elif type != 'Ka' and type != '':
+            raise ValueError('Invalid type "{0}" passed to ThermoTable.getEquilibriumConstants(); should be "Ka", "Kc", or "Kp".'.format(type))
+        return 1.0
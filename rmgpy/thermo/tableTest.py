@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This script contains unit tests of the :mod:`rmgpy.thermo.table` module.
+"""
+
+import unittest
+import numpy
+
+from rmgpy.thermo import NASA, NASAPolynomial, Wilhoit, ThermoData
+from rmgpy.thermo.table import ThermoTable
+from rmgpy.species import Species
+from rmgpy.reaction import Reaction
+import rmgpy.constants as constants
+
+################################################################################
+
+class TestThermoTable(unittest.TestCase):
+    """
+    Contains unit tests of the :class:`ThermoTable` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.OH = Species(label='OH', thermo=NASA(polynomials=[NASAPolynomial(coeffs=[3.51457,2.92787e-05,-5.32168e-07,1.0195e-09,-3.85947e-13,3414.25,2.10435], Tmin=(100,'K'), Tmax=(1145.75,'K')), NASAPolynomial(coeffs=[3.07194,0.000604014,-1.39775e-08,-2.13448e-11,2.48067e-15,3579.39,4.578], Tmin=(1145.75,'K'), Tmax=(5000,'K'))], Tmin=(100,'K'), Tmax=(5000,'K')))
+        self.CH4 = Species(label='CH4', thermo=NASA(polynomials=[NASAPolynomial(coeffs=[4.20541,-0.00535551,2.51121e-05,-2.1376e-08,5.97513e-12,-10161.9,-0.921259], Tmin=(100,'K'), Tmax=(1084.13,'K')), NASAPolynomial(coeffs=[0.908298,0.011454,-4.57171e-06,8.29185e-10,-5.66309e-14,-9719.99,13.9929], Tmin=(1084.13,'K'), Tmax=(5000,'K'))], Tmin=(100,'K'), Tmax=(5000,'K')))
+        self.CH3 = Species(label='CH3', thermo=NASA(polynomials=[NASAPolynomial(coeffs=[3.67359,0.00201095,5.73022e-06,-6.87117e-09,2.54386e-12,16445,1.60456], Tmin=(200,'K'), Tmax=(1000,'K')), NASAPolynomial(coeffs=[2.28572,0.0072399,-2.98714e-06,5.95685e-10,-4.67154e-14,16775.6,8.48007], Tmin=(1000,'K'), Tmax=(3500,'K'))], Tmin=(200,'K'), Tmax=(3500,'K')))
+        self.H2O = Species(label='H2O', thermo=NASA(polynomials=[NASAPolynomial(coeffs=[4.05764,-0.000787936,2.90877e-06,-1.47519e-09,2.12842e-13,-30281.6,-0.311364], Tmin=(100,'K'), Tmax=(1130.24,'K')), NASAPolynomial(coeffs=[2.84325,0.00275109,-7.81031e-07,1.07244e-10,-5.79392e-15,-29958.6,5.91042], Tmin=(1130.24,'K'), Tmax=(5000,'K'))], Tmin=(100,'K'), Tmax=(5000,'K')))
+        self.C2H6 = Species(label='C2H6', thermo=Wilhoit(Cp0=(4.0*constants.R,"J/(mol*K)"), CpInf=(21.5*constants.R,"J/(mol*K)"), a0=0.0977518, a1=-16.3067, a2=26.2524, a3=-12.6785, B=(1068.68,"K"), H0=(-94088.*0.001*constants.R,"kJ/mol"), S0=(-118.46*constants.R,"J/(mol*K)")))
+        self.H = Species(label='H', thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],'K'), Cpdata=([20.8,20.8,20.8,20.8,20.8,20.8,20.8],'J/(mol*K)'), H298=(218.0,'kJ/mol'), S298=(114.7,'J/(mol*K)'), Cp0=(20.8,'J/(mol*K)'), CpInf=(20.8,'J/(mol*K)')))
+        self.reactions = [
+            Reaction(reactants=[self.CH4, self.OH], products=[self.CH3, self.H2O]),
+            Reaction(reactants=[self.CH3, self.CH3], products=[self.C2H6]),
+            Reaction(reactants=[self.CH3, self.H], products=[self.CH4]),
+            Reaction(reactants=[self.C2H6], products=[self.CH3, self.CH3]),
+        ]
+        self.table = ThermoTable()
+        self.table.setReactions(self.reactions)
+
+    def test_setReactions(self):
+        """
+        Test that the species and stoichiometry of the reactions are set.
+        """
+        self.assertEqual(self.table.species, [self.CH4, self.OH, self.CH3, self.H2O, self.C2H6, self.H])
+        self.assertEqual(list(self.table.fallback), [5])
+        self.assertEqual(list(self.table.deltaN), [0, -1, -1, 1])
+        stoichiometry = self.table.stoichiometry.toarray()
+        self.assertEqual(list(stoichiometry[1]), [0, 0, -2, 0, 1, 0])
+        self.assertEqual(list(stoichiometry[3]), [0, 0, 2, 0, -1, 0])
+
+    def test_getFreeEnergies(self):
+        """
+        Test that the table reproduces the thermo of each species.
+        """
+        for T in [300, 500, 1000, 1100, 1500, 2000]:
+            H = self.table.getEnthalpies(T)
+            S = self.table.getEntropies(T)
+            G = self.table.getFreeEnergies(T)
+            for i, spc in enumerate(self.table.species):
+                self.assertAlmostEqual(H[i], spc.getEnthalpy(T), delta=1e-6*abs(spc.getEnthalpy(T)))
+                self.assertAlmostEqual(S[i], spc.getEntropy(T), delta=1e-6*abs(spc.getEntropy(T)))
+                self.assertAlmostEqual(G[i], spc.getFreeEnergy(T), delta=1e-6*abs(spc.getFreeEnergy(T)))
+
+    def test_getEquilibriumConstants(self):
+        """
+        Test that the table reproduces the equilibrium constant of each reaction.
+        """
+        for T in [300, 500, 1000, 1500, 2000]:
+            for Ktype in ['Ka', 'Kc', 'Kp']:
+                Kact = self.table.getEquilibriumConstants(T, Ktype)
+                for rxn, K in zip(self.reactions, Kact):
+                    Kexp = rxn.getEquilibriumConstant(T, Ktype)
+                    self.assertAlmostEqual(K, Kexp, delta=1e-6*Kexp)
+                    self.assertAlmostEqual(self.table.getEquilibriumConstant(rxn, T, Ktype), Kexp, delta=1e-6*Kexp)
+
+    def test_invalidTemperature(self):
+        """
+        Test that a temperature outside all NASA polynomials raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.table.getFreeEnergies(4000.)
+
+    def test_replacedThermo(self):
+        """
+        Test that replacing the thermo of a species is picked up on the next call.
+        """
+        G0 = self.table.getFreeEnergies(1000.)[4]
+        self.C2H6.thermo = self.C2H6.thermo.toNASA(Tmin=300., Tmax=3000., Tint=1000.)
+        self.table.setReactions(self.reactions)
+        self.assertEqual(self.table.packed[self.C2H6][1][0], 'nasa')
+        self.assertAlmostEqual(self.table.getFreeEnergies(1000.)[4], G0, delta=1e-3*abs(G0))
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -34,6 +34,7 @@ import math
 import logging as logging
 from rmgpy.scoop_framework.util import submit_
 from rmgpy.data.rmg import getDB
+from rmgpy.data.store import getPropertyStore
 import rmgpy.constants as constants
 from rmgpy.molecule import Molecule
 from rmgpy.statmech import Conformer
@@ -125,6 +126,9 @@ def generateThermoData(spc, thermoClass=NASA, solventName=''):
     It then calls :meth:`processThermoData`, to convert (via Wilhoit) to NASA
     and set the E0.
     
+    If a property store is in use, the thermo data is taken from the store if
+    possible, and otherwise added to it.
+    
     Result stored in `spc.thermo` and returned.
     """
     
@@ -135,6 +139,13 @@ def generateThermoData(spc, thermoClass=NASA, solventName=''):
         logging.debug('Could not obtain the thermo database. Not generating thermo...')
         return None
     
+    store = getPropertyStore()
+    storeName = 'thermo/{0}/{1}'.format(thermoClass.__name__, solventName or '')
+    if store is not None:
+        stored = store.get(spc, storeName)
+        if stored is not None:
+            return loadStoredThermoData(spc, stored)
+    
     thermo0 = thermodb.getThermoData(spc) 
 
     # 1. maybe only submit cyclic core
@@ -154,7 +165,33 @@ def generateThermoData(spc, thermoClass=NASA, solventName=''):
         
         thermoCentralDatabase.registerInCentralThermoDB(spc)
         
-    return processThermoData(spc, thermo0, thermoClass, solventName)
+    thermo = processThermoData(spc, thermo0, thermoClass, solventName)
+
+    if store is not None:
+        store.put(spc, storeName, (thermo, spc.conformer.E0, spc.molecule[0].toAdjacencyList()))
+
+    return thermo
+
+def loadStoredThermoData(spc, stored):
+    """
+    Set the E0 and the order of the resonance structures of `spc` from the
+    thermo data `stored` in the property store, as :meth:`generateThermoData`
+    would have, and return the thermo data.
+    """
+    thermo, E0, adjlist = stored
+
+    # The estimate puts the resonance structure that the thermo is based on first
+    molecule = Molecule().fromAdjacencyList(adjlist)
+    for index, mol in enumerate(spc.molecule):
+        if mol.isIsomorphic(molecule):
+            spc.molecule.insert(0, spc.molecule.pop(index))
+            break
+
+    if spc.conformer is None:
+        spc.conformer = Conformer()
+    spc.conformer.E0 = E0
+
+    return thermo
 
 
 def evaluator(spc, solventName = ''):
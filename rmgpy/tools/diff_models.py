@@ -63,6 +63,7 @@ import argparse
 from rmgpy.chemkin import loadChemkinFile
 from rmgpy.rmg.model import ReactionModel
 from rmgpy.rmg.output import saveDiffHTML
+from rmgpy.scoop_framework.util import configureExecutor
 
 ################################################################################
 
@@ -206,11 +207,13 @@ def compareModelReactions(model1, model2):
 
     return commonReactions, uniqueReactions1, uniqueReactions2
 
-def saveCompareHTML(outputDir,chemkinPath1,speciesDictPath1,chemkinPath2,speciesDictPath2,readComments1=True,readComments2=True):
+def saveCompareHTML(outputDir,chemkinPath1,speciesDictPath1,chemkinPath2,speciesDictPath2,readComments1=True,readComments2=True,
+                    executor=None,processes=None):
     """
     Saves a model comparison HTML file based on two sets of chemkin and species dictionary
-    files.
+    files. The files are loaded with the given `executor` and number of `processes`.
     """
+    configureExecutor(executor, processes)
     model1 = ReactionModel()
     model1.species, model1.reactions = loadChemkinFile(chemkinPath1, speciesDictPath1, readComments = readComments1)
     model2 = ReactionModel()
@@ -273,6 +276,10 @@ def parseCommandLineArguments():
     parser.add_argument('--diffOnly', action='store_true', help='Do not show identical species thermo or reactions')
     parser.add_argument('--commonDiffOnly', action='store_true',
         help='Only show species and reactions present in BOTH models which have different values')
+    parser.add_argument('-e', '--executor', type=str, choices=['serial', 'process', 'thread', 'scoop'], default=None,
+        help='distribute the loading of the models with EXECUTOR')
+    parser.add_argument('-n', '--processes', type=int, default=None, metavar='N',
+        help='use N workers for the executor')
     
     args = parser.parse_args()
 
@@ -303,12 +310,16 @@ def main():
             'wd': os.getcwd(),
             'diffOnly': args.diffOnly,
             'commonDiffOnly': args.commonDiffOnly,
+            'executor': args.executor,
+            'processes': args.processes,
             }
 
     execute(chemkin1, speciesDict1, thermo1, chemkin2, speciesDict2, thermo2, **kwargs)
 
 def execute(chemkin1, speciesDict1, thermo1, chemkin2, speciesDict2, thermo2, **kwargs):
     
+    configureExecutor(kwargs.get('executor'), kwargs.get('processes'))
+
     model1 = ReactionModel()
     model1.species, model1.reactions = loadChemkinFile(chemkin1, speciesDict1, thermoPath = thermo1)
     model2 = ReactionModel()
@@ -526,10 +526,11 @@ def loadChemkinOutput(outputFile, reactionModel):
 
 def createFluxDiagram(inputFile, chemkinFile, speciesDict, savePath=None, speciesPath=None, java=False, settings=None,
                       chemkinOutput='', centralSpeciesList=None, superimpose=False, saveStates=False,
-                      readStates=False, diffusionLimited=True, checkDuplicates=True):
+                      readStates=False, diffusionLimited=True, checkDuplicates=True, executor=None, processes=None):
     """
     Generates the flux diagram based on a condition 'inputFile', chemkin.inp chemkinFile,
-    a speciesDict txt file, plus an optional chemkinOutput file.
+    a speciesDict txt file, plus an optional chemkinOutput file. The model is loaded
+    with the given `executor` and number of `processes`.
     """
 
     if java==True:
@@ -543,7 +544,8 @@ def createFluxDiagram(inputFile, chemkinFile, speciesDict, savePath=None, specie
 
     print 'Loading RMG job...'
     rmg = loadRMGJob(inputFile, chemkinFile, speciesDict,
-                     generateImages=generateImages, useJava=java, checkDuplicates=checkDuplicates)
+                     generateImages=generateImages, useJava=java, checkDuplicates=checkDuplicates,
+                     generateResonanceStructures=False, executor=executor, processes=processes)
 
     if savePath is None:
         savePath = os.path.join(rmg.outputDirectory, 'flux')
@@ -38,28 +38,37 @@ import warnings
 from rmgpy.chemkin import loadChemkinFile
 from rmgpy.solver.liquid import LiquidReactor
 from rmgpy.solver.base import TerminationConversion
+from rmgpy.scoop_framework.util import configureExecutor
 
 def loadRMGJob(inputFile, chemkinFile=None, speciesDict=None, generateImages=True, useJava=False,
-               useChemkinNames=False, checkDuplicates=True):
+               useChemkinNames=False, checkDuplicates=True, generateResonanceStructures=True,
+               executor=None, processes=None):
 
     if useJava:
         # The argument is an RMG-Java input file
         warnings.warn("The RMG-Java input is no longer supported and may be"\
             "removed in version 2.3.", DeprecationWarning)
         rmg = loadRMGJavaJob(inputFile, chemkinFile, speciesDict, generateImages,
-                             useChemkinNames=useChemkinNames, checkDuplicates=checkDuplicates)
+                             useChemkinNames=useChemkinNames, checkDuplicates=checkDuplicates,
+                             generateResonanceStructures=generateResonanceStructures,
+                             executor=executor, processes=processes)
         
     else:
         # The argument is an RMG-Py input file
         rmg = loadRMGPyJob(inputFile, chemkinFile, speciesDict, generateImages,
-                           useChemkinNames=useChemkinNames, checkDuplicates=checkDuplicates)
+                           useChemkinNames=useChemkinNames, checkDuplicates=checkDuplicates,
+                           generateResonanceStructures=generateResonanceStructures,
+                           executor=executor, processes=processes)
 
     return rmg
 
 def loadRMGPyJob(inputFile, chemkinFile=None, speciesDict=None, generateImages=True,
-                 useChemkinNames=False, checkDuplicates=True):
+                 useChemkinNames=False, checkDuplicates=True, generateResonanceStructures=True,
+                 executor=None, processes=None):
     """
     Load the results of an RMG-Py job generated from the given `inputFile`.
+    The model is loaded with the given `executor` and number of `processes`,
+    which take precedence over the options of the input file.
     """
     from rmgpy.rmg.main import RMG
     
@@ -68,17 +77,29 @@ def loadRMGPyJob(inputFile, chemkinFile=None, speciesDict=None, generateImages=T
     rmg.loadInput(inputFile)
     rmg.outputDirectory = os.path.abspath(os.path.dirname(inputFile))
     
+    # Select the executor for loading the model
+    if executor is not None:
+        rmg.executor = executor
+    if processes is not None:
+        rmg.executorProcesses = processes
+    configureExecutor(rmg.executor, rmg.executorProcesses)
+    
     # Load the final Chemkin model generated by RMG
     if not chemkinFile:
         chemkinFile = os.path.join(os.path.dirname(inputFile), 'chemkin', 'chem.inp')
     if not speciesDict:
         speciesDict = os.path.join(os.path.dirname(inputFile), 'chemkin', 'species_dictionary.txt')
     speciesList, reactionList = loadChemkinFile(chemkinFile, speciesDict,
-                                                useChemkinNames=useChemkinNames, checkDuplicates=checkDuplicates)
+                                                useChemkinNames=useChemkinNames, checkDuplicates=checkDuplicates,
+                                                generateResonanceStructures=generateResonanceStructures)
     
     # Map species in input file to corresponding species in Chemkin file
     speciesDict = {}
     for spec0 in rmg.initialSpecies:
+        if not generateResonanceStructures:
+            # The Chemkin species only have the structures in the dictionary,
+            # so match them against all resonance structures of the input species
+            spec0.generate_resonance_structures()
         for species in speciesList:
             if species.isIsomorphic(spec0):
                 speciesDict[spec0] = species
@@ -131,9 +152,11 @@ def loadRMGPyJob(inputFile, chemkinFile=None, speciesDict=None, generateImages=T
 
 
 def loadRMGJavaJob(inputFile, chemkinFile=None, speciesDict=None, generateImages=True,
-                   useChemkinNames=False, checkDuplicates=True):
+                   useChemkinNames=False, checkDuplicates=True, generateResonanceStructures=True,
+                   executor=None, processes=None):
     """
     Load the results of an RMG-Java job generated from the given `inputFile`.
+    The model is loaded with the given `executor` and number of `processes`.
     """
     warnings.warn("The RMG-Java input is no longer supported and may be"\
             "removed in version 2.3.", DeprecationWarning)
@@ -145,6 +168,7 @@ def loadRMGJavaJob(inputFile, chemkinFile=None, speciesDict=None, generateImages
     rmg = RMG(inputFile=inputFile)
     rmg.loadRMGJavaInput(inputFile)
     rmg.outputDirectory = os.path.abspath(os.path.dirname(inputFile))
+    configureExecutor(executor, processes)
     
     # Load the final Chemkin model generated by RMG-Java
     if not chemkinFile:
@@ -152,7 +176,8 @@ def loadRMGJavaJob(inputFile, chemkinFile=None, speciesDict=None, generateImages
     if not speciesDict:
         speciesDict = os.path.join(os.path.dirname(inputFile), 'RMG_Dictionary.txt')
     speciesList, reactionList = loadChemkinFile(chemkinFile, speciesDict,
-                                                useChemkinNames=useChemkinNames, checkDuplicates=checkDuplicates)
+                                                useChemkinNames=useChemkinNames, checkDuplicates=checkDuplicates,
+                                                generateResonanceStructures=generateResonanceStructures)
     
     # Bath gas species don't appear in RMG-Java species dictionary, so handle
     # those as a special case
@@ -169,6 +194,10 @@ def loadRMGJavaJob(inputFile, chemkinFile=None, speciesDict=None, generateImages
     # Map species in input file to corresponding species in Chemkin file
     speciesDict = {}
     for spec0 in rmg.initialSpecies:
+        if not generateResonanceStructures:
+            # The Chemkin species only have the structures in the dictionary,
+            # so match them against all resonance structures of the input species
+            spec0.generate_resonance_structures()
         for species in speciesList:
             if species.isIsomorphic(spec0):
                 speciesDict[spec0] = species
@@ -46,6 +46,7 @@ import argparse
 
 from rmgpy.chemkin import loadChemkinFile, saveChemkinFile, saveSpeciesDictionary, saveTransportFile
 from rmgpy.rmg.model import ReactionModel
+from rmgpy.scoop_framework.util import configureExecutor
 
 ################################################################################
 
@@ -62,6 +63,10 @@ def parseCommandLineArguments():
         help='the Chemkin files and species dictionaries of the fourth model to merge')
     parser.add_argument('--model5', metavar='FILE', type=str, nargs='+',
         help='the Chemkin files and species dictionaries of the fifth model to merge')
+    parser.add_argument('-e', '--executor', type=str, choices=['serial', 'process', 'thread', 'scoop'], default=None,
+        help='distribute the loading of the models with EXECUTOR')
+    parser.add_argument('-n', '--processes', type=int, default=None, metavar='N',
+        help='use N workers for the executor')
     
     args = parser.parse_args()
     return args
@@ -89,6 +94,8 @@ def main():
     kwargs = {
             'wd': os.getcwd(),
             'transport': transport,
+            'executor': args.executor,
+            'processes': args.processes,
     }
 
     execute(inputModelFiles, **kwargs)
@@ -101,6 +108,8 @@ def execute(inputModelFiles, **kwargs):
         wd = os.getcwd()
 
     transport = kwargs['transport']
+
+    configureExecutor(kwargs.get('executor'), kwargs.get('processes'))
     
     outputChemkinFile = os.path.join(wd, 'chem.inp')
     outputSpeciesDictionary = os.path.join(wd, 'species_dictionary.txt')
@@ -140,14 +140,17 @@ def simulate(rmg, diffusionLimited=True):
         if reactionSystem.sensitiveSpecies:
             plot_sensitivity(rmg.outputDirectory, index, reactionSystem.sensitiveSpecies)
 
-def run_simulation(inputFile, chemkinFile, dictFile, diffusionLimited=True, checkDuplicates=True):
+def run_simulation(inputFile, chemkinFile, dictFile, diffusionLimited=True, checkDuplicates=True,
+                   executor=None, processes=None):
     """
     Runs a standalone simulation of RMG.  Runs sensitivity analysis if sensitive species are given.
     diffusionLimited=True implies that if it is a liquid reactor diffusion limitations will be enforced
     otherwise they will not be in a liquid reactor
+    The model is loaded with the given `executor` and number of `processes`.
     """
     
-    rmg = loadRMGJob(inputFile, chemkinFile, dictFile, generateImages=False, checkDuplicates=checkDuplicates)
+    rmg = loadRMGJob(inputFile, chemkinFile, dictFile, generateImages=False, checkDuplicates=checkDuplicates,
+                     generateResonanceStructures=False, executor=executor, processes=processes)
     
     start_time = time()
     # conduct simulation
@@ -312,19 +312,23 @@ class Uncertainty:
         
             family.fillKineticsRulesByAveragingUp(verbose=True)
 
-    def loadModel(self, chemkinPath, dictionaryPath, transportPath=None):
+    def loadModel(self, chemkinPath, dictionaryPath, transportPath=None, executor=None, processes=None):
         """
         Load a RMG-generated model into the Uncertainty class
         `chemkinPath`: path to the chem_annotated.inp CHEMKIN mechanism 
         `dictionaryPath`: path to the species_dictionary.txt file 
         `transportPath`: path to the tran.dat file (optional)
+        `executor`: the executor used to load the model (optional)
+        `processes`: the number of workers of the executor (optional)
 
         Then create dictionaries stored in self.thermoGroups and self.rateRules
         containing information about the source of the thermodynamic and kinetic
         parameters
         """
         from rmgpy.chemkin import loadChemkinFile
+        from rmgpy.scoop_framework.util import configureExecutor
 
+        configureExecutor(executor, processes)
         self.speciesList, self.reactionList = loadChemkinFile(chemkinPath,
                                                               dictionaryPath=dictionaryPath,
                                                               transportPath=transportPath)
@@ -28,11 +28,16 @@
 #                                                                             #
 ###############################################################################
 
+import os
 import os.path
+import sys
 import shutil
 from functools import wraps
 import time
 import logging
+import multiprocessing
+
+from rmgpy.exceptions import OutputError
 
 
 class Subject(object):
@@ -109,6 +114,91 @@ class Subject(object):
             if modifier != observer:
                 observer.update(self)
 
+class BackgroundWriter(object):
+    """
+    Runs one kind of output writing at a time in a child process forked from
+    the job, so that the job can continue while the output is written. The
+    child process holds a copy-on-write image of the job as it was when the
+    writing was submitted, so later changes to the model do not affect the
+    output, and any changes made while writing are discarded. A new write
+    only waits for the previous write of the same writer to finish.
+
+    If `enabled` is ``False``, or where processes cannot be forked, the
+    writing runs in the calling process instead.
+    """
+
+    def __init__(self, name, enabled=True):
+        self.name = name
+        self.enabled = enabled
+        self.process = None
+
+    def submit(self, function, *args):
+        """
+        Call `function` with the arguments `args`, in a child process if
+        enabled, once the previous write has finished.
+        """
+        self.wait()
+        if not self.enabled or not hasattr(os, 'fork'):
+            function(*args)
+            return
+        self.process = multiprocessing.Process(target=_runInBackground, args=(self.name, function, args))
+        self.process.start()
+
+    def wait(self):
+        """
+        Wait for the running write, if any, to finish. Raises an
+        :class:`OutputError` if it failed.
+        """
+        if self.process is None:
+            return
+        self.process.join()
+        exitcode = self.process.exitcode
+        self.process = None
+        if exitcode != 0:
+            raise OutputError('Writing {0} in the background failed with exit code {1:d}.'.format(self.name, exitcode))
+
+    def __getstate__(self):
+        # A running child process cannot be pickled, e.g. with a restart file
+        state = self.__dict__.copy()
+        state['process'] = None
+        return state
+
+def _runInBackground(name, function, args):
+    """
+    Call `function` with the arguments `args` in a child process started by
+    :class:`BackgroundWriter`, logging any error before exiting.
+    """
+    try:
+        function(*args)
+    except Exception:
+        logging.exception('Error while writing {0} in the background:'.format(name))
+        sys.exit(1)
+
+class BackgroundListener(object):
+    """
+    Wraps a listener so that its updates run in the background with a
+    :class:`BackgroundWriter`. Only listeners that keep no state between
+    updates can be wrapped, since the updates run in child processes.
+
+    e.g.:
+
+    listener = BackgroundListener(ChemkinWriter(outputDirectory))
+    subject.attach(listener)
+    """
+
+    def __init__(self, listener):
+        self.listener = listener
+        self.writer = BackgroundWriter(type(listener).__name__)
+
+    def update(self, subject):
+        self.writer.submit(self.listener.update, subject)
+
+    def wait(self):
+        """
+        Wait for the running update, if any, to finish.
+        """
+        self.writer.wait()
+
 def makeOutputSubdirectory(outputDirectory, folder):
     """
     Create a subdirectory `folder` in the output directory. If the folder
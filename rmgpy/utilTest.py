@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2019 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains unit tests of the rmgpy.util module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import logging
+
+from rmgpy.exceptions import OutputError
+from rmgpy.util import Subject, BackgroundWriter, BackgroundListener
+
+################################################################################
+
+def writeSpeciesCount(path, speciesList):
+    with open(path, 'w') as f:
+        f.write(str(len(speciesList)))
+
+def failToWrite():
+    raise IOError('The disk is full')
+
+class SpeciesCountWriter(object):
+    """
+    A listener that writes the number of species of its subject.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def update(self, subject):
+        writeSpeciesCount(self.path, subject.speciesList)
+
+class TestBackgroundWriter(unittest.TestCase):
+    """
+    Contains unit tests of writing output in the background.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'count.txt')
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        shutil.rmtree(self.directory)
+
+    def testSubmit(self):
+        """
+        Test that the output is written from the data as it was when the
+        writing was submitted.
+        """
+        speciesList = ['CH4', 'H']
+        writer = BackgroundWriter('species count')
+        writer.submit(writeSpeciesCount, self.path, speciesList)
+        speciesList.append('CH3')
+        writer.wait()
+        with open(self.path) as f:
+            self.assertEqual(f.read(), '2')
+        self.assertIsNone(writer.process)
+
+    def testDisabled(self):
+        """
+        Test that a disabled writer writes in the calling process.
+        """
+        writer = BackgroundWriter('species count', enabled=False)
+        writer.submit(writeSpeciesCount, self.path, ['CH4'])
+        self.assertIsNone(writer.process)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), '1')
+
+    def testFailure(self):
+        """
+        Test that an error while writing is raised when waiting for it.
+        """
+        writer = BackgroundWriter('nothing')
+        logging.disable(logging.CRITICAL)
+        try:
+            writer.submit(failToWrite)
+            self.assertRaises(OutputError, writer.wait)
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def testListener(self):
+        """
+        Test that a wrapped listener is updated in the background.
+        """
+        subject = Subject()
+        subject.speciesList = ['CH4', 'H']
+        listener = BackgroundListener(SpeciesCountWriter(self.path))
+        subject.attach(listener)
+        subject.notify()
+        subject.speciesList = ['CH4', 'H', 'CH3']
+        subject.notify()
+        listener.wait()
+        with open(self.path) as f:
+            self.assertEqual(f.read(), '3')
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
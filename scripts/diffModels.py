@@ -50,6 +50,8 @@ Flag                    Description
 ======================= ====================================================================================
 --diffOnly              Only show species and reactions which are unique or have different values
 --commonDiffOnly        Only show species and reactions present in BOTH models which have different values
+-e, --executor          Distribute loading the models with the serial, process, thread or scoop executor
+-n, --processes         Number of workers for the executor
 ======================= ==================================================================================== 
 """
 import rmgpy.tools.diff_models as diff_models
@@ -75,6 +75,10 @@ def parse_arguments():
                                                              ' nodes and edges than given by maxnode and maxedge)')
     parser.add_argument('--saveStates', action='store_true', help='Save simulation states to disk')
     parser.add_argument('--readStates', action='store_true', help='Read simulation states from disk')
+    parser.add_argument('--executor', type=str, choices=['serial', 'process', 'thread', 'scoop'], default=None,
+                        help='distribute the loading of the model with EXECUTOR')
+    parser.add_argument('--processes', type=int, default=None, metavar='N',
+                        help='use N workers for the executor')
 
     args = parser.parse_args()
 
@@ -90,6 +94,8 @@ def parse_arguments():
     superimpose = args.super
     saveStates = args.saveStates
     readStates = args.readStates
+    executor = args.executor
+    processes = args.processes
 
     keys = ('maximumNodeCount',
             'maximumEdgeCount',
@@ -113,7 +119,9 @@ def parse_arguments():
             centralSpeciesList,
             superimpose,
             saveStates,
-            readStates)
+            readStates,
+            executor,
+            processes)
 
 def main():
     (inputFile,
@@ -128,12 +136,14 @@ def main():
      centralSpeciesList,
      superimpose,
      saveStates,
-     readStates) = parse_arguments()
+     readStates,
+     executor,
+     processes) = parse_arguments()
 
     createFluxDiagram(inputFile, chemkinFile, dictFile, speciesPath=speciesPath, java=useJava, settings=settings,
                       chemkinOutput=chemkinOutput, diffusionLimited=dflag, centralSpeciesList=centralSpeciesList,
                       superimpose=superimpose, saveStates=saveStates, readStates=readStates,
-                      checkDuplicates=checkDuplicates)
+                      checkDuplicates=checkDuplicates, executor=executor, processes=processes)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -53,6 +53,10 @@ def parse_arguments():
         help='Turn off diffusion-limited rates for LiquidReactor')
     parser.add_argument('-f', '--foreign', dest='checkDuplicates', action='store_true',
         help='Not an RMG generated Chemkin file (will be checked for duplicates)')
+    parser.add_argument('-e', '--executor', type=str, choices=['serial', 'process', 'thread', 'scoop'], default=None,
+        help='distribute the loading of the model with EXECUTOR')
+    parser.add_argument('-n', '--processes', type=int, default=None, metavar='N',
+        help='use N workers for the executor')
     args = parser.parse_args()
     
     inputFile = os.path.abspath(args.input[0])
@@ -61,12 +65,13 @@ def parse_arguments():
     dflag = args.dlim
     checkDuplicates = args.checkDuplicates
 
-    return inputFile, chemkinFile, dictFile, dflag, checkDuplicates
+    return inputFile, chemkinFile, dictFile, dflag, checkDuplicates, args.executor, args.processes
 
 def main():
-    inputFile, chemkinFile, dictFile, dflag, checkDuplicates = parse_arguments()
+    inputFile, chemkinFile, dictFile, dflag, checkDuplicates, executor, processes = parse_arguments()
 
-    run_simulation(inputFile, chemkinFile, dictFile, diffusionLimited=dflag, checkDuplicates=checkDuplicates)
+    run_simulation(inputFile, chemkinFile, dictFile, diffusionLimited=dflag, checkDuplicates=checkDuplicates,
+                   executor=executor, processes=processes)
 
 ################################################################################
 
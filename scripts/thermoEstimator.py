@@ -38,6 +38,7 @@ heat capacity data in RMG-database format.
 import os.path
 from rmgpy import settings
 from rmgpy.data.rmg import RMGDatabase
+from rmgpy.data.store import setPropertyStore
 from rmgpy.rmg.main import RMG
 from rmgpy.chemkin import saveChemkinFile, saveSpeciesDictionary
 from rmgpy.rmg.model import Species
@@ -65,9 +66,14 @@ def runThermoEstimator(inputFile, library_flag):
         Species.solventData = rmg.database.solvation.getSolventData(rmg.solvent)
         Species.solventName = rmg.solvent
 
+    rmg.openPropertyStore()
+
     for species in rmg.initialSpecies:
         submit(species)
 
+    # Write the new thermo data to the property store
+    setPropertyStore(None)
+
     if library_flag:
         library = ThermoLibrary(name='Thermo Estimation Library')
         for species in rmg.initialSpecies: